@@ -0,0 +1,75 @@
+# scripts/bench_consolidator.py
+"""
+Cost of one consolidated tick over a whole universe: the per-symbol dict path
+(PriceCalculator.handle_outliers + calculate_weighted_average) versus a single
+PriceConsolidator.consolidate() over the symbols x sources matrix.
+
+    python scripts/bench_consolidator.py --symbols 2000 --sources 4
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(ROOT, "src"))
+
+from price_engine.consolidator import PriceConsolidator
+from price_engine.price_calculator import PriceCalculator
+
+
+def make_quotes(symbols, sources, seed=3):
+    rng = np.random.default_rng(seed)
+    base = rng.uniform(1, 1000, size=(symbols, 1))
+    prices = base * (1 + rng.normal(0, 0.0005, size=(symbols, sources)))
+    # A few broken quotes and missing sources.
+    prices[rng.random((symbols, sources)) < 0.02] *= 1.2
+    prices[rng.random((symbols, sources)) < 0.05] = np.nan
+    ages = rng.exponential(2.0, size=(symbols, sources))
+    return prices, ages
+
+
+def per_symbol(prices, names, weights):
+    out = []
+    for row in prices:
+        quotes = {name: (None if np.isnan(p) else float(p)) for name, p in zip(names, row)}
+        quotes = PriceCalculator.handle_outliers(quotes)
+        try:
+            out.append(PriceCalculator.calculate_weighted_average(quotes, weights))
+        except ValueError:
+            out.append(np.nan)
+    return out
+
+
+def best_of(repeat, fn, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark universe-wide price consolidation.")
+    parser.add_argument("--symbols", type=int, default=2000)
+    parser.add_argument("--sources", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    names = [f"source{i}" for i in range(args.sources)]
+    weights = {name: 1.0 / args.sources for name in names}
+    prices, ages = make_quotes(args.symbols, args.sources)
+    consolidator = PriceConsolidator(weights)
+
+    loop = best_of(args.repeat, per_symbol, prices, names, weights)
+    vector = best_of(args.repeat, consolidator.consolidate, prices, ages)
+    print(f"{args.symbols} symbols x {args.sources} sources")
+    print(f"per-symbol dicts : {loop * 1000:8.2f} ms")
+    print(f"one numpy pass   : {vector * 1000:8.2f} ms  ({loop / vector:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
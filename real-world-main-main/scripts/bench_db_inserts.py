@@ -0,0 +1,86 @@
+# scripts/bench_db_inserts.py
+"""
+Insert throughput of PriceDatabase: one commit per tick versus the batched
+WAL writer, plus the cost of a ranged get_prices() on the indexed table.
+--partitioned runs the batched case on PartitionedPriceDatabase (day
+partitions and OHLC rollups) and times a rollup query as well.
+
+    python scripts/bench_db_inserts.py --ticks 20000 --symbols 20 [--partitioned]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(ROOT, "src"))
+
+from price_engine.database import TIMESTAMP_FORMAT, PartitionedPriceDatabase, PriceDatabase
+
+
+def make_ticks(count, symbol_count, days=3):
+    """Ticks spread evenly over the last few days, so partitioned runs span several partitions."""
+    rng = random.Random(42)
+    symbols = [f"SYM{i:03d}USDT" for i in range(symbol_count)]
+    origin = datetime.now(timezone.utc) - timedelta(days=days)
+    step = timedelta(days=days) / max(count, 1)
+    return [("binance_ws", symbols[i % symbol_count], 100 + rng.random(),
+             (origin + step * i).strftime(TIMESTAMP_FORMAT)[:-3]) for i in range(count)]
+
+
+def run(path, ticks, cls=PriceDatabase, **kwargs):
+    db = cls(path, **kwargs)
+    start = time.perf_counter()
+    for source, symbol, price, timestamp in ticks:
+        db.insert_price(source, symbol, price, timestamp)
+    queued = time.perf_counter() - start
+    db.flush()
+    elapsed = time.perf_counter() - start
+    return db, queued, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PriceDatabase insert throughput.")
+    parser.add_argument("--ticks", type=int, default=20000)
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--partitioned", action="store_true", help="Use PartitionedPriceDatabase for the batched run.")
+    args = parser.parse_args()
+
+    ticks = make_ticks(args.ticks, args.symbols)
+    # Committing every row is slow; time it on a slice and report the rate.
+    per_row = ticks[:min(len(ticks), 2000)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db, _, elapsed = run(os.path.join(tmp, "per_row.db"), per_row)
+        db.close()
+        print(f"commit per tick : {len(per_row) / elapsed:>10,.0f} inserts/s  ({len(per_row)} ticks)")
+
+        cls = PartitionedPriceDatabase if args.partitioned else PriceDatabase
+        db, queued, elapsed = run(os.path.join(tmp, "batched.db"), ticks, cls=cls, batched=True,
+                                  batch_size=args.batch_size)
+        label = "partitioned" if args.partitioned else "batched writer"
+        print(f"{label:<16}: {len(ticks) / elapsed:>10,.0f} inserts/s  ({len(ticks)} ticks, "
+              f"enqueue {len(ticks) / queued:,.0f}/s)")
+
+        symbol = ticks[0][1]
+        start = time.perf_counter()
+        rows = db.get_prices(symbol, limit=500)
+        print(f"get_prices page : {(time.perf_counter() - start) * 1000:>10.2f} ms for {len(rows)} rows")
+        if args.partitioned:
+            start = time.perf_counter()
+            bars = db.get_ohlc(symbol, "1h")
+            print(f"get_ohlc 1h     : {(time.perf_counter() - start) * 1000:>10.2f} ms for {len(bars)} bars "
+                  f"({len(db.partitions())} partitions)")
+        else:
+            plan = db.conn.execute("EXPLAIN QUERY PLAN SELECT source, price, timestamp FROM prices "
+                                   "WHERE symbol = ? ORDER BY timestamp DESC", (symbol,)).fetchall()
+            print("query plan      :", "; ".join(row[-1] for row in plan))
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
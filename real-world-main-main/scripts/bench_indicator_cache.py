@@ -0,0 +1,82 @@
+# scripts/bench_indicator_cache.py
+"""
+Parameter sweep with and without the indicator cache (price_engine.indicators.cache).
+
+Sweeps mean reversion thresholds and Bollinger band widths over the same closes
+three times: uncached, against a cold cache (first pass fills it) and against a
+fresh IndicatorCache on the same directory, as the next process would see it.
+
+    python scripts/bench_indicator_cache.py --file btcusdt_price_log.csv --symbols 4
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(ROOT, "src"))
+
+from backtesting_engine.strategies import create_strategy
+from price_engine.indicators import cache as indicator_cache
+
+
+def load_closes(path, limit, symbols):
+    prices = []
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            prices.append(float(row[1]))
+            if limit and len(prices) >= limit:
+                break
+    base = np.asarray(prices)
+    # Extra columns are the log rescaled, so every symbol has its own fingerprint.
+    return pd.DataFrame({f"S{i}": base * (1 + 0.01 * i) for i in range(symbols)})
+
+
+def sweep(closes, use_cache):
+    runs = [("mean_reversion", {"threshold": t}) for t in (0.8, 1.0, 1.2, 1.4, 1.6, 2.0)]
+    runs += [("bollinger", {"num_std": k}) for k in (1.5, 2.0, 2.5, 3.0)]
+    start = time.perf_counter()
+    for name, params in runs:
+        strategy = create_strategy(name, **params)
+        strategy.use_cache = use_cache
+        strategy.on_series(closes)
+    return (time.perf_counter() - start) * 1e3, len(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Indicator cache sweep benchmark.")
+    parser.add_argument("--file", default=os.path.join(ROOT, "btcusdt_price_log.csv"))
+    parser.add_argument("--limit", type=int, default=0, help="Prices read from the log (0 = all)")
+    parser.add_argument("--symbols", type=int, default=4, help="Columns in the sweep")
+    args = parser.parse_args()
+
+    closes = load_closes(args.file, args.limit, args.symbols)
+    print(f"Closes: {closes.shape[0]} bars x {closes.shape[1]} symbols")
+
+    with tempfile.TemporaryDirectory() as path:
+        print("\nSweep                     ms   runs  hit rate")
+        elapsed, runs = sweep(closes, use_cache=False)
+        print(f"  {'uncached':<20} {elapsed:8.1f} {runs:6d}         -")
+        for label in ("cold cache", "warm (memory)", "new process (disk)"):
+            if label == "new process (disk)":
+                indicator_cache.configure_cache(path)
+            elif label == "cold cache":
+                indicator_cache.configure_cache(path).clear()
+            cache = indicator_cache.get_cache()
+            before = cache.stats()
+            elapsed, runs = sweep(closes, use_cache=True)
+            after = cache.stats()
+            hits = (after["memory_hits"] + after["disk_hits"]) - (before["memory_hits"] + before["disk_hits"])
+            lookups = hits + after["misses"] - before["misses"]
+            print(f"  {label:<20} {elapsed:8.1f} {runs:6d} {hits / lookups:9.0%}")
+        stats = indicator_cache.get_cache().stats()
+        print(f"\nDisk tier: {stats['disk_bytes'] / 2 ** 20:,.1f} MiB, memory tier: {stats['memory_items']} series")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# scripts/bench_kernels.py
+"""
+Trend and z-score kernels (price_engine.indicators.kernels) against the code
+they replaced: lstsq slope, convolved EMA weights rebuilt per call, and
+np.mean/np.std per tick.
+
+Per tick: one call on the last window of a tick log. Per series: every bar of
+the log at once, with the numpy and (when numba is installed) JIT kernels,
+against calling the per-tick version bar by bar. Signals: mean reversion
+on_series against strategy_states stepping the strategy per bar.
+
+    python scripts/bench_kernels.py --file btcusdt_price_log.csv --repeat 2000
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(ROOT, "src"))
+
+from backtesting_engine.multi_asset import strategy_states
+from backtesting_engine.strategies.strategy_mean_reversion import MeanReversionStrategy, strategy_mean_reversion
+from price_engine.indicators import kernels
+
+
+def legacy_slope(prices, window):
+    x = np.arange(window)
+    y = np.array(prices[-window:])
+    A = np.vstack([x, np.ones(len(x))]).T
+    m, _ = np.linalg.lstsq(A, y, rcond=None)[0]
+    return m
+
+
+def legacy_ema(prices, window):
+    weights = np.exp(np.linspace(-1., 0., window))
+    weights /= weights.sum()
+    return np.convolve(prices[-window:], weights, mode='valid')[-1]
+
+
+def legacy_zscore(prices, window):
+    tail = prices[-window:]
+    std = np.std(tail)
+    return None if std == 0 else (prices[-1] - np.mean(tail)) / std
+
+
+def load_prices(path, limit):
+    prices = []
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            prices.append(float(row[1]))
+            if limit and len(prices) >= limit:
+                break
+    return prices
+
+
+def per_call_us(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trend / z-score kernel benchmark.")
+    parser.add_argument("--file", default=os.path.join(ROOT, "btcusdt_price_log.csv"))
+    parser.add_argument("--limit", type=int, default=0, help="Prices read from the log (0 = all)")
+    parser.add_argument("--repeat", type=int, default=2000, help="Calls per per-tick measurement")
+    args = parser.parse_args()
+
+    prices = load_prices(args.file, args.limit)
+    series = np.asarray(prices)
+    window = prices[-50:]
+    print(f"Prices: {len(prices)} | JIT: {'numba ' + kernels.numba.__version__ if kernels.JIT else 'off (numpy)'}")
+
+    print("\nPer tick (us per call)           legacy   kernel  speedup")
+    for label, legacy, kernel in (
+        ("slope, 50", lambda: legacy_slope(window, 50), lambda: kernels.slope_last(window, 50)),
+        ("ema, 50", lambda: legacy_ema(window, 50), lambda: kernels.window_ema_last(window, 50)),
+        ("z-score, 20", lambda: legacy_zscore(window, 20), lambda: kernels.zscore_last(window, 20)),
+    ):
+        before, after = per_call_us(legacy, args.repeat), per_call_us(kernel, args.repeat)
+        print(f"  {label:<28} {before:8.1f} {after:8.1f} {before / after:7.1f}x")
+
+    print("\nPer series (ms for every bar)    per-tick    numpy      jit")
+    bars = max(len(prices) - 49, 1)
+    for label, scalar, rolling in (
+        ("slope, 50", lambda i: kernels.slope_last(prices[i - 50:i], 50), kernels.rolling_slope),
+        ("ema, 50", lambda i: kernels.window_ema_last(prices[i - 50:i], 50), kernels.rolling_window_ema),
+        ("z-score, 20", lambda i: kernels.zscore_last(prices[i - 20:i], 20),
+         lambda s, w, jit: kernels.rolling_zscore(s, 20, jit=jit)),
+    ):
+        start = time.perf_counter()
+        for i in range(50, len(prices) + 1):
+            scalar(i)
+        looped = (time.perf_counter() - start) * 1e3
+        start = time.perf_counter()
+        rolling(series, 50, jit=False)
+        vectorized = (time.perf_counter() - start) * 1e3
+        jitted = "-"
+        if kernels.JIT:
+            rolling(series, 50, jit=True)  # compile
+            start = time.perf_counter()
+            rolling(series, 50, jit=True)
+            jitted = f"{(time.perf_counter() - start) * 1e3:8.2f}"
+        print(f"  {label:<28} {looped:9.1f} {vectorized:8.2f} {jitted:>8}  ({bars} bars)")
+
+    closes = pd.DataFrame({"close": series})
+    start = time.perf_counter()
+    reference = strategy_states(closes, strategy_mean_reversion)
+    looped = time.perf_counter() - start
+    start = time.perf_counter()
+    states = MeanReversionStrategy().on_series(closes)
+    vectorized = time.perf_counter() - start
+    print(f"\nMean reversion states: per bar {looped * 1e3:,.1f}ms, on_series {vectorized * 1e3:,.2f}ms "
+          f"({looped / vectorized:,.0f}x), identical: {bool(np.array_equal(reference, states))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# scripts/bench_order_book.py
+"""
+Depth updates per second through OrderBook, reading top of book after every
+update as a strategy would, against a plain dict book that finds the touch
+with max()/min().
+
+    python scripts/bench_order_book.py                       # synthetic BTCUSDT-like depth
+    python scripts/bench_order_book.py --record depth.jsonl --symbol BTCUSDT --seconds 60
+    python scripts/bench_order_book.py --file depth.jsonl
+
+A recording is JSON lines: the REST /depth snapshot first, then the raw
+depthUpdate events in arrival order.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(ROOT, "src"))
+
+from price_engine.order_book import OrderBook
+
+
+def synthetic_depth(events, levels=1000, seed=11, tick=0.01, mid=64000.0):
+    """A snapshot of levels per side and diff events that mostly touch the top 20 levels."""
+    rng = np.random.default_rng(seed)
+    bids = [[f"{mid - tick * (i + 1):.2f}", f"{rng.uniform(0.01, 5):.4f}"] for i in range(levels)]
+    asks = [[f"{mid + tick * (i + 1):.2f}", f"{rng.uniform(0.01, 5):.4f}"] for i in range(levels)]
+    snapshot = {"lastUpdateId": 1000, "bids": bids, "asks": asks}
+    diffs = []
+    update_id = 1001
+    for _ in range(events):
+        mid += tick * rng.integers(-2, 3)
+        sides = []
+        for sign in (-1, 1):
+            offsets = np.minimum(rng.geometric(0.15, size=rng.integers(1, 6)), levels)
+            qtys = np.where(rng.random(len(offsets)) < 0.3, 0.0, rng.uniform(0.01, 5, len(offsets)))
+            sides.append([[f"{mid + sign * tick * o:.2f}", f"{q:.4f}"] for o, q in zip(offsets, qtys)])
+        count = len(sides[0]) + len(sides[1])
+        diffs.append({"e": "depthUpdate", "s": "BTCUSDT", "U": update_id, "u": update_id + count - 1,
+                      "b": sides[0], "a": sides[1]})
+        update_id += count
+    return snapshot, diffs
+
+
+def load_recording(path):
+    with open(path) as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    return lines[0], lines[1:]
+
+
+def record(path, symbol, seconds):
+    """Capture a live snapshot and depth stream from Binance."""
+    import requests
+    import websocket
+
+    ws = websocket.create_connection(f"wss://stream.binance.com:9443/ws/{symbol.lower()}@depth@100ms")
+    snapshot = requests.get("https://api.binance.com/api/v3/depth", params={"symbol": symbol, "limit": 1000},
+                            timeout=5).json()
+    deadline = time.monotonic() + seconds
+    count = 0
+    with open(path, "w") as f:
+        f.write(json.dumps(snapshot) + "\n")
+        while time.monotonic() < deadline:
+            f.write(ws.recv().strip() + "\n")
+            count += 1
+    ws.close()
+    print(f"recorded {count} depth updates to {path}")
+
+
+def run_order_book(snapshot, diffs):
+    book = OrderBook("BTCUSDT")
+    book.apply_snapshot(snapshot)
+    start = time.perf_counter()
+    for event in diffs:
+        book.apply_diff(event)
+        book.top()
+    return time.perf_counter() - start
+
+
+def run_dict_book(snapshot, diffs):
+    bids = {float(p): float(q) for p, q in snapshot["bids"]}
+    asks = {float(p): float(q) for p, q in snapshot["asks"]}
+    start = time.perf_counter()
+    for event in diffs:
+        for side, levels in ((bids, event["b"]), (asks, event["a"])):
+            for price, qty in levels:
+                qty = float(qty)
+                if qty > 0:
+                    side[float(price)] = qty
+                else:
+                    side.pop(float(price), None)
+        max(bids), min(asks)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark local order book maintenance.")
+    parser.add_argument("--file", help="Recorded depth JSON lines (snapshot, then updates)")
+    parser.add_argument("--record", help="Record live Binance depth to this file and exit")
+    parser.add_argument("--symbol", default="BTCUSDT")
+    parser.add_argument("--seconds", type=float, default=60)
+    parser.add_argument("--events", type=int, default=100000, help="Synthetic updates when no --file is given")
+    parser.add_argument("--levels", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record, args.symbol, args.seconds)
+        return
+
+    snapshot, diffs = load_recording(args.file) if args.file else synthetic_depth(args.events, args.levels)
+    book = run_order_book(snapshot, diffs)
+    naive = run_dict_book(snapshot, diffs)
+    print(f"{len(diffs)} depth updates, {len(snapshot['bids'])}/{len(snapshot['asks'])} snapshot levels")
+    print(f"OrderBook       : {len(diffs) / book:12,.0f} updates/s")
+    print(f"dict + max/min  : {len(diffs) / naive:12,.0f} updates/s  ({naive / book:.1f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# scripts/bench_process_workers.py
+"""
+Local replay benchmark for multi-process strategy workers.
+
+Builds --symbols synthetic symbols from the bundled *_price_log.csv series and
+replays them interleaved through the in-process RealTimeTrader and through
+ProcessShardedTrader with an increasing number of worker processes.
+
+    python scripts/bench_process_workers.py --symbols 60 --ticks 500 --workers 1,2,4
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(ROOT, "src"))
+
+from backtesting_engine.real_time_runner import RealTimeTrader
+from backtesting_engine.process_runner import ProcessShardedTrader
+
+LOG_FILES = ["btcusdt_price_log.csv", "ethusdt_price_log.csv", "DOGEUSDT_price_log.csv"]
+
+
+def load_prices(path, limit):
+    prices = []
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            prices.append(float(row[1]))
+            if len(prices) >= limit:
+                break
+    return prices
+
+
+def build_feeds(symbol_count, ticks):
+    series = [load_prices(os.path.join(ROOT, name), ticks * 4) for name in LOG_FILES]
+    feeds = {}
+    for i in range(symbol_count):
+        source = series[i % len(series)]
+        offset = (i // len(series)) * 7 % max(1, len(source) - ticks)
+        feeds[f"SYM{i:03d}USDT"] = source[offset:offset + ticks]
+    return feeds
+
+
+def interleave(feeds):
+    symbols = list(feeds)
+    length = min(len(p) for p in feeds.values())
+    for i in range(length):
+        for symbol in symbols:
+            yield symbol, feeds[symbol][i]
+
+
+def replay(trader, feeds):
+    start = time.perf_counter()
+    count = 0
+    for symbol, price in interleave(feeds):
+        trader.on_price_update(symbol, price)
+        count += 1
+    if isinstance(trader, ProcessShardedTrader):
+        trader.wait_idle()
+    elapsed = time.perf_counter() - start
+    trader.stop()
+    return count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-process strategy worker benchmark.")
+    parser.add_argument("--symbols", type=int, default=60, help="Number of synthetic symbols")
+    parser.add_argument("--ticks", type=int, default=500, help="Ticks per symbol")
+    parser.add_argument("--workers", type=str, default="1,2,4", help="Comma-separated worker counts")
+    args = parser.parse_args()
+
+    feeds = build_feeds(args.symbols, args.ticks)
+    print(f"Symbols: {len(feeds)} | Ticks/symbol: {args.ticks} | CPUs: {os.cpu_count()}")
+
+    count, elapsed = replay(RealTimeTrader(capital=100000, runtime=10 ** 9), feeds)
+    baseline = count / elapsed
+    print(f"in-process      : {baseline:>10,.0f} ticks/s")
+
+    for workers in map(int, args.workers.split(",")):
+        trader = ProcessShardedTrader(capital=100000, runtime=10 ** 9, workers=workers)
+        count, elapsed = replay(trader, feeds)
+        rate = count / elapsed
+        print(f"{workers:>2} worker(s)    : {rate:>10,.0f} ticks/s  ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# scripts/bench_session_archive.py
+"""
+Session history as the dashboard kept it (session_history.json, re-dumped on
+every completed session) against backtesting_engine.session_archive.
+
+Saves --sessions synthetic sessions both ways, each with a trade log and a PnL
+timeline of --points values (the JSON history only ever held the summaries),
+then times opening the history, one page of a symbol filter and the PnL
+histogram, and reports bytes on disk.
+
+    python scripts/bench_session_archive.py --sessions 5000 --points 300
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(ROOT, "src"))
+
+from backtesting_engine.session_archive import SessionArchive
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "BNBUSDT", "SOLUSDT"]
+
+
+def make_sessions(n, points, seed=0):
+    rng = np.random.default_rng(seed)
+    start = datetime(2025, 1, 1)
+    for i in range(n):
+        values = 10_000 * np.exp(np.cumsum(rng.normal(0, 0.001, points)))
+        pnl = float(values[-1] - 10_000)
+        summary = {"initial_capital": 10_000.0, "final_portfolio_value": float(values[-1]), "final_pnl": pnl,
+                   "cash_balance": 5_000.0, "unrealized_pnl": pnl / 2, "fees_paid": 2.0}
+        began = start + timedelta(hours=i)
+        timeline = [{"timestamp": (began + timedelta(seconds=s)).isoformat(), "portfolio_value": float(v)}
+                    for s, v in enumerate(values)]
+        logs = [f"{began + timedelta(seconds=s)} BUY 0.01 {SYMBOLS[i % 4]} @ {v:.2f}" for s, v in
+                enumerate(values[::25])]
+        yield summary, [SYMBOLS[i % 4], SYMBOLS[(i + 1) % 4]], timeline, logs, began + timedelta(seconds=points)
+
+
+def json_history(path, sessions):
+    """Returns the time the last save took in ms."""
+    history = []
+    for summary, symbols, _, _, ended in sessions:
+        start = time.perf_counter()
+        history.append({"Timestamp": ended.strftime("%Y-%m-%d %H:%M:%S"), "Symbols": ", ".join(symbols),
+                        "Initial Capital": summary["initial_capital"],
+                        "Final Portfolio Value": summary["final_portfolio_value"], "PnL": summary["final_pnl"],
+                        "Cash Balance": summary["cash_balance"], "Unrealized PnL": summary["unrealized_pnl"],
+                        "Duration (s)": 300})
+        with open(path, "w") as f:
+            json.dump(history, f, indent=2, default=str)
+    return (time.perf_counter() - start) * 1000
+
+
+def archive_history(path, sessions):
+    archive = SessionArchive(path)
+    for summary, symbols, timeline, logs, ended in sessions:
+        start = time.perf_counter()
+        archive.append(summary, symbols, 300, logs=logs, pnl_timeline=timeline, timestamp=ended.timestamp())
+    return (time.perf_counter() - start) * 1000
+
+
+def timed(run):
+    start = time.perf_counter()
+    result = run()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Session history JSON vs append-only archive benchmark.")
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--points", type=int, default=300, help="PnL timeline points per session")
+    args = parser.parse_args()
+    sessions = list(make_sessions(args.sessions, args.points))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "session_history.json")
+        archive_path = os.path.join(tmp, "session_archive")
+        json_last, json_save = timed(lambda: json_history(json_path, sessions))
+        archive_last, archive_save = timed(lambda: archive_history(archive_path, sessions))
+
+        def json_view():
+            with open(json_path) as f:
+                history = json.load(f)
+            rows = [row for row in history if "ETHUSDT" in row["Symbols"].split(", ")][::-1][:50]
+            return rows, np.histogram([row["PnL"] for row in history], bins=20)
+
+        def archive_view():
+            archive = SessionArchive(archive_path)
+            return archive.page(0, 50, symbol="ETHUSDT"), archive.pnl_histogram(bins=20)
+
+        (json_rows, json_hist), json_read = timed(json_view)
+        (archive_rows, archive_hist), archive_read = timed(archive_view)
+        archive = SessionArchive(archive_path)
+        _, one_session = timed(lambda: archive.session(len(archive) // 2))
+
+        print(f"{args.sessions:,} sessions, {args.points} PnL points each\n")
+        print("                          JSON history   archive")
+        print(f"  save all (ms)           {json_save:12.0f} {archive_save:9.0f}")
+        print(f"  last save (ms)          {json_last:12.2f} {archive_last:9.2f}")
+        print(f"  open + page + hist (ms) {json_read:12.1f} {archive_read:9.1f}")
+        print(f"  bytes on disk           {os.path.getsize(json_path):12,} {directory_size(archive_path):9,}"
+              "   (archive includes logs and timelines)")
+        print(f"  one session's timeline + log: {one_session:.2f} ms")
+        print(f"\nSame page: {[r['PnL'] for r in json_rows] == [r['PnL'] for r in archive_rows]}, "
+              f"same histogram: {np.array_equal(json_hist[0], archive_hist[0])}")
+
+
+if __name__ == "__main__":
+    main()
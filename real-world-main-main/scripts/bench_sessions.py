@@ -0,0 +1,92 @@
+# scripts/bench_sessions.py
+"""
+Replay benchmark for many paper-trading sessions on one shared feed.
+
+Starts --sessions sessions with different capital, runtimes and symbol sets on a
+SessionManager and replays the bundled *_price_log.csv files through its fan-out,
+once with the real strategies and once with a no-op strategy, so the second run
+isolates what a session costs besides its strategy.
+
+    python scripts/bench_sessions.py --sessions 100 --ticks 500
+    python scripts/bench_sessions.py --sessions 20 --strategies mean_reversion,bollinger
+"""
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(ROOT, "src"))
+
+from backtesting_engine.sessions import SessionManager
+
+LOG_FILES = {
+    "BTCUSDT": "btcusdt_price_log.csv",
+    "ETHUSDT": "ethusdt_price_log.csv",
+    "DOGEUSDT": "DOGEUSDT_price_log.csv",
+}
+SYMBOL_SETS = [("BTCUSDT",), ("ETHUSDT",), ("DOGEUSDT",), ("BTCUSDT", "ETHUSDT"), ("BTCUSDT", "ETHUSDT", "DOGEUSDT")]
+
+
+def load_prices(path, limit):
+    prices = []
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            prices.append(float(row[1]))
+            if len(prices) >= limit:
+                break
+    return prices
+
+
+def no_strategy(data_window, current_position=None):
+    return None
+
+
+def run(feeds, sessions, strategies, idle=False):
+    manager = SessionManager(track_latency=False)
+    strategy_cycle = itertools.cycle(strategies)
+    for i in range(sessions):
+        manager.start_session(capital=1000 * (1 + i % 10), runtime=10 ** 9 + i,
+                              symbols=SYMBOL_SETS[i % len(SYMBOL_SETS)], strategy=next(strategy_cycle))
+    if idle:
+        for session in manager.sessions.values():
+            session.trader.strategy = no_strategy
+
+    # Interleave the symbols the way a live feed would deliver them.
+    ticks = [tick for group in itertools.zip_longest(*[[(s, p) for p in prices] for s, prices in feeds.items()])
+             for tick in group if tick is not None]
+    deliveries = sum(len(manager._routes.get(symbol, ())) for symbol, _ in ticks)
+
+    start = time.perf_counter()
+    for symbol, price in ticks:
+        manager.on_price_update(symbol, price)
+    elapsed = time.perf_counter() - start
+    trades = sum(s.trader.get_trade_count() for s in manager.sessions.values())
+    manager.stop_all()
+    return len(ticks), deliveries, elapsed, trades
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Many sessions on one shared feed.")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--ticks", type=int, default=500, help="Ticks replayed per symbol")
+    parser.add_argument("--strategies", default="mean_reversion", help="Comma-separated, assigned round-robin")
+    args = parser.parse_args()
+
+    feeds = {symbol: load_prices(os.path.join(ROOT, name), args.ticks) for symbol, name in LOG_FILES.items()}
+    strategies = args.strategies.split(",")
+    sockets = sum(len(SYMBOL_SETS[i % len(SYMBOL_SETS)]) for i in range(args.sessions))
+    print(f"Sessions: {args.sessions} | Strategies: {', '.join(strategies)} | Symbols: {len(feeds)}")
+    print(f"Sockets: {len(feeds)} shared (a feed per session would open {sockets})")
+
+    for label, idle in (("with strategies", False), ("fan-out only", True)):
+        ticks, deliveries, elapsed, trades = run(feeds, args.sessions, strategies, idle)
+        print(f"{label:>16}: {ticks} ticks -> {deliveries} session ticks in {elapsed:.2f}s "
+              f"({ticks / elapsed:,.0f} ticks/s, {elapsed / deliveries * 1e6:,.1f}us per session tick, "
+              f"{trades} trades)")
+
+
+if __name__ == "__main__":
+    main()
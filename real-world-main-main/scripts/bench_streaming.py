@@ -0,0 +1,94 @@
+# scripts/bench_streaming.py
+"""
+Chunked backtests (backtesting_engine.streaming) against loading the whole file.
+
+Writes a synthetic tick log of --rows ticks, then runs the same strategy three
+ways: pd.read_csv of the whole file, open_chunks over the CSV, and over a
+columnar copy (converted once, then memory mapped). Reports wall time, peak
+traced memory and whether the equity curves are identical.
+
+    python scripts/bench_streaming.py --rows 2000000 --chunksize 250000 --strategy mean_reversion
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(ROOT, "src"))
+
+from backtesting_engine.multi_asset import run_multi_asset_backtest, target_weights
+from backtesting_engine.streaming import open_chunks, run_chunked_backtest
+from backtesting_engine.strategies import available_strategies, create_strategy
+from price_engine.tick_files import write_columnar
+
+
+def write_tick_log(path, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2025-01-01")
+    with open(path, "w") as f:
+        price = 64000.0
+        for lo in range(0, rows, 500_000):
+            n = min(500_000, rows - lo)
+            prices = price * np.exp(np.cumsum(rng.normal(0, 0.0005, n)))
+            price = prices[-1]
+            stamps = (start + pd.to_timedelta(np.arange(lo, lo + n), unit="s")).strftime("%Y-%m-%d %H:%M:%S")
+            f.writelines(f"{stamp},{value:.8f}\n" for stamp, value in zip(stamps, prices))
+
+
+def in_memory(path, strategy_name):
+    data = pd.read_csv(path, header=None, names=["timestamp", "BTCUSDT"], index_col=0)
+    closes = data.ffill()
+    strategy = create_strategy(strategy_name)
+    strategy.use_cache = False
+    weights = target_weights(strategy.on_series(closes))
+    return run_multi_asset_backtest(closes, weights, 1_000_000, lot_size=0.0001)
+
+
+def chunked(chunks, strategy_name):
+    return run_chunked_backtest(chunks, create_strategy(strategy_name), 1_000_000, lot_size=0.0001)
+
+
+def measure(label, run):
+    tracemalloc.start()
+    start = time.perf_counter()
+    portfolio = run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<24} {elapsed:8.2f}s {peak / 2 ** 20:10.1f} MiB")
+    return np.asarray(list(portfolio.net_worth_history))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunked vs in-memory backtest benchmark.")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Ticks in the synthetic log")
+    parser.add_argument("--chunksize", type=int, default=250_000)
+    parser.add_argument("--strategy", choices=available_strategies(), default="mean_reversion")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "btcusdt_price_log.csv")
+        write_tick_log(path, args.rows)
+        print(f"Tick log: {args.rows:,} rows, {os.path.getsize(path) / 2 ** 20:,.1f} MiB | "
+              f"strategy {args.strategy}, {args.chunksize:,} rows per chunk")
+
+        print("\nRun                          time   peak memory")
+        reference = measure("in memory (read_csv)", lambda: in_memory(path, args.strategy))
+        from_csv = measure("chunked csv", lambda: chunked(open_chunks(path, args.chunksize), args.strategy))
+        start = time.perf_counter()
+        columnar = write_columnar(open_chunks(path, args.chunksize), os.path.join(tmp, "btcusdt.cols"))
+        print(f"  {'(convert to columnar)':<24} {time.perf_counter() - start:8.2f}s")
+        from_columnar = measure("chunked columnar", lambda: chunked(columnar.chunks(args.chunksize), args.strategy))
+
+        print(f"\nIdentical equity curves: csv {bool(np.array_equal(reference, from_csv))}, "
+              f"columnar {bool(np.array_equal(reference, from_columnar))}")
+
+
+if __name__ == "__main__":
+    main()
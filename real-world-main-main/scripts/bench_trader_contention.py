@@ -0,0 +1,136 @@
+# scripts/bench_trader_contention.py
+"""
+Multi-threaded replay benchmark for RealTimeTrader lock contention.
+
+One writer thread per symbol replays the bundled *_price_log.csv files into
+on_price_update while reader threads poll the dashboard getters. Run with
+--global-lock to emulate the old single-lock design for comparison.
+
+    python scripts/bench_trader_contention.py --ticks 5000 --readers 2
+"""
+import argparse
+import csv
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(ROOT, "src"))
+
+from backtesting_engine.real_time_runner import RealTimeTrader
+
+LOG_FILES = {
+    "BTCUSDT": "btcusdt_price_log.csv",
+    "ETHUSDT": "ethusdt_price_log.csv",
+    "DOGEUSDT": "DOGEUSDT_price_log.csv",
+}
+
+
+def load_prices(path, limit):
+    prices = []
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            prices.append(float(row[1]))
+            if len(prices) >= limit:
+                break
+    return prices
+
+
+class GlobalLockTrader(RealTimeTrader):
+    """Serializes every tick and read behind one lock, like the original trader."""
+
+    def __init__(self, capital, runtime):
+        super().__init__(capital, runtime)
+        self.global_lock = threading.Lock()
+
+    def on_price_update(self, symbol, price):
+        with self.global_lock:
+            super().on_price_update(symbol, price)
+
+    def get_positions(self):
+        with self.global_lock:
+            return super().get_positions()
+
+    def get_logs(self):
+        with self.global_lock:
+            return super().get_logs()
+
+    def get_price_data(self):
+        with self.global_lock:
+            return super().get_price_data()
+
+    def get_pnl_data(self):
+        with self.global_lock:
+            return super().get_pnl_data()
+
+
+def run(trader, feeds, readers):
+    stop = threading.Event()
+    read_latencies = []
+    tick_latencies = []
+
+    def writer(symbol, prices):
+        local = []
+        for price in prices:
+            t0 = time.perf_counter_ns()
+            trader.on_price_update(symbol, price)
+            local.append(time.perf_counter_ns() - t0)
+        tick_latencies.extend(local)
+
+    def reader():
+        local = []
+        while not stop.is_set():
+            t0 = time.perf_counter_ns()
+            trader.get_positions()
+            trader.get_logs()
+            trader.get_price_data()
+            trader.get_pnl_data()
+            local.append(time.perf_counter_ns() - t0)
+        read_latencies.extend(local)
+
+    writers = [threading.Thread(target=writer, args=item) for item in feeds.items()]
+    reader_threads = [threading.Thread(target=reader) for _ in range(readers)]
+
+    start = time.perf_counter()
+    for t in reader_threads + writers:
+        t.start()
+    for t in writers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for t in reader_threads:
+        t.join()
+
+    return elapsed, sorted(tick_latencies), sorted(read_latencies)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))
+    return sorted_values[idx] / 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RealTimeTrader lock contention benchmark.")
+    parser.add_argument("--ticks", type=int, default=5000, help="Ticks replayed per symbol")
+    parser.add_argument("--readers", type=int, default=2, help="Number of dashboard reader threads")
+    parser.add_argument("--global-lock", action="store_true", help="Emulate the old single-lock trader")
+    args = parser.parse_args()
+
+    feeds = {symbol: load_prices(os.path.join(ROOT, name), args.ticks) for symbol, name in LOG_FILES.items()}
+    trader_cls = GlobalLockTrader if args.global_lock else RealTimeTrader
+    trader = trader_cls(capital=100000, runtime=10 ** 9)
+
+    elapsed, ticks, reads = run(trader, feeds, args.readers)
+    total = sum(len(p) for p in feeds.values())
+
+    print(f"Mode: {'global lock' if args.global_lock else 'sharded'} | Symbols: {len(feeds)} | Readers: {args.readers}")
+    print(f"Ticks: {total} in {elapsed:.2f}s ({total / elapsed:,.0f} ticks/s)")
+    print(f"Tick latency   p50: {percentile(ticks, 50):,.1f}us  p99: {percentile(ticks, 99):,.1f}us")
+    print(f"Reader latency p50: {percentile(reads, 50):,.1f}us  p99: {percentile(reads, 99):,.1f}us ({len(reads)} reads)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# scripts/enginectl.py
+"""
+Command line for a running engine daemon (python src/main.py --mode daemon ...).
+
+    python scripts/enginectl.py status
+    python scripts/enginectl.py subscribe BTCUSDT ETHUSDT
+    python scripts/enginectl.py start --capital 10000 --runtime 600 BTCUSDT ETHUSDT
+    python scripts/enginectl.py start --capital 2500 --strategy bollinger --name bb BTCUSDT
+    python scripts/enginectl.py sessions
+    python scripts/enginectl.py show 1
+    python scripts/enginectl.py stop 1
+    python scripts/enginectl.py shutdown
+"""
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(ROOT, "src"))
+
+from backtesting_engine.engine_client import EngineClient, EngineUnavailable
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Control a running engine daemon.")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status")
+    commands.add_parser("quotes")
+    commands.add_parser("sessions")
+    commands.add_parser("shutdown")
+    subscribe = commands.add_parser("subscribe")
+    subscribe.add_argument("symbols", nargs="+")
+    start = commands.add_parser("start")
+    start.add_argument("symbols", nargs="+")
+    start.add_argument("--capital", type=float, default=10000)
+    start.add_argument("--runtime", type=float, default=300)
+    start.add_argument("--name")
+    start.add_argument("--strategy", default="mean_reversion", help="See GET /status for the available names")
+    for name in ("show", "stop"):
+        command = commands.add_parser(name)
+        command.add_argument("session_id")
+    args = parser.parse_args()
+
+    client = EngineClient(args.url)
+    try:
+        if args.command == "status":
+            result = client.status()
+        elif args.command == "quotes":
+            result = client.quotes()
+        elif args.command == "sessions":
+            result = client.sessions()
+        elif args.command == "subscribe":
+            result = client.subscribe([s.upper() for s in args.symbols])
+        elif args.command == "start":
+            result = client.start_session(args.capital, args.runtime, [s.upper() for s in args.symbols],
+                                          args.name, args.strategy).data
+        elif args.command == "show":
+            result = client.snapshot(args.session_id, logs=20, pnl=0)
+        elif args.command == "stop":
+            result = client.stop_session(args.session_id)
+        else:
+            result = client.shutdown()
+    except EngineUnavailable as e:
+        print(f"error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(result, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# scripts/import_report.py
+"""
+Import-time report for the main.py CLI: for each mode, the wall time to start
+Python and import what that mode needs (main.MODE_IMPORTS), and the heaviest
+top-level imports from `python -X importtime`.
+
+    python scripts/import_report.py                   # every mode, plus "all" (everything eagerly)
+    python scripts/import_report.py --mode api-live --top 15
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SRC = os.path.join(ROOT, "src")
+sys.path.append(SRC)
+
+from main import MODE_IMPORTS
+
+LOADER = """
+import importlib, main
+for module in {modules!r}:
+    try:
+        importlib.import_module(module)
+    except ImportError as e:
+        print(f"MISSING {{module}}: {{e}}")
+"""
+
+
+def parse_importtime(stderr: str):
+    """[(name, self_us, cumulative_us, depth)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def measure(modules, repeat):
+    """Best wall time over repeat runs, plus the -X importtime rows of the last run."""
+    code = LOADER.format(modules=modules)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=SRC,
+                                capture_output=True, text=True)
+        best = min(best, time.perf_counter() - start)
+    missing = [line[len("MISSING "):] for line in result.stdout.splitlines() if line.startswith("MISSING ")]
+    return best, parse_importtime(result.stderr), missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report CLI start-up import time per mode.")
+    parser.add_argument("--mode", choices=sorted(MODE_IMPORTS) + ["all"], action="append",
+                        help="Mode(s) to report (default: every mode and 'all')")
+    parser.add_argument("--top", type=int, default=8, help="Heaviest top-level imports to list per mode")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    modes = dict(MODE_IMPORTS)
+    modes["all"] = sorted({module for modules in MODE_IMPORTS.values() for module in modules})
+    baseline, baseline_rows, _ = measure([], args.repeat)
+    preloaded = {row[0] for row in baseline_rows}
+    print(f"interpreter + main.py: {baseline * 1000:.0f} ms\n")
+
+    for mode in args.mode or list(modes):
+        wall, rows, missing = measure(modes[mode], args.repeat)
+        print(f"{mode:<14} {wall * 1000:6.0f} ms wall, {sum(r[1] for r in rows) / 1000:6.0f} ms in imports")
+        heaviest = sorted((r for r in rows if r[3] == 0 and r[0] not in preloaded), key=lambda r: -r[2])
+        for name, _, cumulative, _ in heaviest[:args.top]:
+            print(f"    {cumulative / 1000:8.1f} ms  {name}")
+        for line in missing:
+            print(f"    not installed: {line}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
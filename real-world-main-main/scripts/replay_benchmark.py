@@ -0,0 +1,76 @@
+# scripts/replay_benchmark.py
+"""
+Replay recorded ticks through the live pipeline and report throughput and
+p50/p99 tick-to-decision latency.
+
+Targets:
+  trader     RealTimeTrader.on_price_update called directly
+  ws-handler BinanceWebSocketClient.on_message -> RealTimeTrader (JSON decode included)
+  ws-socket  local fake WebSocket server -> real client socket -> RealTimeTrader
+  strategy   the strategy alone through Strategy.on_tick (no trader, no account)
+
+    python scripts/replay_benchmark.py --target trader --speed max --limit 5000
+    python scripts/replay_benchmark.py --target ws-socket --speed 50
+    python scripts/replay_benchmark.py --target strategy --strategy enhanced_mean_reversion
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(ROOT, "src"))
+
+from backtesting_engine.real_time_runner import RealTimeTrader
+from backtesting_engine.strategies import available_strategies, create_strategy
+from price_engine.data_sources.websocket_handler import BinanceWebSocketClient
+from price_engine.replay import TickReplayer, merge_tick_logs, replay_over_websocket, ws_message_handler
+
+DEFAULT_LOGS = ["btcusdt_price_log.csv", "ethusdt_price_log.csv", "DOGEUSDT_price_log.csv"]
+
+
+def parse_speed(value):
+    return None if value.lower() in ("max", "0") else float(value.rstrip("x"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded ticks through the live pipeline.")
+    parser.add_argument("--files", nargs="+", default=[os.path.join(ROOT, name) for name in DEFAULT_LOGS],
+                        help="Tick logs to replay (timestamp,price CSV)")
+    parser.add_argument("--target", choices=["trader", "ws-handler", "ws-socket", "strategy"], default="trader")
+    parser.add_argument("--strategy", choices=available_strategies(), default="mean_reversion")
+    parser.add_argument("--speed", type=parse_speed, default=None, help="1, 10, 10x ... or 'max' (default)")
+    parser.add_argument("--limit", type=int, default=5000, help="Ticks per file (0 = all)")
+    parser.add_argument("--no-align", action="store_true", help="Keep each log's original recording time")
+    args = parser.parse_args()
+
+    ticks = merge_tick_logs(args.files, limit=args.limit or None, align_start=not args.no_align)
+    strategy = create_strategy(args.strategy)
+    trader = RealTimeTrader(capital=100000, runtime=10 ** 9, strategy=strategy)
+
+    if args.target == "strategy":
+        handler = strategy.tick_handler()
+        report = TickReplayer(ticks, speed=args.speed).run(handler)
+    elif args.target == "trader":
+        report = TickReplayer(ticks, speed=args.speed).run(trader.on_price_update)
+    elif args.target == "ws-handler":
+        client = BinanceWebSocketClient(sorted({t[1] for t in ticks}), trader.on_price_update)
+        report = TickReplayer(ticks, speed=args.speed).run(ws_message_handler(client))
+    else:
+        report = replay_over_websocket(ticks, trader.on_price_update, speed=args.speed)
+
+    speed = "max" if not args.speed else f"{args.speed:g}x"
+    print(f"Target: {args.target} | Speed: {speed} | Ticks: {report['ticks']}")
+    print(f"Throughput: {report['ticks_per_second']:,.0f} ticks/s over {report['elapsed_s']:.2f}s")
+    print(f"Tick-to-decision latency p50: {report['p50_latency_us']:,.1f}us  p99: {report['p99_latency_us']:,.1f}us")
+    if args.target == "strategy":
+        print(f"Strategy actions: {len(handler.actions)}")
+    else:
+        print(f"Trader actions logged: {trader.get_trade_count()}")
+    for interface, by_symbol in strategy.get_timing().items():
+        stats = by_symbol["ALL"]
+        print(f"Strategy {strategy.name}.{interface}: {stats['count']} calls, "
+              f"p50 {stats['p50_us']:,.1f}us  p99 {stats['p99_us']:,.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,12 @@ import json
 import pandas as pd
 from backtesting_engine.portfolio import Portfolio
 from backtesting_engine.historical_data_loader import load_historical_data
-from backtesting_engine.metrics import print_summary
-from backtesting_engine.strategies.strategy_bollinger import strategy_bollinger
-from backtesting_engine.strategies.strategy_mean_reversion import strategy_mean_reversion
+from backtesting_engine.metrics import portfolio_metrics, print_summary
+from backtesting_engine.execution import SimulatedExecution
+from backtesting_engine.multi_asset import align_closes, align_volumes, run_multi_asset_backtest, target_weights
+from backtesting_engine.streaming import open_chunks, run_chunked_backtest
+from backtesting_engine.strategies import available_strategies, create_strategy
+from price_engine.indicators.cache import configure_cache, get_cache
 
 def convert_to_indicator_format(row):
     return {"price": row["close"]}
@@ -20,15 +23,49 @@ def parse_arguments():
     parser.add_argument('--end', type=str, help="End date (YYYY-MM-DD)")
     parser.add_argument('--asset_type', type=str, default='crypto', help="Asset type (e.g., crypto, stock)")
     parser.add_argument('--config', type=str, help="Optional config JSON file")
-    parser.add_argument('--strategy', type=str, choices=['bollinger', 'mean_reversion'], default='bollinger', help="Strategy to run")
+    parser.add_argument('--strategy', type=str, choices=available_strategies(), default='bollinger', help="Strategy to run")
+    parser.add_argument('--allocation_mode', type=str, choices=['fixed', 'equal'], default='fixed',
+                        help="fixed: each symbol trades its own allocation; equal: split equity across active symbols")
+    parser.add_argument('--rebalance_every', type=int, help="Rebalance all open positions to target every N bars")
+    parser.add_argument('--per_symbol', action='store_true',
+                        help="Run each symbol on its own slice of capital bar by bar, with take-profit/stop-loss "
+                             "exits and short entries, instead of the shared cash pool")
+    parser.add_argument('--fee', type=float, help="Taker fee rate per fill (e.g. 0.001); enables the execution simulator")
+    parser.add_argument('--spread_bps', type=float, default=0.0, help="Quoted spread in basis points (half is paid per fill)")
+    parser.add_argument('--impact', type=float, default=0.0, help="Volume impact: impact * sqrt(qty / bar volume)")
+    parser.add_argument('--max_participation', type=float, help="Largest fraction of bar volume one order may fill")
+    parser.add_argument('--latency_bars', type=int, default=0, help="Bars between a signal and its fill")
+    parser.add_argument('--data_file', type=str,
+                        help="Backtest a tick log, bar CSV or columnar directory chunk by chunk instead of fetching")
+    parser.add_argument('--chunksize', type=int, default=1_000_000, help="Rows per chunk with --data_file")
+    parser.add_argument('--indicator_cache', type=str,
+                        help="Directory for cached indicator series, reused by later runs on the same data")
     return parser.parse_args()
 
 def load_config(path):
     with open(path, 'r') as f:
         return json.load(f)
 
-def run_backtest(symbol, start, end, asset_type, strategy_name, portfolio):
-    df = load_historical_data(symbol, start, end, asset_type)
+def _sync_position(portfolio, symbol, entry_price_map, entry_price):
+    """
+    Set symbol's position state from the quantity actually held after an order.
+    :param entry_price: Entry price of whatever is still held.
+    :return: The state: "long", "short" or None (flat).
+    """
+    held = portfolio.positions.get(symbol, 0)
+    state = "long" if held > 0 else "short" if held < 0 else None
+    portfolio.current_position[symbol] = state
+    entry_price_map[symbol] = entry_price if state else None
+    return state
+
+def run_backtest(symbol, start, end, asset_type, strategy_name, portfolio, data=None):
+    """
+    :param strategy_name: A registered strategy name or a Strategy instance (see strategies/base.py).
+    :param data: Bars with a "close" (and optional "volume") column; fetched for start..end when omitted.
+    """
+    strategy = create_strategy(strategy_name) if isinstance(strategy_name, str) else strategy_name
+    strategy = strategy.clone(symbol.upper())
+    df = load_historical_data(symbol, start, end, asset_type) if data is None else data
     data_for_indicators = []
 
     symbol_upper = symbol.upper()
@@ -42,6 +79,7 @@ def run_backtest(symbol, start, end, asset_type, strategy_name, portfolio):
             continue
 
         price = row["close"]
+        volume = row.get("volume")  # lets the portfolio's execution model cap fills and price impact
         if symbol_upper not in portfolio.current_position:
             portfolio.current_position[symbol_upper] = None
 
@@ -50,41 +88,38 @@ def run_backtest(symbol, start, end, asset_type, strategy_name, portfolio):
         entry_price = entry_price_map.get(symbol_upper)
 
         # === TP/SL Logic ===
+        # After every order the position state is read back from the shares actually held:
+        # a volume-capped (--max_participation) exit can leave a residual, which keeps its
+        # entry price and so its TP/SL, and an entry that did not fill stays flat.
         if current_pos == "long" and entry_price:
             change_pct = ((price - entry_price) / entry_price) * 100
             if change_pct >= 20:
-                portfolio.sell(symbol_upper, price, qty=current_qty)
-                portfolio.current_position[symbol_upper] = None
-                entry_price_map[symbol_upper] = None
+                portfolio.sell(symbol_upper, price, qty=current_qty, volume=volume)
+                _sync_position(portfolio, symbol_upper, entry_price_map, entry_price)
                 print(f"→ TAKE PROFIT LONG @ {price:.2f} (+{change_pct:.2f}%)")
                 continue
             elif change_pct <= -7:
-                portfolio.sell(symbol_upper, price, qty=current_qty)
-                portfolio.current_position[symbol_upper] = None
-                entry_price_map[symbol_upper] = None
+                portfolio.sell(symbol_upper, price, qty=current_qty, volume=volume)
+                _sync_position(portfolio, symbol_upper, entry_price_map, entry_price)
                 print(f"→ STOP LOSS LONG @ {price:.2f} ({change_pct:.2f}%)")
                 continue
 
         if current_pos == "short" and entry_price:
             change_pct = ((entry_price - price) / entry_price) * 100
             if change_pct >= 20:
-                portfolio.buy(symbol_upper, price, qty=abs(current_qty))
-                portfolio.current_position[symbol_upper] = None
-                entry_price_map[symbol_upper] = None
+                portfolio.buy(symbol_upper, price, qty=abs(current_qty), volume=volume)
+                _sync_position(portfolio, symbol_upper, entry_price_map, entry_price)
                 print(f"→ TAKE PROFIT SHORT @ {price:.2f} (+{change_pct:.2f}%)")
                 continue
             elif change_pct <= -7:
-                portfolio.buy(symbol_upper, price, qty=abs(current_qty))
-                portfolio.current_position[symbol_upper] = None
-                entry_price_map[symbol_upper] = None
+                portfolio.buy(symbol_upper, price, qty=abs(current_qty), volume=volume)
+                _sync_position(portfolio, symbol_upper, entry_price_map, entry_price)
                 print(f"→ STOP LOSS SHORT @ {price:.2f} ({change_pct:.2f}%)")
                 continue
 
         # === Generate Strategy Signal ===
-        if strategy_name == 'bollinger':
-            signal = strategy_bollinger(data_for_indicators[-50:], current_position=portfolio.current_position)
-        else:
-            signal = strategy_mean_reversion(data_for_indicators[-50:], current_position=portfolio.current_position)
+        signal = strategy(data_for_indicators[-50:], current_position=portfolio.current_position)
+        if strategy.name == 'mean_reversion':
             print(f"[{symbol_upper}] Signal: {signal}, Current Pos: {current_pos}")
 
         # === Execute Signal ===
@@ -92,52 +127,119 @@ def run_backtest(symbol, start, end, asset_type, strategy_name, portfolio):
             if current_pos == "short":
                 short_qty = abs(current_qty)
                 if short_qty > 0:
-                    portfolio.buy(symbol_upper, price, qty=short_qty)
+                    portfolio.buy(symbol_upper, price, qty=short_qty, volume=volume)
                     print(f"→ BUY to cover short @ {price}")
-                portfolio.current_position[symbol_upper] = None
-                entry_price_map[symbol_upper] = None
+                _sync_position(portfolio, symbol_upper, entry_price_map, entry_price)
 
             if portfolio.current_position[symbol_upper] is None:
                 qty = int((portfolio.cash * 0.10) // price)
                 if qty > 0:
-                    portfolio.buy(symbol_upper, price, qty=qty)
-                    portfolio.current_position[symbol_upper] = "long"
-                    entry_price_map[symbol_upper] = price
-                    print(f"→ NEW LONG @ {price:.2f}, Qty: {qty}")
+                    portfolio.buy(symbol_upper, price, qty=qty, volume=volume)
+                    if _sync_position(portfolio, symbol_upper, entry_price_map, price):
+                        print(f"→ NEW LONG @ {price:.2f}, Qty: {portfolio.positions[symbol_upper]:g}")
 
         elif signal == "sell":
             if current_pos == "long":
                 if current_qty > 0:
-                    portfolio.sell(symbol_upper, price, qty=current_qty)
+                    portfolio.sell(symbol_upper, price, qty=current_qty, volume=volume)
                     print(f"→ SELL to exit long @ {price}")
-                portfolio.current_position[symbol_upper] = None
-                entry_price_map[symbol_upper] = None
+                _sync_position(portfolio, symbol_upper, entry_price_map, entry_price)
 
             if portfolio.current_position[symbol_upper] is None:
                 qty = int((portfolio.cash * 0.10) // price)
                 if qty > 0:
-                    portfolio.sell(symbol_upper, price, qty=qty)
-                    portfolio.current_position[symbol_upper] = "short"
-                    entry_price_map[symbol_upper] = price
-                    print(f"→ NEW SHORT @ {price:.2f}, Qty: {qty}")
+                    portfolio.sell(symbol_upper, price, qty=qty, volume=volume)
+                    if _sync_position(portfolio, symbol_upper, entry_price_map, price):
+                        print(f"→ NEW SHORT @ {price:.2f}, Qty: {qty}")
 
-        portfolio.update_net_worth({symbol_upper: price})
+        portfolio.mark_to_market(symbol_upper, price)
 
-    print_summary(portfolio)
-    buy_count = sum(1 for trade in portfolio.trade_log if trade["action"].lower() == "buy")
-    sell_count = sum(1 for trade in portfolio.trade_log if trade["action"].lower() == "sell")
+    # Daily bars: crypto trades every day of the year, stocks on ~252 sessions.
+    metrics = portfolio_metrics(portfolio, periods_per_year=365 if asset_type == "crypto" else 252)
+    print_summary(portfolio, metrics)
+    buy_count = portfolio.trade_log.count("BUY")
+    sell_count = portfolio.trade_log.count("SELL")
 
     return {
         "final_net_worth": portfolio.get_final_net_worth(),
         "buy_count": buy_count,
         "sell_count": sell_count,
         "total_trades": len(portfolio.trade_log),
+        "metrics": metrics,
     }
 
 
+def run_per_symbol_backtests(frames, allocations, asset_type, strategy, initial_capital, execution=None) -> dict:
+    """
+    --per_symbol: each symbol trades its own allocation through run_backtest.
+    :param frames: Symbol -> bars, as load_historical_data returns them.
+    :param allocations: Percent of initial_capital per symbol, in frames order.
+    """
+    totals = {"final_net_worth": 0.0, "total_trades": 0, "buy_count": 0, "sell_count": 0}
+    for (symbol, df), allocation in zip(frames.items(), allocations):
+        print(f"\n=== Running backtest for {symbol.upper()} | Allocation: {allocation}% ===")
+        sub_portfolio = Portfolio(initial_capital=initial_capital * allocation / 100, execution=execution)
+        result = run_backtest(symbol, None, None, asset_type, strategy, sub_portfolio, data=df)
+        print(f"{symbol.upper()} Final Net Worth: ${result['final_net_worth']:.2f}")
+        for key in totals:
+            totals[key] += result[key]
+
+    print("\n========== Combined Portfolio Summary ==========")
+    print(f"Initial Capital: ${initial_capital:,.2f}")
+    print(f"Final Net Worth: ${totals['final_net_worth']:,.2f}")
+    print(f"Total Trades Executed: {totals['total_trades']}")
+    print(f"  - Buys: {totals['buy_count']}")
+    print(f"  - Sells: {totals['sell_count']}")
+    print(f"Total Return: {(totals['final_net_worth'] - initial_capital) / initial_capital * 100:.2f}%")
+    print("===============================================\n")
+    return totals
+
+
+def build_execution(args):
+    if args.fee is not None or args.spread_bps or args.impact or args.max_participation or args.latency_bars:
+        fee = args.fee or 0.0
+        return SimulatedExecution(maker_fee=fee, taker_fee=fee, spread_bps=args.spread_bps, impact=args.impact,
+                                  max_participation=args.max_participation, latency_bars=args.latency_bars)
+    return None
+
+def run_file_backtest(args, initial_capital=1000000):
+    """--data_file: stream the file through the strategy and portfolio; memory follows --chunksize."""
+    if args.impact or args.max_participation:
+        # Chunks carry closes only, so there is no bar volume to size impact or participation against.
+        raise ValueError("--impact and --max_participation need bar volumes, which --data_file does not read")
+    if args.per_symbol or args.config:
+        raise ValueError("--per_symbol and --config do not apply to --data_file, which takes its symbols from the file")
+    if args.indicator_cache:
+        configure_cache(args.indicator_cache)
+    strategy = create_strategy(args.strategy)
+    allocations = list(map(float, args.allocations.split(','))) if args.allocations else None
+    if allocations and round(sum(allocations), 2) != 100.0:
+        raise ValueError("Allocations must sum to 100%")
+    execution = build_execution(args)
+    print(f"\nRunning Chunked Backtest on: {args.data_file} ({args.chunksize:,} rows per chunk)")
+    portfolio = run_chunked_backtest(
+        open_chunks(args.data_file, args.chunksize), strategy, initial_capital,
+        allocations=[allocation / 100 for allocation in allocations] if allocations else None,
+        mode=args.allocation_mode, rebalance_every=args.rebalance_every,
+        lot_size=1 if args.asset_type == "stock" else 0.0001, execution=execution,
+    )
+    for symbol, price in portfolio.marks.items():
+        print(f"{symbol} Final Position: {portfolio.positions.get(symbol, 0):g} @ {price:.2f}")
+    metrics = portfolio_metrics(portfolio, periods_per_year=365 if args.asset_type == "crypto" else 252)
+    print_summary(portfolio, metrics)
+    if execution is not None:
+        print(f"Fees Paid: ${portfolio.fees_paid:,.2f}")
+    timing = strategy.get_timing().get("series_stream", {}).get("ALL")
+    if timing:
+        print(f"Strategy {strategy.name}: {timing['count']} chunks, {timing['mean_us'] / 1e3:,.1f}ms each")
+
 def main():
     args = parse_arguments()
 
+    if args.data_file:
+        run_file_backtest(args)
+        return
+
     if args.config:
         config = load_config(args.config)
         symbols = config['symbols']
@@ -146,6 +248,9 @@ def main():
         end = config['end']
         asset_type = config.get('asset_type', 'crypto')
         strategy = config.get('strategy', 'bollinger')
+        allocation_mode = config.get('allocation_mode', 'fixed')
+        rebalance_every = config.get('rebalance_every')
+        per_symbol = config.get('per_symbol', args.per_symbol)
     else:
         symbols = args.symbols.split(',')
         allocations = list(map(float, args.allocations.split(',')))
@@ -153,6 +258,9 @@ def main():
         end = args.end
         asset_type = args.asset_type
         strategy = args.strategy
+        allocation_mode = args.allocation_mode
+        rebalance_every = args.rebalance_every
+        per_symbol = args.per_symbol
 
     if len(symbols) != len(allocations):
         raise ValueError("Number of symbols and allocations must match.")
@@ -162,47 +270,56 @@ def main():
 
     print(f"\nRunning Multi-Stock Backtest on: {symbols}")
     initial_capital = 1000000
-    combined_portfolio = Portfolio(initial_capital=initial_capital)
-
-    # Totals for summary
-    total_net_worth = 0
-    total_trades = 0
-    total_buys = 0
-    total_sells = 0
 
-    for symbol, allocation in zip(symbols, allocations):
-        print(f"\n=== Running backtest for {symbol.upper()} | Allocation: {allocation}% ===")
-
-        capital = initial_capital * (allocation / 100)
-        sub_portfolio = Portfolio(initial_capital=capital)
-
-        result = run_backtest(symbol, start, end, asset_type, strategy, sub_portfolio)
-
-        # ✅ Print per-symbol result
-        print(f"{symbol.upper()} Final Net Worth: ${result['final_net_worth']:.2f}")
-
-        # Aggregate portfolio
-        combined_portfolio.cash += sub_portfolio.cash
-        for sym, qty in sub_portfolio.positions.items():
-            combined_portfolio.positions[sym] = combined_portfolio.positions.get(sym, 0) + qty
-        combined_portfolio.trade_log.extend(sub_portfolio.trade_log)
-
-        # Aggregate stats
-        total_net_worth += result["final_net_worth"]
-        total_trades += result["total_trades"]
-        total_buys += result["buy_count"]
-        total_sells += result["sell_count"]
+    frames = {symbol: load_historical_data(symbol, start, end, asset_type) for symbol in symbols}
+    if per_symbol:
+        # The bar-by-bar path sizes and fills orders itself, so only fill costs carry over.
+        if rebalance_every or allocation_mode != 'fixed' or args.latency_bars:
+            raise ValueError("--rebalance_every, --allocation_mode equal and --latency_bars need the shared "
+                             "cash pool; drop --per_symbol")
+        if args.indicator_cache:
+            configure_cache(args.indicator_cache)
+        run_per_symbol_backtests(frames, allocations, asset_type, strategy, initial_capital, build_execution(args))
+        return
+
+    # All symbols trade from one cash pool on a shared clock.
+    closes = align_closes(frames)
+    if closes.empty:
+        print("No historical data loaded; nothing to backtest.")
+        return
+    weight_by_symbol = {symbol.upper(): allocation / 100 for symbol, allocation in zip(symbols, allocations)}
+    allocations = [weight_by_symbol[symbol] for symbol in closes.columns]
+
+    if args.indicator_cache:
+        configure_cache(args.indicator_cache)
+    strategy = create_strategy(strategy)
+    states = strategy.on_series(closes)
+    weights = target_weights(states, allocations, mode=allocation_mode)
+
+    execution = build_execution(args)
+
+    combined_portfolio = run_multi_asset_backtest(
+        closes, weights, initial_capital, rebalance_every=rebalance_every,
+        lot_size=1 if asset_type == "stock" else 0.0001,
+        volumes=align_volumes(frames), execution=execution,
+    )
+
+    for symbol in closes.columns:
+        qty = combined_portfolio.positions.get(symbol, 0)
+        print(f"{symbol} Final Position: {qty:g} @ {closes[symbol].iloc[-1]:.2f}")
 
     # Print final combined portfolio summary
-    print("\n========== Combined Portfolio Summary ==========")
-    print(f"Initial Capital: ${initial_capital:,.2f}")
-    print(f"Final Net Worth: ${total_net_worth:,.2f}")
-    print(f"Total Trades Executed: {total_trades}")
-    print(f"  - Buys: {total_buys}")
-    print(f"  - Sells: {total_sells}")
-    total_return = ((total_net_worth - initial_capital) / initial_capital) * 100
-    print(f"Total Return: {total_return:.2f}%")
-    print("===============================================\n")
+    metrics = portfolio_metrics(combined_portfolio, periods_per_year=365 if asset_type == "crypto" else 252)
+    print_summary(combined_portfolio, metrics)
+    if execution is not None:
+        print(f"Fees Paid: ${combined_portfolio.fees_paid:,.2f}")
+    timing = strategy.get_timing().get("on_series", {}).get("ALL")
+    if timing:
+        print(f"Strategy {strategy.name}: signals in {timing['mean_us'] / 1e3:,.1f}ms")
+    cache = get_cache().stats()
+    if cache["memory_hits"] + cache["disk_hits"] + cache["misses"]:
+        print(f"Indicator cache: {cache['memory_hits'] + cache['disk_hits']} hits, {cache['misses']} misses "
+              f"({cache['hit_rate']:.0%})")
 
 if __name__ == "__main__":
     main()
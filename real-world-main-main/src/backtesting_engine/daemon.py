@@ -0,0 +1,205 @@
+# src/backtesting_engine/daemon.py
+"""
+Long-running engine that owns the market data feed, the tick recorder and the
+paper-trading sessions, controlled over a local HTTP/JSON API:
+
+    engine = Engine(db_path="ticks.db").start(port=8765)   # or: python src/main.py --mode daemon ...
+    engine.subscribe(["BTCUSDT"])
+    session_id = engine.start_session(capital=10000, runtime=300, symbols=["BTCUSDT"])
+    engine.run()                                             # until shutdown() or SIGINT/SIGTERM
+
+Routes (see EngineClient in engine_client.py for the Python side):
+
+    GET    /status                 feed, recorder and session overview
+    GET    /quotes                 latest price and age per subscribed symbol
+    POST   /symbols                {"symbols": [...]} subscribe
+    GET    /sessions               every session's status and summary
+    POST   /sessions               {"capital", "runtime", "symbols", "name"?, "strategy"?, "strategy_params"?}
+    GET    /sessions/<id>          full snapshot (?logs=N&pnl=N bound the tails, N=all for none)
+    DELETE /sessions/<id>          stop it (it stays listed with its final summary)
+    POST   /shutdown
+
+One WebSocket connection per symbol is shared by every session that trades it
+(see SessionManager in sessions.py), so dashboards and CLIs can come and go
+without touching the feed or the sessions.
+"""
+import json
+import signal
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from price_engine.data_sources.websocket_handler import BinanceWebSocketClient
+from price_engine.telemetry import REGISTRY
+from .sessions import EngineError, SessionManager, symbol_list
+from .strategies.base import available_strategies
+
+ENGINE_TICKS = REGISTRY.counter("engine_ticks_total", "Ticks received by the engine feed")
+CONTROL_REQUESTS = REGISTRY.counter("engine_control_requests_total", "Control API requests by method and status")
+
+
+class Engine(SessionManager):
+    def __init__(self, db_path: str = None, retention_days: int = 7, base_url: str = None, rest_url: str = None,
+                 execution=None, pnl_interval: float = 1.0):
+        """
+        :param db_path: Record every trade to this partitioned tick database (see price_engine.database).
+        :param base_url: WebSocket base URL (defaults to Binance; point it at a fake server in tests).
+        :param rest_url: REST base used to backfill trades missed across reconnects.
+        :param execution: Fill model given to every session (free, instant fills by default).
+        :param pnl_interval: Seconds between PnL timeline points per session.
+        """
+        super().__init__(execution=execution, pnl_interval=pnl_interval)
+        self.recorder = None
+        if db_path:
+            from price_engine.database import PartitionedPriceDatabase
+            self.recorder = PartitionedPriceDatabase(db_path, batched=True, retention_days=retention_days)
+        feed_kwargs = {"sink": self.recorder}
+        if base_url:
+            feed_kwargs["base_url"] = base_url
+        if rest_url:
+            feed_kwargs["rest_url"] = rest_url
+        self.feed = BinanceWebSocketClient([], on_price_update=self.on_price_update, **feed_kwargs)
+        self._quotes = {}  # symbol -> (price, time.time())
+        self._stopped = threading.Event()
+        self.started = time.time()
+        self.server = None
+
+    # --- Feed ---
+
+    def on_price_update(self, symbol, price, recv_ns=None):
+        ENGINE_TICKS.inc(symbol=symbol)
+        self._quotes[symbol] = (price, time.time())
+        super().on_price_update(symbol, price, recv_ns=recv_ns)
+
+    def subscribe(self, symbols) -> list:
+        """Open a stream for each symbol not yet subscribed; returns every subscribed symbol."""
+        symbols = symbol_list(symbols)
+        with self._lock:
+            for symbol in symbols:
+                if symbol not in self.feed.connections:
+                    self.feed.symbols.append(symbol)
+                    self.feed.create_ws(symbol)
+            return sorted(self.feed.connections)
+
+    def quotes(self) -> dict:
+        now = time.time()
+        return {symbol: {"price": price, "age": now - stamp} for symbol, (price, stamp) in self._quotes.items()}
+
+    def status(self) -> dict:
+        sessions = list(self.sessions.values())
+        return {
+            "uptime": time.time() - self.started,
+            "symbols": sorted(self.feed.connections),
+            "stale": sorted(self.feed.stale),
+            "sessions": len(sessions),
+            "active_sessions": sum(1 for s in sessions if s.active),
+            "strategies": available_strategies(),
+            "recording": self.recorder.db_path if self.recorder is not None else None,
+        }
+
+    # --- Lifecycle ---
+
+    def start(self, port: int = 8765, host: str = "127.0.0.1"):
+        """Serve the control API on a background thread (loopback only by default)."""
+        self.server = ThreadingHTTPServer((host, port), _ControlHandler)
+        self.server.daemon_threads = True
+        self.server.engine = self
+        threading.Thread(target=self.server.serve_forever, name="engine-control", daemon=True).start()
+        return self
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def run(self):
+        """Block until shutdown(), SIGINT or SIGTERM."""
+        if threading.current_thread() is threading.main_thread():
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(sig, lambda *_: self._stopped.set())
+        self._stopped.wait()
+        self.shutdown()
+
+    def shutdown(self):
+        self._stopped.set()
+        self.stop_all()
+        self.feed.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        if self.server is not None:
+            # shutdown() waits for serve_forever to return, so it cannot run on a request thread.
+            server, self.server = self.server, None
+            threading.Thread(target=lambda: (server.shutdown(), server.server_close()), daemon=True).start()
+
+
+def _bound(value):
+    return None if value == "all" else int(value)
+
+
+class _ControlHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method):
+        engine = self.server.engine
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            body = self._read_json() if method == "POST" else {}
+            status, payload = 200, self._route(engine, method, parts, query, body)
+        except EngineError as e:
+            status, payload = e.status, {"error": str(e)}
+        except (ValueError, TypeError, KeyError) as e:
+            status, payload = 400, {"error": f"bad request: {e}"}
+        except Exception as e:
+            # Any other failure still gets a JSON answer rather than a dropped connection.
+            status, payload = 500, {"error": f"internal error: {type(e).__name__}: {e}"}
+        CONTROL_REQUESTS.inc(method=method, status=status)
+        data = json.dumps(payload, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        if parts == ["shutdown"] and status == 200:
+            engine.shutdown()
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    @staticmethod
+    def _route(engine, method, parts, query, body):
+        route = (method, parts[0] if parts else "", len(parts))
+        if route == ("GET", "status", 1):
+            return engine.status()
+        if route == ("GET", "quotes", 1):
+            return engine.quotes()
+        if route == ("POST", "symbols", 1):
+            return {"symbols": engine.subscribe(body["symbols"])}
+        if route == ("GET", "sessions", 1):
+            return [session.status() for session in list(engine.sessions.values())]
+        if route == ("POST", "sessions", 1):
+            session_id = engine.start_session(float(body["capital"]), float(body["runtime"]), body["symbols"],
+                                              body.get("name"), body.get("strategy") or "mean_reversion",
+                                              body.get("strategy_params"))
+            return engine.session(session_id).status()
+        if route == ("GET", "sessions", 2):
+            return engine.session(parts[1]).snapshot(_bound(query.get("logs", 50)), _bound(query.get("pnl", 500)))
+        if route == ("DELETE", "sessions", 2):
+            return engine.stop_session(parts[1])
+        if route == ("POST", "shutdown", 1):
+            return {"stopping": True}
+        raise EngineError(f"no route {method} /{'/'.join(parts)}", status=404)
+
+    def log_message(self, format, *args):
+        pass
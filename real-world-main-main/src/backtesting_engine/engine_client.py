@@ -0,0 +1,166 @@
+# src/backtesting_engine/engine_client.py
+"""
+Client for the engine daemon's control API (see daemon.py):
+
+    client = EngineClient("http://127.0.0.1:8765")
+    session = client.start_session(capital=10000, runtime=300, symbols=["BTCUSDT"])
+    session.refresh()
+    print(session.get_portfolio_summary(), session.get_logs()[-5:])
+
+RemoteSession answers the RealTimeTrader reader methods the dashboard uses from
+the snapshot taken by its last refresh(), so a page render costs one request.
+"""
+import requests
+
+
+class EngineUnavailable(Exception):
+    """The daemon could not be reached or rejected the request."""
+
+
+def _symbols(symbols):
+    # A bare string goes through as is, so the daemon rejects it rather than getting its letters.
+    return symbols if isinstance(symbols, str) else list(symbols)
+
+
+class EngineClient:
+    def __init__(self, url: str = "http://127.0.0.1:8765", timeout: float = 2.0):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def _request(self, method: str, path: str, **kwargs):
+        try:
+            response = self.session.request(method, f"{self.url}{path}", timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            raise EngineUnavailable(f"engine at {self.url} is unreachable: {e}") from e
+        try:
+            data = response.json()
+        except ValueError:
+            # Not the daemon's JSON (a proxy page, a crashed handler): report the status line instead.
+            raise EngineUnavailable(f"engine at {self.url} returned HTTP {response.status_code} "
+                                    f"with a non-JSON body") from None
+        if response.status_code != 200:
+            error = data.get("error") if isinstance(data, dict) else None
+            raise EngineUnavailable(error or f"HTTP {response.status_code}")
+        return data
+
+    def ping(self) -> bool:
+        try:
+            self.status()
+            return True
+        except EngineUnavailable:
+            return False
+
+    def status(self) -> dict:
+        return self._request("GET", "/status")
+
+    def quotes(self) -> dict:
+        return self._request("GET", "/quotes")
+
+    def subscribe(self, symbols) -> list:
+        return self._request("POST", "/symbols", json={"symbols": _symbols(symbols)})["symbols"]
+
+    def sessions(self) -> list:
+        return self._request("GET", "/sessions")
+
+    def start_session(self, capital: float, runtime: float, symbols, name: str = None,
+                      strategy: str = "mean_reversion", strategy_params: dict = None) -> "RemoteSession":
+        status = self._request("POST", "/sessions", json={"capital": capital, "runtime": runtime,
+                                                          "symbols": _symbols(symbols), "name": name,
+                                                          "strategy": strategy, "strategy_params": strategy_params})
+        return RemoteSession(self, status["id"], status)
+
+    def attach(self, session_id) -> "RemoteSession":
+        session = RemoteSession(self, str(session_id))
+        session.refresh()
+        return session
+
+    def snapshot(self, session_id, logs: int = 50, pnl: int = 500) -> dict:
+        """:param logs: / :param pnl: Tail lengths of the trade log and PnL timeline; None for all of them."""
+        params = {"logs": "all" if logs is None else logs, "pnl": "all" if pnl is None else pnl}
+        return self._request("GET", f"/sessions/{session_id}", params=params)
+
+    def stop_session(self, session_id) -> dict:
+        return self._request("DELETE", f"/sessions/{session_id}")
+
+    def shutdown(self):
+        return self._request("POST", "/shutdown")
+
+
+class RemoteSession:
+    """A daemon session seen through the RealTimeTrader reader interface."""
+
+    LATENCY_STAGES = ("decode", "lock_wait", "strategy", "order", "tick_to_decision", "tick_to_trade")
+
+    def __init__(self, client: EngineClient, session_id: str, status: dict = None):
+        self.client = client
+        self.id = session_id
+        self.data = dict(status or {})
+
+    def refresh(self, logs: int = 50, pnl: int = 500) -> dict:
+        """Take a new snapshot; refresh(logs=None, pnl=None) fetches the whole trade log and PnL timeline."""
+        self.data = self.client.snapshot(self.id, logs=logs, pnl=pnl)
+        return self.data
+
+    def stop(self):
+        self.data.update(self.client.stop_session(self.id))
+
+    def _get(self, key, default=None):
+        if key not in self.data:
+            self.refresh()
+        return self.data.get(key, default)
+
+    @property
+    def summary(self) -> dict:
+        return self._get("summary", {})
+
+    @property
+    def name(self) -> str:
+        return self._get("name")
+
+    @property
+    def is_active(self) -> bool:
+        return self._get("active", False)
+
+    @property
+    def start_time(self) -> float:
+        return self._get("start_time")
+
+    @property
+    def runtime(self) -> float:
+        return self._get("runtime")
+
+    @property
+    def initial_capital(self) -> float:
+        return self.summary["initial_capital"]
+
+    @property
+    def cash_balance(self) -> float:
+        return self.summary["cash_balance"]
+
+    def calculate_unrealized_pnl(self) -> float:
+        return self.summary["unrealized_pnl"]
+
+    def get_portfolio_summary(self) -> dict:
+        return dict(self.summary)
+
+    def get_positions(self) -> dict:
+        return self._get("positions", {})
+
+    def get_latest_price(self, symbol):
+        return self._get("latest_prices", {}).get(symbol)
+
+    def get_logs(self) -> list:
+        return self._get("logs", [])
+
+    def get_pnl_data(self) -> list:
+        return self._get("pnl_timeline", [])
+
+    def get_latency_stats(self) -> dict:
+        return self._get("latency", {})
+
+    def get_strategy_timing(self) -> dict:
+        return self._get("strategy_timing", {})
+
+    def get_trade_count(self) -> int:
+        return self._get("trades", 0)
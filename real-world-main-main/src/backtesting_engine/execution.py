@@ -0,0 +1,125 @@
+# src/backtesting_engine/execution.py
+"""
+Execution models shared by the backtester (Portfolio) and the paper trader
+(RealTimeTrader). A model turns an order into (filled qty, fill price, fee):
+
+    model = SimulatedExecution(taker_fee=0.001, spread_bps=2, impact=0.1,
+                               max_participation=0.05, latency_bars=1)
+    portfolio = Portfolio(100000, execution=model)
+    portfolio.buy("BTCUSDT", 64000.0, 1, volume=250.0)
+
+fill() is the scalar path used per order; fill_many() does the same maths
+over arrays for callers that price a whole batch of orders at once, and
+fill_from_book() fills against a live L2 OrderBook instead of a reference price.
+"""
+import math
+import numpy as np
+
+BUY = 1
+SELL = -1
+ORDER_TYPES = ("market", "limit")
+
+
+class ExecutionModel:
+    """Instant, free fill of the whole order at the reference price (the original behaviour)."""
+
+    latency_bars = 0
+    latency_ms = 0.0
+    max_participation = None
+    resubmit_unfilled = False
+
+    def fill(self, side: int, price: float, qty: float, volume: float = None, order_type: str = "market"):
+        return qty, price, 0.0
+
+    def fill_many(self, sides, prices, qtys, volumes=None, order_type: str = "market"):
+        return np.asarray(qtys, dtype=np.float64), np.asarray(prices, dtype=np.float64), np.zeros(len(qtys))
+
+    def fill_from_book(self, side: int, qty: float, book, order_type: str = "market"):
+        """Whole order at the touch of the opposite side (the mid for a limit order)."""
+        top = book.top()
+        if top is None:
+            return 0.0, None, 0.0
+        if order_type == "limit":
+            return qty, top.microprice, 0.0
+        return qty, top.ask if side > 0 else top.bid, 0.0
+
+
+class SimulatedExecution(ExecutionModel):
+    def __init__(self, maker_fee: float = 0.001, taker_fee: float = 0.001, spread_bps: float = 0.0,
+                 slippage_bps: float = 0.0, impact: float = 0.0, max_participation: float = None,
+                 resubmit_unfilled: bool = False, latency_bars: int = 0, latency_ms: float = 0.0):
+        """
+        :param maker_fee: Fee rate on limit orders, which fill at the reference price.
+        :param taker_fee: Fee rate on market orders.
+        :param spread_bps: Quoted spread; market orders pay half of it.
+        :param slippage_bps: Fixed extra slippage on market orders.
+        :param impact: Volume-based slippage: impact * sqrt(qty / bar volume), as a fraction of price.
+        :param max_participation: Largest fraction of bar volume one order may take.
+        :param resubmit_unfilled: Keep working the part of an order the volume cap held back
+            on the following bars; by default it is cancelled (immediate-or-cancel).
+        :param latency_bars: Bars between a backtest signal and its fill.
+        :param latency_ms: Delay before a live paper order fills at the then-current price.
+        """
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+        self.spread_bps = spread_bps
+        self.slippage_bps = slippage_bps
+        self.impact = impact
+        self.max_participation = max_participation
+        self.resubmit_unfilled = resubmit_unfilled
+        self.latency_bars = latency_bars
+        self.latency_ms = latency_ms
+        self._fixed_slippage = (spread_bps / 2 + slippage_bps) / 10000
+
+    def fill(self, side: int, price: float, qty: float, volume: float = None, order_type: str = "market"):
+        # Unknown (None/NaN) volume puts no limit on the fill.
+        if volume is not None and self.max_participation is not None and volume >= 0:
+            qty = min(qty, self.max_participation * volume)
+        if qty <= 0:
+            return 0.0, price, 0.0
+
+        if order_type == "limit":
+            return qty, price, qty * price * self.maker_fee
+
+        slippage = self._fixed_slippage
+        if self.impact and volume is not None and volume > 0:
+            slippage += self.impact * math.sqrt(qty / volume)
+        fill_price = price * (1 + side * slippage)
+        return qty, fill_price, qty * fill_price * self.taker_fee
+
+    def fill_many(self, sides, prices, qtys, volumes=None, order_type: str = "market"):
+        """Array version of fill(); sides may be a single BUY/SELL for the whole batch."""
+        prices = np.asarray(prices, dtype=np.float64)
+        qtys = np.asarray(qtys, dtype=np.float64)
+        if volumes is not None:
+            volumes = np.asarray(volumes, dtype=np.float64)
+            if self.max_participation is not None:
+                qtys = np.maximum(np.fmin(qtys, self.max_participation * volumes), 0.0)
+
+        if order_type == "limit":
+            return qtys, prices, qtys * prices * self.maker_fee
+
+        slippage = self._fixed_slippage
+        if self.impact and volumes is not None:
+            participation = np.divide(qtys, volumes, out=np.zeros_like(qtys), where=volumes > 0)
+            slippage = slippage + self.impact * np.sqrt(participation)
+        fill_prices = prices * (1 + np.multiply(sides, slippage))
+        return qtys, fill_prices, qtys * fill_prices * self.taker_fee
+
+    def fill_from_book(self, side: int, qty: float, book, order_type: str = "market"):
+        """
+        Market orders sweep the visible levels of an OrderBook, so the spread and
+        depth are real rather than modelled; what the book cannot fill is left
+        unfilled. slippage_bps still applies on top (hidden latency, queue position).
+        Limit orders rest at the microprice and pay the maker fee.
+        """
+        top = book.top()
+        if top is None or qty <= 0:
+            return 0.0, None, 0.0
+        if order_type == "limit":
+            return qty, top.microprice, qty * top.microprice * self.maker_fee
+        filled, price = book.sweep(side, qty)
+        if not filled:
+            return 0.0, None, 0.0
+        fill_price = price * (1 + side * self.slippage_bps / 10000)
+        return filled, fill_price, filled * fill_price * self.taker_fee
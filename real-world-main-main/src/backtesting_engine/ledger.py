@@ -0,0 +1,112 @@
+# src/backtesting_engine/ledger.py
+from collections import deque
+
+COST_METHODS = ("fifo", "lifo", "average")
+
+# Fractional fills leave float residue; quantities this small count as zero.
+QTY_EPSILON = 1e-9
+
+
+class SymbolBook:
+    """Open lots and running totals for one symbol. Lot quantities are signed (negative = short)."""
+
+    __slots__ = ("lots", "qty", "cost_basis", "realized_pnl")
+
+    def __init__(self):
+        self.lots = deque()  # [qty, price] pairs, all with the same sign
+        self.qty = 0
+        self.cost_basis = 0.0  # sum(qty * price) over open lots
+        self.realized_pnl = 0.0
+
+
+class PositionLedger:
+    """
+    Lot-based position ledger that keeps realized and unrealized PnL up to date
+    incrementally, so PnL queries cost O(open positions) instead of rescanning
+    the trade log.
+    """
+
+    def __init__(self, method: str = "fifo"):
+        """
+        :param method: How closing trades are matched against open lots:
+            "fifo" (oldest first), "lifo" (newest first) or "average" (average cost).
+        """
+        if method not in COST_METHODS:
+            raise ValueError(f"Unknown cost method: {method}. Choose from {COST_METHODS}")
+        self.method = method
+        self.books = {}
+        self.realized_pnl = 0.0
+
+    def record(self, symbol: str, qty: float, price: float) -> float:
+        """
+        Apply a fill that changes the position by signed qty at price.
+        Fills against the open direction close lots first; any remainder opens
+        a new lot in the other direction.
+        :return: PnL realized by this fill.
+        """
+        if qty == 0:
+            return 0.0
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = SymbolBook()
+
+        realized = 0.0
+        remaining = qty
+        while abs(remaining) > QTY_EPSILON and book.lots and (book.qty > 0) != (remaining > 0):
+            lot = book.lots[0] if self.method == "fifo" else book.lots[-1]
+            closed = min(abs(remaining), abs(lot[0]))
+            direction = 1 if lot[0] > 0 else -1
+            realized += direction * closed * (price - lot[1])
+
+            lot[0] -= direction * closed
+            book.qty -= direction * closed
+            book.cost_basis -= direction * closed * lot[1]
+            remaining += direction * closed
+            if abs(lot[0]) <= QTY_EPSILON:
+                if self.method == "fifo":
+                    book.lots.popleft()
+                else:
+                    book.lots.pop()
+
+        if abs(book.qty) <= QTY_EPSILON:
+            book.lots.clear()
+        if not book.lots:
+            book.qty = 0
+            book.cost_basis = 0.0  # drop float residue once flat
+
+        if abs(remaining) > QTY_EPSILON:
+            if self.method == "average" and book.lots:
+                lot = book.lots[0]
+                lot[0] += remaining
+                book.qty += remaining
+                book.cost_basis += remaining * price
+                lot[1] = book.cost_basis / book.qty
+            else:
+                book.lots.append([remaining, price])
+                book.qty += remaining
+                book.cost_basis += remaining * price
+
+        book.realized_pnl += realized
+        self.realized_pnl += realized
+        return realized
+
+    def position(self, symbol: str) -> float:
+        book = self.books.get(symbol)
+        return book.qty if book else 0
+
+    def average_price(self, symbol: str):
+        book = self.books.get(symbol)
+        if not book or not book.qty:
+            return None
+        return book.cost_basis / book.qty
+
+    def unrealized_pnl(self, current_prices: dict) -> float:
+        total = 0.0
+        for symbol, book in self.books.items():
+            if book.qty and symbol in current_prices:
+                total += book.qty * current_prices[symbol] - book.cost_basis
+        return total
+
+    def open_lots(self, symbol: str) -> list:
+        book = self.books.get(symbol)
+        return [tuple(lot) for lot in book.lots] if book else []
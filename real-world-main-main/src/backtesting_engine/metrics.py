@@ -1,17 +1,163 @@
 # C:\real-world-main\src\backtesting_engine\metrics.py
+from collections import namedtuple
+import numpy as np
+
+# One row per backtest. A namedtuple keeps thousands of results cheap to hold,
+# compare and turn into a DataFrame (pd.DataFrame(results)).
+BacktestMetrics = namedtuple("BacktestMetrics", [
+    "initial_capital", "final_net_worth", "total_return", "cagr",
+    "sharpe", "sortino", "volatility",
+    "max_drawdown", "max_drawdown_duration",
+    "trades", "closed_trades", "win_rate", "profit_factor",
+    "exposure", "avg_exposure", "turnover",
+])
+
+
+def _max_drawdown(equity: np.ndarray):
+    """Deepest peak-to-trough drop (fraction, <= 0) and the longest stretch of bars spent below a prior peak."""
+    peaks = np.maximum.accumulate(equity)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdowns = np.where(peaks > 0, equity / peaks - 1.0, 0.0)
+    at_peak = np.flatnonzero(equity >= peaks)
+    gaps = np.diff(np.append(at_peak, len(equity))) - 1
+    return float(drawdowns.min()), int(gaps.max())
+
+
+def compute_metrics(net_worth, trade_log=None, exposure=None, initial_capital: float = None,
+                    periods_per_year: int = 252, risk_free_rate: float = 0.0) -> BacktestMetrics:
+    """
+    Compute performance metrics for one equity curve without Python-level loops.
+
+    :param net_worth: Net worth per bar (EquityCurve, ndarray or list).
+    :param trade_log: Optional TradeLog; supplies win rate, profit factor and turnover.
+    :param exposure: Optional gross exposure per bar (sum of |qty| * price), same length as net_worth.
+    :param initial_capital: Starting equity; defaults to the first net worth value.
+    :param periods_per_year: Bars per year used to annualize (252 for daily equities, 365 for daily crypto).
+    :param risk_free_rate: Annual risk-free rate subtracted in Sharpe and Sortino.
+    """
+    equity = net_worth.to_numpy() if hasattr(net_worth, "to_numpy") else np.asarray(net_worth, dtype=np.float64)
+    if initial_capital is None:
+        initial_capital = float(equity[0]) if len(equity) else 0.0
+    final = float(equity[-1]) if len(equity) else float(initial_capital)
+    nan = float("nan")
+
+    total_return = final / initial_capital - 1.0 if initial_capital else nan
+    curve = np.concatenate(([initial_capital], equity))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(curve) / curve[:-1]
+    returns = returns[np.isfinite(returns)]
+
+    bars = len(equity)
+    if bars and initial_capital > 0 and final > 0:
+        cagr = (final / initial_capital) ** (periods_per_year / bars) - 1.0
+    else:
+        cagr = nan
+
+    sharpe = sortino = volatility = nan
+    if len(returns) > 1:
+        excess = returns - risk_free_rate / periods_per_year
+        std = returns.std(ddof=1)
+        volatility = float(std * np.sqrt(periods_per_year))
+        if std > 0:
+            sharpe = float(excess.mean() / std * np.sqrt(periods_per_year))
+        downside = np.sqrt(np.mean(np.minimum(excess, 0.0) ** 2))
+        if downside > 0:
+            sortino = float(excess.mean() / downside * np.sqrt(periods_per_year))
+
+    max_drawdown, max_drawdown_duration = _max_drawdown(curve)
+
+    trades = closed_trades = 0
+    win_rate = profit_factor = turnover = nan
+    if trade_log is not None:
+        trades = len(trade_log)
+        pnl = trade_log.view("pnl")
+        closed = pnl[~np.isnan(pnl)]
+        closed_trades = len(closed)
+        if closed_trades:
+            win_rate = float(np.count_nonzero(closed > 0) / closed_trades)
+            gains = closed[closed > 0].sum()
+            losses = -closed[closed < 0].sum()
+            profit_factor = float(gains / losses) if losses > 0 else (float("inf") if gains > 0 else nan)
+        mean_equity = curve.mean()
+        if mean_equity > 0:
+            turnover = float(np.dot(trade_log.view("price"), trade_log.view("qty")) / mean_equity)
+
+    exposure_pct = avg_exposure = nan
+    if exposure is not None and bars:
+        exposure = np.asarray(exposure, dtype=np.float64)
+        exposure_pct = float(np.count_nonzero(exposure > 0) / bars)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = exposure / equity
+        ratio = ratio[np.isfinite(ratio)]
+        avg_exposure = float(ratio.mean()) if len(ratio) else nan
+
+    return BacktestMetrics(
+        initial_capital=float(initial_capital),
+        final_net_worth=final,
+        total_return=total_return,
+        cagr=cagr,
+        sharpe=sharpe,
+        sortino=sortino,
+        volatility=volatility,
+        max_drawdown=max_drawdown,
+        max_drawdown_duration=max_drawdown_duration,
+        trades=trades,
+        closed_trades=closed_trades,
+        win_rate=win_rate,
+        profit_factor=profit_factor,
+        exposure=exposure_pct,
+        avg_exposure=avg_exposure,
+        turnover=turnover,
+    )
+
+
+def portfolio_metrics(portfolio, periods_per_year: int = 252, risk_free_rate: float = 0.0) -> BacktestMetrics:
+    """compute_metrics() over a Portfolio's equity curve, exposure and trade log."""
+    return compute_metrics(
+        portfolio.net_worth_history,
+        trade_log=portfolio.trade_log,
+        exposure=portfolio.net_worth_history.exposure(),
+        initial_capital=portfolio.initial_capital,
+        periods_per_year=periods_per_year,
+        risk_free_rate=risk_free_rate,
+    )
+
+
+def rank_metrics(results, by: str = "sharpe", descending: bool = True) -> list:
+    """
+    Order BacktestMetrics (or (params, BacktestMetrics) pairs from a sweep) by one field.
+    NaN scores always sort last.
+    """
+    results = list(results)
+    if not results:
+        return []
+    metrics = [r[-1] if not isinstance(r, BacktestMetrics) else r for r in results]
+    scores = np.array([getattr(m, by) for m in metrics], dtype=np.float64)
+    keys = np.where(np.isnan(scores), -np.inf, scores if descending else -scores)
+    order = np.argsort(-keys, kind="stable")
+    return [results[i] for i in order]
+
+
+def print_summary(portfolio, metrics: BacktestMetrics = None):
+    if metrics is None:
+        metrics = portfolio_metrics(portfolio)
 
-def print_summary(portfolio):
     print("\n========== Backtest Summary ==========")
     print(f"Initial Capital: ${portfolio.initial_capital:,.2f}")
     print(f"Final Net Worth: ${portfolio.get_final_net_worth():,.2f}")
     print(f"Total Trades Executed: {len(portfolio.trade_log)}")
-    
-    buy_count = sum(1 for t in portfolio.trade_log if t["action"] == "BUY")
-    sell_count = sum(1 for t in portfolio.trade_log if t["action"] == "SELL")
-    
+
+    buy_count = portfolio.trade_log.count("BUY")
+    sell_count = portfolio.trade_log.count("SELL")
+
     print(f"  - Buys: {buy_count}")
     print(f"  - Sells: {sell_count}")
-    
+
     total_return = ((portfolio.get_final_net_worth() - portfolio.initial_capital) / portfolio.initial_capital) * 100
     print(f"Total Return: {total_return:.2f}%")
+    print(f"CAGR: {metrics.cagr * 100:.2f}%")
+    print(f"Sharpe: {metrics.sharpe:.2f} | Sortino: {metrics.sortino:.2f}")
+    print(f"Max Drawdown: {metrics.max_drawdown * 100:.2f}% over {metrics.max_drawdown_duration} bars")
+    print(f"Win Rate: {metrics.win_rate * 100:.2f}% | Profit Factor: {metrics.profit_factor:.2f}")
+    print(f"Exposure: {metrics.exposure * 100:.2f}% of bars | Turnover: {metrics.turnover:.2f}x")
     print("======================================\n")
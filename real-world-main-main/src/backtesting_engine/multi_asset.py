@@ -0,0 +1,396 @@
+# src/backtesting_engine/multi_asset.py
+"""
+Multi-asset backtest on one shared clock and one cash pool.
+
+    closes = align_closes({s: load_historical_data(s, start, end) for s in symbols})
+    states = bollinger_states(closes)                  # T x N, 1 = long, 0 = flat
+    weights = target_weights(states, allocations)      # T x N fraction of equity
+    portfolio = run_multi_asset_backtest(closes, weights, initial_capital=1_000_000)
+
+Signals and weights are computed for every symbol at once. The accounting only
+steps through bars where a target changes (or a periodic rebalance is due);
+the equity between those bars is a single matrix product over the segment.
+"""
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from price_engine.indicators.cache import fingerprint
+from price_engine.indicators.kernels import rolling_mean_std
+
+from .execution import BUY, SELL
+from .portfolio import Portfolio
+from .trade_store import Action
+
+ALLOCATION_MODES = ("fixed", "equal")
+
+
+def align_closes(frames: dict) -> pd.DataFrame:
+    """
+    Put each symbol's "close" column on the union of all timestamps.
+    Gaps are forward filled; bars before a symbol's first quote stay NaN (not tradable).
+    """
+    columns = {symbol.upper(): df["close"] for symbol, df in frames.items() if not df.empty}
+    if not columns:
+        return pd.DataFrame()
+    closes = pd.concat(columns, axis=1, sort=True)
+    closes = closes[~closes.index.duplicated(keep="last")].sort_index()
+    return closes.ffill()
+
+
+def align_volumes(frames: dict) -> pd.DataFrame:
+    """Each symbol's "volume" column on the union clock; bars without a print stay NaN (no volume cap)."""
+    columns = {symbol.upper(): df["volume"] for symbol, df in frames.items() if "volume" in df}
+    if not columns:
+        return None
+    volumes = pd.concat(columns, axis=1, sort=True)
+    return volumes[~volumes.index.duplicated(keep="last")]
+
+
+def _wilder_rsi(closes: pd.DataFrame, window: int) -> pd.DataFrame:
+    diff = closes.diff()
+    up = diff.clip(lower=0.0).ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+    down = (-diff).clip(lower=0.0).ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+    return _rsi(up.to_numpy(), down.to_numpy())
+
+
+def _rsi(up: np.ndarray, down: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - 100 / (1 + up / down)
+    return np.where(down != 0, rsi, 100.0)
+
+
+def _rolling_bands(values: np.ndarray, window: int) -> np.ndarray:
+    """2 x T x N rolling mean and population std of every column."""
+    bands = np.empty((2,) + values.shape)
+    for j in range(values.shape[1]):
+        bands[0, :, j], bands[1, :, j] = rolling_mean_std(values[:, j], window)
+    return bands
+
+
+def _bollinger_events(values, bands, rsi, num_std) -> np.ndarray:
+    mean, std = bands
+    with np.errstate(invalid="ignore"):
+        enter = (values < mean - num_std * std) & (rsi < 40)
+        exit_ = (values > mean + num_std * std) & (rsi > 60)
+    return np.where(enter, 1.0, np.where(exit_, 0.0, np.nan))
+
+
+def carry_forward(events: np.ndarray, initial: np.ndarray = None) -> np.ndarray:
+    """
+    Forward fill T x N signals (1 = buy, 0 = sell, NaN = no signal) down each column.
+    :param initial: Each column's state before the first row (a previous chunk's last row); flat by default.
+    """
+    filled = np.vstack((np.full((1, events.shape[1]), np.nan) if initial is None else initial, events))
+    last = np.where(np.isnan(filled), 0, np.arange(len(filled))[:, None])
+    np.maximum.accumulate(last, axis=0, out=last)
+    return np.nan_to_num(filled[last, np.arange(events.shape[1])][1:], nan=0.0)
+
+
+def bollinger_states(closes: pd.DataFrame, window: int = 20, num_std: float = 2, rsi_window: int = 14,
+                     warmup: int = 50, cache=None) -> np.ndarray:
+    """
+    Vectorized strategy_bollinger over all symbols: go long when price < lower band
+    and RSI < 40, go flat when price > upper band and RSI > 60, otherwise hold.
+    RSI runs over the full history rather than the last 50 bars, so values right
+    after a regime change can differ slightly from the per-bar strategy.
+    :param cache: IndicatorCache for the bands and RSI (a num_std sweep computes them once).
+    :return: T x N array of 1 (long) / 0 (flat).
+    """
+    values = closes.to_numpy(dtype=np.float64)
+    if cache is not None:
+        fp = fingerprint(values)
+        bands = cache.get_or_compute(fp, "rolling_mean_std", {"window": window},
+                                     lambda: _rolling_bands(values, window))
+        rsi = cache.get_or_compute(fp, "wilder_rsi", {"window": rsi_window},
+                                   lambda: _wilder_rsi(closes, rsi_window))
+    else:
+        bands = _rolling_bands(values, window)
+        rsi = _wilder_rsi(closes, rsi_window)
+
+    events = _bollinger_events(values, bands, rsi, num_std)
+    events[:warmup] = np.nan
+    return carry_forward(events)
+
+
+class BollingerStream:
+    """
+    bollinger_states over consecutive chunks of one long close series, giving the same
+    states bar for bar as a single call on the whole series. Between chunks it keeps
+    the last window - 1 closes for the bands, the last close and the smoothed RSI gains
+    and losses, the bar count and each column's position, so memory does not grow with
+    the series. Closes should be forward filled (only leading bars NaN), as align_closes
+    and streaming.forward_fill_chunks leave them.
+
+        stream = BollingerStream(num_std=2.5)
+        for chunk in chunks:
+            states = stream(chunk)
+    """
+
+    def __init__(self, window: int = 20, num_std: float = 2, rsi_window: int = 14, warmup: int = 50):
+        self.window = window
+        self.num_std = num_std
+        self.rsi_window = rsi_window
+        self.warmup = warmup
+        self._tail = None          # last window - 1 closes (the last close for window 1)
+        self._levels = None        # 2 x N smoothed gains and losses
+        self._observations = None  # price changes seen per column
+        self._state = None         # 1 x N position after the last bar
+        self.bars = 0
+
+    def __call__(self, closes: pd.DataFrame) -> np.ndarray:
+        values = closes.to_numpy(dtype=np.float64)
+        if not len(values):
+            return np.zeros(values.shape)
+        n = values.shape[1]
+        first = self._tail is None
+        if first:
+            self._tail = np.empty((0, n))
+            self._observations = np.zeros(n, dtype=np.int64)
+
+        extended = np.vstack((self._tail, values))
+        bands = _rolling_bands(extended, self.window)[:, len(self._tail):]
+
+        # Price changes continue from the previous chunk's last close, and the gain and loss
+        # averages from their carried levels: ewm seeded with the level is the same recursion.
+        diff = np.diff(extended[len(extended) - len(values) - 1:], axis=0) if not first else \
+            np.vstack((np.full((1, n), np.nan), np.diff(values, axis=0)))
+        smoothed = []
+        for k, moves in enumerate((np.clip(diff, 0.0, None), np.clip(-diff, 0.0, None))):
+            if not first:
+                moves = np.vstack((self._levels[k], moves))
+            averaged = pd.DataFrame(moves).ewm(alpha=1 / self.rsi_window, adjust=False).mean().to_numpy()
+            smoothed.append(averaged if first else averaged[1:])
+        observations = self._observations + np.cumsum(~np.isnan(diff), axis=0)
+        up, down = (np.where(observations < self.rsi_window, np.nan, averaged) for averaged in smoothed)
+
+        events = _bollinger_events(values, bands, _rsi(up, down), self.num_std)
+        events[:max(0, self.warmup - self.bars)] = np.nan
+        states = carry_forward(events, self._state)
+
+        self._tail = extended[max(0, len(extended) - max(self.window - 1, 1)):]
+        self._levels = np.array([averaged[-1] for averaged in smoothed])
+        self._observations = observations[-1]
+        self._state = states[-1:]
+        self.bars += len(values)
+        return states
+
+
+def strategy_states(closes: pd.DataFrame, strategy, warmup: int = 50) -> np.ndarray:
+    """
+    Per-bar fallback for strategies that only exist as strategy(data_window, current_position).
+    "buy" opens a long and "sell" goes flat, matching how backtest_runner trades them.
+    """
+    values = closes.to_numpy()
+    states = np.zeros(values.shape)
+    for j in range(values.shape[1]):
+        series = values[:, j]
+        window = []
+        state = 0.0
+        for t, price in enumerate(series):
+            if np.isnan(price):
+                continue
+            window.append({"price": price})
+            if len(window) > warmup:
+                signal = strategy(window[-warmup:], current_position="long" if state else None)
+                if signal == "buy":
+                    state = 1.0
+                elif signal == "sell":
+                    state = 0.0
+            states[t, j] = state
+    return states
+
+
+class StrategyStream:
+    """
+    strategy_states over consecutive chunks. Per column it carries the last warmup
+    prices, the count seen and the position, and gives a Strategy its own clone per
+    column as Strategy.on_series does.
+    """
+
+    def __init__(self, strategy, warmup: int = 50):
+        self.strategy = strategy
+        self.warmup = warmup
+        self._columns = None  # per column: [strategy, last warmup prices, prices seen, state]
+
+    def __call__(self, closes: pd.DataFrame) -> np.ndarray:
+        values = closes.to_numpy(dtype=np.float64)
+        if self._columns is None:
+            clone = getattr(self.strategy, "clone", None)
+            self._columns = [[clone(column) if clone else self.strategy, deque(maxlen=self.warmup), 0, 0.0]
+                             for column in closes.columns]
+        states = np.zeros(values.shape)
+        for j, column in enumerate(self._columns):
+            strategy, window, seen, state = column
+            for t, price in enumerate(values[:, j]):
+                if np.isnan(price):
+                    continue
+                window.append({"price": price})
+                seen += 1
+                if seen > self.warmup:
+                    signal = strategy(list(window), current_position="long" if state else None)
+                    if signal == "buy":
+                        state = 1.0
+                    elif signal == "sell":
+                        state = 0.0
+                states[t, j] = state
+            column[2:] = [seen, state]
+        return states
+
+
+def target_weights(states: np.ndarray, allocations=None, mode: str = "fixed") -> np.ndarray:
+    """
+    Turn T x N position states into T x N target fractions of equity.
+    :param allocations: Per-symbol fractions (sum <= 1) used by "fixed"; defaults to equal slices.
+    :param mode: "fixed" gives each active symbol its own allocation and keeps the rest in cash;
+        "equal" splits the whole equity evenly across whichever symbols are active.
+    """
+    if mode not in ALLOCATION_MODES:
+        raise ValueError(f"Unknown allocation mode: {mode}. Choose from {ALLOCATION_MODES}")
+    states = np.asarray(states, dtype=np.float64)
+    if mode == "equal":
+        active = np.count_nonzero(states, axis=1)[:, None]
+        return np.divide(states, active, out=np.zeros_like(states), where=active > 0)
+
+    n = states.shape[1]
+    allocations = np.full(n, 1.0 / n) if allocations is None else np.asarray(allocations, dtype=np.float64)
+    if len(allocations) != n:
+        raise ValueError("Number of symbols and allocations must match.")
+    return states * allocations
+
+
+def _rebalance(portfolio, symbols, prices, volumes, shares, targets, lot_size):
+    """Trade the given columns to their target share counts: sells first, then buys with the freed cash."""
+    fill = portfolio.execution.fill
+    deltas = (targets - shares).tolist()
+    prices = prices.tolist()
+    volumes = [None] * len(deltas) if volumes is None else volumes.tolist()
+    traded = [j for j, delta in enumerate(deltas) if delta]
+
+    for j in traded:
+        if deltas[j] < 0:
+            qty, price, fee = fill(SELL, prices[j], -deltas[j], volumes[j])
+            if qty > 0:
+                portfolio.book_fill(Action.SELL, symbols[j], qty, price, fee)
+    for j in traded:
+        if deltas[j] > 0:
+            qty, price, fee = fill(BUY, prices[j], deltas[j], volumes[j])
+            if qty > 0 and price * qty + fee > portfolio.cash:
+                # Shrink to what the cash covers and re-price the smaller order.
+                qty = math.floor(portfolio.cash / (price + fee / qty) / lot_size) * lot_size
+                qty, price, fee = fill(BUY, prices[j], qty, volumes[j])
+                if price * qty + fee > portfolio.cash:
+                    continue
+            if qty > 0:
+                portfolio.book_fill(Action.BUY, symbols[j], qty, price, fee)
+
+    for j in traded:
+        shares[j] = portfolio.positions.get(symbols[j], 0)
+
+
+def _record_segment(portfolio, segment, shares):
+    # einsum rather than matmul: BLAS rounds a row differently depending on the block it lands
+    # in, and a chunked run (carry=...) cuts the same bars into different segments.
+    portfolio.net_worth_history.extend(portfolio.cash + np.einsum("ij,j->i", segment, shares),
+                                       np.einsum("ij,j->i", segment, np.abs(shares)))
+
+
+def run_multi_asset_backtest(closes: pd.DataFrame, weights: np.ndarray, initial_capital: float,
+                             rebalance_every: int = None, lot_size: float = 1.0,
+                             portfolio: Portfolio = None, volumes: pd.DataFrame = None,
+                             execution=None, carry: dict = None) -> Portfolio:
+    """
+    Simulate one Portfolio trading every column of closes against the weight matrix.
+
+    :param closes: T x N close prices from align_closes().
+    :param weights: T x N target fraction of equity per symbol (long only).
+    :param rebalance_every: Also restore all active symbols to their targets every N bars;
+        by default a symbol is only traded when its own target changes.
+    :param lot_size: Smallest tradable quantity (1 for shares, e.g. 0.0001 for crypto).
+    :param volumes: Optional T x N bar volumes aligned with closes, passed to the execution model.
+    :param execution: ExecutionModel for a new portfolio; its latency_bars delays every target.
+    :param carry: For consecutive chunks of one long series (see streaming.py): pass the same
+        portfolio and dict to every call, which keeps the last targets, delayed signals, bar
+        count and volume-capped remainders between them, so the result matches a single call.
+    :return: The portfolio, with trade_log and net_worth_history covering every bar.
+    """
+    symbols = list(closes.columns)
+    prices = closes.to_numpy(dtype=np.float64)
+    tradable = ~np.isnan(prices)
+    marks = np.where(tradable, prices, 0.0)
+    bars, n = prices.shape
+    if portfolio is None:
+        portfolio = Portfolio(initial_capital=initial_capital, execution=execution)
+
+    carried = carry or {}
+    weights = np.asarray(weights, dtype=np.float64)
+    delay = portfolio.execution.latency_bars
+    if delay:
+        # A signal on bar t is only filled on bar t + delay.
+        signals = np.vstack((carried.get("delayed", np.zeros((delay, n))), weights))
+        weights = signals[:bars]
+        if carry is not None:
+            carry["delayed"] = signals[bars:]
+    weights = np.where(tradable, weights, 0.0)
+    bar_volumes = None
+    if volumes is not None:
+        bar_volumes = volumes.reindex(index=closes.index, columns=closes.columns).to_numpy(dtype=np.float64)
+    for symbol in symbols:
+        portfolio.current_position.setdefault(symbol, None)
+
+    # Bars where some target moves (plus periodic rebalances) are the only ones that trade.
+    changed = np.zeros((bars, n), dtype=bool)
+    if bars:
+        changed[0] = weights[0] != carried.get("weights", 0)
+    changed[1:] = weights[1:] != weights[:-1]
+    if rebalance_every:
+        due = -carried.get("bars", 0) % rebalance_every
+        changed[due::rebalance_every] |= weights[due::rebalance_every] != 0
+    events = np.flatnonzero(changed.any(axis=1))
+
+    shares = np.array([portfolio.positions.get(symbol, 0) for symbol in symbols], dtype=np.float64)
+    targets = carried.get("targets", shares).copy()
+    unfilled = carried.get("unfilled", np.zeros(n, dtype=bool))
+    first = 0 if unfilled.any() else events[0] if len(events) else bars
+    if first:
+        _record_segment(portfolio, marks[:first], shares)
+
+    # Volume-capped remainders are retried on the next bars if the model resubmits them.
+    execution = portfolio.execution
+    carry_over = bar_volumes is not None and execution.max_participation is not None and execution.resubmit_unfilled
+    t = first
+    while t < bars:
+        row = marks[t]
+        cols = np.flatnonzero(changed[t])
+        # Only held or traded symbols need their mark refreshed before filling.
+        for j in np.flatnonzero(tradable[t] & ((shares != 0) | changed[t] | unfilled)):
+            portfolio.mark_price(symbols[j], row[j])
+        equity = portfolio.cash + row @ shares
+        targets[~unfilled] = shares[~unfilled]
+        prices_now = np.where(row[cols] > 0, row[cols], np.inf)
+        targets[cols] = np.floor(weights[t, cols] * equity / prices_now / lot_size) * lot_size
+        before = shares.copy()
+        _rebalance(portfolio, symbols, row, None if bar_volumes is None else bar_volumes[t],
+                   shares, targets, lot_size)
+
+        if carry_over:
+            # Retry only what the volume cap held back; cash-limited buys are not chased.
+            requested = np.abs(targets - before)
+            capped = execution.max_participation * bar_volumes[t] < requested
+            unfilled = capped & (np.abs(targets - shares) >= lot_size)
+        if unfilled.any():
+            next_t = t + 1
+        else:
+            next_t = events[np.searchsorted(events, t, side="right")] if len(events) and t < events[-1] else bars
+        segment = marks[t:next_t]
+        _record_segment(portfolio, segment, shares)
+        t = next_t
+
+    if bars:
+        for j in np.flatnonzero(tradable[-1]):
+            portfolio.mark_price(symbols[j], marks[-1, j])
+        if carry is not None:
+            carry.update(weights=weights[-1], targets=targets, unfilled=unfilled, bars=carried.get("bars", 0) + bars)
+    return portfolio
@@ -1,135 +1,150 @@
 # C:\real-world-main\src\backtesting_engine\portfolio.py
+from .execution import BUY, SELL, ExecutionModel
+from .ledger import QTY_EPSILON, PositionLedger
+from .trade_store import Action, EquityCurve, TradeLog
 
 class Portfolio:
-    def __init__(self, initial_capital: float):
+    def __init__(self, initial_capital: float, cost_method: str = "fifo", execution: ExecutionModel = None):
+        """
+        :param cost_method: Lot matching for PnL: "fifo", "lifo" or "average".
+        :param execution: Fill model for fees, slippage and partial fills; default fills
+            the whole order at the given price for free.
+        """
         self.initial_capital = initial_capital
         self.cash = initial_capital
         self.positions = {}  # symbol -> quantity
-        self.trade_log = []
-        self.net_worth_history = []
+        self.trade_log = TradeLog()
+        self.net_worth_history = EquityCurve()
         self.current_position = {}  # symbol -> "long" or "short" or None
-
-    def buy(self, symbol: str, price: float, qty: int):
-        cost = price * qty
+        self.ledger = PositionLedger(cost_method)
+        self.execution = execution or ExecutionModel()
+        self.fees_paid = 0.0
+
+        # Last marked price per symbol and the running net and gross market
+        # value of all positions at those marks, kept current on every fill and mark.
+        self.marks = {}
+        self.market_value = 0.0
+        self.gross_exposure = 0.0
+
+    def _change_position(self, symbol: str, delta: float):
+        held = self.positions.get(symbol, 0)
+        mark = self.marks.get(symbol, 0.0)
+        new_qty = held + delta
+        if abs(new_qty) <= QTY_EPSILON:
+            new_qty = 0
+        self.positions[symbol] = new_qty
+        self.market_value += (new_qty - held) * mark
+        self.gross_exposure += (abs(new_qty) - abs(held)) * mark
+
+    def _fill(self, action: Action, symbol: str, price: float, qty: float, delta: float, fee: float = 0.0):
+        """Book a fill that changes the position by delta in the ledger and the trade log."""
+        closes = self.positions.get(symbol, 0) * delta < 0
+        self._change_position(symbol, delta)
+        realized = self.ledger.record(symbol, delta, price)
+        self.cash -= fee
+        self.fees_paid += fee
+        self.trade_log.record(action, symbol, price, qty, realized if closes else float("nan"), fee)
+
+    def buy(self, symbol: str, price: float, qty: int, volume: float = None):
+        """:param volume: Bar volume, used by the execution model for impact and partial fills."""
+        qty, price, fee = self.execution.fill(BUY, price, qty, volume)
+        if qty <= 0:
+            return
+        cost = price * qty + fee
         if self.cash >= cost:
-            self.cash -= cost
+            self.cash -= price * qty
             self.current_position[symbol] = "long"
-            self.positions[symbol] = self.positions.get(symbol, 0) + qty
-            self.trade_log.append({
-                "action": "BUY",
-                "symbol": symbol,
-                "price": price,
-                "qty": qty
-            })
+            self._fill(Action.BUY, symbol, price, qty, qty, fee)
         else:
             print(f"[WARN] Not enough cash to buy {qty} of {symbol} at {price:.2f} | Available: {self.cash:.2f}")
 
-    def sell(self, symbol: str, price: float, qty: int):
+    def sell(self, symbol: str, price: float, qty: int, volume: float = None):
         held_qty = self.positions.get(symbol, 0)
 
         if held_qty > 0:
             # Selling from a long position
-            if held_qty >= qty:
-                self.positions[symbol] -= qty
-            else:
+            if held_qty < qty:
                 qty = held_qty
-                self.positions[symbol] = 0
                 print(f"[WARN] Partial sell: Only had {held_qty} of {symbol}, sold all.")
-            
+            qty, price, fee = self.execution.fill(SELL, price, qty, volume)
+            if qty <= 0:
+                return
+            self._fill(Action.SELL, symbol, price, qty, -qty, fee)
+
             self.cash += price * qty
             if self.positions[symbol] == 0:
                 self.current_position[symbol] = None
-            self.trade_log.append({
-                "action": "SELL",
-                "symbol": symbol,
-                "price": price,
-                "qty": qty,
-                "note": "long position"
-            })
 
         elif held_qty < 0:
              # Covering a short position
-            cover_qty = min(abs(held_qty), qty)
-            self.positions[symbol] += cover_qty
+            cover_qty, price, fee = self.execution.fill(BUY, price, min(abs(held_qty), qty), volume)
+            if cover_qty <= 0:
+                return
+            self._fill(Action.BUY_TO_COVER, symbol, price, cover_qty, cover_qty, fee)
             self.cash -= price * cover_qty
             if self.positions[symbol] == 0:
                 self.current_position[symbol] = None
 
-            
-            self.trade_log.append({
-                "action": "BUY_TO_COVER",
-                "symbol": symbol,
-                "price": price,
-                "qty": cover_qty,
-                "note": "short position"
-            })
-
         else:
             print(f"[WARN] No position to sell for {symbol}")
 
 
-    def short(self, symbol: str, price: float, qty: int):
+    def short(self, symbol: str, price: float, qty: int, volume: float = None):
         # Borrow asset and sell at current price (cash increases)
+        qty, price, fee = self.execution.fill(SELL, price, qty, volume)
+        if qty <= 0:
+            return
         self.cash += price * qty
-        self.positions[symbol] = self.positions.get(symbol, 0) - qty  # negative = short
+        self._fill(Action.SHORT, symbol, price, qty, -qty, fee)  # negative = short
         self.current_position[symbol] = "short"
-        self.trade_log.append({
-              "action": "SHORT",
-              "symbol": symbol,
-              "price": price,
-              "qty": qty
-        })
 
-    def update_net_worth(self, current_prices: dict):
+    def book_fill(self, action: Action, symbol: str, qty: float, price: float, fee: float = 0.0):
         """
-        Handles both single float (for single symbol) or dict of symbol -> price
+        Book an order the caller already priced with the execution model, e.g. a batch
+        from fill_many(). Unlike buy()/sell() it makes no cash or position checks.
         """
-        net_worth = self.cash
-
-        for symbol, qty in self.positions.items():
-            if isinstance(current_prices, dict):
-                symbol_price = current_prices.get(symbol, 0.0)
-            else:
-                symbol_price = current_prices  # fallback if it's accidentally still passed as float
+        delta = qty if action in (Action.BUY, Action.BUY_TO_COVER) else -qty
+        self.cash -= delta * price
+        self._fill(action, symbol, price, qty, delta, fee)
+        held = self.positions[symbol]
+        self.current_position[symbol] = "long" if held > 0 else "short" if held < 0 else None
+
+    def mark_price(self, symbol: str, price: float):
+        """Update one symbol's mark; O(1) regardless of how many positions are held."""
+        qty = self.positions.get(symbol, 0)
+        if qty:
+            move = price - self.marks.get(symbol, 0.0)
+            self.market_value += qty * move
+            self.gross_exposure += abs(qty) * move
+        self.marks[symbol] = price
+
+    def mark_to_market(self, symbol: str, price: float):
+        """Mark one symbol and append the resulting net worth (the per-bar fast path)."""
+        self.mark_price(symbol, price)
+        self.net_worth_history.append(self.cash + self.market_value, self.gross_exposure)
 
-            net_worth += qty * symbol_price  # Applies same price to all holdings
+    def update_net_worth(self, current_prices: dict):
+        """
+        Handles both single float (for single symbol) or dict of symbol -> price.
+        Symbols missing from the dict keep their last mark.
+        """
+        if isinstance(current_prices, dict):
+            for symbol, price in current_prices.items():
+                self.mark_price(symbol, price)
+        else:
+            # fallback if it's accidentally still passed as float: same price for all holdings
+            for symbol in self.positions:
+                self.mark_price(symbol, current_prices)
 
-        self.net_worth_history.append(net_worth)
+        self.net_worth_history.append(self.cash + self.market_value, self.gross_exposure)
 
     def calculate_pnl(self, current_prices: dict):
-        realized_pnl = 0
-        unrealized_pnl = 0
-
-        for trade in self.trade_log:
-            if trade["action"] in ["SELL", "BUY_TO_COVER"]:
-                # Closing trade, calculate realized P&L
-                symbol = trade["symbol"]
-                qty = trade["qty"]
-                price = trade["price"]
-
-                # Find corresponding opening trade
-                open_trades = [t for t in self.trade_log if t["symbol"] == symbol and
-                            ((t["action"] == "BUY" and trade["action"] == "SELL") or
-                                (t["action"] == "SHORT" and trade["action"] == "BUY_TO_COVER"))]
-
-                if open_trades:
-                    entry_price = open_trades[-1]["price"]
-                    direction = 1 if trade["action"] == "SELL" else -1
-                    realized_pnl += direction * qty * (price - entry_price)
-
-        for symbol, qty in self.positions.items():
-            if symbol in current_prices:
-                current_price = current_prices[symbol]
-                if qty > 0:
-                    buy_trades = [t for t in self.trade_log if t["symbol"] == symbol and t["action"] == "BUY"]
-                    if buy_trades:
-                        entry_price = buy_trades[-1]["price"]
-                        unrealized_pnl += qty * (current_price - entry_price)
-                elif qty < 0:
-                    short_trades = [t for t in self.trade_log if t["symbol"] == symbol and t["action"] == "SHORT"]
-                    if short_trades:
-                        entry_price = short_trades[-1]["price"]
-                        unrealized_pnl += abs(qty) * (entry_price - current_price)
+        """
+        Realized PnL is accumulated by the ledger on every fill; unrealized PnL
+        marks the open lots of symbols present in current_prices.
+        """
+        realized_pnl = self.ledger.realized_pnl
+        unrealized_pnl = self.ledger.unrealized_pnl(current_prices)
 
         return {
             "realized_pnl": realized_pnl,
@@ -141,4 +156,4 @@ class Portfolio:
     def get_final_net_worth(self):
         if not self.net_worth_history:
             return self.initial_capital
-        return self.net_worth_history[-1]
\ No newline at end of file
+        return self.net_worth_history[-1]
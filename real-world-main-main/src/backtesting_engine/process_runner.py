@@ -0,0 +1,354 @@
+# src/backtesting_engine/process_runner.py
+
+import importlib
+import multiprocessing as mp
+import os
+import struct
+import threading
+import time
+from datetime import datetime
+from multiprocessing import shared_memory
+
+from .real_time_runner import RealTimeTrader, SymbolShard, decide_action
+from .strategies.base import Strategy, create_strategy
+
+# Ring layout: producer head and consumer tail on separate cache lines,
+# followed by fixed-size tick slots (symbol id, price, monotonic ns stamp)
+# and one position side byte per symbol id.
+# The consumer's line also counts the action batches it has sent back, and
+# the line after it the batches the accounting process has applied.
+_HEAD_OFFSET = 0
+_TAIL_OFFSET = 64
+_SENT_OFFSET = 72
+_APPLIED_OFFSET = 128
+_SLOTS_OFFSET = 192
+_COUNTER = struct.Struct("<q")
+_SLOT = struct.Struct("<qdq")
+_SIDES = (None, "long", "short")
+MAX_SYMBOLS = 4096
+
+
+class TickRing:
+    """
+    Single-producer/single-consumer tick queue in shared memory.
+    The producer only writes the head and the consumer only writes the tail,
+    so no cross-process lock is needed.
+    """
+
+    def __init__(self, capacity: int = 65536, name: str = None):
+        self.capacity = capacity
+        self._sides_offset = _SLOTS_OFFSET + capacity * _SLOT.size
+        size = self._sides_offset + MAX_SYMBOLS
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.shm.buf[:_SLOTS_OFFSET] = bytes(_SLOTS_OFFSET)
+            self.shm.buf[self._sides_offset:size] = bytes(MAX_SYMBOLS)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.buf = self.shm.buf
+
+    def _head(self):
+        return _COUNTER.unpack_from(self.buf, _HEAD_OFFSET)[0]
+
+    def _tail(self):
+        return _COUNTER.unpack_from(self.buf, _TAIL_OFFSET)[0]
+
+    def __len__(self):
+        return self._head() - self._tail()
+
+    def sent(self) -> int:
+        """Action batches the consumer has put on its results queue."""
+        return _COUNTER.unpack_from(self.buf, _SENT_OFFSET)[0]
+
+    def mark_sent(self):
+        _COUNTER.pack_into(self.buf, _SENT_OFFSET, self.sent() + 1)
+
+    def applied(self) -> int:
+        """Action batches the accounting process has applied to the account."""
+        return _COUNTER.unpack_from(self.buf, _APPLIED_OFFSET)[0]
+
+    def mark_applied(self):
+        _COUNTER.pack_into(self.buf, _APPLIED_OFFSET, self.applied() + 1)
+
+    def side(self, symbol_id: int):
+        """Side of the account's position in symbol_id ("long", "short" or None)."""
+        return _SIDES[self.buf[self._sides_offset + symbol_id]]
+
+    def set_side(self, symbol_id: int, side):
+        self.buf[self._sides_offset + symbol_id] = _SIDES.index(side)
+
+    def put(self, symbol_id: int, price: float, ts_ns: int) -> bool:
+        """Append a tick. Returns False if the ring is full."""
+        head = self._head()
+        if head - self._tail() >= self.capacity:
+            return False
+        _SLOT.pack_into(self.buf, _SLOTS_OFFSET + (head % self.capacity) * _SLOT.size, symbol_id, price, ts_ns)
+        # Publish the slot only after it is written.
+        _COUNTER.pack_into(self.buf, _HEAD_OFFSET, head + 1)
+        return True
+
+    def peek_batch(self, max_items: int = 1024) -> list:
+        """Read up to max_items pending ticks without consuming them."""
+        tail = self._tail()
+        count = min(self._head() - tail, max_items)
+        return [
+            _SLOT.unpack_from(self.buf, _SLOTS_OFFSET + ((tail + i) % self.capacity) * _SLOT.size)
+            for i in range(count)
+        ]
+
+    def advance(self, count: int):
+        """Mark count ticks as processed, freeing their slots for the producer."""
+        _COUNTER.pack_into(self.buf, _TAIL_OFFSET, self._tail() + count)
+
+    def close(self, unlink: bool = False):
+        self.buf = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def _strategy_worker(worker, ring_name, capacity, results, stop_event, params):
+    """
+    Worker process main loop: evaluate the strategy for its symbols and send
+    throttled actions back to the accounting process in batches.
+    """
+    ring = TickRing(capacity, name=ring_name)
+    # Importing the strategy's module registers a plugin in this process too.
+    importlib.import_module(params["strategy_module"])
+    strategy = create_strategy(params["strategy"], **params["strategy_params"])
+    shards = {}
+    # Symbols with an action the accounting process has not applied yet. A fill
+    # can be partial or empty, so their position side is only known once it has.
+    in_flight = set()
+
+    def send(actions):
+        results.put((worker, actions))
+        # Counted before the ticks are released, so an empty ring means
+        # sent() covers every batch the collector still has to apply.
+        ring.mark_sent()
+
+    try:
+        while True:
+            batch = ring.peek_batch()
+            if not batch:
+                if stop_event.is_set():
+                    break
+                time.sleep(0.0002)
+                continue
+
+            actions = []
+            now = time.time()
+            for symbol_id, price, ts_ns in batch:
+                shard = shards.get(symbol_id)
+                if shard is None:
+                    shard = shards[symbol_id] = SymbolShard(params["max_ticks"], strategy.clone(str(symbol_id)))
+                shard.ticks.append({"price": price})
+
+                if symbol_id in in_flight:
+                    if actions:
+                        send(actions)
+                        actions = []
+                    while ring.applied() < ring.sent():
+                        time.sleep(0.00005)
+                    in_flight.clear()
+                action = decide_action(shard, price, ring.side(symbol_id), now, params["cooldown_seconds"],
+                                       params["min_price_change"], params["min_ticks"], shard.strategy)
+                if action:
+                    actions.append((symbol_id, price, action, ts_ns))
+                    in_flight.add(symbol_id)
+
+            if actions:
+                send(actions)
+            ring.advance(len(batch))
+    finally:
+        results.put(None)
+        ring.close()
+
+
+class ProcessShardedTrader(RealTimeTrader):
+    """
+    RealTimeTrader that shards symbols across strategy worker processes.
+
+    Ticks are written to one shared-memory TickRing per worker. Workers run the
+    strategy and return actions, which this process applies to the single
+    account, so cash and positions are reconciled in one place. After each
+    action the side of the position actually held is written back to the
+    symbol's ring, which is what the worker's strategy sees next.
+    """
+
+    def __init__(self, capital, runtime, workers: int = None, ring_capacity: int = 65536, execution=None,
+                 strategy=None):
+        """
+        :param strategy: A registered strategy name or a Strategy instance; each worker builds
+            its own with create_strategy from the name and parameters. "mean_reversion" by default.
+        """
+        super().__init__(capital, runtime, execution=execution, strategy=strategy)
+        if not isinstance(self.strategy, Strategy) or self.strategy.name is None:
+            raise TypeError("ProcessShardedTrader needs a registered strategy name or Strategy instance")
+        self.worker_count = workers or os.cpu_count() or 1
+        self.ring_capacity = ring_capacity
+        self._symbol_ids = {}
+        self._symbol_names = []
+        self._rings = []
+        self._ring_locks = []
+        self._processes = []
+        self._results = None
+        self._stop_event = None
+        self._collector = None
+        # Guards starting and stopping the workers against feed threads taking the rings.
+        self._workers_lock = threading.RLock()
+        self.dropped_ticks = 0
+
+    def start(self):
+        with self._workers_lock:
+            if not self._processes:
+                self._start_workers()
+
+    def _start_workers(self):
+        ctx = mp.get_context()
+        self._results = ctx.Queue()
+        self._stop_event = ctx.Event()
+        params = {
+            "max_ticks": self.max_ticks,
+            "min_ticks": self.min_ticks,
+            "cooldown_seconds": self.cooldown_seconds,
+            "min_price_change": self.min_price_change,
+            "strategy": self.strategy.name,
+            "strategy_params": self.strategy.params,
+            "strategy_module": type(self.strategy).__module__,
+        }
+
+        for worker in range(self.worker_count):
+            ring = TickRing(self.ring_capacity)
+            process = ctx.Process(
+                target=_strategy_worker,
+                args=(worker, ring.name, self.ring_capacity, self._results, self._stop_event, params),
+                daemon=True
+            )
+            process.start()
+            self._rings.append(ring)
+            self._ring_locks.append(threading.Lock())
+            self._processes.append(process)
+
+        self._collector = threading.Thread(target=self._collect_actions,
+                                           args=(self._results, list(self._rings), self.worker_count), daemon=True)
+        self._collector.start()
+
+    def _symbol_id(self, symbol):
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            with self._shards_lock:
+                symbol_id = self._symbol_ids.get(symbol)
+                if symbol_id is None:
+                    symbol_id = len(self._symbol_names)
+                    if symbol_id >= MAX_SYMBOLS:
+                        raise ValueError(f"ProcessShardedTrader supports at most {MAX_SYMBOLS} symbols")
+                    self._symbol_names.append(symbol)
+                    self._symbol_ids[symbol] = symbol_id
+        return symbol_id
+
+    def on_price_update(self, symbol, price, recv_ns=None, block: bool = True):
+        if not self.is_active:
+            return
+        # stop() and reset() may run on another thread; work on this generation of rings.
+        with self._workers_lock:
+            if not self.is_active:
+                return
+            if not self._processes:
+                self._start_workers()
+            rings, ring_locks, stop_event = self._rings, self._ring_locks, self._stop_event
+        # The receive stamp travels through the ring so tick_to_trade spans processes.
+        ts_ns = recv_ns or time.monotonic_ns()
+
+        price = float(price)
+        symbol_id = self._symbol_id(symbol)
+        self._latest_prices[symbol] = price
+
+        # Symbols are assigned round-robin in order of first appearance.
+        worker = symbol_id % self.worker_count
+        ring = rings[worker]
+        # Several feed threads may share a ring; the lock keeps it single-producer,
+        # and stop() takes it before closing the ring.
+        with ring_locks[worker]:
+            if ring.buf is None:
+                return  # stopped since the rings were taken
+            while not ring.put(symbol_id, price, ts_ns):
+                if not block or stop_event.is_set():
+                    self.dropped_ticks += 1
+                    break
+                time.sleep(0.0001)
+
+            if self._pending_orders.get(symbol):
+                self._fill_due_orders(symbol, price, time.monotonic_ns())
+                ring.set_side(symbol_id, self.get_current_position(symbol))
+        self._record_portfolio_value(datetime.utcnow().isoformat(), time.time())
+
+    def _collect_actions(self, results, rings, workers):
+        finished = 0
+        while finished < workers:
+            message = results.get()
+            if message is None:
+                finished += 1
+                continue
+            worker, actions = message
+            ring = rings[worker]
+            try:
+                for symbol_id, price, action, ts_ns in actions:
+                    symbol = self._symbol_names[symbol_id]
+                    self.apply_action(symbol, price, action)
+                    ring.set_side(symbol_id, self.get_current_position(symbol))
+                    # Only this thread records in process mode.
+                    if self.latency.enabled:
+                        self.latency.record("tick_to_trade", symbol, time.monotonic_ns() - ts_ns)
+            finally:
+                # Always acknowledged: the worker waits on it before deciding these symbols again.
+                ring.mark_applied()
+
+    def pending_ticks(self):
+        return sum(len(ring) for ring in self._rings)
+
+    def wait_idle(self, timeout: float = None):
+        """Block until workers have processed every tick written so far and their actions are applied."""
+        deadline = None if timeout is None else time.time() + timeout
+        while self.pending_ticks() or any(ring.applied() < ring.sent() for ring in self._rings):
+            if deadline is not None and time.time() > deadline:
+                return False
+            time.sleep(0.001)
+        return True
+
+    def stop(self):
+        with self._workers_lock:
+            super().stop()
+            if not self._processes:
+                return
+            self._stop_event.set()
+            for process in self._processes:
+                process.join()
+            self._collector.join()
+            for ring, lock in zip(self._rings, self._ring_locks):
+                with lock:  # no feed thread is writing to it
+                    ring.close(unlink=True)
+            self._processes = []
+            self._rings = []
+            self._ring_locks = []
+
+    def reset(self):
+        # The workers' tick windows and the rings' position sides describe the old
+        # account, so they are stopped with their rings and restarted on the next tick.
+        self.stop()
+        super().reset()
+        self.dropped_ticks = 0
+
+    def _collect_metrics(self):
+        families = super()._collect_metrics()
+        trader = {"trader": self.metrics_id}
+        families.append(("trader_worker_queue_depth", "gauge", "Ticks waiting in each worker's shared-memory ring",
+                         [(dict(trader, worker=str(i)), len(ring)) for i, ring in enumerate(list(self._rings))]))
+        families.append(("trader_dropped_ticks_total", "counter", "Ticks dropped because a worker ring was full",
+                         [(trader, self.dropped_ticks)]))
+        return families
+
+    def get_price_data(self):
+        # Tick windows live in the workers; only latest prices are kept here.
+        return {symbol: [{"price": price}] for symbol, price in self._latest_prices.items()}
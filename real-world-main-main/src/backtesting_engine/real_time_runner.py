@@ -1,163 +1,408 @@
 # src/backtesting_engine/real_time_runner.py
 
+import heapq
+import itertools
 import time
 import threading
-import csv
+from collections import deque, namedtuple
 from datetime import datetime
-from collections import defaultdict
+from types import MappingProxyType
+from price_engine.latency import LatencyTracker
+from price_engine.telemetry import REGISTRY
+from .execution import BUY, SELL, ExecutionModel
+from .ledger import QTY_EPSILON
+from .strategies.base import Strategy, create_strategy
 from .strategies.strategy_mean_reversion import strategy_mean_reversion
 
+# Immutable view of the shared account. A new one is published on every
+# cash/position change so readers never need the account lock.
+AccountSnapshot = namedtuple("AccountSnapshot", ["cash_balance", "positions"])
+
+_EMPTY_POSITIONS = MappingProxyType({})
+
+
+class SymbolShard:
+    """Per-symbol tick window, strategy and log throttling state, guarded by its own lock."""
+
+    __slots__ = ("lock", "ticks", "strategy", "tick_count", "action_count",
+                 "last_logged_action", "last_logged_price", "last_log_time")
+
+    def __init__(self, max_ticks, strategy=strategy_mean_reversion):
+        self.lock = threading.Lock()
+        self.strategy = strategy
+        self.ticks = deque(maxlen=max_ticks)
+        self.tick_count = 0
+        self.action_count = 0
+        self.last_logged_action = None
+        self.last_logged_price = None
+        self.last_log_time = 0
+
+
+def decide_action(shard, price, position, now, cooldown_seconds, min_price_change, min_ticks,
+                  strategy=strategy_mean_reversion):
+    """
+    Run the strategy on a shard's tick window and apply log throttling.
+    Returns the action to execute, or None. Shared by the in-process trader
+    and the strategy worker processes.
+    """
+    if len(shard.ticks) < min_ticks:
+        return None
+
+    action = strategy(shard.ticks, position)
+    if not action:
+        return None
+
+    is_significant_price_move = abs(price - (shard.last_logged_price or 0)) >= min_price_change
+    is_new_action = action != shard.last_logged_action
+    is_cooldown_complete = (now - shard.last_log_time) >= cooldown_seconds
+    if not (is_new_action or is_significant_price_move or is_cooldown_complete):
+        return None
+
+    shard.last_logged_action = action
+    shard.last_logged_price = price
+    shard.last_log_time = now
+    return action
+
+
 class RealTimeTrader:
-    def __init__(self, capital, runtime):
+    max_ticks = 1000
+    min_ticks = 20  # the mean reversion indicator needs a full window
+
+    # Latency stages, all measured from the tick's monotonic receive stamp (recv_ns)
+    # or from the previous stage:
+    #   decode        recv_ns -> on_price_update entry (JSON decode, callback dispatch)
+    #   lock_wait     entry -> symbol shard lock acquired
+    #   strategy      strategy evaluation and throttling
+    #   order         enter_position / exit_position
+    #   tick_to_decision, tick_to_trade   end-to-end from recv_ns
+    LATENCY_STAGES = ("decode", "lock_wait", "strategy", "order", "tick_to_decision", "tick_to_trade")
+
+    def __init__(self, capital, runtime, track_latency=True, execution: ExecutionModel = None, books=None,
+                 strategy=None, pnl_interval: float = 0.0):
+        """
+        :param execution: Fill model for fees and slippage; with latency_ms set, orders
+            fill at the first tick of their symbol after the delay.
+        :param books: Optional symbol -> OrderBook mapping (e.g. BinanceDepthClient.books);
+            orders in a symbol with a synced book fill against its levels.
+        :param strategy: A Strategy (cloned per symbol, so per-symbol state stays separate),
+            a registered strategy name, or a plain strategy(data_window, current_position)
+            function; "mean_reversion" by default.
+        :param pnl_interval: Minimum seconds between PnL timeline points (0 records every tick).
+        """
+        if strategy is None or isinstance(strategy, str):
+            strategy = create_strategy(strategy or "mean_reversion")
+        self.strategy = strategy
+        self.pnl_interval = pnl_interval
+        self._last_pnl_time = 0.0
         self.runtime = runtime
         self.initial_capital = capital
-        self.cash_balance = capital
-        self.positions = {}
-        self.data = defaultdict(list)
         self.logs = []
         self.pnl_timeline = []
         self.start_time = time.time()
+
+        # Account lock: only held while cash and positions change.
         self.lock = threading.Lock()
+        self._account = AccountSnapshot(capital, _EMPTY_POSITIONS)
 
-        self.last_logged_action = defaultdict(lambda: None)
-        self.last_logged_price = defaultdict(lambda: None)
-        self.last_log_time = defaultdict(lambda: 0)
+        self._shards = {}
+        self._shards_lock = threading.Lock()
+        self._latest_prices = {}
 
         self.cooldown_seconds = 1
         self.min_price_change = 0.05
         self.is_active = True
-
-    def on_price_update(self, symbol, price):
+        self.latency = LatencyTracker(enabled=track_latency)
+
+        self.execution = execution or ExecutionModel()
+        self.books = books if books is not None else {}
+        self.fees_paid = 0.0
+        # Orders waiting out the simulated latency: symbol -> heap of (due_ns, seq, action).
+        # Each symbol's orders fill at that symbol's own ticks.
+        self._pending_orders = {}
+        self._orders_lock = threading.Lock()
+        self._order_seq = itertools.count()
+
+        self.metrics_id = REGISTRY.next_instance_id()
+        REGISTRY.add_collector(self._collect_metrics)
+
+    # --- Published state (lock-free reads) ---
+
+    @property
+    def cash_balance(self):
+        return self._account.cash_balance
+
+    @property
+    def positions(self):
+        return self._account.positions
+
+    def _publish_account(self, cash_balance, positions):
+        self._account = AccountSnapshot(cash_balance, MappingProxyType(positions))
+
+    def _get_shard(self, symbol):
+        shard = self._shards.get(symbol)
+        if shard is None:
+            with self._shards_lock:
+                shard = self._shards.get(symbol)
+                if shard is None:
+                    strategy = self.strategy
+                    if isinstance(strategy, Strategy):
+                        strategy = strategy.clone(symbol)
+                    shard = SymbolShard(self.max_ticks, strategy)
+                    self._shards[symbol] = shard
+        return shard
+
+    # --- Tick processing ---
+
+    def on_price_update(self, symbol, price, recv_ns=None, timestamp=None):
+        """
+        :param timestamp: ISO receive time; a fan-out feeding many traders formats it once per tick.
+        """
         if not self.is_active:
             return
 
-        with self.lock:
-            price = float(price)
+        entry_ns = time.monotonic_ns()
+        if recv_ns is None:
+            recv_ns = entry_ns
+        price = float(price)
+        if timestamp is None:
             timestamp = datetime.utcnow().isoformat()
+        shard = self._get_shard(symbol)
 
-            self.data[symbol].append({
+        # Ticks for the same symbol are serialized; different symbols run in parallel.
+        with shard.lock:
+            locked_ns = time.monotonic_ns()
+            shard.ticks.append({
                 "timestamp": timestamp,
                 "price": price
             })
+            self._latest_prices[symbol] = price
+            shard.tick_count += 1
 
-            if len(self.data[symbol]) > 1000:
-                self.data[symbol] = self.data[symbol][-1000:]
-
-            action = strategy_mean_reversion(self.data[symbol], self.get_current_position(symbol))
             now = time.time()
-
-            last_action = self.last_logged_action[symbol]
-            last_price = self.last_logged_price[symbol]
-            last_time = self.last_log_time[symbol]
-
-            is_significant_price_move = abs(price - (last_price or 0)) >= self.min_price_change
-            is_new_action = action != last_action
-            is_cooldown_complete = (now - last_time) >= self.cooldown_seconds
-
-            if is_new_action or is_significant_price_move or is_cooldown_complete:
-                log_line = f"[{datetime.utcnow().strftime('%H:%M:%S')}] {symbol}: {price:.2f} ➤ Action: {action.upper()}"
-                self.logs.append(log_line)
-
-                if action == "buy":
-                    self.enter_position(symbol, "long", price)
-                elif action == "sell":
-                    self.exit_position(symbol, price)
-
-                self.last_logged_action[symbol] = action
-                self.last_logged_price[symbol] = price
-                self.last_log_time[symbol] = now
-
+            action = decide_action(shard, price, self.get_current_position(symbol), now,
+                                   self.cooldown_seconds, self.min_price_change, self.min_ticks, shard.strategy)
+            decided_ns = time.monotonic_ns()
+            if action:
+                shard.action_count += 1
+                self.apply_action(symbol, price, action)
+
+            # Recorded under the shard lock, which serializes this symbol's histograms.
+            latency = self.latency
+            if latency.enabled:
+                latency.record("decode", symbol, entry_ns - recv_ns)
+                latency.record("lock_wait", symbol, locked_ns - entry_ns)
+                latency.record("strategy", symbol, decided_ns - locked_ns)
+                latency.record("tick_to_decision", symbol, decided_ns - recv_ns)
+                if action:
+                    traded_ns = time.monotonic_ns()
+                    latency.record("order", symbol, traded_ns - decided_ns)
+                    latency.record("tick_to_trade", symbol, traded_ns - recv_ns)
+
+        if self._pending_orders.get(symbol):
+            self._fill_due_orders(symbol, price, time.monotonic_ns())
+        self._record_portfolio_value(timestamp, now)
+
+    def apply_action(self, symbol, price, action):
+        """Log a throttled strategy action and update the account accordingly."""
+        log_line = f"[{datetime.utcnow().strftime('%H:%M:%S')}] {symbol}: {price:.2f} ➤ Action: {action.upper()}"
+        self.logs.append(log_line)
+
+        if self.execution.latency_ms:
+            due_ns = time.monotonic_ns() + int(self.execution.latency_ms * 1e6)
+            with self._orders_lock:
+                heapq.heappush(self._pending_orders.setdefault(symbol, []), (due_ns, next(self._order_seq), action))
+        else:
+            self._execute_action(symbol, price, action)
+
+    def _execute_action(self, symbol, price, action):
+        if action == "buy":
+            self.enter_position(symbol, "long", price)
+        elif action == "sell":
+            self.exit_position(symbol, price)
+
+    def _fill_due_orders(self, symbol, price, now_ns):
+        """Fill symbol's delayed orders whose latency has elapsed at this tick's price."""
+        due = []
+        with self._orders_lock:
+            orders = self._pending_orders.get(symbol)
+            while orders and orders[0][0] <= now_ns:
+                due.append(heapq.heappop(orders))
+        for _, _, action in due:
+            self._execute_action(symbol, price, action)
+
+    def pending_orders(self):
+        with self._orders_lock:
+            return sum(len(orders) for orders in self._pending_orders.values())
+
+    def _record_portfolio_value(self, timestamp, now):
+        if not self.pnl_interval or now - self._last_pnl_time >= self.pnl_interval:
+            self._last_pnl_time = now
+            account = self._account
             self.pnl_timeline.append({
                 "timestamp": timestamp,
-                "portfolio_value": self.cash_balance + self.calculate_unrealized_pnl()
+                "portfolio_value": account.cash_balance + self._unrealized_pnl(account.positions)
             })
 
-            if now - self.start_time > self.runtime:
-                self.is_active = False
+        if now - self.start_time > self.runtime:
+            self.is_active = False
 
     def get_current_position(self, symbol):
-        return self.positions[symbol]["side"] if symbol in self.positions else None
+        position = self._account.positions.get(symbol)
+        return position["side"] if position else None
+
+    def _fill(self, symbol, side, price, qty):
+        book = self.books.get(symbol)
+        if book is not None and book.synced:
+            return self.execution.fill_from_book(side, qty, book)
+        return self.execution.fill(side, price, qty)
+
+    def get_top_of_book(self, symbol):
+        """TopOfBook (bid, ask, sizes, microprice) for symbol, or None without a synced book."""
+        book = self.books.get(symbol)
+        return book.top() if book is not None and book.synced else None
 
     def enter_position(self, symbol, side, price):
-        if symbol in self.positions:
-            return
+        with self.lock:
+            account = self._account
+            if symbol in account.positions:
+                return
+
+            allocation = 0.1 * account.cash_balance
+            size, fill_price, fee = self._fill(symbol, BUY if side == "long" else SELL, price, allocation / price)
+            if size <= 0:
+                return
+
+            positions = dict(account.positions)
+            positions[symbol] = {
+                "side": side,
+                "size": size,
+                "entry_price": fill_price
+            }
+            self.fees_paid += fee
+            self._publish_account(account.cash_balance - size * fill_price - fee, positions)
 
-        allocation = 0.1 * self.cash_balance
-        size = allocation / price
+    def exit_position(self, symbol, price):
+        with self.lock:
+            account = self._account
+            if symbol not in account.positions:
+                return
 
-        self.positions[symbol] = {
-            "side": side,
-            "size": size,
-            "entry_price": price
-        }
+            positions = dict(account.positions)
+            position = positions.pop(symbol)
+            side = SELL if position["side"] == "long" else BUY
+            size, fill_price, fee = self._fill(symbol, side, price, position["size"])
+            if size <= 0:
+                return
+            if position["size"] - size > QTY_EPSILON:
+                positions[symbol] = dict(position, size=position["size"] - size)
+            pnl = 0
 
-        self.cash_balance -= allocation
+            if position["side"] == "long":
+                pnl = (fill_price - position["entry_price"]) * size
 
-    def exit_position(self, symbol, price):
-        if symbol not in self.positions:
-            return
+            self.fees_paid += fee
+            self._publish_account(account.cash_balance + (size * fill_price) + pnl - fee, positions)
 
-        position = self.positions[symbol]
-        pnl = 0
+    def stop(self):
+        self.is_active = False
 
-        if position["side"] == "long":
-            pnl = (price - position["entry_price"]) * position["size"]
+    # --- Readers ---
 
-        self.cash_balance += (position["size"] * price) + pnl
-        del self.positions[symbol]
-    
     def get_trade_count(self):
-        return len([log for log in self.logs if "Action" in log])
+        return len([log for log in self.get_logs() if "Action" in log])
 
-    def calculate_unrealized_pnl(self):
+    def _unrealized_pnl(self, positions):
         total = 0
-        for symbol, position in self.positions.items():
-            if self.data[symbol]:
-                latest_price = self.data[symbol][-1]['price']
-                if position["side"] == "long":
-                    total += (latest_price - position["entry_price"]) * position["size"]
+        for symbol, position in positions.items():
+            latest_price = self._latest_prices.get(symbol)
+            if latest_price is not None and position["side"] == "long":
+                total += (latest_price - position["entry_price"]) * position["size"]
         return total
 
+    def calculate_unrealized_pnl(self):
+        return self._unrealized_pnl(self._account.positions)
+
+    def get_latest_price(self, symbol):
+        return self._latest_prices.get(symbol)
+
     def get_portfolio_summary(self):
-        final_balance = self.cash_balance + self.calculate_unrealized_pnl()
+        account = self._account
+        unrealized_pnl = self._unrealized_pnl(account.positions)
+        final_balance = account.cash_balance + unrealized_pnl
         net_pnl = final_balance - self.initial_capital
         return {
             "initial_capital": self.initial_capital,
-            "cash_balance": self.cash_balance,
-            "unrealized_pnl": self.calculate_unrealized_pnl(),
+            "cash_balance": account.cash_balance,
+            "unrealized_pnl": unrealized_pnl,
             "final_pnl": net_pnl,
             "final_portfolio_value": final_balance,
-            "position_count": len(self.positions) 
+            "fees_paid": self.fees_paid,
+            "position_count": len(account.positions)
         }
 
     def get_positions(self):
-        with self.lock:
-            return self.positions.copy()
+        return dict(self._account.positions)
 
     def get_logs(self):
-        with self.lock:
-            return list(self.logs)
+        # list() of a list is a single C-level copy, so no lock is needed.
+        return list(self.logs)
 
     def get_price_data(self):
-        with self.lock:
-            return dict(self.data)
+        data = {}
+        for symbol, shard in list(self._shards.items()):
+            with shard.lock:
+                data[symbol] = list(shard.ticks)
+        return data
 
     def get_pnl_data(self):
-        with self.lock:
-            return list(self.pnl_timeline)
+        return list(self.pnl_timeline)
+
+    def get_latency_stats(self):
+        """Per-stage, per-symbol latency summaries in microseconds (see LATENCY_STAGES)."""
+        return self.latency.get_stats()
+
+    def get_strategy_timing(self):
+        """The strategy's own per-symbol timing (see Strategy.get_timing); {} for plain functions."""
+        return self.strategy.get_timing() if isinstance(self.strategy, Strategy) else {}
+
+    def _collect_metrics(self):
+        """Scrape-time metrics for the telemetry registry (see price_engine.telemetry)."""
+        trader = {"trader": self.metrics_id}
+        shards = list(self._shards.items())
+        account = self._account
+        families = [
+            ("trader_ticks_total", "counter", "Ticks processed per symbol",
+             [(dict(trader, symbol=s), shard.tick_count) for s, shard in shards]),
+            ("trader_actions_total", "counter", "Strategy actions executed per symbol",
+             [(dict(trader, symbol=s), shard.action_count) for s, shard in shards]),
+            ("trader_open_positions", "gauge", "Open positions", [(trader, len(account.positions))]),
+            ("trader_cash_balance", "gauge", "Cash balance", [(trader, account.cash_balance)]),
+            ("trader_log_buffer_size", "gauge", "Lines held in the trade log", [(trader, len(self.logs))]),
+            ("trader_pnl_buffer_size", "gauge", "Points held in the PnL timeline", [(trader, len(self.pnl_timeline))]),
+        ]
+        latency_samples = []
+        for stage, by_symbol in list(self.latency.histograms.items()):
+            for symbol, histogram in list(by_symbol.items()):
+                latency_samples.append((dict(trader, stage=stage, symbol=symbol), histogram))
+        families.append(("trader_stage_latency_seconds", "histogram",
+                         "Live pipeline stage latency (see RealTimeTrader.LATENCY_STAGES)", latency_samples))
+        return families
 
     def reset(self):
+        with self._shards_lock:
+            self._shards = {}
         with self.lock:
-            self.data.clear()
-            self.logs.clear()
-            self.pnl_timeline.clear()
-            self.positions.clear()
-            self.cash_balance = self.initial_capital
-            self.start_time = time.time()
-            self.is_active = True
-            self.last_logged_action.clear()
-            self.last_logged_price.clear()
-            self.last_log_time.clear()
+            self._publish_account(self.initial_capital, {})
+        self._latest_prices = {}
+        self.logs = []
+        self.pnl_timeline = []
+        self._last_pnl_time = 0.0
+        self.latency.reset()
+        with self._orders_lock:
+            self._pending_orders = {}
+        self.fees_paid = 0.0
+        self.start_time = time.time()
+        self.is_active = True
 
     def is_running(self):
         return self.is_active
@@ -0,0 +1,252 @@
+# src/backtesting_engine/session_archive.py
+"""
+Append-only binary archive of completed trading sessions:
+
+    archive = SessionArchive("src/session_archive")
+    session_id = archive.append(trader.get_portfolio_summary(), symbols, runtime,
+                                logs=trader.get_logs(), pnl_timeline=trader.get_pnl_data())
+    archive.page(0, 50, symbol="BTCUSDT")      # newest first, legacy session_history.json rows
+    archive.count(symbol="BTCUSDT", min_pnl=0)
+    archive.session(session_id)                 # one session's summary, trade log and PnL timeline
+    archive.pnl_histogram(bins=20)              # cached until the next append
+    archive.symbols()                           # every symbol traded, for filter options
+
+index.bin holds one fixed-size record per session (summary, symbols, strategy
+and where its payload starts), so listing, filtering and paging read one small
+array and never touch the payloads. data.bin holds each session's PnL timeline
+as int64 microsecond timestamps and float64 values, followed by its trade log
+as zlib-compressed text. A session is appended payload first and index record
+last, so readers never see a record whose payload is missing; a torn index
+record from a crash is dropped on the next open. Appends are serialized within
+one process; run a single writer per archive. Symbols and strategy are stored
+whole or not at all: a list longer than the index field is rejected rather
+than cut mid-symbol, where the symbol filter would no longer find it.
+"""
+import json
+import os
+import threading
+import zlib
+from datetime import datetime
+
+import numpy as np
+
+INDEX_DTYPE = np.dtype([
+    ("timestamp", "<f8"),          # completion time, epoch seconds
+    ("initial_capital", "<f8"),
+    ("final_value", "<f8"),
+    ("pnl", "<f8"),
+    ("cash", "<f8"),
+    ("unrealized_pnl", "<f8"),
+    ("fees", "<f8"),
+    ("duration", "<f8"),
+    ("trades", "<i4"),
+    ("points", "<i4"),
+    ("offset", "<i8"),             # payload start in data.bin
+    ("log_bytes", "<i8"),          # compressed trade log length
+    ("symbols", "S128"),           # "BTCUSDT,ETHUSDT"
+    ("strategy", "S32"),
+])
+
+# Rows as the dashboard's session_history.json stored them.
+_LEGACY_FIELDS = (
+    ("Timestamp", "timestamp"), ("Symbols", "symbols"), ("Initial Capital", "initial_capital"),
+    ("Final Portfolio Value", "final_value"), ("PnL", "pnl"), ("Cash Balance", "cash"),
+    ("Unrealized PnL", "unrealized_pnl"), ("Duration (s)", "duration"),
+)
+
+
+def _timestamps_us(timestamps) -> np.ndarray:
+    return np.array(timestamps, dtype="datetime64[us]").astype(np.int64)
+
+
+class SessionArchive:
+    def __init__(self, path: str):
+        """:param path: Directory holding index.bin and data.bin; created if missing."""
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._index_path = os.path.join(path, "index.bin")
+        self._data_path = os.path.join(path, "data.bin")
+        self._lock = threading.Lock()
+        self._index = None
+        self._stats = {}  # cached aggregates, cleared by append()
+        if os.path.exists(self._index_path):
+            size = os.path.getsize(self._index_path)
+            if size % INDEX_DTYPE.itemsize:
+                with open(self._index_path, "r+b") as f:
+                    f.truncate(size - size % INDEX_DTYPE.itemsize)
+
+    # --- Writing ---
+
+    def append(self, summary: dict, symbols, duration: float, logs=(), pnl_timeline=(), strategy: str = "",
+               timestamp: float = None, trades: int = None) -> int:
+        """
+        :param summary: get_portfolio_summary() of the finished trader.
+        :param logs: The whole trade log; a truncated tail is stored as given.
+        :param pnl_timeline: get_pnl_data() points, {"timestamp": ISO string, "portfolio_value": float}.
+        :param timestamp: Completion time in epoch seconds; now by default.
+        :param trades: get_trade_count() of the trader; len(logs) by default.
+        :return: The session id (its position in the archive).
+        :raises ValueError: The symbols or strategy do not fit their index fields.
+        """
+        symbols = [symbols] if isinstance(symbols, str) else list(symbols)
+        symbol_bytes = ",".join(symbols).encode()
+        strategy_bytes = (strategy or "").encode()
+        for field, value in (("symbols", symbol_bytes), ("strategy", strategy_bytes)):
+            if len(value) > INDEX_DTYPE[field].itemsize:
+                raise ValueError(f"{field} {value.decode()!r} is longer than the archive's "
+                                 f"{INDEX_DTYPE[field].itemsize}-byte {field} field")
+        stamps = _timestamps_us([point["timestamp"] for point in pnl_timeline])
+        values = np.array([point["portfolio_value"] for point in pnl_timeline], dtype="<f8")
+        log_blob = zlib.compress("\n".join(logs).encode()) if logs else b""
+
+        record = np.zeros(1, dtype=INDEX_DTYPE)
+        record["timestamp"] = datetime.now().timestamp() if timestamp is None else timestamp
+        record["initial_capital"] = summary.get("initial_capital", 0.0)
+        record["final_value"] = summary.get("final_portfolio_value", 0.0)
+        record["pnl"] = summary.get("final_pnl", 0.0)
+        record["cash"] = summary.get("cash_balance", 0.0)
+        record["unrealized_pnl"] = summary.get("unrealized_pnl", 0.0)
+        record["fees"] = summary.get("fees_paid", 0.0)
+        record["duration"] = duration
+        record["trades"] = len(logs) if trades is None else trades
+        record["points"] = len(values)
+        record["log_bytes"] = len(log_blob)
+        record["symbols"] = symbol_bytes
+        record["strategy"] = strategy_bytes
+
+        with self._lock:
+            with open(self._data_path, "ab") as f:
+                record["offset"] = f.tell()
+                f.write(stamps.astype("<i8").tobytes())
+                f.write(values.tobytes())
+                f.write(log_blob)
+            with open(self._index_path, "ab") as f:
+                session_id = f.tell() // INDEX_DTYPE.itemsize
+                f.write(record.tobytes())
+            self._index = None
+            self._stats = {}
+        return session_id
+
+    def import_json(self, path: str) -> int:
+        """Append the rows of a legacy session_history.json (summaries only); returns how many."""
+        with open(path) as f:
+            rows = json.load(f)
+        for row in rows:
+            summary = {"initial_capital": row.get("Initial Capital", 0.0),
+                       "final_portfolio_value": row.get("Final Portfolio Value", 0.0),
+                       "final_pnl": row.get("PnL", 0.0), "cash_balance": row.get("Cash Balance", 0.0),
+                       "unrealized_pnl": row.get("Unrealized PnL", 0.0)}
+            symbols = [symbol.strip() for symbol in str(row.get("Symbols", "")).split(",") if symbol.strip()]
+            stamp = datetime.strptime(row["Timestamp"], "%Y-%m-%d %H:%M:%S").timestamp() if row.get("Timestamp") else 0.0
+            self.append(summary, symbols, row.get("Duration (s)", 0), timestamp=stamp)
+        return len(rows)
+
+    # --- Reading ---
+
+    @property
+    def index(self) -> np.ndarray:
+        """Every session's index record (a structured array, oldest first)."""
+        with self._lock:
+            if self._index is None:
+                if os.path.exists(self._index_path) and os.path.getsize(self._index_path):
+                    self._index = np.fromfile(self._index_path, dtype=INDEX_DTYPE)
+                else:
+                    self._index = np.zeros(0, dtype=INDEX_DTYPE)
+            return self._index
+
+    def __len__(self):
+        return len(self.index)
+
+    def query(self, symbol: str = None, strategy: str = None, since: float = None, until: float = None,
+              min_pnl: float = None, max_pnl: float = None) -> np.ndarray:
+        """Ids of the sessions matching every given filter, oldest first. since/until are epoch seconds."""
+        index = self.index
+        mask = np.ones(len(index), dtype=bool)
+        if symbol:
+            # Whole symbols only: ",BTC," does not match ",BTCUSDT,".
+            padded = np.char.add(np.char.add(b",", index["symbols"]), b",")
+            mask &= np.char.find(padded, f",{symbol.upper()},".encode()) >= 0
+        if strategy:
+            mask &= index["strategy"] == strategy.encode()
+        if since is not None:
+            mask &= index["timestamp"] >= since
+        if until is not None:
+            mask &= index["timestamp"] < until
+        if min_pnl is not None:
+            mask &= index["pnl"] >= min_pnl
+        if max_pnl is not None:
+            mask &= index["pnl"] <= max_pnl
+        return np.flatnonzero(mask)
+
+    def count(self, **filters) -> int:
+        return len(self.query(**filters))
+
+    def page(self, page: int = 0, page_size: int = 50, newest_first: bool = True, **filters) -> list:
+        """One page of matching sessions as session_history.json rows, plus "Session" (the id) and "Strategy"."""
+        ids = self.query(**filters)
+        if newest_first:
+            ids = ids[::-1]
+        ids = ids[page * page_size:(page + 1) * page_size]
+        return [self._row(session_id, record) for session_id, record in zip(ids, self.index[ids])]
+
+    def _row(self, session_id, record) -> dict:
+        row = {"Session": int(session_id)}
+        for label, field in _LEGACY_FIELDS:
+            value = record[field]
+            if field == "timestamp":
+                value = datetime.fromtimestamp(float(value)).strftime("%Y-%m-%d %H:%M:%S")
+            elif field == "symbols":
+                value = ", ".join(value.decode().split(",")) if value else ""
+            elif field == "duration":
+                value = int(value)
+            else:
+                value = float(value)
+            row[label] = value
+        row["Strategy"] = record["strategy"].decode()
+        return row
+
+    def session(self, session_id: int) -> dict:
+        """Summary row, trade log lines and PnL timeline of one session."""
+        record = self.index[session_id]
+        points = int(record["points"])
+        with open(self._data_path, "rb") as f:
+            f.seek(int(record["offset"]))
+            stamps = np.frombuffer(f.read(8 * points), dtype="<i8")
+            values = np.frombuffer(f.read(8 * points), dtype="<f8")
+            log_blob = f.read(int(record["log_bytes"]))
+        logs = zlib.decompress(log_blob).decode().split("\n") if log_blob else []
+        timeline = [{"timestamp": stamp.isoformat(), "portfolio_value": value}
+                    for stamp, value in zip(stamps.astype("datetime64[us]").tolist(), values.tolist())]
+        return {"summary": self._row(session_id, record), "logs": logs, "pnl_timeline": timeline}
+
+    # --- Aggregates (cached until the next append) ---
+
+    def stats(self) -> dict:
+        stats = self._stats.get("stats")
+        if stats is None:
+            pnl = self.index["pnl"]
+            stats = self._stats["stats"] = {
+                "sessions": len(pnl),
+                "total_pnl": float(pnl.sum()),
+                "mean_pnl": float(pnl.mean()) if len(pnl) else 0.0,
+                "win_rate": float((pnl > 0).mean()) if len(pnl) else 0.0,
+                "best_pnl": float(pnl.max()) if len(pnl) else 0.0,
+                "worst_pnl": float(pnl.min()) if len(pnl) else 0.0,
+            }
+        return stats
+
+    def symbols(self) -> list:
+        """Every symbol any session traded, sorted."""
+        symbols = self._stats.get("symbols")
+        if symbols is None:
+            symbols = self._stats["symbols"] = sorted({symbol for entry in np.unique(self.index["symbols"])
+                                                       for symbol in entry.decode().split(",") if symbol})
+        return symbols
+
+    def pnl_histogram(self, bins: int = 20):
+        """(counts, bin edges) of every session's PnL."""
+        key = ("histogram", bins)
+        histogram = self._stats.get(key)
+        if histogram is None:
+            histogram = self._stats[key] = np.histogram(self.index["pnl"], bins=bins)
+        return histogram
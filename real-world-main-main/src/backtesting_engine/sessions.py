@@ -0,0 +1,188 @@
+# src/backtesting_engine/sessions.py
+"""
+Many independent paper-trading sessions fed by one market data feed:
+
+    manager = SessionManager()
+    feed = BinanceWebSocketClient(["BTCUSDT", "ETHUSDT"], on_price_update=manager.on_price_update)
+    manager.start_session(capital=10000, runtime=600, symbols=["BTCUSDT"])
+    manager.start_session(capital=2500, runtime=60, symbols=["BTCUSDT", "ETHUSDT"], strategy="bollinger")
+
+Each session is a RealTimeTrader with its own capital, runtime, symbols and
+strategy. Ticks are routed by symbol, so a session only sees the symbols it
+trades, and the per-tick work shared by every session (the receive timestamp,
+the route lookup) is done once. Adding a session costs its strategy's CPU and
+no extra sockets; the Engine daemon (daemon.py) subclasses this to own the feed.
+"""
+import itertools
+import threading
+import time
+from datetime import datetime
+
+from price_engine.telemetry import REGISTRY
+from .real_time_runner import RealTimeTrader
+from .strategies.base import create_strategy
+
+ENGINE_SESSIONS = REGISTRY.gauge("engine_sessions", "Paper-trading sessions held by the engine, by state")
+
+
+class EngineError(Exception):
+    """A control request that cannot be carried out (unknown session, bad arguments)."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def symbol_list(symbols) -> list:
+    """Upper-cased symbols from a list or tuple of non-empty strings, or an EngineError."""
+    if not isinstance(symbols, (list, tuple)) or not all(isinstance(s, str) and s.strip() for s in symbols):
+        raise EngineError("symbols must be a list of non-empty strings")
+    return [s.strip().upper() for s in symbols]
+
+
+def resolve_strategy(name: str, params: dict = None):
+    """A new instance of a registered strategy (see strategies/base.py), or an EngineError."""
+    try:
+        return create_strategy(name, **(params or {}))
+    except KeyError as e:
+        raise EngineError(e.args[0]) from None
+    except TypeError as e:
+        raise EngineError(f"bad parameters for {name}: {e}") from None
+
+
+class Session:
+    __slots__ = ("id", "name", "symbols", "strategy", "trader", "created", "stopped_at")
+
+    def __init__(self, session_id, name, symbols, trader, strategy="mean_reversion"):
+        self.id = session_id
+        self.name = name
+        self.symbols = tuple(symbols)
+        self.strategy = strategy
+        self.trader = trader
+        self.created = time.time()
+        self.stopped_at = None
+
+    @property
+    def active(self) -> bool:
+        return self.trader.is_active
+
+    def status(self) -> dict:
+        return {"id": self.id, "name": self.name, "symbols": list(self.symbols), "strategy": self.strategy,
+                "active": self.active, "runtime": self.trader.runtime, "start_time": self.trader.start_time,
+                "stopped_at": self.stopped_at, "summary": self.trader.get_portfolio_summary()}
+
+    def snapshot(self, logs: int = 50, pnl: int = 500) -> dict:
+        """:param logs: / :param pnl: Lines and points to include from the end; None for all of them."""
+        trader = self.trader
+        data = self.status()
+        data.update(
+            positions={symbol: dict(position) for symbol, position in trader.get_positions().items()},
+            latest_prices={symbol: trader.get_latest_price(symbol) for symbol in self.symbols},
+            logs=_tail(trader.get_logs(), logs),
+            pnl_timeline=_tail(trader.get_pnl_data(), pnl),
+            latency=trader.get_latency_stats(),
+            strategy_timing=trader.get_strategy_timing(),
+            trades=trader.get_trade_count(),
+        )
+        return data
+
+
+def _tail(items: list, count: int) -> list:
+    return items if count is None else items[-count:] if count else []
+
+
+class SessionManager:
+    def __init__(self, execution=None, pnl_interval: float = 1.0, track_latency: bool = True):
+        """
+        :param execution: Fill model given to every session (free, instant fills by default).
+        :param pnl_interval: Seconds between PnL timeline points per session, which bounds
+            each session's memory at roughly runtime / pnl_interval points.
+        :param track_latency: Per-stage latency histograms in every session.
+        """
+        self.execution = execution
+        self.pnl_interval = pnl_interval
+        self.track_latency = track_latency
+        self.sessions = {}
+        # symbol -> tuple of traders; replaced (never mutated) under _lock so the feed threads read it lock-free.
+        self._routes = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    # --- Fan-out ---
+
+    def on_price_update(self, symbol, price, recv_ns=None):
+        traders = self._routes.get(symbol)
+        if not traders:
+            return
+        timestamp = datetime.utcnow().isoformat()
+        expired = False
+        for trader in traders:
+            if trader.is_active:
+                trader.on_price_update(symbol, price, recv_ns=recv_ns, timestamp=timestamp)
+            else:
+                expired = True
+        if expired:
+            self._retire_finished()
+
+    def subscribe(self, symbols) -> list:
+        """Hook for owners of a feed (see Engine) to open streams; returns the routed symbols."""
+        return sorted(symbol for symbol, traders in self._routes.items() if traders)
+
+    # --- Sessions ---
+
+    def start_session(self, capital: float, runtime: float, symbols, name: str = None,
+                      strategy: str = "mean_reversion", strategy_params: dict = None) -> str:
+        symbols = symbol_list(symbols)
+        if not symbols:
+            raise EngineError("a session needs at least one symbol")
+        if capital <= 0 or runtime <= 0:
+            raise EngineError("capital and runtime must be positive")
+        trader = RealTimeTrader(capital=capital, runtime=runtime, track_latency=self.track_latency,
+                                execution=self.execution, strategy=resolve_strategy(strategy, strategy_params),
+                                pnl_interval=self.pnl_interval)
+        session_id = str(next(self._ids))
+        session = Session(session_id, name or f"session-{session_id}", symbols, trader, strategy)
+        self.subscribe(symbols)
+        with self._lock:
+            self.sessions[session_id] = session
+            for symbol in symbols:
+                self._routes[symbol] = self._routes.get(symbol, ()) + (trader,)
+        self._publish_counts()
+        return session_id
+
+    def stop_session(self, session_id: str) -> dict:
+        session = self.session(session_id)
+        session.trader.stop()
+        with self._lock:
+            if session.stopped_at is None:
+                session.stopped_at = time.time()
+            for symbol in session.symbols:
+                self._routes[symbol] = tuple(t for t in self._routes.get(symbol, ()) if t is not session.trader)
+        self._publish_counts()
+        return session.status()
+
+    def stop_all(self):
+        for session_id, session in list(self.sessions.items()):
+            if session.stopped_at is None:
+                self.stop_session(session_id)
+
+    def _retire_finished(self):
+        """Unroute sessions whose runtime ran out; they stay listed with their final summary."""
+        for session_id, session in list(self.sessions.items()):
+            if not session.active and session.stopped_at is None:
+                self.stop_session(session_id)
+
+    def session(self, session_id: str) -> Session:
+        session = self.sessions.get(str(session_id))
+        if session is None:
+            raise EngineError(f"no session {session_id}", status=404)
+        return session
+
+    def active_sessions(self) -> list:
+        return [s for s in list(self.sessions.values()) if s.active]
+
+    def _publish_counts(self):
+        sessions = list(self.sessions.values())
+        active = sum(1 for s in sessions if s.active)
+        ENGINE_SESSIONS.set(active, state="active")
+        ENGINE_SESSIONS.set(len(sessions) - active, state="finished")
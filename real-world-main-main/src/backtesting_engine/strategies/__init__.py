@@ -0,0 +1 @@
+from .base import Strategy, available_strategies, create_strategy, get_strategy_class, register_strategy
@@ -0,0 +1,194 @@
+# src/backtesting_engine/strategies/base.py
+"""
+Strategy plugin API shared by the backtester, the replay harness and the live trader:
+
+    strategy = create_strategy("mean_reversion", threshold=1.5)
+    strategy(window, current_position)           # on_bar, timed; fits anywhere a strategy function does
+    strategy.on_tick("BTCUSDT", 64000.0, None)   # incremental: keeps its own per-symbol window
+    states = strategy.on_series(closes)          # vectorized: T x N DataFrame -> T x N 1 (long) / 0 (flat)
+    stream = strategy.series_stream()            # on_series chunk by chunk: stream(chunk) -> states
+    strategy.get_timing()                        # per-interface, per-symbol latency summaries
+
+Strategies hold their parameters and indicator objects per instance. Anything
+stateful (hold counters, rolling sums) lives on the instance, and clone() gives
+each symbol its own copy while sharing the timing histograms, so one object can
+be handed to RealTimeTrader, TickReplayer and backtest_runner alike.
+
+New strategies subclass Strategy and register themselves:
+
+    @register_strategy("breakout")
+    class Breakout(Strategy):
+        def on_bar(self, window, position):
+            ...
+"""
+import abc
+import importlib
+import inspect
+import time
+from collections import deque
+
+from price_engine.indicators.cache import get_cache
+from price_engine.latency import LatencyTracker
+
+# Built-in strategies, imported on first use (bollinger pulls in pandas and ta).
+_REGISTRY = {
+    "mean_reversion": "backtesting_engine.strategies.strategy_mean_reversion:MeanReversionStrategy",
+    "bollinger": "backtesting_engine.strategies.strategy_bollinger:BollingerStrategy",
+    "enhanced_mean_reversion": "backtesting_engine.strategies.enhanced_mean_reversion:EnhancedMeanReversionStrategy",
+}
+
+
+def register_strategy(name: str):
+    """Class decorator adding a Strategy subclass to the registry under name."""
+    def decorator(cls):
+        if inspect.isabstract(cls):
+            missing = ", ".join(sorted(cls.__abstractmethods__))
+            raise TypeError(f"strategy {name!r} does not implement {missing}")
+        cls.name = name
+        _REGISTRY[name] = cls
+        return cls
+    return decorator
+
+
+def get_strategy_class(name: str):
+    entry = _REGISTRY.get(name)
+    if entry is None:
+        raise KeyError(f"unknown strategy {name!r} (expected one of {', '.join(available_strategies())})")
+    if isinstance(entry, str):
+        module, class_name = entry.split(":")
+        entry = _REGISTRY[name] = getattr(importlib.import_module(module), class_name)
+    return entry
+
+
+def create_strategy(name: str, **params) -> "Strategy":
+    return get_strategy_class(name)(**params)
+
+
+def available_strategies() -> list:
+    return sorted(_REGISTRY)
+
+
+class Strategy(abc.ABC):
+    """
+    Base class. Subclasses implement on_bar (a subclass without it cannot be
+    instantiated) and may override on_series with a vectorized version; the
+    default on_series steps on_bar through each column.
+    """
+
+    name = None
+    warmup = 50  # bars of history passed to on_bar by on_tick and on_series
+    use_cache = True  # memoize on_series indicator inputs in the process-wide IndicatorCache
+
+    def __init__(self, **params):
+        self.params = params
+        self.symbol = None
+        self.timing = LatencyTracker()
+        self._windows = {}
+        self._children = {}
+
+    def clone(self, symbol: str = None) -> "Strategy":
+        """A fresh instance with the same parameters and timing histograms, for one symbol."""
+        child = type(self)(**self.params)
+        child.symbol = symbol
+        child.timing = self.timing
+        return child
+
+    def reset(self):
+        """Drop per-instance state (tick windows, per-symbol copies)."""
+        self._windows = {}
+        self._children = {}
+
+    # --- Interfaces ---
+
+    @abc.abstractmethod
+    def on_bar(self, window, position):
+        """
+        Decide on the latest bar or tick.
+        :param window: Sequence of {"price": ...} dicts, oldest first (a list or a deque).
+        :param position: "long", "short" or None.
+        :return: "buy", "sell" or None.
+        """
+
+    def __call__(self, data_window, current_position=None):
+        start = time.perf_counter_ns()
+        action = self.on_bar(data_window, current_position)
+        self.timing.record("on_bar", self.symbol or "-", time.perf_counter_ns() - start)
+        return action
+
+    def on_tick(self, symbol: str, price: float, position=None):
+        """Append one tick to this strategy's own window for symbol and decide on it."""
+        start = time.perf_counter_ns()
+        child = self._children.get(symbol)
+        if child is None:
+            child = self._children[symbol] = self.clone(symbol)
+            self._windows[symbol] = deque(maxlen=self.warmup)
+        window = self._windows[symbol]
+        window.append({"price": price})
+        action = child.on_bar(window, position) if len(window) >= self.warmup else None
+        self.timing.record("on_tick", symbol, time.perf_counter_ns() - start)
+        return action
+
+    def on_series(self, closes):
+        """
+        Position states for every bar of every column of closes (T x N DataFrame):
+        "buy" goes long and "sell" goes flat, as backtest_runner trades them.
+        """
+        from ..multi_asset import strategy_states
+        import numpy as np
+
+        start = time.perf_counter_ns()
+        columns = [strategy_states(closes[[column]], self.clone(column), warmup=self.warmup)
+                   for column in closes.columns]
+        states = np.hstack(columns) if columns else np.zeros((len(closes), 0))
+        self.timing.record("on_series", "-", time.perf_counter_ns() - start)
+        return states
+
+    def series_stream(self):
+        """
+        on_series for a series read in consecutive chunks (see backtesting_engine.streaming):
+        stream(chunk) returns the chunk's states, the same rows on_series gives for the whole
+        series. The default steps on_bar through each column, carrying the last warmup bars.
+        """
+        from ..multi_asset import StrategyStream
+
+        return StrategyStream(self, warmup=self.warmup)
+
+    # --- Harness adapters ---
+
+    def tick_handler(self):
+        """
+        handler(symbol, price) for TickReplayer that trades long/flat on this
+        strategy's own signals; handler.positions and handler.actions hold the result.
+        """
+        positions = {}
+        actions = []
+
+        def handler(symbol, price):
+            action = self.on_tick(symbol, price, positions.get(symbol))
+            if action == "buy":
+                positions[symbol] = "long"
+            elif action == "sell":
+                positions.pop(symbol, None)
+            if action:
+                actions.append((symbol, price, action))
+
+        handler.positions = positions
+        handler.actions = actions
+        return handler
+
+    def cached(self, data_fingerprint: str, indicator: str, params: dict, compute):
+        """
+        compute() through the indicator cache (see price_engine.indicators.cache),
+        unless use_cache is off or there is no data_fingerprint.
+        """
+        if not self.use_cache or data_fingerprint is None:
+            return compute()
+        return get_cache().get_or_compute(data_fingerprint, indicator, params, compute)
+
+    def get_timing(self) -> dict:
+        """{interface: {symbol: summary, ..., "ALL": summary}} in microseconds."""
+        return self.timing.get_stats()
+
+    def __repr__(self):
+        params = ", ".join(f"{k}={v!r}" for k, v in self.params.items())
+        return f"{type(self).__name__}({params})"
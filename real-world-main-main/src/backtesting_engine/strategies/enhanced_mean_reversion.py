@@ -0,0 +1,33 @@
+# src/backtesting_engine/strategies/enhanced_mean_reversion.py
+from itertools import islice
+
+from price_engine.indicators.enhanced_mean_reversion import EnhancedMeanReversion
+
+from .base import Strategy, register_strategy
+
+
+@register_strategy("enhanced_mean_reversion")
+class EnhancedMeanReversionStrategy(Strategy):
+    """
+    Z-score mean reversion whose threshold and minimum hold adapt to volatility
+    (see EnhancedMeanReversion). The hold counter is per instance, so every
+    symbol gets its own through clone(). Shorting is only allowed for
+    non-USDT symbols, and emits "short"/"cover", which the long-only live
+    trader ignores.
+    """
+
+    def __init__(self, window: int = 20, verbose: bool = False):
+        super().__init__(window=window, verbose=verbose)
+        self.model = EnhancedMeanReversion(window=window, verbose=verbose)
+        self.warmup = window
+
+    def reset(self):
+        super().reset()
+        self.model.hold_counter = 0
+
+    def on_bar(self, window, position):
+        if len(window) < self.model.window:
+            return None
+        # The model slices its input, which a live trader's deque does not support.
+        recent = list(islice(window, len(window) - self.model.window, None))
+        return self.model.decide(recent, position, self.symbol or "unknown")
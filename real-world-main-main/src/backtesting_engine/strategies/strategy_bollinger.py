@@ -3,40 +3,61 @@
 from price_engine.indicators.bollinger_bands import BollingerBands
 from ta.momentum import RSIIndicator
 import pandas as pd
+import time
 
-bb = BollingerBands(window=20, num_std=2)
+from price_engine.indicators.cache import get_cache
 
-def strategy_bollinger(data_window: list, current_position: str = None) -> str:
+from .base import Strategy, register_strategy
+
+
+@register_strategy("bollinger")
+class BollingerStrategy(Strategy):
     """
-    Improved strategy:
     - Buy when price < lower band AND RSI < 40 (oversold-ish), only if not already in long
     - Sell when price > upper band AND RSI > 60 (overbought-ish), only if currently in long
     """
 
-    if len(data_window) < 20:
-        return None  # not enough data yet
+    def __init__(self, window: int = 20, num_std: float = 2, rsi_window: int = 14):
+        super().__init__(window=window, num_std=num_std, rsi_window=rsi_window)
+        self.bb = BollingerBands(window=window, num_std=num_std)
+        self.window = window
+        self.rsi_window = rsi_window
+
+    def on_bar(self, window, position):
+        if len(window) < self.window:
+            return None  # not enough data yet
 
-    df = pd.DataFrame(data_window)
-    current_price = df["price"].iloc[-1]
-    timestamp = df["timestamp"].iloc[-1] if "timestamp" in df.columns else "Unknown"
+        closes = pd.Series([entry["price"] for entry in window])
+        current_price = closes.iloc[-1]
+        result = self.bb.calculate(window)
+        rsi = RSIIndicator(close=closes, window=self.rsi_window).rsi().iloc[-1]
 
-    # Bollinger Bands
-    result = bb.calculate(data_window)
+        if position != "long" and current_price < result["lower_band"] and rsi < 40:
+            return "buy"
+        elif position == "long" and current_price > result["upper_band"] and rsi > 60:
+            return "sell"
+        return None
 
-    # RSI calculation
-    rsi = RSIIndicator(close=df["price"], window=14).rsi().iloc[-1]
+    def on_series(self, closes):
+        """Vectorized over every column at once (see multi_asset.bollinger_states for the RSI caveat)."""
+        from ..multi_asset import bollinger_states
 
-    # Logging for debug
-    #print(f"[{timestamp}] Price: {current_price:.2f}, RSI: {rsi:.2f}, Lower: {result['lower_band']:.2f}, Upper: {result['upper_band']:.2f}, Position: {current_position}")
+        start = time.perf_counter_ns()
+        states = bollinger_states(closes, window=self.window, num_std=self.bb.num_std, rsi_window=self.rsi_window,
+                                  warmup=self.warmup, cache=get_cache() if self.use_cache else None)
+        self.timing.record("on_series", "-", time.perf_counter_ns() - start)
+        return states
 
-    # Buy signal (relaxed condition)
-    if current_position != "long" and current_price < result["lower_band"] and rsi < 40:
-        #print(f"→ Buy signal triggered")
-        return "buy"
+    def series_stream(self):
+        from ..multi_asset import BollingerStream
 
-    # Sell signal (relaxed condition)
-    elif current_position == "long" and current_price > result["upper_band"] and rsi > 60:
-        #print(f"→ Sell signal triggered")
-        return "sell"
+        return BollingerStream(window=self.window, num_std=self.bb.num_std, rsi_window=self.rsi_window,
+                               warmup=self.warmup)
 
-    return None
+
+_default = BollingerStrategy()
+
+
+def strategy_bollinger(data_window: list, current_position: str = None) -> str:
+    """Function form of BollingerStrategy with the default parameters."""
+    return _default(data_window, current_position)
@@ -1,8 +1,15 @@
 # src/backtesting_engine/strategies/strategy_mean_reversion.py
+import time
+from itertools import islice
+
+from price_engine.indicators.cache import fingerprint
+from price_engine.indicators.kernels import (
+    rolling_slope, rolling_window_ema, rolling_zscore, slope_last, window_ema_last,
+)
 from price_engine.indicators.mean_reversion import MeanReversion
 import numpy as np
 
-mr = MeanReversion(window=20, threshold=1.2)
+from .base import Strategy, register_strategy
 
 def sma(prices, window):
     if len(prices) < window:
@@ -10,28 +17,18 @@ def sma(prices, window):
     return np.mean(prices[-window:])
 
 def slope(prices, window):
-    if len(prices) < window:
-        return 0
-    x = np.arange(window)
-    y = np.array(prices[-window:])
-    # Linear regression to calculate slope
-    A = np.vstack([x, np.ones(len(x))]).T
-    m, _ = np.linalg.lstsq(A, y, rcond=None)[0]
-    return m
+    # Least-squares slope in closed form (see price_engine.indicators.kernels)
+    return slope_last(prices, window)
 
 def ema(prices, window):
-    if len(prices) < window:
-        return None
-    weights = np.exp(np.linspace(-1., 0., window))
-    weights /= weights.sum()
-    a = np.convolve(prices[-window:], weights, mode='valid')
-    return a[-1] if len(a) > 0 else None
+    return window_ema_last(prices, window)
 
 def detect_trend(data_window, short_window=20, long_window=50, slope_threshold=0.003):
-    prices = [candle["price"] for candle in data_window]
-
-    if len(prices) < long_window:
+    if len(data_window) < long_window:
         return False, "sideways"
+    # Only the last long_window (or short_window) prices are read.
+    tail = max(short_window, long_window)
+    prices = [candle["price"] for candle in islice(data_window, max(len(data_window) - tail, 0), None)]
 
     # Calculate EMAs
     short_ema = ema(prices, short_window)
@@ -53,34 +50,137 @@ def detect_trend(data_window, short_window=20, long_window=50, slope_threshold=0
     return False, "sideways"
 
 
-def strategy_mean_reversion(data_window: list, current_position: str = None) -> str:
-    latest_price = data_window[-1]['price']
-    is_trending, trend_direction = detect_trend(data_window)
-
-    # print(f"Price: {latest_price:.2f}, Trend: {trend_direction}, In Trend Mode: {is_trending}, Position: {current_position}")
-
-    # Trend-following logic
-    if is_trending:
-        if trend_direction == "up":
-            if current_position != "long":
-                return "buy"  # enter long
-        elif trend_direction == "down":
-            if current_position != "short":
-                return "sell"  # enter short
-        else:
-            # Exit position if trend direction changes
-            if current_position == "long" and trend_direction != "up":
-                return "sell"
-            elif current_position == "short" and trend_direction != "down":
+@register_strategy("mean_reversion")
+class MeanReversionStrategy(Strategy):
+    """Trend-follow when the EMAs and slope agree on a trend, otherwise fade z-score extremes."""
+
+    def __init__(self, window: int = 20, threshold: float = 1.2, short_window: int = 20, long_window: int = 50,
+                 slope_threshold: float = 0.003):
+        super().__init__(window=window, threshold=threshold, short_window=short_window, long_window=long_window,
+                         slope_threshold=slope_threshold)
+        self.mr = MeanReversion(window=window, threshold=threshold)
+        self.short_window = short_window
+        self.long_window = long_window
+        self.slope_threshold = slope_threshold
+        self.warmup = max(window, short_window, long_window)
+
+    def on_bar(self, window, position):
+        is_trending, trend_direction = detect_trend(window, self.short_window, self.long_window,
+                                                    self.slope_threshold)
+
+        # Trend-following logic
+        if is_trending:
+            if trend_direction == "up":
+                if position != "long":
+                    return "buy"  # enter long
+            elif trend_direction == "down":
+                if position != "short":
+                    return "sell"  # enter short
+            else:
+                # Exit position if trend direction changes
+                if position == "long" and trend_direction != "up":
+                    return "sell"
+                elif position == "short" and trend_direction != "down":
+                    return "buy"
+
+        # Mean Reversion logic (only if not trending)
+        if not is_trending:
+            result = self.mr.calculate(window)
+            if result["oversold"] and position != "long":
                 return "buy"
+            elif result["overbought"] and position != "short":
+                return "sell"
+
+        return None
+
+    def on_series(self, closes):
+        """
+        Vectorized: the trend and z-score inputs come from the rolling kernels for
+        every bar at once. Buys and sells only move between long and flat, so the
+        states are the last signal carried forward, which matches strategy_states
+        (NaN bars stay flat and do not advance the window).
+        """
+        start = time.perf_counter_ns()
+        values = np.asarray(closes, dtype=np.float64)
+        states = np.zeros(values.shape)
+        for j in range(values.shape[1]):
+            valid = ~np.isnan(values[:, j])
+            states[valid, j] = self._series_states(values[valid, j])
+        self.timing.record("on_series", "-", time.perf_counter_ns() - start)
+        return states
+
+    def series_stream(self):
+        return MeanReversionStream(self)
+
+    def _series_states(self, prices):
+        from ..multi_asset import carry_forward
+
+        events = self._events(prices)
+        events[:self.warmup] = np.nan  # strategy_states decides once it holds more than warmup bars
+        # The last signal carried forward; flat before the first one.
+        return carry_forward(events[:, None])[:, 0]
+
+    def _events(self, prices, cache: bool = True):
+        """
+        1 (buy), 0 (sell) or NaN per bar, ignoring warmup. Every input is a window of at most
+        warmup prices, so a chunk with warmup - 1 prices of history in front gets the same values.
+        """
+        # Indicator inputs are cached by content, so sweeping thresholds reuses them.
+        fp = fingerprint(prices) if cache and self.use_cache else None
+        short_ema = self.cached(fp, "window_ema", {"window": self.short_window},
+                                lambda: rolling_window_ema(prices, self.short_window))
+        long_ema = self.cached(fp, "window_ema", {"window": self.long_window},
+                               lambda: rolling_window_ema(prices, self.long_window))
+        trend_slope = self.cached(fp, "slope", {"window": self.long_window},
+                                  lambda: rolling_slope(prices, self.long_window))
+        z = self.cached(fp, "zscore", {"window": self.mr.window}, lambda: rolling_zscore(prices, self.mr.window))
+
+        with np.errstate(invalid="ignore"):
+            up = (trend_slope > self.slope_threshold) & (short_ema > long_ema)
+            down = (trend_slope < -self.slope_threshold) & (short_ema < long_ema)
+            sideways = ~(up | down)
+            buy = up | (sideways & (z < -self.mr.threshold))
+            sell = down | (sideways & (z > self.mr.threshold))
+        return np.where(buy, 1.0, np.where(sell, 0.0, np.nan))
+
+
+class MeanReversionStream:
+    """
+    MeanReversionStrategy.on_series over consecutive chunks of one long series (see
+    Strategy.series_stream). Per column it keeps the last warmup - 1 prices, the count of
+    prices seen and the position: all the rolling kernels and the carried signal need.
+    """
+
+    def __init__(self, strategy: MeanReversionStrategy):
+        self.strategy = strategy
+        self._columns = None  # per column: [last prices, prices seen, 1 x 1 position]
+
+    def __call__(self, closes) -> np.ndarray:
+        from ..multi_asset import carry_forward
+
+        values = np.asarray(closes, dtype=np.float64)
+        if self._columns is None:
+            self._columns = [[np.empty(0), 0, None] for _ in range(values.shape[1])]
+        warmup = self.strategy.warmup
+        states = np.zeros(values.shape)
+        for j, column in enumerate(self._columns):
+            history, seen, position = column
+            valid = ~np.isnan(values[:, j])
+            prices = values[valid, j]
+            if not len(prices):
+                continue
+            extended = np.concatenate((history, prices))
+            events = self.strategy._events(extended, cache=False)[len(history):]
+            events[:max(0, warmup - seen)] = np.nan
+            filled = carry_forward(events[:, None], position)
+            states[valid, j] = filled[:, 0]
+            column[:] = [extended[max(0, len(extended) - (warmup - 1)):], seen + len(prices), filled[-1:]]
+        return states
+
+
+_default = MeanReversionStrategy()
 
-    # Mean Reversion logic (only if not trending)
-    if not is_trending:
-        result = mr.calculate(data_window)
-       # print(f"[MR] Price: {latest_price:.2f} | Oversold: {result['oversold']} | Overbought: {result['overbought']}")
-        if result["oversold"] and current_position != "long":
-            return "buy"
-        elif result["overbought"] and current_position != "short":
-            return "sell"
 
-    return None
\ No newline at end of file
+def strategy_mean_reversion(data_window: list, current_position: str = None) -> str:
+    """Function form of MeanReversionStrategy with the default parameters."""
+    return _default.on_bar(data_window, current_position)
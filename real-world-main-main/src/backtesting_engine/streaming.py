@@ -0,0 +1,77 @@
+# src/backtesting_engine/streaming.py
+"""
+Backtests over price files larger than memory, one chunk at a time:
+
+    chunks = open_chunks("btcusdt_price_log.csv", chunksize=1_000_000)  # tick log, bar CSV or columnar dir
+    portfolio = run_chunked_backtest(chunks, create_strategy("mean_reversion"), initial_capital=1_000_000)
+
+Every chunk goes through the in-memory steps (forward fill, on_series,
+target_weights, run_multi_asset_backtest) and the state that crosses a chunk
+boundary is carried explicitly: the last close per symbol for the forward
+fill, Strategy.series_stream() for indicator windows and positions, and
+run_multi_asset_backtest(carry=...) for pending targets. Memory follows the
+chunk size and the indicator windows, not the file, and the trades and equity
+curve match an in-memory run over the whole file bar for bar. The equity curve
+(two floats per bar) and the trade log are the only results that keep growing.
+"""
+import os
+import time
+
+import pandas as pd
+
+from price_engine.tick_files import ColumnarFile, read_csv_chunks, read_tick_log_chunks
+
+from .multi_asset import run_multi_asset_backtest, target_weights
+from .portfolio import Portfolio
+
+
+def open_chunks(path: str, chunksize: int = 1_000_000):
+    """Chunks of closes from a columnar directory, a headerless tick log or a CSV with a header."""
+    if os.path.isdir(path):
+        return ColumnarFile(path).chunks(chunksize)
+    with open(path) as f:
+        fields = f.readline().split(",")
+    try:
+        float(fields[1])
+    except (IndexError, ValueError):
+        return read_csv_chunks(path, chunksize)
+    return read_tick_log_chunks(path, chunksize)
+
+
+def forward_fill_chunks(chunks):
+    """Forward fill gaps as align_closes does, continuing from the previous chunk's last row."""
+    last = None
+    for chunk in chunks:
+        if last is not None:
+            chunk = pd.concat((last, chunk)).ffill().iloc[1:]
+        else:
+            chunk = chunk.ffill()
+        if len(chunk):
+            last = chunk.iloc[-1:]
+        yield chunk
+
+
+def run_chunked_backtest(chunks, strategy, initial_capital: float, allocations=None, mode: str = "fixed",
+                         rebalance_every: int = None, lot_size: float = 1.0, execution=None) -> Portfolio:
+    """
+    :param chunks: Closes DataFrames in time order with the same columns, e.g. from open_chunks().
+    :param strategy: A Strategy; its series_stream() turns each chunk into position states.
+    :param allocations: Per-symbol fractions for target_weights; equal slices by default.
+    :return: The portfolio, as run_multi_asset_backtest returns it for the whole series.
+    """
+    portfolio = Portfolio(initial_capital=initial_capital, execution=execution)
+    stream = strategy.series_stream()
+    carry = {}
+    columns = None
+    for closes in forward_fill_chunks(chunks):
+        if columns is None:
+            columns = list(closes.columns)
+        elif list(closes.columns) != columns:
+            raise ValueError(f"Chunk columns {list(closes.columns)} differ from {columns}")
+        start = time.perf_counter_ns()
+        states = stream(closes)
+        strategy.timing.record("series_stream", "-", time.perf_counter_ns() - start)
+        run_multi_asset_backtest(closes, target_weights(states, allocations, mode=mode), initial_capital,
+                                 rebalance_every=rebalance_every, lot_size=lot_size, portfolio=portfolio,
+                                 carry=carry)
+    return portfolio
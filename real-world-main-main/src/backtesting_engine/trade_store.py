@@ -0,0 +1,195 @@
+# src/backtesting_engine/trade_store.py
+from enum import IntEnum
+import numpy as np
+
+
+class Action(IntEnum):
+    BUY = 0
+    SELL = 1
+    SHORT = 2
+    BUY_TO_COVER = 3
+
+
+_NOTES = {Action.SELL: "long position", Action.BUY_TO_COVER: "short position"}
+
+
+class _GrowableColumns:
+    """Preallocated numpy columns that double in capacity when full."""
+
+    def __init__(self, dtypes: dict, capacity: int):
+        self.size = 0
+        self.capacity = capacity
+        self.columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in dtypes.items()}
+
+    def _reserve(self, extra: int):
+        needed = self.size + extra
+        if needed <= self.capacity:
+            return
+        capacity = max(needed, self.capacity * 2)
+        for name, column in self.columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self.columns[name] = grown
+        self.capacity = capacity
+
+    def view(self, name: str) -> np.ndarray:
+        return self.columns[name][:self.size]
+
+
+class TradeLog(_GrowableColumns):
+    """
+    Struct-of-arrays trade log with per-action running counters.
+
+    Still behaves like the old list of dicts for existing callers: len(),
+    iteration, indexing and append()/extend() all work with dict records.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        super().__init__({"action": np.int8, "symbol": np.int32, "price": np.float64, "qty": np.float64,
+                          "pnl": np.float64, "fee": np.float64}, capacity)
+        self.symbols = []
+        self._symbol_ids = {}
+        self.counts = [0] * len(Action)
+
+    def _symbol_id(self, symbol: str) -> int:
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._symbol_ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return symbol_id
+
+    def record(self, action: Action, symbol: str, price: float, qty: float, pnl: float = np.nan,
+               fee: float = 0.0):
+        """
+        :param pnl: PnL realized by a closing fill (before fees); NaN for fills that only open.
+        :param fee: Commission paid on the fill.
+        """
+        self._reserve(1)
+        i = self.size
+        cols = self.columns
+        cols["action"][i] = action
+        cols["symbol"][i] = self._symbol_id(symbol)
+        cols["price"][i] = price
+        cols["qty"][i] = qty
+        cols["pnl"][i] = pnl
+        cols["fee"][i] = fee
+        self.size = i + 1
+        self.counts[action] += 1
+
+    def append(self, trade: dict):
+        pnl = trade.get("pnl")
+        self.record(Action[trade["action"]], trade["symbol"], trade["price"], trade["qty"],
+                    np.nan if pnl is None else pnl, trade.get("fee", 0.0))
+
+    def extend(self, trades):
+        if isinstance(trades, TradeLog):
+            n = trades.size
+            self._reserve(n)
+            remap = np.array([self._symbol_id(s) for s in trades.symbols], dtype=np.int32)
+            end = self.size + n
+            self.columns["action"][self.size:end] = trades.view("action")
+            self.columns["symbol"][self.size:end] = remap[trades.view("symbol")] if n else []
+            self.columns["price"][self.size:end] = trades.view("price")
+            self.columns["qty"][self.size:end] = trades.view("qty")
+            self.columns["pnl"][self.size:end] = trades.view("pnl")
+            self.columns["fee"][self.size:end] = trades.view("fee")
+            self.size = end
+            self.counts = [a + b for a, b in zip(self.counts, trades.counts)]
+        else:
+            for trade in trades:
+                self.append(trade)
+
+    def count(self, action) -> int:
+        """O(1) number of trades with the given action (Action or its name)."""
+        if isinstance(action, str):
+            action = Action[action.upper()]
+        return self.counts[action]
+
+    def _to_dict(self, i: int) -> dict:
+        action = Action(int(self.columns["action"][i]))
+        trade = {
+            "action": action.name,
+            "symbol": self.symbols[self.columns["symbol"][i]],
+            "price": float(self.columns["price"][i]),
+            "qty": float(self.columns["qty"][i]),
+        }
+        if action in _NOTES:
+            trade["note"] = _NOTES[action]
+        pnl = self.columns["pnl"][i]
+        if not np.isnan(pnl):
+            trade["pnl"] = float(pnl)
+        fee = self.columns["fee"][i]
+        if fee:
+            trade["fee"] = float(fee)
+        return trade
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for i in range(self.size):
+            yield self._to_dict(i)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._to_dict(i) for i in range(*index.indices(self.size))]
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("trade index out of range")
+        return self._to_dict(index)
+
+    def to_dataframe(self):
+        import pandas as pd
+        return pd.DataFrame({
+            "action": [Action(a).name for a in self.view("action")],
+            "symbol": [self.symbols[s] for s in self.view("symbol")],
+            "price": self.view("price"),
+            "qty": self.view("qty"),
+            "pnl": self.view("pnl"),
+            "fee": self.view("fee"),
+        })
+
+
+class EquityCurve(_GrowableColumns):
+    """
+    Preallocated float64 net-worth history; list-like for existing callers.
+    Alongside each value it keeps the gross exposure (sum of |qty| * price).
+    """
+
+    def __init__(self, capacity: int = 4096):
+        super().__init__({"value": np.float64, "exposure": np.float64}, capacity)
+
+    def append(self, value: float, exposure: float = 0.0):
+        self._reserve(1)
+        self.columns["value"][self.size] = value
+        self.columns["exposure"][self.size] = exposure
+        self.size += 1
+
+    def extend(self, values, exposure=None):
+        """Append a block of values (and matching exposures) in one copy."""
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        self._reserve(n)
+        end = self.size + n
+        self.columns["value"][self.size:end] = values
+        self.columns["exposure"][self.size:end] = 0.0 if exposure is None else exposure
+        self.size = end
+
+    def to_numpy(self) -> np.ndarray:
+        """Zero-copy view of the recorded values."""
+        return self.view("value")
+
+    def exposure(self) -> np.ndarray:
+        return self.view("exposure")
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return iter(self.to_numpy().tolist())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.to_numpy()[index]
+        return float(self.to_numpy()[index])
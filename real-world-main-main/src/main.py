@@ -1,21 +1,23 @@
 # src/main.py
 import time 
 import argparse
-import asyncio
 from colorama import Fore, Style
 from datetime import datetime
-from tabulate import tabulate
-import plotly.graph_objs as go
 
-
-from price_engine.aggregator import PriceAggregator
-from price_engine.price_calculator import PriceCalculator
-from price_engine.indicators.bollinger_bands import BollingerBands
-from price_engine.indicators.mean_reversion import MeanReversion
-from price_engine.api_handler import fetch_price_from_api
-from price_engine.data_sources.websocket_handler import BinanceWebSocketClient
-from price_engine.price_stream_to_csv import stream_prices_to_csv
-from price_engine.live_price_plot import plot_live_price
+# Every mode imports what it needs when it runs, so e.g. api-live never loads
+# pandas, plotly, matplotlib or yfinance. `python scripts/import_report.py`
+# times the imports of each mode; keep this table in step with the run_* functions.
+MODE_IMPORTS = {
+    "live": ["price_engine.aggregator", "price_engine.indicators.bollinger_bands",
+             "price_engine.indicators.mean_reversion"],
+    "api-live": ["price_engine.api_handler"],
+    "ws-live": ["price_engine.aggregator", "price_engine.data_sources.websocket_handler"],
+    "historical": ["price_engine.aggregator", "tabulate", "price_engine.indicators.bollinger_bands",
+                   "price_engine.indicators.mean_reversion"],
+    "stream-to-csv": ["price_engine.price_stream_to_csv"],
+    "live-plot": ["price_engine.live_price_plot"],
+    "daemon": ["backtesting_engine.daemon"],
+}
 
 def parse_args():
     """Parse command-line arguments."""
@@ -23,9 +25,10 @@ def parse_args():
     parser.add_argument(
         "--mode",
         type=str,
-        choices=["live", "api-live", "ws-live", "historical", "stream-to-csv", "live-plot"],
+        choices=["live", "api-live", "ws-live", "historical", "stream-to-csv", "live-plot", "daemon"],
         required=True,
-         help="Mode to run: 'live', 'api-live', 'ws-live', 'historical', 'stream-to-csv', or 'live-plot'.",
+         help="Mode to run: 'live', 'api-live', 'ws-live', 'historical', 'stream-to-csv', 'live-plot', "
+              "or 'daemon' (long-running engine with a local control API; --symbol are its first subscriptions).",
     )
     parser.add_argument(
         "--symbol",
@@ -71,10 +74,39 @@ def parse_args():
     action="store_true",
     help="Show interactive price trend plot (only for historical mode).",
     )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        dest="metrics_port",
+        help="Expose Prometheus metrics on http://127.0.0.1:<port>/metrics while running.",
+    )
+    parser.add_argument(
+        "--db",
+        type=str,
+        help="Persist every fetched quote and WebSocket trade to this SQLite file (batched, WAL mode, "
+             "one partition per symbol and day, with 1m/1h OHLC rollups).",
+    )
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=7,
+        dest="retention_days",
+        help="Days of raw ticks kept in --db (default: 7). Rollups are kept longer.",
+    )
+    parser.add_argument(
+        "--control-port",
+        type=int,
+        default=8765,
+        dest="control_port",
+        help="Port of the daemon's control API on 127.0.0.1 (default: 8765).",
+    )
     return parser.parse_args()
 
 def run_live_mode(aggregator, symbols: list[str], window: int, std_dev: float):
     """Fetch and display live prices with indicators."""
+    from price_engine.indicators.bollinger_bands import BollingerBands
+    from price_engine.indicators.mean_reversion import MeanReversion
+
     for symbol in symbols:
         # Fetch prices and calculate weighted average
         prices = aggregator.get_all_prices(symbol)
@@ -82,14 +114,14 @@ def run_live_mode(aggregator, symbols: list[str], window: int, std_dev: float):
             print(f"No prices available for symbol {symbol}")
             continue
 
-        prices = PriceCalculator.handle_outliers(prices)
-        weights = {source: info["weight"] for source, info in aggregator.sources.items()}
-        weighted_avg_price = PriceCalculator.calculate_weighted_average(prices, weights)
+        # Median/MAD filtered, weighted by source, quote age and source latency; the quotes
+        # shown are the ones the consolidator saw, marked where it left them out.
+        weighted_avg_price, quotes = aggregator.get_consolidated_quotes(symbol)
 
         # Display current prices
         print(f"\nLive Prices for {symbol} from all sources:")
-        for source, price in prices.items():
-            print(f"{source}: {price}")
+        for source, (price, used) in quotes.items():
+            print(f"{source}: {price}" + ("" if used else " (excluded: outlier or stale)"))
         print(f"\nWeighted Average Price: {weighted_avg_price}")
 
         # Get price history for indicators
@@ -120,6 +152,8 @@ def run_live_mode(aggregator, symbols: list[str], window: int, std_dev: float):
 
 
 def run_stream_to_csv_mode(symbols, asset_type):
+    from price_engine.price_stream_to_csv import stream_prices_to_csv
+
     print(f"💾 Starting CSV stream for {', '.join(symbols)} ({asset_type})...")
     try:
         stream_prices_to_csv(symbols=symbols, asset_type=asset_type)
@@ -127,14 +161,20 @@ def run_stream_to_csv_mode(symbols, asset_type):
         print(f"\n{Fore.RED}Stopped CSV streaming.{Style.RESET_ALL}")
 
 def run_live_plot_mode(symbols, asset_type):
+    from price_engine.live_price_plot import plot_live_price
+
     print(f"📈 Starting live plot for {', '.join(symbols)} ({asset_type})...")
     try:
-        plot_live_price(symbols=symbol_list, asset_type=args.asset_type)
+        plot_live_price(symbols=symbols, asset_type=asset_type)
     except KeyboardInterrupt:
         print(f"\n{Fore.RED}Stopped live plotting.{Style.RESET_ALL}")
 
 def run_historical_mode(aggregator, symbol: str, from_date: str, to_date: str, window: int, std_dev: float, args):
     """Fetch and display historical prices with indicators."""
+    from tabulate import tabulate
+    from price_engine.indicators.bollinger_bands import BollingerBands
+    from price_engine.indicators.mean_reversion import MeanReversion
+
     # Get historical prices
     historical_prices = aggregator.get_historical_prices(symbol, from_date, to_date)
     
@@ -200,6 +240,8 @@ def run_historical_mode(aggregator, symbol: str, from_date: str, to_date: str, w
     
     # Optional interactive plotting with Plotly
     if args.plot:
+        import plotly.graph_objs as go
+
         dates = [entry["date"] for entry in historical_prices]
         prices = [entry["price"] for entry in historical_prices]
 
@@ -256,6 +298,8 @@ def run_historical_mode(aggregator, symbol: str, from_date: str, to_date: str, w
 
 def run_api_live_mode(symbol: str, asset_type: str):
     """Fetch live price using API handler and print every 5 seconds."""
+    from price_engine.api_handler import fetch_price_from_api
+
     print(f"🔄 Starting API polling for {symbol} ({asset_type})...\n")
     try:
         while True:
@@ -269,13 +313,25 @@ def run_api_live_mode(symbol: str, asset_type: str):
     except KeyboardInterrupt:
         print(f"\n{Fore.RED}Stopped API live mode.{Style.RESET_ALL}")
 
-def run_websocket_live_mode(symbols):
+def run_websocket_live_mode(symbols, sink=None):
     """Run real-time streaming using WebSocket."""
+    from price_engine.aggregator import PriceAggregator
+
     print(f"🛰️ Subscribing to {', '.join(symbols).upper()} WebSocket stream...\n")
-    aggregator = PriceAggregator(asset_type="crypto", symbols=symbols)
+    aggregator = PriceAggregator(asset_type="crypto", symbols=symbols, sink=sink)
     client = aggregator.sources["binance_ws"]["handler"]
     client.start()
 
+def run_daemon_mode(symbols, args):
+    """Run the engine daemon until SIGINT/SIGTERM or POST /shutdown."""
+    from backtesting_engine.daemon import Engine
+
+    engine = Engine(db_path=args.db, retention_days=args.retention_days).start(port=args.control_port)
+    engine.subscribe(symbols)
+    print(f"🛠️ Engine daemon listening on {engine.url} (streams: {', '.join(symbols)})")
+    engine.run()
+    print(f"\n{Fore.RED}Engine daemon stopped.{Style.RESET_ALL}")
+
 
 if __name__ == "__main__":
     args = parse_args()
@@ -292,8 +348,22 @@ if __name__ == "__main__":
         print("Warning: Window size too small. Setting to minimum value of 5.")
         args.window = 5
 
-    # Initialize the appropriate aggregator
-    aggregator = PriceAggregator(asset_type=args.asset_type, symbols=symbol_list)
+    if args.metrics_port:
+        from price_engine.telemetry import start_metrics_server
+        start_metrics_server(port=args.metrics_port)
+        print(f"📡 Metrics available at http://127.0.0.1:{args.metrics_port}/metrics")
+
+    database = None
+    if args.db and args.mode != "daemon":  # the daemon owns its recorder
+        from price_engine.database import PartitionedPriceDatabase
+        database = PartitionedPriceDatabase(args.db, batched=True, retention_days=args.retention_days)
+
+    # Only the modes that read through the aggregator build one; its sources are
+    # themselves constructed on first use.
+    aggregator = None
+    if args.mode in ("live", "historical"):
+        from price_engine.aggregator import PriceAggregator
+        aggregator = PriceAggregator(asset_type=args.asset_type, symbols=symbol_list, sink=database)
 
     if args.mode == "live":
         run_live_mode(aggregator, [s.upper() for s in args.symbol], window=args.window, std_dev=args.std_dev)
@@ -302,7 +372,7 @@ if __name__ == "__main__":
         run_api_live_mode(args.symbol, args.asset_type)
 
     elif args.mode == "ws-live":
-        run_websocket_live_mode(symbol_list)
+        run_websocket_live_mode(symbol_list, sink=database)
     
     elif args.mode == "stream-to-csv":
         run_stream_to_csv_mode(symbol_list, args.asset_type)
@@ -310,10 +380,16 @@ if __name__ == "__main__":
     elif args.mode == "live-plot":
         run_live_plot_mode(symbol_list, args.asset_type)
 
+    elif args.mode == "daemon":
+        run_daemon_mode(symbol_list, args)
+
     elif args.mode == "historical":
         if not args.from_date or not args.to_date:
             print("Error: --from and --to dates are required for historical mode.")
         else:
             for symbol in args.symbol:
                  run_historical_mode(aggregator, symbol=symbol, from_date=args.from_date, to_date=args.to_date,
-                        window=args.window, std_dev=args.std_dev, args=args)
\ No newline at end of file
+                        window=args.window, std_dev=args.std_dev, args=args)
+
+    if database is not None:
+        database.close()
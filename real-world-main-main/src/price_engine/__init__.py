@@ -1,5 +1,17 @@
-# src/price_engine/__init__.py
-from .indicators.bollinger_bands import BollingerBands
-from .indicators.mean_reversion import MeanReversion
+import importlib
 
-__all__ = ["BollingerBands", "MeanReversion"]
\ No newline at end of file
+__all__ = ["BollingerBands", "MeanReversion"]
+
+# Resolved on first use so that importing any price_engine module does not pull in numpy.
+_LAZY = {
+    "BollingerBands": ".indicators.bollinger_bands",
+    "MeanReversion": ".indicators.mean_reversion",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,14 +1,45 @@
 # src/price_engine/aggregator.py
-from .data_sources.binance_api import BinanceAPI
-from .data_sources.coingecko_api import CoinGeckoAPI
-from .data_sources.coinbase_api import CoinbaseAPI
-from .data_sources.yahoo_finance import YahooFinanceAPI
 from .price_calculator import PriceCalculator
+from .consolidator import PriceConsolidator
+from .quote_cache import QuoteCache
+from .resilience import SourceGuard, SourceUnavailable
 from .price_history import PriceHistory
-from .data_sources.websocket_handler import BinanceWebSocketClient
+from .telemetry import REGISTRY
 import asyncio
+import importlib
 import inspect
-import pandas as pd
+import time
+
+import numpy as np
+
+SOURCE_QUOTES = REGISTRY.counter("price_engine_source_quotes_total", "Quotes returned by each data source")
+SOURCE_EMPTY = REGISTRY.counter("price_engine_source_empty_total", "Fetches that returned no price")
+SOURCE_ERRORS = REGISTRY.counter("price_engine_source_errors_total", "Fetches that raised an error")
+SOURCE_LATENCY = REGISTRY.histogram("price_engine_source_fetch_seconds", "Per-source quote fetch latency")
+
+
+class LazySource(dict):
+    """
+    A source's settings dict whose "handler" is only built on first access, so
+    the data source module (and yfinance, requests sessions, websocket-client
+    behind it) is imported and constructed only if the source is actually used.
+    """
+
+    def __init__(self, module: str, class_name: str, handler_kwargs: dict = None, **settings):
+        super().__init__(**settings)
+        self._factory = (module, class_name, handler_kwargs or {})
+
+    def __missing__(self, key):
+        if key != "handler":
+            raise KeyError(key)
+        module, class_name, kwargs = self._factory
+        handler = getattr(importlib.import_module(module, __package__), class_name)(**kwargs)
+        self["handler"] = handler
+        return handler
+
+    @property
+    def built(self) -> bool:
+        return "handler" in self
 
 
 def run_async(coro):
@@ -22,30 +53,84 @@ def is_async_callable(method):
 
 
 class PriceAggregator:
-    def __init__(self, asset_type: str = "crypto", symbols=None):
+    def __init__(self, asset_type: str = "crypto", symbols=None, sink=None, ttls: dict = None):
         """
         Initialize with asset type (crypto/stock).
         Defaults to crypto for backward compatibility.
+        :param sink: Optional tick store (e.g. a batched PriceDatabase); every quote is passed
+            to sink.insert_price(source, symbol, price), including WebSocket trades.
+        :param ttls: Per-source overrides of how long (seconds) a cached quote is served
+            before the source is fetched again.
         """
         self.asset_type = asset_type.lower()
         self.symbols = symbols or []
+        self.sink = sink
+        self.quotes = QuoteCache()
         self.sources = self._initialize_sources()
+        for source_name, ttl in (ttls or {}).items():
+            if source_name in self.sources:
+                self.sources[source_name]["ttl"] = ttl
+        # Token bucket + circuit breaker per source; see resilience.py.
+        self.guards = {name: SourceGuard(name, **info.get("limits", {})) for name, info in self.sources.items()}
         self.price_history = PriceHistory()
+        self.consolidator = PriceConsolidator({name: info["weight"] for name, info in self.sources.items()})
 
     def _initialize_sources(self):
-        """Initialize data sources based on asset type."""
+        """
+        Initialize data sources based on asset type. Handlers are built lazily (see LazySource).
+        ttl is how long a cached quote from the source is served before it is refetched;
+        binance_ws is a stream with no REST fallback and is only ever read from the cache it fills.
+        limits are the SourceGuard settings: healthy request rate (per second) and burst.
+        """
         if self.asset_type == "stock":
             return {
-                "yahoo": {"handler": YahooFinanceAPI(), "weight": 1.0}
+                "yahoo": LazySource(".data_sources.yahoo_finance", "YahooFinanceAPI", weight=1.0, ttl=15.0,
+                                    limits={"rate": 1.0, "burst": 5})
             }
         else:  # crypto
             return {
-                "binance_ws": {"handler": BinanceWebSocketClient(self.symbols), "weight": 0.4},
-                "binance": {"handler": BinanceAPI(), "weight": 0.4},
-                "coingecko": {"handler": CoinGeckoAPI(), "weight": 0.3},
-                "coinbase": {"handler": CoinbaseAPI(), "weight": 0.3}
+                "binance_ws": LazySource(".data_sources.websocket_handler", "BinanceWebSocketClient",
+                                         {"symbols": self.symbols, "sink": self.sink, "quotes": self.quotes},
+                                         weight=0.4, ttl=5.0, stream=True),
+                "binance": LazySource(".data_sources.binance_api", "BinanceAPI", weight=0.4, ttl=2.0,
+                                      limits={"rate": 10.0, "burst": 20}),
+                "coingecko": LazySource(".data_sources.coingecko_api", "CoinGeckoAPI", weight=0.3, ttl=30.0,
+                                        limits={"rate": 0.5, "burst": 3}),
+                "coinbase": LazySource(".data_sources.coinbase_api", "CoinbaseAPI", weight=0.3, ttl=5.0,
+                                       limits={"rate": 5.0, "burst": 10})
             }
 
+    def start_streams(self):
+        """Open the streaming sources' connections in the background so they keep the quote cache warm."""
+        for source_info in self.sources.values():
+            if not source_info.get("stream"):
+                continue
+            handler = source_info["handler"]
+            if hasattr(handler, "create_ws"):
+                for symbol in self.symbols:
+                    if symbol not in handler.connections:
+                        handler.create_ws(symbol)
+
+    def _cached_quote(self, source_name: str, source_info: dict, symbol: str):
+        """Fresh cached price for the source, or None when it has to be fetched (or cannot be)."""
+        return self.quotes.get(source_name, symbol, source_info.get("ttl", 0.0))
+
+    def _guarded_call(self, source_name: str, handler, get_price, arg):
+        """Call get_price through the source's rate limiter and circuit breaker."""
+        return self.guards[source_name].call(get_price, arg, headers=lambda: getattr(handler, "last_headers", None))
+
+    def _record_quote(self, source_name: str, symbol: str, price: float, elapsed_ns: int):
+        SOURCE_LATENCY.observe_ns(elapsed_ns, source=source_name)
+        self.consolidator.observe_latency(source_name, elapsed_ns / 1e9)
+        if price is None:
+            SOURCE_EMPTY.inc(source=source_name)
+            return
+        SOURCE_QUOTES.inc(source=source_name)
+        self.quotes.put(source_name, symbol, price)
+        self.price_history.add_price(symbol, source_name, price)
+        if self.sink is not None:
+            self.sink.insert_price(source_name, symbol, price)
+
     def get_all_prices_async(self, symbol: str) -> dict:
         """
         Fetch prices from all sources asynchronously where supported.
@@ -53,6 +138,12 @@ class PriceAggregator:
         """
         prices = {}
         for source_name, source_info in self.sources.items():
+            cached = self._cached_quote(source_name, source_info, symbol)
+            if cached is not None:
+                prices[source_name] = cached
+                continue
+            if source_info.get("stream"):
+                continue
             handler = source_info["handler"]
             try:
                 get_price = getattr(handler, "get_price", None)
@@ -60,38 +151,80 @@ class PriceAggregator:
                     continue
 
                 if is_async_callable(get_price):
-                    price = run_async(get_price(symbol))
+                    fetch = lambda arg: run_async(get_price(arg))
                 else:
-                    price = get_price(symbol)
-
+                    fetch = get_price
+                start = time.monotonic_ns()
+                price = self._guarded_call(source_name, handler, fetch, symbol)
+                self._record_quote(source_name, symbol, price, time.monotonic_ns() - start)
                 if price is not None:
                     prices[source_name] = price
-                    self.price_history.add_price(symbol, source_name, price)
 
+            except SourceUnavailable:
+                continue
             except Exception as e:
+                SOURCE_ERRORS.inc(source=source_name)
                 print(f"Error fetching from {source_name}: {e}")
                 prices[source_name] = None
         return prices
 
     def get_all_prices(self, symbol: str) -> dict:
-        """Fetch prices from all available sources for the given symbol."""
+        """
+        Prices from all available sources for the given symbol. Quotes younger than their
+        source's ttl come from the cache; only stale sources are fetched.
+        """
         prices = {}
         for source_name, source_info in self.sources.items():
+            cached = self._cached_quote(source_name, source_info, symbol)
+            if cached is not None:
+                prices[source_name] = cached
+                continue
+            if source_info.get("stream") or not hasattr(source_info["handler"], "get_price"):
+                continue  # streaming source without a fresh quote
+            start = time.monotonic_ns()
             try:
+                handler = source_info["handler"]
                 if source_name == "coingecko" and self.asset_type == "crypto":
-                    coin_id = self._get_coin_id(symbol)
-                    price = source_info["handler"].get_price(coin_id)
+                    price = self._guarded_call(source_name, handler, handler.get_price, self._get_coin_id(symbol))
                 else:
-                    price = source_info["handler"].get_price(symbol)
-
+                    price = self._guarded_call(source_name, handler, handler.get_price, symbol)
+                self._record_quote(source_name, symbol, price, time.monotonic_ns() - start)
                 if price is not None:
                     prices[source_name] = price
-                    self.price_history.add_price(symbol, source_name, price)
+            except SourceUnavailable:
+                continue  # rate limited or breaker open: left out of this round
             except Exception as e:
+                SOURCE_ERRORS.inc(source=source_name)
                 print(f"Error fetching data from {source_name}: {e}")
                 prices[source_name] = None
         return prices
 
+    def get_consolidated_prices(self, symbols=None) -> dict:
+        """
+        One consolidated price per symbol from the latest quote of every source,
+        filtered by median/MAD and weighted by source weight, quote age and source latency.
+        """
+        symbols = list(symbols or self.symbols)
+        prices, ages = self.quotes.snapshot(symbols, self.consolidator.sources)
+        consolidated, _ = self.consolidator.consolidate(prices, ages)
+        return dict(zip(symbols, consolidated.tolist()))
+
+    def get_consolidated_quotes(self, symbol: str) -> tuple:
+        """
+        The consolidated price for symbol and the quotes behind it, as
+        {source: (price, used)}; used is False for stale quotes and robust_mask outliers.
+        """
+        prices, ages = self.quotes.snapshot([symbol], self.consolidator.sources)
+        consolidated, kept = self.consolidator.consolidate(prices, ages)
+        quotes = {source: (float(prices[0, i]), bool(kept[0, i]))
+                  for i, source in enumerate(self.consolidator.sources) if not np.isnan(prices[0, i])}
+        return float(consolidated[0]), quotes
+
+    def get_consolidated_price(self, symbol: str) -> float:
+        """Refresh stale sources for symbol and return the consolidated price (NaN if none survive)."""
+        self.get_all_prices(symbol)
+        return self.get_consolidated_prices([symbol])[symbol]
+
     def get_historical_prices(self, symbol: str, from_date: str, to_date: str) -> list:
         """Get historical prices for the symbol."""
         if self.asset_type == "stock":
@@ -130,11 +263,13 @@ class PriceAggregator:
                 print(f"Error fetching crypto historical prices from Binance: {e}")
                 return []
 
-    def fetch_historical_data(self, symbol: str, from_date: str, to_date: str) -> pd.DataFrame:
+    def fetch_historical_data(self, symbol: str, from_date: str, to_date: str) -> "pd.DataFrame":
         """
         Fetch historical price data in DataFrame format using internal logic.
         This wraps get_historical_prices into a DataFrame output.
         """
+        import pandas as pd
+
         try:
             raw_data = self.get_historical_prices(symbol, from_date, to_date)
 
@@ -0,0 +1,135 @@
+# src/price_engine/consolidator.py
+"""
+Consolidated price across sources, for one symbol or a whole universe at once.
+
+    consolidator = PriceConsolidator({"binance": 0.4, "coinbase": 0.3, "coingecko": 0.3})
+    prices = np.array([[64000.0, 64010.0, 71000.0],    # one row per symbol,
+                       [3100.0, np.nan, 3101.0]])       # one column per source
+    ages = np.array([[0.2, 1.5, 0.4], [0.1, 0.0, 9.0]])  # seconds since each quote
+    price, kept = consolidator.consolidate(prices, ages)
+
+Each quote is weighted by its source weight, decayed by age (half-life) and
+scaled down for sources that answer slowly. Quotes further than
+mad_threshold robust deviations from the median, or older than max_age, are
+dropped before the weighted mean. Everything is array maths over the
+symbols x sources matrix.
+"""
+import numpy as np
+
+from .telemetry import REGISTRY
+
+CONSOLIDATED = REGISTRY.counter("price_engine_consolidated_prices_total", "Consolidated prices produced")
+REJECTED = REGISTRY.counter("price_engine_rejected_quotes_total", "Quotes rejected as outliers by the consolidator")
+STALE = REGISTRY.counter("price_engine_stale_quotes_total", "Quotes ignored because they were older than max_age")
+
+# Scales the median absolute deviation to a standard deviation for normal data.
+MAD_SCALE = 1.4826
+
+
+def row_median(values: np.ndarray) -> np.ndarray:
+    """Median of each row ignoring NaN (NaN for rows with no values), without nanmedian's warnings."""
+    ordered = np.sort(values, axis=1)  # NaN sorts last
+    count = np.count_nonzero(~np.isnan(values), axis=1)
+    low = np.maximum((count - 1) // 2, 0)[:, None]
+    high = np.maximum(count // 2, 0)[:, None]
+    median = (np.take_along_axis(ordered, low, axis=1) + np.take_along_axis(ordered, high, axis=1))[:, 0] / 2
+    return np.where(count > 0, median, np.nan)
+
+
+def robust_mask(prices: np.ndarray, mad_threshold: float = 3.5, tolerance_bps: float = 5.0) -> np.ndarray:
+    """
+    True where a quote is within mad_threshold robust deviations of its row's median.
+    Deviations up to tolerance_bps of the median always pass, so sources that agree
+    to the tick (MAD of 0) do not reject a quote that is a hair away.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    median = row_median(prices)[:, None]
+    deviation = np.abs(prices - median)
+    mad = row_median(deviation)[:, None]
+    limit = np.maximum(mad_threshold * MAD_SCALE * mad, np.abs(median) * tolerance_bps / 10000)
+    return deviation <= limit  # False for NaN quotes
+
+
+class PriceConsolidator:
+    def __init__(self, weights: dict, half_life: float = 5.0, max_age: float = 30.0, mad_threshold: float = 3.5,
+                 tolerance_bps: float = 5.0, latency_scale: float = 0.25, latency_alpha: float = 0.2):
+        """
+        :param weights: Base weight per source; the column order of the price matrix.
+        :param half_life: Seconds after which a quote's weight has halved.
+        :param max_age: Quotes older than this (seconds) are ignored; None keeps them all.
+        :param mad_threshold: Robust z-score beyond which a quote is an outlier.
+        :param tolerance_bps: Deviation from the median that is never treated as an outlier.
+        :param latency_scale: Fetch latency (seconds) at which a source's weight is halved.
+        :param latency_alpha: Smoothing factor of the per-source latency average.
+        """
+        self.sources = list(weights)
+        self.index = {source: i for i, source in enumerate(self.sources)}
+        self.base_weights = np.array([weights[s] for s in self.sources], dtype=np.float64)
+        self.half_life = half_life
+        self.max_age = max_age
+        self.mad_threshold = mad_threshold
+        self.tolerance_bps = tolerance_bps
+        self.latency_scale = latency_scale
+        self.latency_alpha = latency_alpha
+        self.latency = np.full(len(self.sources), np.nan)
+
+    def observe_latency(self, source: str, seconds: float):
+        """Fold one fetch latency into the source's moving average."""
+        i = self.index.get(source)
+        if i is None:
+            return
+        previous = self.latency[i]
+        self.latency[i] = seconds if np.isnan(previous) else previous + self.latency_alpha * (seconds - previous)
+
+    def source_scores(self) -> np.ndarray:
+        """Per-source weight multiplier in (0, 1]: 1 for instant sources, 1/2 at latency_scale."""
+        latency = np.nan_to_num(self.latency, nan=0.0)
+        return 1.0 / (1.0 + latency / self.latency_scale) if self.latency_scale else np.ones(len(self.sources))
+
+    def consolidate(self, prices, ages=None):
+        """
+        :param prices: symbols x sources matrix, NaN where a source has no quote.
+        :param ages: Matching matrix of quote ages in seconds (None treats every quote as fresh).
+        :return: (consolidated price per symbol, NaN when nothing survives; mask of quotes used).
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        weights = np.where(np.isnan(prices), 0.0, self.base_weights * self.source_scores())
+        if ages is not None:
+            ages = np.asarray(ages, dtype=np.float64)
+            weights = weights * np.exp2(-np.maximum(ages, 0.0) / self.half_life)
+            if self.max_age is not None:
+                stale = (ages > self.max_age) & (weights > 0)
+                if stale.any():
+                    self._count(STALE, stale)
+                    weights[stale] = 0.0
+
+        live = np.where(weights > 0, prices, np.nan)
+        kept = robust_mask(live, self.mad_threshold, self.tolerance_bps)
+        rejected = (weights > 0) & ~kept
+        if rejected.any():
+            self._count(REJECTED, rejected)
+
+        weights = np.where(kept, weights, 0.0)
+        total = weights.sum(axis=1)
+        weighted = np.where(kept, prices, 0.0) * weights
+        consolidated = np.divide(weighted.sum(axis=1), total, out=np.full(len(total), np.nan), where=total > 0)
+        CONSOLIDATED.inc(int(np.count_nonzero(total > 0)))
+        return consolidated, kept
+
+    def consolidate_quotes(self, quotes: dict, ages: dict = None) -> float:
+        """Single-symbol convenience: {source: price} (and {source: age}) in, consolidated price out."""
+        row = np.full((1, len(self.sources)), np.nan)
+        age_row = None if ages is None else np.zeros((1, len(self.sources)))
+        for source, price in quotes.items():
+            i = self.index.get(source)
+            if i is None or price is None:
+                continue
+            row[0, i] = price
+            if ages is not None:
+                age_row[0, i] = ages.get(source, 0.0)
+        return float(self.consolidate(row, age_row)[0][0])
+
+    def _count(self, counter, mask):
+        for i, n in enumerate(np.count_nonzero(mask, axis=0)):
+            if n:
+                counter.inc(int(n), source=self.sources[i])
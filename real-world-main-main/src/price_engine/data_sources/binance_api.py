@@ -1,13 +1,20 @@
+# src/price_engine/data_sources/binance_api.py
 import requests
 
+from ..resilience import raise_for_rate_limit
+
 class BinanceAPI:
-    def __init__(self):
-        self.base_url = "https://api.binance.com/api/v3"
+    def __init__(self, base_url: str = "https://api.binance.com/api/v3", timeout: float = 2.0):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.last_headers = None  # rate-limit headers of the last response, read by SourceGuard
 
     def get_price(self, symbol: str) -> float:
         url = f"{self.base_url}/ticker/price"
         params = {"symbol": symbol}
-        response = requests.get(url, params=params)
+        response = requests.get(url, params=params, timeout=self.timeout)
+        self.last_headers = response.headers
+        raise_for_rate_limit(response, "Binance")
         if response.status_code == 200:
             return float(response.json()["price"])
         else:
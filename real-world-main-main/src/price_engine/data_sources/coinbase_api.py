@@ -3,19 +3,23 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from ..resilience import raise_for_rate_limit
+
 class CoinbaseAPI:
-    def __init__(self):
-        self.base_url = "https://api.coinbase.com/v2/prices"
+    def __init__(self, base_url: str = "https://api.coinbase.com/v2/prices", timeout: float = 2.0):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.last_headers = None  # rate-limit headers of the last response, read by SourceGuard
         self.session = self._create_session()
 
     def _create_session(self):
-        """Create a requests session with retry logic."""
+        """
+        Create a requests session that retries a failed connect once, immediately.
+        Slow or failing responses are not retried here: the aggregator's circuit
+        breaker backs off instead, so a quote never waits on a backoff sleep.
+        """
         session = requests.Session()
-        retries = Retry(
-            total=3,  # Number of retries
-            backoff_factor=1,  # Delay between retries (1s, 2s, 4s, etc.)
-            status_forcelist=[500, 502, 503, 504],  # Retry on these status codes
-        )
+        retries = Retry(total=1, connect=1, read=0, status=0, backoff_factor=0)
         adapter = HTTPAdapter(max_retries=retries)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
@@ -26,7 +30,9 @@ class CoinbaseAPI:
         coinbase_symbol = self._map_symbol(symbol)
         url = f"{self.base_url}/{coinbase_symbol}/spot"
         try:
-            response = self.session.get(url, timeout=5)  # Add a timeout
+            response = self.session.get(url, timeout=self.timeout)
+            self.last_headers = response.headers
+            raise_for_rate_limit(response, "Coinbase")
             response.raise_for_status()  # Raise an exception for HTTP errors
             data = response.json()
             if "data" in data and "amount" in data["data"]:
@@ -34,8 +40,8 @@ class CoinbaseAPI:
             else:
                 raise Exception(f"Invalid response from Coinbase: {data}")
         except requests.exceptions.RequestException as e:
-            print(f"Failed to fetch price from Coinbase: {e}")
-            return None  # Return None if the API fails
+            # Propagate so the caller's circuit breaker counts the failure.
+            raise Exception(f"Failed to fetch price from Coinbase: {e}") from e
 
     def _map_symbol(self, symbol: str) -> str:
         # Map common symbols to Coinbase's format
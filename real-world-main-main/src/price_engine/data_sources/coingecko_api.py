@@ -2,14 +2,20 @@
 import requests
 from datetime import datetime
 
+from ..resilience import raise_for_rate_limit
+
 class CoinGeckoAPI:
-    def __init__(self):
-        self.base_url = "https://api.coingecko.com/api/v3"
+    def __init__(self, base_url: str = "https://api.coingecko.com/api/v3", timeout: float = 3.0):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.last_headers = None  # rate-limit headers of the last response, read by SourceGuard
 
     def get_price(self, coin_id: str, vs_currency: str = "usd") -> float:
         url = f"{self.base_url}/simple/price"
         params = {"ids": coin_id, "vs_currencies": vs_currency}
-        response = requests.get(url, params=params)
+        response = requests.get(url, params=params, timeout=self.timeout)
+        self.last_headers = response.headers
+        raise_for_rate_limit(response, "CoinGecko")
         if response.status_code == 200:
             data = response.json()
             if coin_id in data and vs_currency in data[coin_id]:
@@ -0,0 +1,127 @@
+# src/price_engine/data_sources/depth_stream.py
+"""
+Binance <symbol>@depth stream client that keeps a local OrderBook per symbol:
+
+    client = BinanceDepthClient(["BTCUSDT"], on_book_update=lambda symbol, book: print(book.top()))
+    client.start()
+
+On every (re)connect it fetches a REST /depth snapshot and applies the buffered
+diff updates on top of it; a sequence gap triggers a new snapshot. A snapshot
+that fails (e.g. HTTP 429) or turns out older than the diffs backs off per
+symbol, so an out-of-sync book does not refetch 1000 levels on every diff.
+Streams run under the same supervisor as the trade client (reconnect,
+heartbeat, watchdog).
+"""
+import json
+import time
+
+import requests
+from colorama import Fore
+
+from ..order_book import OrderBook, SequenceGapError
+from ..telemetry import REGISTRY
+from .websocket_handler import WS_DROPPED, BinanceWebSocketClient
+
+BOOK_UPDATES = REGISTRY.counter("price_engine_book_updates_total", "Depth updates applied to local order books")
+BOOK_RESYNCS = REGISTRY.counter("price_engine_book_resyncs_total", "Order book snapshots fetched after a connect or a sequence gap")
+BOOK_DROPPED = REGISTRY.counter("price_engine_book_dropped_updates_total", "Depth updates dropped while a book was out of sync")
+
+
+class BinanceDepthClient(BinanceWebSocketClient):
+    stream = "depth@100ms"
+
+    def __init__(self, symbols, on_book_update=None, base_url="wss://stream.binance.com:9443/ws",
+                 rest_url="https://api.binance.com/api/v3", depth_limit=1000, quotes=None, **kwargs):
+        """
+        :param on_book_update: Optional callback(symbol, book) after every applied update;
+            book.top() gives bid/ask, their sizes and the microprice.
+        :param depth_limit: Levels per side requested in each REST snapshot.
+        :param quotes: Optional QuoteCache; the microprice is cached as source "binance_book".
+        """
+        super().__init__(symbols, base_url=base_url, rest_url=rest_url, quotes=quotes, **kwargs)
+        self.on_book_update = on_book_update
+        self.depth_limit = depth_limit
+        self.books = {symbol.upper(): OrderBook(symbol.upper()) for symbol in symbols}
+        # symbol -> (time.monotonic() before which no snapshot is fetched, next backoff delay)
+        self._resync_backoff = {}
+
+    def book(self, symbol: str) -> OrderBook:
+        return self.books[symbol.upper()]
+
+    def top(self, symbol: str):
+        """TopOfBook for symbol, or None while its book is out of sync."""
+        book = self.books.get(symbol.upper())
+        return book.top() if book is not None and book.synced else None
+
+    def snapshot(self, symbol: str) -> bool:
+        """Reload symbol's book from the REST depth endpoint."""
+        symbol = symbol.upper()
+        BOOK_RESYNCS.inc(symbol=symbol)
+        try:
+            response = requests.get(f"{self.rest_url}/depth", params={"symbol": symbol, "limit": self.depth_limit},
+                                    timeout=3)
+            response.raise_for_status()
+            self.books[symbol].apply_snapshot(response.json())
+        except (requests.RequestException, ValueError, KeyError) as e:
+            print(Fore.RED + f"Depth snapshot for {symbol} failed: {e}")
+            return False
+        return True
+
+    def resync(self, symbol: str) -> bool:
+        """
+        snapshot(symbol), unless an earlier resync of symbol is still backing off.
+        Each symbol's snapshots run on its stream's thread, so one is in flight at a time.
+        """
+        symbol = symbol.upper()
+        retry_at, _ = self._resync_backoff.get(symbol, (0.0, None))
+        if time.monotonic() < retry_at:
+            return False
+        if self.snapshot(symbol):
+            return True
+        self._back_off(symbol)
+        return False
+
+    def _back_off(self, symbol):
+        _, delay = self._resync_backoff.get(symbol, (0.0, self.backoff_initial))
+        self._resync_backoff[symbol] = (time.monotonic() + delay, min(delay * 2, self.backoff_max))
+
+    def _after_open(self, symbol, reconnected):
+        # Diffs sent while the snapshot downloads wait in the socket and are
+        # applied (or dropped as already included) once it is in place.
+        self.resync(symbol)
+
+    def on_message(self, ws, message):
+        try:
+            event = json.loads(message)
+            symbol = event["s"]
+            book = self.books[symbol]
+        except (ValueError, KeyError, TypeError):
+            WS_DROPPED.inc()
+            return
+        self.last_trade_at[symbol] = time.monotonic()
+        self.trade_counts[symbol] = self.trade_counts.get(symbol, 0) + 1
+        try:
+            applied = book.apply_diff(event)
+        except SequenceGapError:
+            if not self.resync(symbol):
+                BOOK_DROPPED.inc(symbol=symbol)
+                return
+            try:
+                applied = book.apply_diff(event)
+            except SequenceGapError:
+                # The snapshot is older than this update; a later one will try again.
+                self._back_off(symbol)
+                BOOK_DROPPED.inc(symbol=symbol)
+                return
+        if not applied:
+            return
+        self._resync_backoff.pop(symbol, None)
+        BOOK_UPDATES.inc(symbol=symbol)
+        if self.stale:
+            self.stale.discard(symbol)
+        if self.quotes is not None:
+            microprice = book.microprice()
+            if microprice is not None:
+                self.quotes.put("binance_book", symbol, microprice)
+        if self.on_book_update:
+            self.on_book_update(symbol, book)
@@ -1,23 +1,120 @@
 # C:\real-world-main\src\price_engine\data_sources\websocket_handler.py
 import websocket
 import threading
+import inspect
 import json
+import random
+import requests
+import socket
 import time
 from datetime import datetime
 from colorama import init, Fore
+from ..telemetry import REGISTRY
 
 init(autoreset=True)
 
+WS_MESSAGES = REGISTRY.counter("price_engine_ws_messages_total", "Trade messages received over WebSocket")
+WS_DROPPED = REGISTRY.counter("price_engine_ws_dropped_messages_total", "WebSocket messages dropped because they could not be decoded")
+WS_ERRORS = REGISTRY.counter("price_engine_ws_errors_total", "WebSocket errors reported by websocket-client")
+WS_CONNECTS = REGISTRY.counter("price_engine_ws_connects_total", "WebSocket connections opened")
+WS_RECONNECTS = REGISTRY.counter("price_engine_ws_reconnects_total", "WebSocket connections re-opened for a stream seen before")
+WS_OPEN = REGISTRY.gauge("price_engine_ws_open_connections", "Currently open WebSocket connections")
+WS_DUPLICATES = REGISTRY.counter("price_engine_ws_duplicate_trades_total", "Trades dropped because their id was already seen")
+WS_STALE = REGISTRY.counter("price_engine_ws_stale_total", "Streams restarted because no trade arrived within stale_after")
+WS_BACKFILLED = REGISTRY.counter("price_engine_ws_backfilled_trades_total", "Missed trades recovered over REST after a reconnect")
+WS_GAPS = REGISTRY.counter("price_engine_ws_unfilled_gaps_total", "Reconnects whose gap was longer than one REST page")
+
+
+def _stream_name(ws):
+    url = getattr(ws, "url", "") or ""
+    return url.rsplit("/", 1)[-1]
+
+def _stream_symbol(ws):
+    return _stream_name(ws).split("@", 1)[0].upper()
+
 class BinanceWebSocketClient:
-    def __init__(self, symbols, on_price_update=None):
+    stream = "trade"  # stream suffix: wss://.../ws/<symbol>@<stream>
+
+    def __init__(self, symbols, on_price_update=None, base_url="wss://stream.binance.com:9443/ws", sink=None,
+                 quotes=None, reconnect=True, rest_url="https://api.binance.com/api/v3", ping_interval=20,
+                 ping_timeout=10, stale_after=60.0, backoff_initial=0.5, backoff_max=30.0, on_stale=None):
+        """
+        Each symbol's stream runs under a supervisor thread: heartbeats (ping/pong), reconnects
+        with exponential backoff and jitter, and after a reconnect a REST backfill of the trades
+        missed while disconnected. Trades are de-duplicated by trade id.
+
+        :param reconnect: Restart a stream when it closes or drops (False runs each stream once).
+        :param rest_url: Binance REST base for the backfill (None disables it).
+        :param ping_interval: Seconds between client pings; a missing pong after ping_timeout drops the connection.
+        :param stale_after: A stream that delivers no trade for this many seconds is restarted (None disables).
+        :param on_stale: Optional callback(symbol) when a stream goes stale, e.g. to stop trading it.
+        """
         self.symbols = symbols
         self.previous_prices = {}
         self.on_price_update = on_price_update  # 💥 You missed this line earlier
+        self.base_url = base_url  # point at a local fake server for replays
+        self.connections = {}
+        self.sink = sink  # optional tick store with insert_price(source, symbol, price)
+        self.quotes = quotes  # optional QuoteCache kept current with every trade
+        self.reconnect = reconnect
+        self.rest_url = rest_url
+        self.ping_interval = ping_interval or 0
+        self.ping_timeout = ping_timeout if ping_interval else None
+        self.stale_after = stale_after
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.on_stale = on_stale
+        self.last_trade_ids = {}     # symbol -> highest trade id delivered
+        self.last_trade_at = {}      # symbol -> time.monotonic() of the last trade
+        self.trade_counts = {}       # symbol -> trades delivered
+        self.stale = set()
+        self._stopped = threading.Event()
+        self._watchdog = None
+        self._opened_streams = set()
+        # Connections that reached on_open; websocket-client also calls on_close
+        # when the connect itself fails, which must not lower WS_OPEN.
+        self._open_sockets = set()
+        # Callbacks that accept recv_ns get the tick's monotonic receive stamp
+        self._pass_recv_ns = self._accepts_recv_ns(on_price_update)
+
+    @staticmethod
+    def _accepts_recv_ns(callback):
+        if callback is None:
+            return False
+        try:
+            return "recv_ns" in inspect.signature(callback).parameters
+        except (TypeError, ValueError):
+            return False
 
     def on_message(self, ws, message):
-        data = json.loads(message)
-        symbol = data['s']
-        price = float(data['p'])
+        recv_ns = time.monotonic_ns()
+        try:
+            data = json.loads(message)
+            symbol = data['s']
+            price = float(data['p'])
+        except (ValueError, KeyError, TypeError):
+            WS_DROPPED.inc()
+            return
+        self._handle_trade(symbol, price, data.get('t'), recv_ns)
+
+    def _handle_trade(self, symbol, price, trade_id, recv_ns):
+        # A symbol's live trades and its backfill both run on that stream's own thread,
+        # so the check-and-set on its last trade id needs no lock.
+        if trade_id is not None:
+            last_id = self.last_trade_ids.get(symbol)
+            if last_id is not None and trade_id <= last_id:
+                WS_DUPLICATES.inc(symbol=symbol)
+                return
+            self.last_trade_ids[symbol] = trade_id
+        self.last_trade_at[symbol] = time.monotonic()
+        self.trade_counts[symbol] = self.trade_counts.get(symbol, 0) + 1
+        if symbol in self.stale:
+            self.stale.discard(symbol)
+        WS_MESSAGES.inc(symbol=symbol)
+        if self.quotes is not None:
+            self.quotes.put("binance_ws", symbol, price)
+        if self.sink is not None:
+            self.sink.insert_price("binance_ws", symbol, price)
 
         now = datetime.now().strftime('%H:%M:%S')
 
@@ -32,7 +129,11 @@ class BinanceWebSocketClient:
 
         # 🔄 Real-time strategy logic
         if self.on_price_update:
-            self.on_price_update(symbol, price)  # forward price to strategy
+            # forward price to strategy
+            if self._pass_recv_ns:
+                self.on_price_update(symbol, price, recv_ns=recv_ns)
+            else:
+                self.on_price_update(symbol, price)
         else:
             # 🖨️ Fancy print if no trading logic
             if diff_percent > 0:
@@ -48,36 +149,151 @@ class BinanceWebSocketClient:
             print(f"{color}[{now}] {symbol}: {price:.2f} {change}")
 
     def on_error(self, ws, error):
+        WS_ERRORS.inc(stream=_stream_name(ws))
         print(Fore.RED + f"WebSocket error: {error}")
 
     def on_close(self, ws, close_status_code, close_msg):
-        print(Fore.LIGHTBLACK_EX + "WebSocket closed.")
+        if ws in self._open_sockets:
+            self._open_sockets.discard(ws)
+            WS_OPEN.dec()
+        if self.reconnect and not self._stopped.is_set():
+            print(Fore.LIGHTBLACK_EX + f"WebSocket {_stream_name(ws)} closed; reconnecting.")
+        else:
+            print(Fore.LIGHTBLACK_EX + "WebSocket closed.")
 
     def on_open(self, ws):
+        stream = _stream_name(ws)
+        WS_CONNECTS.inc(stream=stream)
+        reconnected = stream in self._opened_streams
+        if reconnected:
+            WS_RECONNECTS.inc(stream=stream)
+        self._opened_streams.add(stream)
+        self._open_sockets.add(ws)
+        WS_OPEN.inc()
         print(Fore.CYAN + "WebSocket connection opened.")
+        self._after_open(_stream_symbol(ws), reconnected)
 
-    def create_ws(self, symbol):
+    def _after_open(self, symbol, reconnected):
+        # Runs before this connection's first message is read, so backfilled
+        # trades are delivered ahead of (and de-duplicated against) live ones.
+        if reconnected:
+            self.backfill(symbol)
+
+    def backfill(self, symbol: str) -> int:
+        """Deliver trades newer than the last one seen, fetched from the REST trades endpoint."""
+        symbol = symbol.upper()
+        last_id = self.last_trade_ids.get(symbol)
+        if last_id is None or not self.rest_url:
+            return 0
+        try:
+            response = requests.get(f"{self.rest_url}/trades", params={"symbol": symbol, "limit": 1000}, timeout=3)
+            response.raise_for_status()
+            trades = response.json()
+        except (requests.RequestException, ValueError) as e:
+            print(Fore.RED + f"Backfill for {symbol} failed: {e}")
+            return 0
+        missed = sorted((t for t in trades if t["id"] > last_id), key=lambda t: t["id"])
+        if missed and missed[0]["id"] > last_id + 1:
+            WS_GAPS.inc(symbol=symbol)  # older trades fell outside the page
+        recv_ns = time.monotonic_ns()
+        for trade in missed:
+            self._handle_trade(symbol, float(trade["price"]), trade["id"], recv_ns)
+        WS_BACKFILLED.inc(len(missed), symbol=symbol)
+        return len(missed)
+
+    def _new_ws(self, symbol):
         stream_symbol = symbol.lower()
-        url = f"wss://stream.binance.com:9443/ws/{stream_symbol}@trade"
-        ws = websocket.WebSocketApp(
+        url = f"{self.base_url}/{stream_symbol}@{self.stream}"
+        return websocket.WebSocketApp(
             url,
             on_message=self.on_message,
             on_error=self.on_error,
             on_close=self.on_close,
             on_open=self.on_open
         )
-        thread = threading.Thread(target=ws.run_forever)
+
+    def create_ws(self, symbol):
+        ws = self._new_ws(symbol)
+        thread = threading.Thread(target=self._supervise, args=(symbol, ws), name=f"ws-{symbol.lower()}")
         thread.daemon = True
+        self.connections[symbol] = (ws, thread)
         thread.start()
+        if self.stale_after and self._watchdog is None:
+            self._watchdog = threading.Thread(target=self._watch, name="ws-watchdog", daemon=True)
+            self._watchdog.start()
+        return ws
+
+    def _supervise(self, symbol, ws):
+        """Keep symbol's stream running until stop(): reconnect with exponential backoff and jitter."""
+        delay = self.backoff_initial
+        while True:
+            trades_before = self.trade_counts.get(symbol.upper(), 0)
+            ws.run_forever(ping_interval=self.ping_interval, ping_timeout=self.ping_timeout)
+            if not self.reconnect or self._stopped.is_set():
+                return
+            if self.trade_counts.get(symbol.upper(), 0) > trades_before:
+                delay = self.backoff_initial  # the connection was healthy; start the backoff over
+            if self._stopped.wait(delay * random.uniform(0.8, 1.2)):
+                return
+            delay = min(delay * 2, self.backoff_max)
+            ws = self._new_ws(symbol)
+            self.connections[symbol] = (ws, threading.current_thread())
+
+    def _watch(self):
+        """Restart streams that have gone quiet, so a frozen feed never looks live."""
+        interval = max(self.stale_after / 4, 0.05)
+        while not self._stopped.wait(interval):
+            now = time.monotonic()
+            for symbol, (ws, _thread) in list(self.connections.items()):
+                last = self.last_trade_at.get(symbol.upper())
+                if last is None or now - last <= self.stale_after or symbol.upper() in self.stale:
+                    continue
+                self.stale.add(symbol.upper())
+                WS_STALE.inc(symbol=symbol.upper())
+                print(Fore.YELLOW + f"No trades for {symbol} in {now - last:.1f}s; restarting its stream.")
+                if self.on_stale:
+                    self.on_stale(symbol.upper())
+                self._abort(ws)
+
+    @staticmethod
+    def _abort(ws):
+        """
+        Drop a connection from another thread. ws.close() waits for the peer's close
+        frame, which a frozen peer never sends, and closing the socket does not wake
+        run_forever's select; shutting the socket down does.
+        """
+        ws.keep_running = False
+        sock = getattr(ws.sock, "sock", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def is_stale(self, symbol: str) -> bool:
+        return symbol.upper() in self.stale
+
+    def stop(self):
+        """Close every stream and stop reconnecting."""
+        self._stopped.set()
+        for ws, _thread in list(self.connections.values()):
+            # Send the close frame but do not wait up to 3s per stream for the
+            # server's reply (ws.close() would); shutting down ends run_forever.
+            try:
+                if ws.sock is not None:
+                    ws.sock.send_close()
+            except (OSError, websocket.WebSocketException):
+                pass
+            self._abort(ws)
 
     def start(self):
         for symbol in self.symbols:
             self.create_ws(symbol)
 
         try:
-            while True:
-                time.sleep(1)
+            self._stopped.wait()  # until stop(), from any thread
         except KeyboardInterrupt:
+            self.stop()
             print(Fore.LIGHTBLUE_EX + "\nStreaming stopped by user.")
 
 # 👇 Wrapper function you can import
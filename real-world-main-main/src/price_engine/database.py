@@ -1,14 +1,103 @@
+# src/price_engine/database.py
+"""
+SQLite tick store.
+
+    db = PriceDatabase("prices.db", batched=True)    # background group-commit writer
+    aggregator = PriceAggregator("crypto", ["BTCUSDT"], sink=db)
+    ...
+    db.flush()
+    db.get_prices("BTCUSDT", start="2024-05-01 00:00:00", limit=500)
+    db.close()
+
+The database runs in WAL mode so readers never block the writer. With
+batched=True, insert_price() only queues the tick; a writer thread drains the
+queue and writes each batch with one executemany() and one commit.
+
+PartitionedPriceDatabase keeps the same API but stores each symbol's ticks in
+one table per UTC day, drops days past the retention window, and maintains
+minute/hour OHLC rollups as ticks arrive:
+
+    db = PartitionedPriceDatabase("ticks.db", batched=True, retention_days=7)
+    db.get_ohlc("BTCUSDT", "1h", start="2024-05-01", as_frame=True)
+"""
+import queue
 import sqlite3  # or any other DB (e.g., PostgreSQL, MySQL)
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict
 
+from .telemetry import REGISTRY
+
+DB_INSERTS = REGISTRY.counter("price_engine_db_inserts_total", "Price rows written to the tick database")
+DB_COMMITS = REGISTRY.counter("price_engine_db_commits_total", "Commits issued by the tick database")
+DB_DROPPED = REGISTRY.counter("price_engine_db_dropped_total", "Ticks dropped because the write queue was full")
+DB_QUEUE = REGISTRY.gauge("price_engine_db_queue_depth", "Ticks waiting for the background writer")
+DB_BATCH = REGISTRY.histogram("price_engine_db_batch_write_seconds", "Time to write and commit one batch")
+DB_PARTITIONS = REGISTRY.gauge("price_engine_db_partitions", "Day partitions currently stored")
+DB_EXPIRED = REGISTRY.counter("price_engine_db_expired_partitions_total", "Day partitions dropped by retention")
+
+# Same text layout as SQLite's datetime(), with milliseconds so ticks keep their order.
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+_INSERT = "INSERT INTO prices (source, symbol, price, timestamp) VALUES (?, ?, ?, ?)"
+_STOP = object()
+
+# interval -> (rollup table, timestamp prefix length, suffix completing the bucket label)
+ROLLUPS = {"1m": ("ohlc_1m", 16, ""), "1h": ("ohlc_1h", 13, ":00")}
+_UPSERT_OHLC = """
+    INSERT INTO {table} (symbol, bucket, open, high, low, close, ticks, first_ts, last_ts)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (symbol, bucket) DO UPDATE SET
+        open = CASE WHEN excluded.first_ts < first_ts THEN excluded.open ELSE open END,
+        high = max(high, excluded.high),
+        low = min(low, excluded.low),
+        close = CASE WHEN excluded.last_ts >= last_ts THEN excluded.close ELSE close END,
+        ticks = ticks + excluded.ticks,
+        first_ts = min(first_ts, excluded.first_ts),
+        last_ts = max(last_ts, excluded.last_ts)
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)[:-3]
+
+
 class PriceDatabase:
-    def __init__(self, db_path: str = "prices.db"):
-        self.conn = sqlite3.connect(db_path)
+    def __init__(self, db_path: str = "prices.db", batched: bool = False, batch_size: int = 1000,
+                 flush_interval: float = 0.05, max_queue: int = 100000):
+        """
+        :param db_path: SQLite file (":memory:" works for tests).
+        :param batched: Queue inserts for a background writer instead of committing each one.
+        :param batch_size: Most rows the writer puts in one transaction.
+        :param flush_interval: Longest a queued tick waits (seconds) before its batch is committed.
+        :param max_queue: Queue bound; when full, new ticks are dropped and counted rather than blocking the feed.
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        # One connection is shared by the writer thread and readers.
+        self._lock = threading.Lock()
+        self._configure()
         self._create_tables()
 
+        self._queue = None
+        self._writer = None
+        if batched:
+            self._queue = queue.Queue(maxsize=max_queue)
+            self._writer = threading.Thread(target=self._write_loop, name="price-db-writer", daemon=True)
+            self._writer.start()
+
+    def _configure(self):
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL only syncs at checkpoints; a crash can lose the last commits but never corrupts.
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+
     def _create_tables(self):
         cursor = self.conn.cursor()
-        cursor.execute('''
+        cursor.execute("""
             CREATE TABLE IF NOT EXISTS prices (
                 id INTEGER PRIMARY KEY,
                 source TEXT,
@@ -16,22 +105,411 @@ class PriceDatabase:
                 price REAL,
                 timestamp DATETIME
             )
-        ''')
+        """)
+        # Covers get_prices(): symbol/time range lookups read only the index.
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_prices_symbol_ts
+            ON prices (symbol, timestamp, source, price)
+        """)
         self.conn.commit()
 
-    def insert_price(self, source: str, symbol: str, price: float):
+    @property
+    def batched(self) -> bool:
+        return self._writer is not None
+
+    def insert_price(self, source: str, symbol: str, price: float, timestamp: str = None):
+        """Store one tick; in batched mode it is queued and written by the background thread."""
+        row = (source, symbol, price, timestamp or _now())
+        if self._queue is None:
+            self._write_rows([row])
+            return
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            DB_DROPPED.inc()
+
+    def insert_prices(self, rows):
+        """Store many (source, symbol, price[, timestamp]) rows in one transaction."""
+        stamp = _now()
+        rows = [row if len(row) == 4 else (row[0], row[1], row[2], stamp) for row in rows]
+        if self._queue is None:
+            self._write_rows(rows)
+            return
+        for row in rows:
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                DB_DROPPED.inc()
+
+    def _write_rows(self, rows):
+        if not rows:
+            return
+        with DB_BATCH.time(), self._lock:
+            self.conn.executemany(_INSERT, rows)
+            self.conn.commit()
+        DB_INSERTS.inc(len(rows))
+        DB_COMMITS.inc()
+
+    def _write_loop(self):
+        get = self._queue.get
+        while True:
+            batch, waiters, stop = [], [], False
+            item = get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    # Group commit: the first tick of a batch waits at most flush_interval for company.
+                    try:
+                        item = get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+            DB_QUEUE.set(self._queue.qsize())
+            try:
+                self._write_rows(batch)
+            except sqlite3.Error as e:
+                print(f"Error writing {len(batch)} prices: {e}")
+            for event in waiters:
+                event.set()
+            if stop:
+                return
+
+    def flush(self, timeout: float = None) -> bool:
+        """Block until every tick queued so far is committed."""
+        if self._writer is None or not self._writer.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Drain the write queue, stop the writer and close the connection."""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get_prices(self, symbol: str, start: str = None, end: str = None, limit: int = None,
+                   offset: int = 0, ascending: bool = False) -> List[Dict]:
+        """
+        Ticks for one symbol as (source, price, timestamp) rows, newest first by default.
+        :param start: Inclusive lower timestamp bound ("YYYY-MM-DD HH:MM:SS[.fff]").
+        :param end: Exclusive upper timestamp bound.
+        :param limit: Page size; without it every matching row is returned.
+        :param offset: Rows to skip, for simple paging (iter_prices() pages without rescanning).
+        """
+        where, params = self._range(symbol, start, end)
+        order = "ASC" if ascending else "DESC"
+        sql = f"SELECT source, price, timestamp FROM prices WHERE {where} ORDER BY timestamp {order}"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params += [-1 if limit is None else limit, offset]
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def iter_prices(self, symbol: str, start: str = None, end: str = None, page_size: int = 1000):
+        """
+        Yield pages of (source, price, timestamp) rows, newest first. Each page continues
+        from the last (timestamp, id) seen, so deep pages cost the same as the first.
+        """
+        where, params = self._range(symbol, start, end)
+        sql = f"SELECT id, source, price, timestamp FROM prices WHERE {where} "
+        order = " ORDER BY timestamp DESC, id DESC LIMIT ?"
+        query, args = sql + order, params + [page_size]
+        while True:
+            with self._lock:
+                rows = self.conn.execute(query, args).fetchall()
+            if not rows:
+                return
+            yield [row[1:] for row in rows]
+            if len(rows) < page_size:
+                return
+            last_id, _, _, last_ts = rows[-1]
+            query = sql + "AND (timestamp < ? OR (timestamp = ? AND id < ?))" + order
+            args = params + [last_ts, last_ts, last_id, page_size]
+
+    @staticmethod
+    def _range(symbol, start, end):
+        clauses, params = ["symbol = ?"], [symbol]
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(end)
+        return " AND ".join(clauses), params
+
+
+def _shift_day(day: str, days: int) -> str:
+    return (datetime.strptime(day, "%Y-%m-%d") + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def _ohlc_buckets(rows, prefix: int, suffix: str) -> dict:
+    """Fold (symbol, price, timestamp) rows into {(symbol, bucket): [open, high, low, close, ticks, first, last]}."""
+    buckets = {}
+    for symbol, price, ts in rows:
+        key = (symbol, ts[:prefix] + suffix)
+        bar = buckets.get(key)
+        if bar is None:
+            buckets[key] = [price, price, price, price, 1, ts, ts]
+            continue
+        if price > bar[1]:
+            bar[1] = price
+        if price < bar[2]:
+            bar[2] = price
+        if ts < bar[5]:
+            bar[0], bar[5] = price, ts
+        if ts >= bar[6]:
+            bar[3], bar[6] = price, ts
+        bar[4] += 1
+    return buckets
+
+
+class PartitionedPriceDatabase(PriceDatabase):
+    """
+    Tick store partitioned by symbol and UTC day, with retention and OHLC rollups.
+
+    Each (symbol, day) gets its own table, listed in the partitions catalog, so a
+    query only reads the days it asks for and expiring a day is a DROP TABLE.
+    Every write batch also folds its ticks into the ohlc_1m and ohlc_1h tables;
+    the rollups combine all sources quoting the symbol.
+    """
+
+    def __init__(self, db_path: str = "ticks.db", retention_days: int = 7, minute_retention_days: int = 90,
+                 hour_retention_days: int = None, **kwargs):
+        """
+        :param retention_days: Raw tick days kept, counting back from the newest day stored.
+        :param minute_retention_days: Days of 1m rollups kept (None keeps them all).
+        :param hour_retention_days: Days of 1h rollups kept (None keeps them all).
+        :param kwargs: batched, batch_size, flush_interval, max_queue as for PriceDatabase.
+        """
+        self.retention_days = retention_days
+        self.minute_retention_days = minute_retention_days
+        self.hour_retention_days = hour_retention_days
+        self._partitions = {}
+        super().__init__(db_path, **kwargs)
+
+    def _configure(self):
+        # Lets dropped partitions hand their pages back to the file; only applies to a new database.
+        self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        super()._configure()
+
+    def _create_tables(self):
         cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT INTO prices (source, symbol, price, timestamp)
-            VALUES (?, ?, ?, datetime('now'))
-        ''', (source, symbol, price))
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS partitions (
+                id INTEGER PRIMARY KEY,
+                symbol TEXT NOT NULL,
+                day TEXT NOT NULL,
+                name TEXT NOT NULL,
+                rows INTEGER NOT NULL DEFAULT 0,
+                UNIQUE (symbol, day)
+            )
+        """)
+        for table, _, _ in ROLLUPS.values():
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    symbol TEXT NOT NULL,
+                    bucket TEXT NOT NULL,
+                    open REAL, high REAL, low REAL, close REAL,
+                    ticks INTEGER,
+                    first_ts TEXT,
+                    last_ts TEXT,
+                    PRIMARY KEY (symbol, bucket)
+                ) WITHOUT ROWID
+            """)
         self.conn.commit()
+        for symbol, day, name in cursor.execute("SELECT symbol, day, name FROM partitions"):
+            self._partitions[(symbol, day)] = name
+        DB_PARTITIONS.set(len(self._partitions))
 
-    def get_prices(self, symbol: str) -> List[Dict]:
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT source, price, timestamp FROM prices
-            WHERE symbol = ?
-            ORDER BY timestamp DESC
-        ''', (symbol,))
-        return cursor.fetchall()
\ No newline at end of file
+    def _partition(self, symbol: str, day: str) -> str:
+        """Table holding symbol's ticks for day, created on first use (caller holds the lock)."""
+        name = self._partitions.get((symbol, day))
+        if name is None:
+            cursor = self.conn.execute("INSERT INTO partitions (symbol, day, name) VALUES (?, ?, '')", (symbol, day))
+            name = f"ticks_{day.replace('-', '')}_{cursor.lastrowid}"
+            self.conn.execute("UPDATE partitions SET name = ? WHERE id = ?", (name, cursor.lastrowid))
+            self.conn.execute(f"""
+                CREATE TABLE {name} (
+                    id INTEGER PRIMARY KEY,
+                    source TEXT,
+                    price REAL,
+                    timestamp TEXT
+                )
+            """)
+            self.conn.execute(f"CREATE INDEX {name}_ts ON {name} (timestamp, source, price)")
+            self._partitions[(symbol, day)] = name
+            DB_PARTITIONS.set(len(self._partitions))
+        return name
+
+    def _write_rows(self, rows):
+        if not rows:
+            return
+        by_partition = {}
+        for source, symbol, price, ts in rows:
+            by_partition.setdefault((symbol, ts[:10]), []).append((source, price, ts))
+        ticks = [(symbol, price, ts) for _, symbol, price, ts in rows]
+
+        with DB_BATCH.time(), self._lock:
+            known_days = {day for _, day in self._partitions}
+            for (symbol, day), partition_rows in by_partition.items():
+                name = self._partition(symbol, day)
+                self.conn.executemany(f"INSERT INTO {name} (source, price, timestamp) VALUES (?, ?, ?)",
+                                      partition_rows)
+                self.conn.execute("UPDATE partitions SET rows = rows + ? WHERE name = ?",
+                                  (len(partition_rows), name))
+            for table, prefix, suffix in ROLLUPS.values():
+                buckets = _ohlc_buckets(ticks, prefix, suffix)
+                self.conn.executemany(_UPSERT_OHLC.format(table=table),
+                                      [key + tuple(bar) for key, bar in buckets.items()])
+            self.conn.commit()
+            new_day = any(day not in known_days for _, day in by_partition)
+        DB_INSERTS.inc(len(rows))
+        DB_COMMITS.inc()
+        if new_day:
+            self.apply_retention()
+
+    def apply_retention(self, today: str = None) -> list:
+        """
+        Drop tick partitions and rollup rows older than their retention windows.
+        :param today: "YYYY-MM-DD" the windows count back from; defaults to the newest day stored.
+        :return: Names of the dropped partition tables.
+        """
+        with self._lock:
+            if today is None:
+                if not self._partitions:
+                    return []
+                today = max(day for _, day in self._partitions)
+            dropped = []
+            if self.retention_days is not None:
+                cutoff = _shift_day(today, -self.retention_days + 1)
+                for (symbol, day), name in list(self._partitions.items()):
+                    if day < cutoff:
+                        self.conn.execute(f"DROP TABLE IF EXISTS {name}")
+                        self.conn.execute("DELETE FROM partitions WHERE name = ?", (name,))
+                        del self._partitions[(symbol, day)]
+                        dropped.append(name)
+            for interval, days in (("1m", self.minute_retention_days), ("1h", self.hour_retention_days)):
+                if days is not None:
+                    self.conn.execute(f"DELETE FROM {ROLLUPS[interval][0]} WHERE bucket < ?",
+                                      (_shift_day(today, -days + 1),))
+            self.conn.commit()
+            if dropped:
+                self.conn.execute("PRAGMA incremental_vacuum")
+        DB_EXPIRED.inc(len(dropped))
+        DB_PARTITIONS.set(len(self._partitions))
+        return dropped
+
+    def _symbol_partitions(self, symbol: str, start: str, end: str, newest_first: bool) -> list:
+        days = sorted(day for s, day in self._partitions if s == symbol
+                      and (start is None or day >= start[:10]) and (end is None or day <= end[:10]))
+        if newest_first:
+            days.reverse()
+        return [self._partitions[(symbol, day)] for day in days]
+
+    @staticmethod
+    def _bounds(start, end):
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(end)
+        return "".join(f" AND {c}" for c in clauses), params
+
+    def partitions(self, symbol: str = None) -> list:
+        """(symbol, day, rows) for every stored partition, oldest first."""
+        with self._lock:
+            sql = "SELECT symbol, day, rows FROM partitions"
+            if symbol is None:
+                return self.conn.execute(sql + " ORDER BY day, symbol").fetchall()
+            return self.conn.execute(sql + " WHERE symbol = ? ORDER BY day", (symbol,)).fetchall()
+
+    def get_prices(self, symbol: str, start: str = None, end: str = None, limit: int = None,
+                   offset: int = 0, ascending: bool = False) -> List[Dict]:
+        """Same rows and arguments as PriceDatabase.get_prices(); only the days in range are read."""
+        where, params = self._bounds(start, end)
+        order = "ASC" if ascending else "DESC"
+        wanted = None if limit is None else offset + limit
+        rows = []
+        with self._lock:
+            for name in self._symbol_partitions(symbol, start, end, newest_first=not ascending):
+                sql = f"SELECT source, price, timestamp FROM {name} WHERE 1{where} ORDER BY timestamp {order}"
+                if wanted is None:
+                    rows.extend(self.conn.execute(sql, params).fetchall())
+                    continue
+                rows.extend(self.conn.execute(sql + " LIMIT ?", params + [wanted - len(rows)]).fetchall())
+                if len(rows) >= wanted:
+                    break
+        return rows[offset:wanted]
+
+    def iter_prices(self, symbol: str, start: str = None, end: str = None, page_size: int = 1000):
+        """Pages of (source, price, timestamp) rows, newest first; a page never spans two days."""
+        where, params = self._bounds(start, end)
+        with self._lock:
+            names = self._symbol_partitions(symbol, start, end, newest_first=True)
+        for name in names:
+            sql = f"SELECT id, source, price, timestamp FROM {name} WHERE 1{where}"
+            order = " ORDER BY timestamp DESC, id DESC LIMIT ?"
+            query, args = sql + order, params + [page_size]
+            while True:
+                with self._lock:
+                    try:
+                        rows = self.conn.execute(query, args).fetchall()
+                    except sqlite3.OperationalError:
+                        rows = []  # expired while we were paging
+                if rows:
+                    yield [row[1:] for row in rows]
+                if len(rows) < page_size:
+                    break
+                last_id, _, _, last_ts = rows[-1]
+                query = sql + " AND (timestamp < ? OR (timestamp = ? AND id < ?))" + order
+                args = params + [last_ts, last_ts, last_id, page_size]
+
+    def get_ohlc(self, symbol: str, interval: str = "1m", start: str = None, end: str = None,
+                 as_frame: bool = False):
+        """
+        Rolled-up bars, oldest first, as (bucket, open, high, low, close, ticks) rows.
+        :param interval: "1m" or "1h".
+        :param start: Inclusive lower bucket bound, e.g. "2024-05-01" or "2024-05-01 10:00".
+        :param end: Exclusive upper bucket bound.
+        :param as_frame: Return a DataFrame indexed by bucket time, ready for align_closes().
+        """
+        if interval not in ROLLUPS:
+            raise ValueError(f"Unknown interval: {interval}. Choose from {tuple(ROLLUPS)}")
+        clauses, params = ["symbol = ?"], [symbol]
+        if start is not None:
+            clauses.append("bucket >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("bucket < ?")
+            params.append(end)
+        sql = (f"SELECT bucket, open, high, low, close, ticks FROM {ROLLUPS[interval][0]} "
+               f"WHERE {' AND '.join(clauses)} ORDER BY bucket")
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        if not as_frame:
+            return rows
+        import pandas as pd
+        frame = pd.DataFrame(rows, columns=["timestamp", "open", "high", "low", "close", "ticks"])
+        frame.index = pd.to_datetime(frame.pop("timestamp"))
+        return frame
@@ -0,0 +1,281 @@
+# src/price_engine/fake_exchange.py
+"""
+Local stand-ins for exchange endpoints, used by the replay harness and tests
+so the live pipeline can be exercised without network access.
+"""
+import base64
+import hashlib
+import json
+import socketserver
+import struct
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .replay import trade_message
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def _encode_frame(payload: bytes, opcode: int = 0x1) -> bytes:
+    """Encode an unmasked, final server-to-client WebSocket frame."""
+    header = bytes([0x80 | opcode])
+    length = len(payload)
+    if length < 126:
+        header += bytes([length])
+    elif length < 65536:
+        header += bytes([126]) + struct.pack("!H", length)
+    else:
+        header += bytes([127]) + struct.pack("!Q", length)
+    return header + payload
+
+
+class _WebSocketHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        request_line = self.rfile.readline().decode("latin-1").strip()
+        headers = {}
+        while True:
+            line = self.rfile.readline().decode("latin-1").strip()
+            if not line:
+                break
+            key, _, value = line.partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+        key = headers.get("sec-websocket-key")
+        if not key:
+            self.wfile.write(b"HTTP/1.1 400 Bad Request\r\n\r\n")
+            return
+        accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest()).decode()
+        self.wfile.write(
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n".encode()
+        )
+
+        # Path looks like /ws/btcusdt@trade
+        path = request_line.split(" ")[1] if " " in request_line else ""
+        symbol = path.rsplit("/", 1)[-1].split("@")[0].upper()
+        try:
+            if self.server.fake.stream(symbol, self.wfile):
+                self.wfile.write(_encode_frame(struct.pack("!H", 1000), opcode=0x8))
+            # else: dropped on purpose, the socket closes with no close frame
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client went away mid-stream
+
+
+class FakeBinanceWebSocketServer:
+    """
+    Minimal Binance-style trade stream server. Each connection to
+    /ws/<symbol>@trade receives that symbol's recorded ticks as trade messages,
+    paced by their timestamps divided by speed (speed=None sends at max speed),
+    followed by a normal close frame.
+
+    Trade ids are positions in the symbol's tick list, and a reconnect resumes
+    where the previous connection stopped. drop_after=N cuts each symbol's first
+    connection after N trades without a close frame (stall=True instead keeps it
+    open and silent, like a half-dead TCP connection); the next drop_gap trades
+    "happen" while the client is away and are only available from published()
+    (served over REST by FakeRestExchange(trade_feed=server)).
+    """
+
+    def __init__(self, ticks: list, speed: float = None, host: str = "127.0.0.1", port: int = 0,
+                 drop_after: int = None, drop_gap: int = 0, stall: bool = False):
+        self.speed = speed
+        self.drop_after = drop_after
+        self.drop_gap = drop_gap
+        self.stall = stall
+        self._stopped = threading.Event()
+        self.ticks_by_symbol = defaultdict(list)
+        for ts, symbol, price in ticks:
+            self.ticks_by_symbol[symbol.upper()].append((ts, price))
+        self.cursor = defaultdict(int)       # symbol -> next trade id to publish
+        self.connections = defaultdict(int)  # symbol -> connections served
+        self.server = socketserver.ThreadingTCPServer((host, port), _WebSocketHandler, bind_and_activate=False)
+        self.server.allow_reuse_address = True
+        self.server.daemon_threads = True
+        self.server.fake = self
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address
+        return f"ws://{host}:{port}/ws"
+
+    def stream(self, symbol: str, wfile) -> bool:
+        """Send the symbol's remaining ticks; False if the connection was dropped on purpose."""
+        ticks = self.ticks_by_symbol.get(symbol, [])
+        self.connections[symbol] += 1
+        drop = self.drop_after is not None and self.connections[symbol] == 1
+        start = time.monotonic()
+        first_ts = ticks[self.cursor[symbol]][0] if self.cursor[symbol] < len(ticks) else 0
+        sent = 0
+        while self.cursor[symbol] < len(ticks):
+            trade_id = self.cursor[symbol]
+            ts, price = ticks[trade_id]
+            if drop and sent == self.drop_after:
+                self.cursor[symbol] = min(len(ticks), trade_id + self.drop_gap)
+                if self.stall:
+                    self._stopped.wait(60)
+                return False
+            if self.speed:
+                delay = start + (ts - first_ts) / self.speed - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            message = trade_message(symbol, price, trade_id, sent_ns=time.monotonic_ns())
+            wfile.write(_encode_frame(message.encode()))
+            self.cursor[symbol] = trade_id + 1
+            sent += 1
+        return True
+
+    def published(self, symbol: str, limit: int = 500) -> list:
+        """The symbol's most recent published trades in Binance REST /trades shape, oldest first."""
+        ticks = self.ticks_by_symbol.get(symbol.upper(), [])
+        end = self.cursor[symbol.upper()]
+        return [{"id": i, "price": f"{ticks[i][1]:.8f}", "qty": "1.0", "time": int(ticks[i][0] * 1000),
+                 "isBuyerMaker": False} for i in range(max(0, end - limit), end)]
+
+    def start(self):
+        self.server.server_bind()
+        self.server.server_activate()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class _RestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        fake = self.server.fake
+        status, retry_after, delay = fake._next_response()
+        if delay:
+            time.sleep(delay)
+
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        body = None
+        if status == 200:
+            body = fake._quote(url.path, query)
+            if body is None:
+                status = 404
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("X-MBX-USED-WEIGHT-1M", str(fake.used_weight))
+        if retry_after is not None:
+            self.send_header("Retry-After", str(retry_after))
+        for key, value in fake.headers.items():
+            self.send_header(key, value)
+        payload = json.dumps(body if body is not None else {"code": status, "msg": "injected failure"}).encode()
+        self.send_header("Content-Length", str(len(payload)))
+        try:
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client timed out first, as tests of slow upstreams intend
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeRestExchange:
+    """
+    Local REST quote endpoints in the shapes BinanceAPI, CoinbaseAPI and
+    CoinGeckoAPI expect (plus Binance /trades for WebSocket backfills), with
+    failures that tests can inject:
+
+        fake = FakeRestExchange({"BTCUSDT": 64000.0, "bitcoin": 64005.0}).start()
+        api = BinanceAPI(base_url=fake.binance_url)
+        fake.fail(3, status=500)            # the next three requests fail
+        fake.fail(1, status=429, retry_after=2)
+        fake.delay = 0.5                    # every request is slow
+
+    prices is keyed by what each API asks for: Binance symbols, CoinGecko coin ids;
+    Coinbase pairs such as BTC-USD are looked up as BTCUSDT. depth holds /depth
+    snapshots by symbol, for order book tests.
+    """
+
+    def __init__(self, prices: dict = None, host: str = "127.0.0.1", port: int = 0, trade_feed=None):
+        """
+        :param trade_feed: A FakeBinanceWebSocketServer whose published trades back /api/v3/trades.
+        """
+        self.prices = dict(prices or {})
+        self.trade_feed = trade_feed
+        self.depth = {}
+        self.delay = 0.0
+        self.headers = {}
+        self.used_weight = 0
+        self.requests = 0
+        self._failures = deque()
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), _RestHandler, bind_and_activate=False)
+        self.server.allow_reuse_address = True
+        self.server.daemon_threads = True
+        self.server.fake = self
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    @property
+    def binance_url(self) -> str:
+        return f"{self.base_url}/api/v3"
+
+    @property
+    def coingecko_url(self) -> str:
+        return f"{self.base_url}/api/v3"
+
+    @property
+    def coinbase_url(self) -> str:
+        return f"{self.base_url}/v2/prices"
+
+    def fail(self, count: int = 1, status: int = 500, retry_after: float = None, delay: float = 0.0):
+        """Queue count failing responses ahead of the normal ones."""
+        with self._lock:
+            for _ in range(count):
+                self._failures.append((status, retry_after, delay))
+
+    def _next_response(self):
+        with self._lock:
+            self.requests += 1
+            self.used_weight += 2
+            if self._failures:
+                return self._failures.popleft()
+        return 200, None, self.delay
+
+    def _quote(self, path: str, query: dict):
+        if path.endswith("/trades") and self.trade_feed is not None:
+            return self.trade_feed.published(query.get("symbol", ""), int(query.get("limit", 500)))
+        if path.endswith("/depth"):
+            return self.depth.get(query.get("symbol", ""))
+        if path.endswith("/ticker/price"):
+            price = self.prices.get(query.get("symbol", ""))
+            return None if price is None else {"symbol": query["symbol"], "price": str(price)}
+        if path.endswith("/simple/price"):
+            currency = query.get("vs_currencies", "usd")
+            found = {coin: {currency: self.prices[coin]} for coin in query.get("ids", "").split(",")
+                     if coin in self.prices}
+            return found or None
+        if path.startswith("/v2/prices/") and path.endswith("/spot"):
+            pair = path.split("/")[3]
+            price = self.prices.get(pair.replace("-USD", "USDT"))
+            return None if price is None else {"data": {"base": pair.split("-")[0], "amount": str(price)}}
+        return None
+
+    def start(self):
+        self.server.server_bind()
+        self.server.server_activate()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
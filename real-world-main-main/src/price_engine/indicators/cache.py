@@ -0,0 +1,235 @@
+# src/price_engine/indicators/cache.py
+"""
+Memoized indicator series keyed by (data fingerprint, indicator, parameters):
+
+    cache = IndicatorCache("~/.cache/price_engine/indicators")
+    fp = fingerprint(closes)
+    slope = cache.get_or_compute(fp, "rolling_slope", {"window": 50}, lambda: rolling_slope(closes, 50))
+    cache.stats()   # hits per tier, misses, hit_rate, sizes
+
+Results live in an in-memory LRU tier bounded by bytes and, when a directory is
+given, in an on-disk tier of .npy files evicted least recently used once it
+grows past disk_bytes. A parameter sweep or walk-forward run over the same
+closes therefore computes each rolling mean, std, RSI, EMA and slope once, and
+with a disk tier so does the next process (a re-run backtest, a dashboard
+reload). Cached arrays are returned read-only.
+
+get_cache() is the process-wide cache the strategies use: memory only unless
+INDICATOR_CACHE_DIR is set or configure_cache() is given a directory.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from ..telemetry import REGISTRY
+
+CACHE_LOOKUPS = REGISTRY.counter("indicator_cache_lookups_total", "Indicator cache lookups by result (memory, disk, miss)")
+CACHE_EVICTIONS = REGISTRY.counter("indicator_cache_evictions_total", "Indicator series evicted, by tier")
+
+
+def fingerprint(data) -> str:
+    """Content hash of an array or DataFrame's values (dtype and shape included)."""
+    values = np.ascontiguousarray(getattr(data, "values", data), dtype=np.float64)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(values.shape).encode())
+    digest.update(memoryview(values).cast("B"))
+    return digest.hexdigest()
+
+
+def _key(data_fingerprint: str, indicator: str, params: dict) -> str:
+    spec = f"{data_fingerprint}|{indicator}|{sorted((params or {}).items())!r}"
+    return hashlib.blake2b(spec.encode(), digest_size=16).hexdigest()
+
+
+def _touch(path):
+    # The mtime is the disk tier's LRU clock. Set it from time_ns(): the filesystem's
+    # own timestamps are only as fine as the kernel tick, too coarse to order writes.
+    now = time.time_ns()
+    os.utime(path, ns=(now, now))
+
+
+class IndicatorCache:
+    def __init__(self, path: str = None, memory_bytes: int = 256 * 2 ** 20, disk_bytes: int = 2 * 2 ** 30):
+        """
+        :param path: Directory of the on-disk tier; None keeps results in memory only.
+        :param memory_bytes: Size of the in-memory LRU tier.
+        :param disk_bytes: Size past which the least recently used files are deleted.
+        """
+        self.path = os.path.expanduser(path) if path else None
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self._memory = OrderedDict()  # key -> array, least recently used first
+        self._memory_size = 0
+        self._disk_size = 0
+        self._lock = threading.Lock()
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+        if self.path:
+            os.makedirs(self.path, exist_ok=True)
+            self._disk_size = sum(size for _, _, size in self._disk_entries())
+
+    def get_or_compute(self, data_fingerprint: str, indicator: str, params: dict, compute) -> np.ndarray:
+        """
+        :param data_fingerprint: fingerprint() of the input series.
+        :param compute: Called on a miss; must return an array.
+        """
+        key = _key(data_fingerprint, indicator, params)
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, np.asarray(compute()))
+        return value
+
+    def get(self, key: str):
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits["memory"] += 1
+                CACHE_LOOKUPS.inc(result="memory")
+                return value
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                CACHE_LOOKUPS.inc(result="miss")
+                return None
+            self.hits["disk"] += 1
+            CACHE_LOOKUPS.inc(result="disk")
+            self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: np.ndarray) -> np.ndarray:
+        value = np.array(value)  # a private copy nobody else can write to
+        value.setflags(write=False)
+        with self._lock:
+            self._remember(key, value)
+        self._write_disk(key, value)
+        return value
+
+    def _remember(self, key, value):
+        if value.nbytes > self.memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_size -= old.nbytes
+        self._memory[key] = value
+        self._memory_size += value.nbytes
+        while self._memory_size > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= evicted.nbytes
+            CACHE_EVICTIONS.inc(tier="memory")
+
+    # --- Disk tier ---
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.npy")
+
+    def _read_disk(self, key):
+        if not self.path:
+            return None
+        try:
+            value = np.load(self._file(key), allow_pickle=False)
+            _touch(self._file(key))
+        except (OSError, ValueError):
+            return None
+        value.setflags(write=False)
+        return value
+
+    def _write_disk(self, key, value):
+        if not self.path:
+            return
+        target = self._file(key)
+        # Written under a temporary name and renamed, so readers never see a partial file.
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, value, allow_pickle=False)
+            previous = os.path.getsize(target) if os.path.exists(target) else 0
+            os.replace(tmp, target)
+            _touch(target)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        with self._lock:
+            self._disk_size += os.path.getsize(target) - previous
+            over = self._disk_size > self.disk_bytes
+        if over:
+            self._evict_disk()
+
+    def _disk_entries(self):
+        entries = []
+        for name in os.listdir(self.path):
+            if name.endswith(".npy"):
+                try:
+                    stat = os.stat(os.path.join(self.path, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, name, stat.st_size))
+        return entries
+
+    def _evict_disk(self):
+        entries = sorted(self._disk_entries())
+        total = sum(size for _, _, size in entries)
+        for _, name, size in entries:
+            if total <= self.disk_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.path, name))
+            except OSError:
+                continue
+            total -= size
+            CACHE_EVICTIONS.inc(tier="disk")
+        with self._lock:
+            self._disk_size = total
+
+    # --- Readers ---
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.hits["memory"] + self.hits["disk"]
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.hits["memory"],
+                "disk_hits": self.hits["disk"],
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_items": len(self._memory),
+                "memory_bytes": self._memory_size,
+                "disk_bytes": self._disk_size,
+            }
+
+    def clear(self, disk: bool = True):
+        with self._lock:
+            self._memory.clear()
+            self._memory_size = 0
+        if disk and self.path:
+            for _, name, _ in self._disk_entries():
+                try:
+                    os.remove(os.path.join(self.path, name))
+                except OSError:
+                    pass
+            with self._lock:
+                self._disk_size = 0
+
+
+_default = None
+
+
+def get_cache() -> IndicatorCache:
+    global _default
+    if _default is None:
+        _default = IndicatorCache(os.environ.get("INDICATOR_CACHE_DIR") or None)
+    return _default
+
+
+def configure_cache(path: str = None, **kwargs) -> IndicatorCache:
+    """Replace the process-wide cache, e.g. with a disk tier for a backtest sweep."""
+    global _default
+    _default = IndicatorCache(path, **kwargs)
+    return _default
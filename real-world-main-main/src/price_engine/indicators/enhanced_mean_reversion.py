@@ -1,8 +1,9 @@
-import numpy as np
+from .kernels import mean_std_last
 
 class EnhancedMeanReversion:
-    def __init__(self, window=20):
+    def __init__(self, window=20, verbose=True):
         self.window = window
+        self.verbose = verbose
         self.hold_counter = 0
         self.in_trade = False
 
@@ -32,8 +33,7 @@ class EnhancedMeanReversion:
 
         prices = [p['price'] for p in data_window[-self.window:]]
         latest_price = data_window[-1]['price']
-        mean_price = np.mean(prices)
-        std_dev = np.std(prices)
+        mean_price, std_dev = mean_std_last(prices, self.window)
 
         if std_dev == 0:
             return None
@@ -43,7 +43,8 @@ class EnhancedMeanReversion:
         min_hold_days = self.auto_min_hold_days(std_dev)
         allow_short = self.auto_allow_short(asset_name)
 
-        print(f"[Auto MR] Asset: {asset_name} | Price: {latest_price:.2f}, Z: {z_score:.2f}, Thresh: {threshold}, Pos: {current_position}, Hold: {self.hold_counter}")
+        if self.verbose:
+            print(f"[Auto MR] Asset: {asset_name} | Price: {latest_price:.2f}, Z: {z_score:.2f}, Thresh: {threshold}, Pos: {current_position}, Hold: {self.hold_counter}")
 
         if self.hold_counter < min_hold_days:
             self.hold_counter += 1
@@ -0,0 +1,243 @@
+# src/price_engine/indicators/kernels.py
+"""
+Numeric kernels behind the trend and z-score signals, per tick and per series:
+
+    slope_last(prices, 50)            # least-squares slope of the last 50 prices
+    window_ema_last(prices, 20)       # the strategies' exponentially weighted window mean
+    zscore_last(prices, 20)           # (last - mean) / std over the last 20 prices (mean_std_last for both)
+    rolling_slope(series, 50)         # the same three for every bar of a series at once
+    rolling_window_ema(series, 20)
+    rolling_zscore(series, 20)
+    rolling_mean_std(series, 20)      # Bollinger middle band and width
+    ewma(series, alpha)               # recursive EMA, y[t] = alpha * x[t] + (1 - alpha) * y[t-1]
+
+The per-tick kernels replace design matrices and lstsq with closed forms
+against cached x offsets and weights, so a 50-point window is a couple of dot
+products. The series kernels are compiled with numba when it is installed
+(set PRICE_ENGINE_NO_JIT=1 to turn that off) and are vectorized numpy
+otherwise; both give the per-tick values for every bar. Bars without a full
+window are NaN.
+"""
+import os
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+JIT = numba is not None and os.environ.get("PRICE_ENGINE_NO_JIT") != "1"
+
+
+@lru_cache(maxsize=None)
+def slope_offsets(window: int):
+    """x - mean(x) for x = 0..window-1, and sum((x - mean(x))**2)."""
+    offsets = np.arange(window, dtype=np.float64) - (window - 1) / 2
+    offsets.setflags(write=False)
+    return offsets, float(offsets @ offsets)
+
+
+@lru_cache(maxsize=None)
+def window_ema_weights(window: int):
+    """
+    Weights of the strategies' "ema", oldest price first. It convolves the window with
+    exp(linspace(-1, 0, window)), so the oldest price gets the largest weight.
+    """
+    weights = np.exp(np.linspace(-1., 0., window))
+    weights /= weights.sum()
+    weights = weights[::-1].copy()
+    weights.setflags(write=False)
+    return weights
+
+
+def _tail(prices, window: int) -> np.ndarray:
+    return np.asarray(prices[-window:], dtype=np.float64)
+
+
+# --- Per tick ---
+
+def slope_last(prices, window: int) -> float:
+    if len(prices) < window:
+        return 0
+    offsets, sxx = slope_offsets(window)
+    return float(offsets @ _tail(prices, window)) / sxx
+
+
+def window_ema_last(prices, window: int):
+    if len(prices) < window:
+        return None
+    return float(window_ema_weights(window) @ _tail(prices, window))
+
+
+def mean_std_last(prices, window: int):
+    """Mean and population std of the last window, rounded exactly like np.mean/np.std."""
+    tail = _tail(prices, window)
+    mean = tail.sum() / window
+    deviations = tail - mean
+    return float(mean), float(np.sqrt((deviations * deviations).sum() / window))
+
+
+def zscore_last(prices, window: int):
+    """z-score of the last price against the last window (population std); None when flat."""
+    mean, std = mean_std_last(prices, window)
+    return None if std == 0 else (float(prices[-1]) - mean) / std
+
+
+# --- Per series (numpy) ---
+
+def _pad(values: np.ndarray, length: int) -> np.ndarray:
+    out = np.full(length, np.nan)
+    out[length - len(values):] = values
+    return out
+
+
+# einsum rather than matmul: BLAS rounds a window differently depending on where it starts in
+# memory, and chunked backtests (backtesting_engine.streaming) need every window bit for bit
+# the same whichever chunk it falls in.
+
+def _np_rolling_slope(series, window):
+    offsets, sxx = slope_offsets(window)
+    return _pad(np.einsum("ij,j->i", sliding_window_view(series, window), offsets) / sxx, len(series))
+
+
+def _np_rolling_window_ema(series, window):
+    return _pad(np.einsum("ij,j->i", sliding_window_view(series, window), window_ema_weights(window)), len(series))
+
+
+def _np_rolling_mean_std(series, window):
+    windows = sliding_window_view(series, window)
+    mean = windows.sum(axis=1) / window
+    deviations = windows - mean[:, None]
+    return mean, deviations, np.sqrt(np.einsum("ij,ij->i", deviations, deviations) / window)
+
+
+def _np_rolling_zscore(series, window):
+    _, deviations, std = _np_rolling_mean_std(series, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(std == 0, np.nan, deviations[:, -1] / std)
+    return _pad(z, len(series))
+
+
+def _np_ewma(series, alpha):
+    # Unrolled recursion: y[s+i] = d^(i+1) * (y[s-1] + sum_{k<=i} alpha * x[s+k] / d^(k+1)), with d = 1 - alpha
+    # and y[-1] = x[0]. Evaluated in blocks short enough that d^-(k+1) stays well inside float range.
+    out = np.empty(len(series))
+    decay = 1.0 - alpha
+    if not len(series) or decay <= 0:
+        out[:] = series
+        return out
+    block = max(1, int(500 / max(-np.log(decay), 1e-12)))
+    level = series[0]
+    for start in range(0, len(series), block):
+        chunk = series[start:start + block]
+        powers = decay ** np.arange(1, len(chunk) + 1)
+        out[start:start + len(chunk)] = powers * (level + np.cumsum(alpha * chunk / powers))
+        level = out[start + len(chunk) - 1]
+    return out
+
+
+# --- Per series (loops, compiled when numba is available) ---
+
+def _loop_rolling_slope(series, window, offsets, sxx):
+    out = np.full(len(series), np.nan)
+    for t in range(window - 1, len(series)):
+        acc = 0.0
+        for k in range(window):
+            acc += offsets[k] * series[t - window + 1 + k]
+        out[t] = acc / sxx
+    return out
+
+
+def _loop_rolling_weighted(series, window, weights):
+    out = np.full(len(series), np.nan)
+    for t in range(window - 1, len(series)):
+        acc = 0.0
+        for k in range(window):
+            acc += weights[k] * series[t - window + 1 + k]
+        out[t] = acc
+    return out
+
+
+def _loop_rolling_zscore(series, window):
+    out = np.full(len(series), np.nan)
+    for t in range(window - 1, len(series)):
+        total = 0.0
+        for k in range(t - window + 1, t + 1):
+            total += series[k]
+        mean = total / window
+        squares = 0.0
+        for k in range(t - window + 1, t + 1):
+            squares += (series[k] - mean) ** 2
+        std = np.sqrt(squares / window)
+        if std > 0:
+            out[t] = (series[t] - mean) / std
+    return out
+
+
+def _loop_ewma(series, alpha):
+    out = np.empty(len(series))
+    level = series[0] if len(series) else 0.0
+    for t in range(len(series)):
+        level = series[t] if t == 0 else alpha * series[t] + (1.0 - alpha) * level
+        out[t] = level
+    return out
+
+
+if JIT:
+    _loop_rolling_slope = numba.njit(cache=True)(_loop_rolling_slope)
+    _loop_rolling_weighted = numba.njit(cache=True)(_loop_rolling_weighted)
+    _loop_rolling_zscore = numba.njit(cache=True)(_loop_rolling_zscore)
+    _loop_ewma = numba.njit(cache=True)(_loop_ewma)
+
+
+def _as_series(series) -> np.ndarray:
+    return np.ascontiguousarray(series, dtype=np.float64)
+
+
+def rolling_slope(series, window: int, jit: bool = None) -> np.ndarray:
+    series = _as_series(series)
+    if len(series) < window:
+        return np.full(len(series), np.nan)
+    if JIT if jit is None else jit:
+        offsets, sxx = slope_offsets(window)
+        return _loop_rolling_slope(series, window, offsets, sxx)
+    return _np_rolling_slope(series, window)
+
+
+def rolling_window_ema(series, window: int, jit: bool = None) -> np.ndarray:
+    series = _as_series(series)
+    if len(series) < window:
+        return np.full(len(series), np.nan)
+    if JIT if jit is None else jit:
+        return _loop_rolling_weighted(series, window, window_ema_weights(window))
+    return _np_rolling_window_ema(series, window)
+
+
+def rolling_mean_std(series, window: int):
+    """Rolling mean and population std (mean_std_last for every bar); windows holding a NaN are NaN."""
+    series = _as_series(series)
+    if len(series) < window:
+        return np.full(len(series), np.nan), np.full(len(series), np.nan)
+    mean, _, std = _np_rolling_mean_std(series, window)
+    return _pad(mean, len(series)), _pad(std, len(series))
+
+
+def rolling_zscore(series, window: int, jit: bool = None) -> np.ndarray:
+    """NaN where the window is flat (zscore_last returns None there)."""
+    series = _as_series(series)
+    if len(series) < window:
+        return np.full(len(series), np.nan)
+    if JIT if jit is None else jit:
+        return _loop_rolling_zscore(series, window)
+    return _np_rolling_zscore(series, window)
+
+
+def ewma(series, alpha: float, jit: bool = None) -> np.ndarray:
+    """Recursive EMA seeded with the first value (pandas ewm(alpha=alpha, adjust=False).mean())."""
+    series = _as_series(series)
+    if JIT if jit is None else jit:
+        return _loop_ewma(series, alpha)
+    return _np_ewma(series, alpha)
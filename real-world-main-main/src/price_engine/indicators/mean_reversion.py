@@ -1,6 +1,8 @@
 # src/price_engine/indicators/mean_reversion.py
+from itertools import islice
+
 from .base_indicator import BaseIndicator
-import numpy as np
+from .kernels import zscore_last
 
 class MeanReversion(BaseIndicator):
     def __init__(self, window: int = 20, threshold: float = 2.0):
@@ -18,15 +20,14 @@ class MeanReversion(BaseIndicator):
         :param data: List of price data (e.g., [{"price": 100.0}, {"price": 101.0}, ...]).
         :return: Dictionary with overbought/oversold signals.
         """
-        prices = [entry["price"] for entry in data]
-        if len(prices) < self.window:
-            raise ValueError(f"Not enough data points. Required: {self.window}, Available: {len(prices)}")
+        if len(data) < self.window:
+            raise ValueError(f"Not enough data points. Required: {self.window}, Available: {len(data)}")
 
-        # Calculate mean and standard deviation
-        mean = np.mean(prices[-self.window:])
-        std_dev = np.std(prices[-self.window:])
+        # Only the last window is read, so a long live tick window costs no more than a short one.
+        prices = [entry["price"] for entry in islice(data, len(data) - self.window, None)]
+        deviation = zscore_last(prices, self.window)
 
-        if std_dev == 0:
+        if deviation is None:
             # Avoid division by zero, return neutral signals
             return {
                 "overbought": False,
@@ -34,9 +35,6 @@ class MeanReversion(BaseIndicator):
             }
 
         # Detect overbought/oversold conditions
-        current_price = prices[-1]
-        deviation = (current_price - mean) / std_dev
-
         return {
             "overbought": deviation > self.threshold,
             "oversold": deviation < -self.threshold,
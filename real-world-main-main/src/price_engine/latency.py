@@ -0,0 +1,116 @@
+# src/price_engine/latency.py
+"""
+Low-overhead latency histograms for the live pipeline.
+
+Values are nanoseconds from time.monotonic_ns(). Buckets are log-linear: four
+sub-buckets per power of two (about 19% resolution), so recording a value is a
+bit_length() and one list increment.
+"""
+from collections import defaultdict
+
+_SUB_BITS = 2
+_SUB_BUCKETS = 1 << _SUB_BITS
+_BUCKETS = 64 * _SUB_BUCKETS
+
+
+def _bucket_index(value: int) -> int:
+    if value < _SUB_BUCKETS:
+        return max(value, 0)
+    bits = value.bit_length()
+    return (bits - _SUB_BITS) * _SUB_BUCKETS + ((value >> (bits - _SUB_BITS - 1)) & (_SUB_BUCKETS - 1))
+
+
+def _bucket_upper(index: int) -> int:
+    """Smallest value that maps to the next bucket, i.e. this bucket's exclusive upper bound."""
+    if index < _SUB_BUCKETS:
+        return index + 1
+    bits = index // _SUB_BUCKETS + _SUB_BITS
+    sub = index % _SUB_BUCKETS
+    return ((_SUB_BUCKETS + sub + 1) << (bits - _SUB_BITS - 1))
+
+
+class LatencyHistogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * _BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value_ns: int):
+        self.counts[_bucket_index(value_ns)] += 1
+        self.count += 1
+        self.total += value_ns
+        if value_ns > self.max:
+            self.max = value_ns
+
+    def merge(self, other: "LatencyHistogram"):
+        for i, c in enumerate(other.counts):
+            if c:
+                self.counts[i] += c
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct: float) -> int:
+        """Upper bound of the bucket holding the pct-th percentile, capped at the observed max."""
+        if not self.count:
+            return 0
+        target = self.count * pct / 100
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if c and seen >= target:
+                return min(_bucket_upper(i), self.max)
+        return self.max
+
+    def buckets(self) -> list:
+        """Non-empty (upper_bound_ns, count) pairs in ascending order."""
+        return [(_bucket_upper(i), c) for i, c in enumerate(self.counts) if c]
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_us": (self.total / self.count / 1e3) if self.count else 0.0,
+            "p50_us": self.percentile(50) / 1e3,
+            "p99_us": self.percentile(99) / 1e3,
+            "max_us": self.max / 1e3,
+        }
+
+
+class LatencyTracker:
+    """
+    Histograms keyed by (stage, symbol). Callers must serialize writes for a
+    given symbol (RealTimeTrader records under the symbol's shard lock).
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.histograms = defaultdict(dict)  # stage -> symbol -> LatencyHistogram
+
+    def record(self, stage: str, symbol: str, value_ns: int):
+        by_symbol = self.histograms[stage]
+        histogram = by_symbol.get(symbol)
+        if histogram is None:
+            histogram = by_symbol[symbol] = LatencyHistogram()
+        histogram.record(value_ns)
+
+    def stage_histogram(self, stage: str) -> LatencyHistogram:
+        """All symbols of a stage merged into one histogram."""
+        merged = LatencyHistogram()
+        for histogram in list(self.histograms.get(stage, {}).values()):
+            merged.merge(histogram)
+        return merged
+
+    def get_stats(self) -> dict:
+        """{stage: {symbol: summary, ..., "ALL": summary}}"""
+        stats = {}
+        for stage, by_symbol in list(self.histograms.items()):
+            stage_stats = {symbol: h.summary() for symbol, h in list(by_symbol.items())}
+            stage_stats["ALL"] = self.stage_histogram(stage).summary()
+            stats[stage] = stage_stats
+        return stats
+
+    def reset(self):
+        self.histograms = defaultdict(dict)
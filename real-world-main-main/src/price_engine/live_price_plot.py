@@ -4,8 +4,10 @@ from matplotlib.animation import FuncAnimation
 import os
 from price_engine.indicators.bollinger_bands import BollingerBands
 from price_engine.indicators.mean_reversion import MeanReversion
+from price_engine.tick_files import tail_tick_log
 
-def plot_live_price(symbols, asset_type):
+def plot_live_price(symbols, asset_type, max_points=5000):
+    """:param max_points: Ticks drawn per symbol; only that tail of each log is read per frame."""
     indicators = {symbol: {
         'bb': BollingerBands(window=20, num_std=2),
         'mr': MeanReversion(window=20, threshold=2.0)
@@ -26,9 +28,8 @@ def plot_live_price(symbols, asset_type):
                 continue
 
             try:
-                data = pd.read_csv(filename, header=None, names=['Timestamp', 'Price'])
-                data['Timestamp'] = pd.to_datetime(data['Timestamp'])
-                data['Price'] = pd.to_numeric(data['Price'], errors='coerce')
+                tail = tail_tick_log(filename, max_points, symbol=symbol)
+                data = pd.DataFrame({'Timestamp': tail.index, 'Price': tail.iloc[:, 0].to_numpy()})
 
                 price_data = [{"price": p} for p in data['Price'].tolist()]
 
@@ -0,0 +1,172 @@
+# src/price_engine/order_book.py
+"""
+Local L2 order book kept from a depth snapshot plus diff updates, the way
+Binance documents it for <symbol>@depth streams:
+
+    book = OrderBook("BTCUSDT")
+    book.apply_snapshot(rest_snapshot)   # {"lastUpdateId": ..., "bids": [[p, q], ...], "asks": [...]}
+    book.apply_diff(event)               # {"U": first_id, "u": final_id, "b": [...], "a": [...]}
+    book.top()                           # TopOfBook(bid, bid_qty, ask, ask_qty, microprice)
+
+Each side is a price -> quantity dict plus a sorted list of its prices with the
+best price at the end, so the touch is an O(1) read and a level update is an
+O(log n) bisect (the list shift it implies is a short memmove, because most
+updates land near the touch). A diff whose first update id skips past the
+book's last one raises SequenceGapError; the book then needs a new snapshot.
+"""
+from bisect import bisect_left, insort
+from collections import namedtuple
+
+TopOfBook = namedtuple("TopOfBook", ["bid", "bid_qty", "ask", "ask_qty", "microprice"])
+
+
+class SequenceGapError(Exception):
+    """A depth update was missed; the book is out of sync until the next snapshot."""
+
+
+class OrderBook:
+    __slots__ = ("symbol", "bids", "asks", "_bid_prices", "_ask_keys", "last_update_id", "updates")
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids = {}          # price -> qty
+        self.asks = {}
+        self._bid_prices = []   # ascending, best bid last
+        self._ask_keys = []     # negated ask prices, ascending, so the best ask is last too
+        self.last_update_id = None
+        self.updates = 0
+
+    @property
+    def synced(self) -> bool:
+        return self.last_update_id is not None
+
+    def clear(self):
+        """Drop every level and mark the book as needing a snapshot."""
+        self.bids.clear()
+        self.asks.clear()
+        self._bid_prices.clear()
+        self._ask_keys.clear()
+        self.last_update_id = None
+
+    def apply_snapshot(self, snapshot: dict):
+        """Replace the book with a REST /depth snapshot."""
+        self.clear()
+        for price, qty in snapshot.get("bids", ()):
+            self._set_bid(float(price), float(qty))
+        for price, qty in snapshot.get("asks", ()):
+            self._set_ask(float(price), float(qty))
+        self.last_update_id = snapshot["lastUpdateId"]
+
+    def apply_diff(self, event: dict) -> bool:
+        """
+        Apply a depthUpdate event.
+        :return: False if the event is older than the book (already in the snapshot).
+        :raises SequenceGapError: The book is not synced, or updates between it and the event were missed.
+        """
+        last = self.last_update_id
+        if last is None:
+            raise SequenceGapError(f"{self.symbol} book has no snapshot")
+        if event["u"] <= last:
+            return False
+        if event["U"] > last + 1:
+            self.clear()  # never let a strategy trade on a book with holes in it
+            raise SequenceGapError(f"{self.symbol} depth gap: expected update {last + 1}, got {event['U']}")
+        set_bid, set_ask = self._set_bid, self._set_ask
+        for price, qty in event["b"]:
+            set_bid(float(price), float(qty))
+        for price, qty in event["a"]:
+            set_ask(float(price), float(qty))
+        self.last_update_id = event["u"]
+        self.updates += 1
+        return True
+
+    def _set_bid(self, price: float, qty: float):
+        bids = self.bids
+        if qty > 0:
+            if price not in bids:
+                insort(self._bid_prices, price)
+            bids[price] = qty
+        elif bids.pop(price, None) is not None:
+            prices = self._bid_prices
+            del prices[bisect_left(prices, price)]
+
+    def _set_ask(self, price: float, qty: float):
+        asks = self.asks
+        if qty > 0:
+            if price not in asks:
+                insort(self._ask_keys, -price)
+            asks[price] = qty
+        elif asks.pop(price, None) is not None:
+            keys = self._ask_keys
+            del keys[bisect_left(keys, -price)]
+
+    # --- Top of book ---
+
+    def best_bid(self):
+        """(price, qty) of the best bid, or None."""
+        if not self._bid_prices:
+            return None
+        price = self._bid_prices[-1]
+        return price, self.bids[price]
+
+    def best_ask(self):
+        """(price, qty) of the best ask, or None."""
+        if not self._ask_keys:
+            return None
+        price = -self._ask_keys[-1]
+        return price, self.asks[price]
+
+    def mid(self):
+        if not (self._bid_prices and self._ask_keys):
+            return None
+        return (self._bid_prices[-1] - self._ask_keys[-1]) / 2
+
+    def spread(self):
+        if not (self._bid_prices and self._ask_keys):
+            return None
+        return -self._ask_keys[-1] - self._bid_prices[-1]
+
+    def microprice(self):
+        """Touch prices weighted by the opposite side's size: leans towards the side about to be taken out."""
+        top = self.top()
+        return None if top is None else top.microprice
+
+    def top(self):
+        """TopOfBook for the touch, or None while either side is empty."""
+        if not (self._bid_prices and self._ask_keys):
+            return None
+        bid = self._bid_prices[-1]
+        ask = -self._ask_keys[-1]
+        bid_qty = self.bids[bid]
+        ask_qty = self.asks[ask]
+        microprice = (bid * ask_qty + ask * bid_qty) / (bid_qty + ask_qty)
+        return TopOfBook(bid, bid_qty, ask, ask_qty, microprice)
+
+    def depth(self, levels: int = 10):
+        """([(price, qty), ...] bids best first, [(price, qty), ...] asks best first)."""
+        bids = [(p, self.bids[p]) for p in self._bid_prices[:-levels - 1:-1]]
+        asks = [(-k, self.asks[-k]) for k in self._ask_keys[:-levels - 1:-1]]
+        return bids, asks
+
+    def sweep(self, side: int, qty: float):
+        """
+        Walk the opposite side for a market order of qty.
+        :param side: 1 to buy (takes asks), -1 to sell (takes bids).
+        :return: (filled qty, average price); filled is less than qty when the visible book runs out.
+        """
+        if side > 0:
+            keys, levels, sign = self._ask_keys, self.asks, -1
+        else:
+            keys, levels, sign = self._bid_prices, self.bids, 1
+        filled = cost = 0.0
+        for i in range(len(keys) - 1, -1, -1):
+            price = sign * keys[i]
+            take = min(levels[price], qty - filled)
+            filled += take
+            cost += take * price
+            if filled >= qty:
+                break
+        return filled, (cost / filled if filled else None)
+
+    def __len__(self):
+        return len(self.bids) + len(self.asks)
@@ -1,23 +1,33 @@
 # src/price_engine/price_calculator.py
 import numpy as np
 
+from .consolidator import robust_mask
+
 class PriceCalculator:
     @staticmethod
-    def calculate_weighted_average(prices: dict, weights: dict) -> float:
+    def calculate_weighted_average(prices: dict, weights: dict, default_weight: float = 1.0) -> float:
+        """Weighted mean of the non-None prices; sources missing from weights count with default_weight."""
         valid_prices = {k: v for k, v in prices.items() if v is not None}
         if not valid_prices:
             raise ValueError("No valid prices available.")
 
-        weighted_sum = sum(valid_prices[source] * weights[source] for source in valid_prices)
-        total_weight = sum(weights[source] for source in valid_prices)
+        source_weights = {source: weights.get(source, default_weight) for source in valid_prices}
+        total_weight = sum(source_weights.values())
+        if total_weight <= 0:
+            raise ValueError("No weighted prices available.")
+        weighted_sum = sum(valid_prices[source] * source_weights[source] for source in valid_prices)
         return weighted_sum / total_weight
 
     @staticmethod
-    def handle_outliers(prices: dict) -> dict:
-        valid_prices = [v for v in prices.values() if v is not None]
-        if not valid_prices:
+    def handle_outliers(prices: dict, mad_threshold: float = 3.5, tolerance_bps: float = 5.0) -> dict:
+        """
+        Replace outlying prices with None. A price is an outlier when it is more than
+        mad_threshold robust deviations (median/MAD) from the median of all sources.
+        """
+        sources = [k for k, v in prices.items() if v is not None]
+        if not sources:
             return prices
 
-        mean = np.mean(valid_prices)
-        std = np.std(valid_prices)
-        return {k: v if v is None or abs(v - mean) <= 2 * std else None for k, v in prices.items()}
\ No newline at end of file
+        row = np.array([[prices[k] for k in sources]], dtype=np.float64)
+        kept = dict(zip(sources, robust_mask(row, mad_threshold, tolerance_bps)[0]))
+        return {k: v if v is None or kept[k] else None for k, v in prices.items()}
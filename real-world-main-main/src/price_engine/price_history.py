@@ -2,6 +2,9 @@
 import json
 from datetime import datetime
 import os
+from .telemetry import REGISTRY
+
+HISTORY_SIZE = REGISTRY.gauge("price_engine_price_history_entries", "Entries held in the JSON price history buffer")
 
 class PriceHistory:
     def __init__(self, file_path: str = "prices.json"):
@@ -29,6 +32,7 @@ class PriceHistory:
             "price": price,
         }
         self.history.append(entry)
+        HISTORY_SIZE.set(len(self.history), file=self.file_path)
         self._save_history()
 
     def get_history(self) -> list:
@@ -4,7 +4,11 @@ import websocket
 import threading
 import json
 import time
+from .telemetry import REGISTRY
 
+RECORDER_ROWS = REGISTRY.counter("price_engine_recorder_rows_total", "Price rows appended to CSV logs")
+RECORDER_ERRORS = REGISTRY.counter("price_engine_recorder_errors_total", "Recorder WebSocket errors")
+RECORDER_CLOSES = REGISTRY.counter("price_engine_recorder_disconnects_total", "Recorder WebSocket disconnects")
 
 def stream_single_symbol(symbol):
     def write_to_csv(price):
@@ -13,6 +17,7 @@ def stream_single_symbol(symbol):
         with open(filename, 'a', newline='') as f:
             writer = csv.writer(f)
             writer.writerow([now, price])
+        RECORDER_ROWS.inc(symbol=symbol.upper())
 
     def on_message(ws, message):
         data = json.loads(message)
@@ -21,9 +26,11 @@ def stream_single_symbol(symbol):
         write_to_csv(price)
 
     def on_error(ws, error):
+        RECORDER_ERRORS.inc(symbol=symbol.upper())
         print(f"Error for {symbol.upper()}: {error}")
 
     def on_close(ws, close_status_code, close_msg):
+        RECORDER_CLOSES.inc(symbol=symbol.upper())
         print(f"### Closed WebSocket for {symbol.upper()} ###")
 
     def on_open(ws):
@@ -0,0 +1,69 @@
+# src/price_engine/quote_cache.py
+"""
+Last quote per (source, symbol) with its arrival time.
+
+Streaming sources (the Binance WebSocket client) write into it on every trade;
+PriceAggregator writes REST results into it and only refetches a source once
+its cached quote is older than that source's TTL.
+"""
+import time
+
+import numpy as np
+
+from .telemetry import REGISTRY
+
+CACHE_HITS = REGISTRY.counter("price_engine_quote_cache_hits_total", "Quotes served from the last-quote cache")
+CACHE_MISSES = REGISTRY.counter("price_engine_quote_cache_misses_total", "Cache lookups that found no fresh quote")
+
+
+class QuoteCache:
+    def __init__(self, clock=time.monotonic):
+        """
+        :param clock: Seconds clock used to stamp and age quotes (monotonic by default).
+        """
+        self.clock = clock
+        # (source, symbol) -> (price, stamp). Writers replace whole tuples, so readers
+        # on other threads never see a torn entry and no lock is needed.
+        self._quotes = {}
+
+    def put(self, source: str, symbol: str, price: float, stamp: float = None):
+        self._quotes[(source, symbol)] = (price, self.clock() if stamp is None else stamp)
+
+    def get(self, source: str, symbol: str, ttl: float = None):
+        """
+        :param ttl: Largest acceptable age in seconds; None accepts any age.
+        :return: The cached price, or None when there is none or it is older than ttl.
+        """
+        quote = self._quotes.get((source, symbol))
+        if quote is None or (ttl is not None and self.clock() - quote[1] > ttl):
+            CACHE_MISSES.inc(source=source)
+            return None
+        CACHE_HITS.inc(source=source)
+        return quote[0]
+
+    def age(self, source: str, symbol: str) -> float:
+        """Seconds since the quote arrived; inf if there is none."""
+        quote = self._quotes.get((source, symbol))
+        return float("inf") if quote is None else self.clock() - quote[1]
+
+    def snapshot(self, symbols: list, sources: list):
+        """
+        :return: (prices, ages) symbols x sources matrices; NaN price and inf age where nothing is cached.
+        """
+        prices = np.full((len(symbols), len(sources)), np.nan)
+        ages = np.full(prices.shape, np.inf)
+        now = self.clock()
+        quotes = self._quotes
+        for i, symbol in enumerate(symbols):
+            for j, source in enumerate(sources):
+                quote = quotes.get((source, symbol))
+                if quote is not None:
+                    prices[i, j] = quote[0]
+                    ages[i, j] = now - quote[1]
+        return prices, ages
+
+    def clear(self):
+        self._quotes.clear()
+
+    def __len__(self):
+        return len(self._quotes)
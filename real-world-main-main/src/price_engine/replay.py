@@ -0,0 +1,158 @@
+# src/price_engine/replay.py
+"""
+Deterministic tick replay for offline throughput/latency measurement of the
+live pipeline (RealTimeTrader.on_price_update, BinanceWebSocketClient.on_message).
+"""
+import csv
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+
+def load_tick_log(path: str, symbol: str = None) -> list:
+    """
+    Load a '<YYYY-mm-dd HH:MM:SS>,<price>' log (as written by stream-to-csv).
+    :param symbol: Defaults to the file name prefix, e.g. btcusdt_price_log.csv -> BTCUSDT.
+    :return: List of (epoch_seconds, symbol, price) tuples in file order.
+    """
+    symbol = (symbol or os.path.basename(path).split("_")[0]).upper()
+    ticks = []
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            if len(row) < 2:
+                continue
+            ts = datetime.strptime(row[0], "%Y-%m-%d %H:%M:%S").timestamp()
+            ticks.append((ts, symbol, float(row[1])))
+    return ticks
+
+
+def merge_tick_logs(paths: list, limit: int = None, align_start: bool = False) -> list:
+    """
+    Merge several tick logs into one timeline. Ties keep file order, so replays are deterministic.
+    :param align_start: Shift every log to start at the earliest log's first tick, so
+        recordings made at different times replay side by side.
+    """
+    logs = []
+    for path in paths:
+        log = load_tick_log(path)
+        logs.append(log[:limit] if limit else log)
+
+    ticks = []
+    origin = min((log[0][0] for log in logs if log), default=0)
+    for log in logs:
+        shift = origin - log[0][0] if align_start and log else 0
+        ticks.extend((ts + shift, symbol, price) for ts, symbol, price in log)
+    ticks.sort(key=lambda tick: tick[0])
+    return ticks
+
+
+def trade_message(symbol: str, price: float, trade_id: int, sent_ns: int = None) -> str:
+    """Build a Binance @trade payload. sent_ns is a monotonic stamp used for latency."""
+    message = {"e": "trade", "s": symbol, "t": trade_id, "p": f"{price:.8f}", "T": int(time.time() * 1000)}
+    if sent_ns is not None:
+        message["_sent_ns"] = sent_ns
+    return json.dumps(message)
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def latency_report(count: int, elapsed: float, latencies_ns: list) -> dict:
+    return {
+        "ticks": count,
+        "elapsed_s": elapsed,
+        "ticks_per_second": count / elapsed if elapsed > 0 else 0.0,
+        "p50_latency_us": percentile(latencies_ns, 50) / 1e3,
+        "p99_latency_us": percentile(latencies_ns, 99) / 1e3,
+    }
+
+
+class TickReplayer:
+    def __init__(self, ticks: list, speed: float = 1.0):
+        """
+        :param ticks: (epoch_seconds, symbol, price) tuples, e.g. from merge_tick_logs.
+        :param speed: 1.0 replays in real time, N replays N times faster, None/0 replays at max speed.
+        """
+        self.ticks = ticks
+        self.speed = speed
+
+    def run(self, handler) -> dict:
+        """
+        Feed every tick to handler(symbol, price) on the calling thread.
+        Latency is measured from when a tick was due to when handler returned,
+        so it includes any backlog when the handler falls behind the replay clock.
+        """
+        latencies = []
+        start = time.monotonic_ns()
+        first_ts = self.ticks[0][0] if self.ticks else 0
+
+        for ts, symbol, price in self.ticks:
+            if self.speed:
+                due = start + int((ts - first_ts) / self.speed * 1e9)
+                delay = due - time.monotonic_ns()
+                if delay > 0:
+                    time.sleep(delay / 1e9)
+            else:
+                due = time.monotonic_ns()
+            handler(symbol, price)
+            latencies.append(time.monotonic_ns() - due)
+
+        elapsed = (time.monotonic_ns() - start) / 1e9
+        return latency_report(len(self.ticks), elapsed, latencies)
+
+
+def ws_message_handler(client):
+    """Adapt a BinanceWebSocketClient so replayed ticks go through on_message, JSON decoding included."""
+    trade_ids = {}
+
+    def handler(symbol, price):
+        trade_id = trade_ids.get(symbol, 0)
+        trade_ids[symbol] = trade_id + 1
+        client.on_message(None, trade_message(symbol, price, trade_id))
+
+    return handler
+
+
+def replay_over_websocket(ticks: list, on_price_update, speed: float = None, timeout: float = 300) -> dict:
+    """
+    Serve ticks from a local FakeBinanceWebSocketServer and consume them with a
+    real BinanceWebSocketClient. Latency runs from the server writing a frame
+    to on_price_update returning for that tick.
+    """
+    from .fake_exchange import FakeBinanceWebSocketServer
+    from .data_sources.websocket_handler import BinanceWebSocketClient
+
+    symbols = sorted({symbol for _, symbol, _ in ticks})
+    server = FakeBinanceWebSocketServer(ticks, speed=speed).start()
+    client = BinanceWebSocketClient(symbols, on_price_update, base_url=server.url, reconnect=False, stale_after=None)
+
+    latencies = []
+    done = threading.Event()
+    on_message = client.on_message
+
+    def timed_on_message(ws, message):
+        sent_ns = json.loads(message).get("_sent_ns")
+        on_message(ws, message)
+        if sent_ns is not None:
+            latencies.append(time.monotonic_ns() - sent_ns)
+        if len(latencies) >= len(ticks):
+            done.set()
+
+    client.on_message = timed_on_message
+    start = time.monotonic_ns()
+    try:
+        for symbol in symbols:
+            client.create_ws(symbol)
+        done.wait(timeout)
+        elapsed = (time.monotonic_ns() - start) / 1e9
+    finally:
+        for ws, _thread in client.connections.values():
+            ws.close()
+        server.stop()
+    return latency_report(len(latencies), elapsed, latencies)
@@ -0,0 +1,261 @@
+# src/price_engine/resilience.py
+"""
+Per-source rate limiting and circuit breaking for the REST fan-out.
+
+    guard = SourceGuard("coingecko", rate=0.5, burst=5)
+    try:
+        price = guard.call(api.get_price, "bitcoin", headers=lambda: api.last_headers)
+    except SourceUnavailable:
+        ...  # skipped this round: out of tokens or the breaker is open
+
+Nothing here sleeps. A source that is out of budget or failing is skipped at
+once, so one degraded upstream cannot hold up a quote from the others.
+"""
+import threading
+import time
+
+from .telemetry import REGISTRY
+
+SOURCE_SKIPPED = REGISTRY.counter("price_engine_source_skipped_total",
+                                  "Fetches skipped because the source was rate limited or its breaker was open")
+SOURCE_THROTTLED = REGISTRY.counter("price_engine_source_throttled_total", "HTTP 429/418 responses from a source")
+BREAKER_STATE = REGISTRY.gauge("price_engine_source_breaker_state", "Circuit breaker state: 0 closed, 1 half-open, 2 open")
+SOURCE_RATE = REGISTRY.gauge("price_engine_source_rate_limit", "Current request budget of a source (requests/s)")
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class RateLimitedError(Exception):
+    """The upstream answered 429/418; retry_after is its Retry-After in seconds (None if not given)."""
+
+    def __init__(self, message: str, retry_after: float = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class SourceUnavailable(Exception):
+    """The call was not made: the source is rate limited or its circuit breaker is open."""
+
+
+def raise_for_rate_limit(response, source: str):
+    """Turn a 429/418 response into RateLimitedError carrying its Retry-After."""
+    if response.status_code not in (418, 429):
+        return
+    retry_after = response.headers.get("Retry-After")
+    try:
+        retry_after = float(retry_after) if retry_after is not None else None
+    except ValueError:
+        retry_after = None
+    raise RateLimitedError(f"{source} rate limited (HTTP {response.status_code})", retry_after)
+
+
+class TokenBucket:
+    """
+    Token bucket whose refill rate adapts: it halves on every 429, creeps back
+    towards max_rate on success, and follows rate-limit headers when a source sends them.
+    """
+
+    def __init__(self, rate: float, burst: float = None, min_rate: float = None, clock=time.monotonic):
+        """
+        :param rate: Requests per second allowed when the source is healthy.
+        :param burst: Bucket size (defaults to one second of requests, at least 1).
+        :param min_rate: Floor for the adaptive rate (defaults to rate / 16).
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = rate / 16 if min_rate is None else min_rate
+        self.burst = max(1.0, rate) if burst is None else burst
+        self.clock = clock
+        self.tokens = self.burst
+        self.updated = clock()
+        self.blocked_until = 0.0
+        # Binance's minute weight window, located on self.clock by the used weight dropping.
+        self._window_start = None
+        self._used_weight = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            now = self.clock()
+            if now < self.blocked_until:
+                return False
+            self._refill(now)
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+    def wait_time(self) -> float:
+        """Seconds until the next request would be allowed."""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            refill = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            return max(self.blocked_until - now, refill)
+
+    def penalize(self, retry_after: float = None):
+        """A 429: halve the rate, drop the tokens and honour Retry-After (or one refill period)."""
+        with self._lock:
+            now = self.clock()
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0.0
+            self.updated = now
+            self.blocked_until = now + (retry_after if retry_after is not None else 1.0 / self.rate)
+
+    def reward(self):
+        """A success: grow the rate back by a tenth of the healthy rate."""
+        if self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+    def observe_headers(self, headers):
+        """
+        Follow the budget a source advertises. Understands the common
+        X-RateLimit-Remaining / X-RateLimit-Reset pair and Binance's X-MBX-USED-WEIGHT-1M.
+        """
+        if not headers:
+            return
+        with self._lock:
+            now = self.clock()
+            if "X-RateLimit-Remaining" in headers:
+                remaining = float(headers["X-RateLimit-Remaining"])
+                reset = float(headers.get("X-RateLimit-Reset", 60))
+            elif "X-MBX-USED-WEIGHT-1M" in headers:
+                # Binance allows 6000 weight per minute; a ticker request costs 2. The used
+                # weight drops when a new minute starts, which dates the window on this
+                # bucket's clock; until then the whole minute is assumed to be left.
+                used = float(headers["X-MBX-USED-WEIGHT-1M"])
+                if self._window_start is None or used < self._used_weight:
+                    self._window_start = now
+                self._used_weight = used
+                remaining = (6000 - used) / 2
+                reset = 60 - (now - self._window_start) % 60
+            else:
+                return
+            if remaining <= 0:
+                self.tokens = 0.0
+                self.updated = now
+                self.blocked_until = now + max(reset, 0.0)
+            elif reset > 0:
+                self.rate = max(self.min_rate, min(self.max_rate, remaining / reset))
+
+
+class CircuitBreaker:
+    """
+    Closed: calls flow. After failure_threshold consecutive failures it opens and
+    refuses calls for reset_timeout seconds, then lets one probe through (half-open);
+    the probe's outcome closes it again or re-opens it with a doubled timeout.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 15.0, max_reset_timeout: float = 300.0,
+                 clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.base_timeout = reset_timeout
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if self.clock() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return False  # one probe at a time
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.reset_timeout = self.base_timeout
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN:
+                self.reset_timeout = min(self.max_reset_timeout, self.reset_timeout * 2)
+                self._open()
+            elif self.failures >= self.failure_threshold:
+                self._open()
+
+    def release_probe(self):
+        """The half-open probe was not sent or was throttled, which says nothing about health; allow another."""
+        with self._lock:
+            self._probing = False
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = self.clock()
+        self._probing = False
+
+
+class SourceGuard:
+    """A source's token bucket and circuit breaker behind one call()."""
+
+    def __init__(self, name: str, rate: float = 5.0, burst: float = None, failure_threshold: int = 3,
+                 reset_timeout: float = 15.0, clock=time.monotonic):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst, clock=clock)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout, clock=clock)
+        self._publish()
+
+    def available(self) -> bool:
+        """False while the breaker is open; does not use up a half-open probe."""
+        breaker = self.breaker
+        return breaker.state != OPEN or breaker.clock() - breaker.opened_at >= breaker.reset_timeout
+
+    def call(self, fn, *args, headers=None, **kwargs):
+        """
+        Run fn(*args, **kwargs) if the breaker and the bucket allow it.
+        :param headers: Callable returning the last response's headers, to learn the source's budget.
+        :raises SourceUnavailable: The call was skipped.
+        """
+        if not self.breaker.allow():
+            SOURCE_SKIPPED.inc(source=self.name, reason="breaker_open")
+            raise SourceUnavailable(f"{self.name} circuit breaker is open")
+        if not self.bucket.try_acquire():
+            self.breaker.release_probe()
+            SOURCE_SKIPPED.inc(source=self.name, reason="rate_limited")
+            raise SourceUnavailable(f"{self.name} is rate limited for {self.bucket.wait_time():.2f}s")
+
+        try:
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                if headers is not None:
+                    self.bucket.observe_headers(headers())
+        except RateLimitedError as e:
+            SOURCE_THROTTLED.inc(source=self.name)
+            self.bucket.penalize(e.retry_after)
+            self.breaker.release_probe()
+            self._publish()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            self._publish()
+            raise
+        self.breaker.record_success()
+        self.bucket.reward()
+        self._publish()
+        return result
+
+    def _publish(self):
+        BREAKER_STATE.set(_STATE_VALUES[self.breaker.state], source=self.name)
+        SOURCE_RATE.set(self.bucket.rate, source=self.name)
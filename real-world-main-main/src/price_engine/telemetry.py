@@ -0,0 +1,234 @@
+# src/price_engine/telemetry.py
+"""
+In-process metrics registry with a Prometheus text-format HTTP endpoint.
+
+    from price_engine.telemetry import REGISTRY, start_metrics_server
+    REGISTRY.counter("price_engine_ws_messages_total", "Trade messages received").inc(symbol="BTCUSDT")
+    start_metrics_server(port=9108)   # curl http://127.0.0.1:9108/metrics
+"""
+import itertools
+import threading
+import time
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .latency import LatencyHistogram
+
+# Fixed export buckets (seconds), so series stay stable between scrapes.
+DEFAULT_BUCKETS = (0.00001, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def samples(self) -> list:
+        with self.lock:
+            return list(self.values.items())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self.values.get(_label_key(labels), 0)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with self.lock:
+            self.values[_label_key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        return self.values.get(_label_key(labels), 0)
+
+
+class Histogram(_Metric):
+    """Latency histogram in seconds, backed by LatencyHistogram (nanosecond buckets)."""
+    kind = "histogram"
+
+    def observe_ns(self, value_ns: int, **labels):
+        key = _label_key(labels)
+        with self.lock:
+            histogram = self.values.get(key)
+            if histogram is None:
+                histogram = self.values[key] = LatencyHistogram()
+            histogram.record(value_ns)
+
+    def observe(self, seconds: float, **labels):
+        self.observe_ns(int(seconds * 1e9), **labels)
+
+    def time(self, **labels):
+        return _Timer(self, labels)
+
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.monotonic_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe_ns(time.monotonic_ns() - self.start, **self.labels)
+        return False
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = {}
+        self.collectors = []
+        self.lock = threading.Lock()
+        self._instance_ids = itertools.count(1)
+
+    def _get_or_create(self, cls, name, help_text):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, help_text)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help_text: str = "") -> Counter:
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str = "") -> Gauge:
+        return self._get_or_create(Gauge, name, help_text)
+
+    def histogram(self, name: str, help_text: str = "") -> Histogram:
+        return self._get_or_create(Histogram, name, help_text)
+
+    def next_instance_id(self) -> str:
+        """Label value to tell apart several live instances (e.g. traders) of one component."""
+        return str(next(self._instance_ids))
+
+    def add_collector(self, callback):
+        """
+        Register a scrape-time callback returning [(name, kind, help, [(labels, value), ...]), ...].
+        For kind "histogram" the value is a LatencyHistogram. Bound methods are held
+        weakly, so collectors disappear with their owner.
+        """
+        ref = weakref.WeakMethod(callback) if hasattr(callback, "__self__") else (lambda: callback)
+        with self.lock:
+            self.collectors.append(ref)
+
+    def _collect(self) -> dict:
+        families = {}
+        for metric in list(self.metrics.values()):
+            families[metric.name] = [metric.kind, metric.help, metric.samples()]
+
+        with self.lock:
+            self.collectors = [ref for ref in self.collectors if ref() is not None]
+            callbacks = [ref() for ref in self.collectors]
+        for callback in callbacks:
+            if callback is None:
+                continue
+            for name, kind, help_text, samples in callback():
+                family = families.setdefault(name, [kind, help_text, []])
+                family[2].extend((_label_key(labels), value) for labels, value in samples)
+        return families
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format (v0.0.4)."""
+        lines = []
+        for name, (kind, help_text, samples) in sorted(self._collect().items()):
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, value in samples:
+                if kind == "histogram":
+                    lines.extend(_render_histogram(name, key, value))
+                else:
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _render_histogram(name: str, key: tuple, histogram: LatencyHistogram) -> list:
+    lines = []
+    buckets = histogram.buckets()
+    idx = 0
+    cumulative = 0
+    for bound in DEFAULT_BUCKETS:
+        bound_ns = bound * 1e9
+        while idx < len(buckets) and buckets[idx][0] <= bound_ns:
+            cumulative += buckets[idx][1]
+            idx += 1
+        lines.append(f"{name}_bucket{_format_labels(key, (('le', bound),))} {cumulative}")
+    lines.append(f"{name}_bucket{_format_labels(key, (('le', '+Inf'),))} {histogram.count}")
+    lines.append(f"{name}_sum{_format_labels(key)} {histogram.total / 1e9!r}")
+    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+    return lines
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep scrapes out of the console
+
+
+def start_metrics_server(port: int = 9108, host: str = "127.0.0.1", registry: MetricsRegistry = None):
+    """Serve /metrics on a background thread. Returns the server; call shutdown() to stop it."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    server.registry = registry or REGISTRY
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
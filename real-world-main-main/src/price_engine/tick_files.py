@@ -0,0 +1,137 @@
+# src/price_engine/tick_files.py
+"""
+Tick logs and bar files read in pieces instead of whole:
+
+    for chunk in read_tick_log_chunks("btcusdt_price_log.csv", chunksize=1_000_000):
+        ...                                             # time index, one column: BTCUSDT
+    for chunk in read_csv_chunks("btcusdt_1d.csv", chunksize=500_000):
+        ...                                             # bar file ("close" column) or one column per symbol
+    write_columnar(read_tick_log_chunks(path), "btcusdt.cols")   # convert once...
+    ColumnarFile("btcusdt.cols").chunks(1_000_000)               # ...then memory map it
+    tail_tick_log("btcusdt_price_log.csv", 5000)        # the last 5000 ticks, read from the end
+
+A columnar file is a directory of raw little-endian arrays, int64 nanosecond
+timestamps in index.i8 and float64 closes in 0.f8, 1.f8, ..., plus meta.json
+with the row count and column names. meta.json is written last, so a
+conversion that stopped halfway cannot be opened. Columns are np.memmap'd and
+a chunk only pages in its own rows, so later runs skip CSV parsing entirely.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+def _symbol_from_path(path: str) -> str:
+    return os.path.basename(path).split("_")[0].split(".")[0].upper()
+
+
+def _parse_ticks(chunk: pd.DataFrame) -> pd.DataFrame:
+    chunk.index = pd.to_datetime(chunk.index, format="%Y-%m-%d %H:%M:%S")
+    return chunk.apply(pd.to_numeric, errors="coerce")
+
+
+def read_tick_log_chunks(path: str, chunksize: int = 1_000_000, symbol: str = None):
+    """
+    Yield a '<YYYY-mm-dd HH:MM:SS>,<price>' log (as written by stream-to-csv) chunksize rows at a time.
+    :param symbol: Column name; defaults to the file name prefix, e.g. btcusdt_price_log.csv -> BTCUSDT.
+    """
+    symbol = (symbol or _symbol_from_path(path)).upper()
+    with pd.read_csv(path, header=None, names=["timestamp", symbol], usecols=[0, 1], index_col=0,
+                     chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield _parse_ticks(chunk)
+
+
+def read_csv_chunks(path: str, chunksize: int = 1_000_000, symbol: str = None):
+    """
+    Yield closes from a CSV with a header and the time in its first column, chunksize rows at a time.
+    A bar file (a "close" column, as fetch_historical_data returns) gives one column named symbol
+    (default: the file name prefix); otherwise every other column is one symbol's close.
+    """
+    with pd.read_csv(path, index_col=0, chunksize=chunksize) as reader:
+        for chunk in reader:
+            chunk.index = pd.to_datetime(chunk.index)
+            if "close" in chunk.columns:
+                chunk = chunk[["close"]].rename(columns={"close": (symbol or _symbol_from_path(path)).upper()})
+            yield chunk.astype(np.float64)
+
+
+def tail_tick_log(path: str, rows: int, symbol: str = None, block_size: int = 1 << 16) -> pd.DataFrame:
+    """The last rows ticks of a tick log, reading backwards from the end in blocks."""
+    symbol = (symbol or _symbol_from_path(path)).upper()
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        while position > 0 and data.count(b"\n") <= rows:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    lines = [line for line in data.decode().splitlines() if line.strip()]
+    if position > 0:
+        lines = lines[1:]  # the first line may be cut off
+    records = [line.split(",")[:2] for line in lines[-rows:]] if rows else []
+    frame = pd.DataFrame(records, columns=["timestamp", symbol]).set_index("timestamp")
+    return _parse_ticks(frame)
+
+
+def write_columnar(chunks, path: str) -> "ColumnarFile":
+    """Write an iterable of closes DataFrames (same columns, time index) as a columnar file."""
+    os.makedirs(path, exist_ok=True)
+    meta_path = os.path.join(path, "meta.json")
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+    columns = None
+    rows = 0
+    files = []
+    try:
+        for chunk in chunks:
+            if columns is None:
+                columns = [str(column) for column in chunk.columns]
+                files = [open(os.path.join(path, "index.i8"), "wb")]
+                files += [open(os.path.join(path, f"{j}.f8"), "wb") for j in range(len(columns))]
+            elif [str(column) for column in chunk.columns] != columns:
+                raise ValueError(f"Chunk columns {list(chunk.columns)} differ from {columns}")
+            stamps = np.asarray(chunk.index, dtype="datetime64[ns]").view(np.int64)
+            files[0].write(stamps.astype("<i8").tobytes())
+            for j in range(len(columns)):
+                files[j + 1].write(chunk.iloc[:, j].to_numpy(dtype="<f8").tobytes())
+            rows += len(chunk)
+    finally:
+        for f in files:
+            f.close()
+    with open(meta_path, "w") as f:
+        json.dump({"rows": rows, "columns": columns or []}, f)
+    return ColumnarFile(path)
+
+
+class ColumnarFile:
+    def __init__(self, path: str):
+        """:param path: Directory written by write_columnar()."""
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        self.path = path
+        self.columns = meta["columns"]
+        self.rows = meta["rows"]
+
+    def __len__(self):
+        return self.rows
+
+    def _map(self, name, dtype):
+        if not self.rows:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(self.path, name), dtype=dtype, mode="r", shape=(self.rows,))
+
+    def chunks(self, chunksize: int = 1_000_000, start: int = 0, stop: int = None):
+        """Yield rows [start, stop) as closes DataFrames of up to chunksize rows."""
+        stamps = self._map("index.i8", "<i8")
+        columns = [self._map(f"{j}.f8", "<f8") for j in range(len(self.columns))]
+        stop = self.rows if stop is None else min(stop, self.rows)
+        for lo in range(start, stop, chunksize):
+            hi = min(lo + chunksize, stop)
+            index = pd.DatetimeIndex(np.array(stamps[lo:hi]).view("datetime64[ns]"), name="timestamp")
+            yield pd.DataFrame({name: np.array(column[lo:hi]) for name, column in zip(self.columns, columns)},
+                               index=index)
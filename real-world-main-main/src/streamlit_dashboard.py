@@ -2,7 +2,6 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
 
-import json
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
@@ -21,71 +20,53 @@ import plotly.io as pio
 import io
 
 from backtesting_engine.real_time_runner import RealTimeTrader
+from backtesting_engine.engine_client import EngineClient, RemoteSession
+from backtesting_engine.session_archive import SessionArchive
 from price_engine.data_sources.websocket_handler import start_price_feed
 
+# With an engine daemon running (python src/main.py --mode daemon ...), sessions live
+# in the daemon and survive reruns and reloads, and several can run side by side on
+# its shared feed; otherwise the page runs its own feed for a single session.
+ENGINE_URL = os.environ.get("ENGINE_URL", "http://127.0.0.1:8765")
 
 
 
-SESSION_HISTORY_FILE = os.path.join(os.path.dirname(__file__), "session_history.json")
+
+SESSION_HISTORY_FILE = os.path.join(os.path.dirname(__file__), "session_history.json")  # legacy, imported once
+SESSION_ARCHIVE_DIR = os.path.join(os.path.dirname(__file__), "session_archive")
+HISTORY_PAGE_SIZE = 50
 
 def load_history():
+    """Open the session archive, importing the old session_history.json into it the first time."""
+    archive = SessionArchive(SESSION_ARCHIVE_DIR)
     try:
-        if os.path.exists(SESSION_HISTORY_FILE):
-            with open(SESSION_HISTORY_FILE, "r") as f:
-                history = json.load(f)
-                # Validate loaded data is a list
-                return history if isinstance(history, list) else []
+        if not len(archive) and os.path.exists(SESSION_HISTORY_FILE):
+            archive.import_json(SESSION_HISTORY_FILE)
     except Exception as e:
-        st.error(f"Error loading history: {e}")
-    return []
+        st.error(f"Error importing history: {e}")
+    return archive
 
-def save_history(history):
-    """Save session history to JSON file with better validation"""
-    try:
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(SESSION_HISTORY_FILE), exist_ok=True)
-        
-        # Validate history data
-        if not isinstance(history, list):
-            st.error("History must be a list")
-            return False
-            
-        # Convert pandas Timestamps to strings if present
-        for item in history:
-            if 'Timestamp' in item and pd.notna(item['Timestamp']):
-                item['Timestamp'] = str(item['Timestamp'])
-        
-        with open(SESSION_HISTORY_FILE, 'w') as f:
-            json.dump(history, f, indent=2, default=str)  # Handles non-serializable objects
-        return True
-    except Exception as e:
-        st.error(f"Failed to save history: {str(e)}")
-        return False
+def session_settings(trader, symbols, strategy):
+    """
+    (symbols, initial capital, runtime, strategy) the trader runs with. A daemon session
+    reports its own, which may differ from the sidebar after switching or re-attaching;
+    the in-page trader takes its symbols and strategy from the sidebar.
+    """
+    if isinstance(trader, RemoteSession):
+        return trader.data["symbols"], trader.initial_capital, trader.runtime, trader.data["strategy"]
+    return symbols, trader.initial_capital, trader.runtime, strategy
 
-# In save_completed_session(), add validation:
-def save_completed_session(trader, symbols, initial_capital, runtime):
+
+def save_completed_session(trader, symbols, initial_capital, runtime, strategy=""):
+    """Append the finished session (summary, trade log, PnL timeline) to the archive."""
     try:
-        summary = trader.get_portfolio_summary()
-        st.write("Debug - Trader Summary:", summary)  # Debug output
-        
-        session_info = {
-            "Timestamp": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "Symbols": ', '.join(symbols),
-            "Initial Capital": float(summary["initial_capital"]),
-            "Final Portfolio Value": float(summary["final_portfolio_value"]),
-            "PnL": float(summary["final_pnl"]),
-            "Cash Balance": float(summary["cash_balance"]),
-            "Unrealized PnL": float(summary["unrealized_pnl"]),
-            "Duration (s)": int(runtime)
-        }
-        
-        st.write("Debug - Session Info:", session_info)  # Debug output
-        
-        st.session_state.completed_runs.append(session_info)
-        if save_history(st.session_state.completed_runs):
-            st.success("Session saved successfully!")
-        else:
-            st.error("Failed to save session")
+        if hasattr(trader, "refresh"):
+            trader.refresh(logs=None, pnl=None)  # a daemon session's snapshots only carry the tails
+        st.session_state.completed_runs.append(
+            trader.get_portfolio_summary(), symbols, int(runtime),
+            logs=trader.get_logs(), pnl_timeline=trader.get_pnl_data(), strategy=strategy,
+            trades=trader.get_trade_count())
+        st.success("Session saved successfully!")
     except Exception as e:
         st.error(f"Error in save_completed_session: {str(e)}")
 
@@ -233,6 +214,16 @@ if "show_summary" not in st.session_state:
 if "completed_runs" not in st.session_state:
     st.session_state.completed_runs = load_history()
 
+if "engine" not in st.session_state:
+    engine_client = EngineClient(ENGINE_URL, timeout=1.0)
+    st.session_state.engine = engine_client if engine_client.ping() else None
+
+# Re-attach to a session still running in the daemon after a reload
+if st.session_state.engine and st.session_state.trader is None and not st.session_state.show_summary:
+    running = [s for s in st.session_state.engine.sessions() if s["active"]]
+    if running:
+        st.session_state.trader = st.session_state.engine.attach(running[-1]["id"])
+
 # Sidebar config
 st.sidebar.title("⚙️ Trading Configuration")
 
@@ -247,15 +238,35 @@ symbols = st.sidebar.multiselect(
     default=["BTCUSDT", "ETHUSDT"]
 )
 
-# Start button
-if st.sidebar.button("▶️ Start Trading") and st.session_state.trader is None:
-    st.session_state.trader = RealTimeTrader(capital=initial_capital, runtime=runtime)
-    st.session_state.runner_thread = threading.Thread(
-        target=start_price_feed,
-        args=(symbols, st.session_state.trader.on_price_update),
-        daemon=True
-    )
-    st.session_state.runner_thread.start()
+strategy = "mean_reversion"
+if st.session_state.engine:
+    strategy = st.sidebar.selectbox("Strategy", st.session_state.engine.status().get("strategies", [strategy]))
+
+    # Switch the view between the daemon's running sessions
+    running = [s for s in st.session_state.engine.sessions() if s["active"]]
+    if len(running) > 1:
+        labels = {s["id"]: f"{s['name']} ({', '.join(s['symbols'])}, {s['strategy']})" for s in running}
+        current = getattr(st.session_state.trader, "id", running[-1]["id"])
+        ids = list(labels)
+        chosen = st.sidebar.selectbox("Active Sessions", ids, index=ids.index(current) if current in ids else 0,
+                                      format_func=labels.get)
+        if chosen != current:
+            st.session_state.trader = st.session_state.engine.attach(chosen)
+
+# Start button (a daemon runs any number of sessions, the in-page feed only one)
+if st.sidebar.button("▶️ Start Trading") and (st.session_state.engine or st.session_state.trader is None):
+    if st.session_state.engine:
+        st.session_state.trader = st.session_state.engine.start_session(initial_capital, runtime, symbols,
+                                                                        strategy=strategy)
+        st.session_state.show_summary = False
+    else:
+        st.session_state.trader = RealTimeTrader(capital=initial_capital, runtime=runtime)
+        st.session_state.runner_thread = threading.Thread(
+            target=start_price_feed,
+            args=(symbols, st.session_state.trader.on_price_update),
+            daemon=True
+        )
+        st.session_state.runner_thread.start()
     st.success("🚀 Trading session started!")
 
 # Stop button
@@ -263,10 +274,8 @@ if st.sidebar.button("⏹ Stop Trading"):
     if st.session_state.trader:
         st.session_state.trader.stop()
         save_completed_session(
-            st.session_state.trader, 
-            symbols, 
-            initial_capital, 
-            runtime
+            st.session_state.trader,
+            *session_settings(st.session_state.trader, symbols, strategy)
         )
         
         st.session_state.trader = None
@@ -315,14 +324,29 @@ if st.session_state.trader is None:
         # Display Session History Table
         # st.write("DEBUG - completed_runs:", st.session_state.get("completed_runs", "Not Found"))
 
-        if st.session_state.completed_runs:
+        history = st.session_state.completed_runs
+        if len(history):
             st.subheader("📊 Session History")
-            history_df = pd.DataFrame(st.session_state.completed_runs)
+            col_filter, col_page = st.columns(2)
+            symbol_filter = col_filter.selectbox("Symbol", ["All"] + history.symbols())
+            filters = {} if symbol_filter == "All" else {"symbol": symbol_filter}
+            pages = max(1, -(-history.count(**filters) // HISTORY_PAGE_SIZE))
+            page = col_page.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1)
+            history_df = pd.DataFrame(history.page(page - 1, HISTORY_PAGE_SIZE, **filters))
             st.dataframe(history_df)
 
+            if not history_df.empty:
+                chosen = st.selectbox("Replay a session's portfolio value", history_df["Session"],
+                                      format_func=lambda i: f"#{i} {history_df.set_index('Session').at[i, 'Timestamp']}")
+                past_df = pd.DataFrame(history.session(int(chosen))["pnl_timeline"])
+                if not past_df.empty:
+                    st.line_chart(past_df.set_index(pd.to_datetime(past_df["timestamp"]))["portfolio_value"])
+
             st.subheader("📈 Profit & Loss Distribution")
-            pnl_values = [run['PnL'] for run in st.session_state.completed_runs]
-            fig = px.histogram(pnl_values, nbins=20, title="Profit & Loss Distribution Across All Sessions")
+            counts, edges = history.pnl_histogram(bins=20)
+            fig = px.bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, labels={"x": "PnL", "y": "Sessions"},
+                         title="Profit & Loss Distribution Across All Sessions")
+            fig.update_traces(width=edges[1] - edges[0])
             st.plotly_chart(fig)
 
         st.stop()
@@ -335,9 +359,11 @@ if st.session_state.trader is None:
 
 # Active session continues here
 trader = st.session_state.trader
+if hasattr(trader, "refresh"):
+    trader.refresh()  # one snapshot request per render for a daemon session
 
 elapsed = int(time.time() - trader.start_time)
-remaining = max(runtime - elapsed, 0)
+remaining = max(int(trader.runtime) - elapsed, 0)  # the session's own runtime, not the sidebar's
 st.sidebar.metric("⏳ Time Remaining", f"{remaining} sec")
 
 # Auto-close if trader ends silently
@@ -353,9 +379,7 @@ if st.session_state.trader and not st.session_state.trader.is_active:
     # Save session
     save_completed_session(
         trader,
-        symbols,
-        initial_capital,
-        runtime
+        *session_settings(trader, symbols, strategy)
     )
 
     # Generate chart only if timeline exists
@@ -393,10 +417,6 @@ if st.session_state.trader and not st.session_state.trader.is_active:
     st.rerun()
 
 
-if time.time() - getattr(trader, 'last_save_time', 0) > 300:  # Auto-save every 5 minutes
-    save_history(st.session_state.completed_runs)
-    trader.last_save_time = time.time()
-
 # --- Main UI ---
 st.title("♞ The Real World Trading Engine")
 st.subheader("📊 Real-Time Trading Dashboard")
@@ -415,10 +435,15 @@ with col4:
     portfolio_value = trader.cash_balance + unrealized
     st.metric("📊 Current Portfolio Value", f"${portfolio_value:,.2f}")
 
+# Snapshot trader state once per render; the getters never block the feed threads
+positions = trader.get_positions()
+logs = trader.get_logs()
+pnl_timeline = trader.get_pnl_data()
+
 # PnL Chart
 expected_keys = {"timestamp", "portfolio_value"}
 cleaned_timeline = [
-    entry for entry in trader.pnl_timeline
+    entry for entry in pnl_timeline
     if isinstance(entry, dict) and expected_keys.issubset(entry)
 ]
 pnl_df = pd.DataFrame(cleaned_timeline)
@@ -442,11 +467,11 @@ if not pnl_df.empty:
 st.plotly_chart(fig, use_container_width=True)
 
 # Open Positions
-if trader.positions:
+if positions:
     st.subheader("📌 Open Positions")
     pos_data = []
-    for symbol, pos in trader.positions.items():
-        current_price = trader.data[symbol][-1]["price"] if trader.data[symbol] and "price" in trader.data[symbol][-1] else 0
+    for symbol, pos in positions.items():
+        current_price = trader.get_latest_price(symbol) or 0
         pnl = (current_price - pos["entry_price"]) * pos["size"]
         pos_data.append({
             "Symbol": symbol,
@@ -462,16 +487,33 @@ else:
 
 # Trade Logs
 st.subheader("🧾 Trade Logs")
-if trader.logs:
-    st.code("\n".join(trader.logs[-20:]), language="bash")
+if logs:
+    st.code("\n".join(logs[-20:]), language="bash")
 else:
     st.write("Waiting for trade signals...")
-    
+
+# Pipeline latency (tick receive -> decision -> order)
+latency_stats = trader.get_latency_stats()
+if latency_stats:
+    st.subheader("⏱️ Pipeline Latency (µs)")
+    latency_rows = []
+    for stage in trader.LATENCY_STAGES:
+        for symbol, stats in latency_stats.get(stage, {}).items():
+            latency_rows.append({
+                "Stage": stage,
+                "Symbol": symbol,
+                "Count": stats["count"],
+                "p50": round(stats["p50_us"], 1),
+                "p99": round(stats["p99_us"], 1),
+                "Max": round(stats["max_us"], 1)
+            })
+    st.dataframe(pd.DataFrame(latency_rows), use_container_width=True)
+
 
 # Download logs
 if st.button("📥 Download Logs as CSV"):
     csv_buffer = StringIO()
-    log_df = pd.DataFrame(trader.logs, columns=["Trade Logs"])
+    log_df = pd.DataFrame(logs, columns=["Trade Logs"])
     log_df.to_csv(csv_buffer, index=False)
     st.download_button("Download Logs", csv_buffer.getvalue(), file_name="trade_logs.csv", mime="text/csv")
 
@@ -484,7 +526,7 @@ if st.button("📧 Send Email Summary"):
         "cash_balance": trader.cash_balance,
         "unrealized_pnl": unrealized
     }
-    if send_email_with_chart(summary, trader.logs, fig):
+    if send_email_with_chart(summary, logs, fig):
         st.success("✅ Email sent successfully!")
     else:
         st.error("❌ Failed to send email")
@@ -496,8 +538,8 @@ st.session_state.last_summary = {
     "cash_balance": trader.cash_balance,
     "unrealized_pnl": unrealized
 }
-st.session_state.last_logs = trader.logs.copy()
-st.session_state.last_timeline = trader.pnl_timeline.copy()
+st.session_state.last_logs = logs
+st.session_state.last_timeline = pnl_timeline
 
 # Reset
 if st.sidebar.button("🔄 Reset Session"):
@@ -0,0 +1,99 @@
+# tests/test_aggregator.py
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC)
+
+from price_engine.aggregator import PriceAggregator
+from price_engine.data_sources.binance_api import BinanceAPI
+from price_engine.data_sources.coinbase_api import CoinbaseAPI
+from price_engine.data_sources.coingecko_api import CoinGeckoAPI
+from price_engine.fake_exchange import FakeRestExchange
+from price_engine.price_history import PriceHistory
+
+HEAVY = ("pandas", "yfinance", "plotly", "matplotlib", "tabulate", "websocket", "numpy")
+
+
+def modules_loaded_by(code):
+    probe = f"{code}\nimport sys\nprint(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", probe], cwd=SRC, capture_output=True, text=True, check=True)
+    return [m for m in result.stdout.strip().split(",") if m]
+
+
+class TestLazySources(unittest.TestCase):
+    def test_sources_are_built_on_first_use(self):
+        aggregator = PriceAggregator("crypto", ["BTCUSDT"])
+        self.assertFalse(any(info.built for info in aggregator.sources.values()))
+
+        handler = aggregator.sources["binance"]["handler"]
+        self.assertIsInstance(handler, BinanceAPI)
+        self.assertIs(aggregator.sources["binance"]["handler"], handler)
+        self.assertEqual([name for name, info in aggregator.sources.items() if info.built], ["binance"])
+
+    def test_rest_fetch_leaves_stream_unbuilt(self):
+        fake = FakeRestExchange({"BTCUSDT": 64000.0, "bitcoin": 64010.0}).start()
+        tmp = tempfile.TemporaryDirectory()
+        try:
+            aggregator = PriceAggregator("crypto", ["BTCUSDT"])
+            aggregator.price_history = PriceHistory(os.path.join(tmp.name, "prices.json"))
+            aggregator.sources["binance"]["handler"] = BinanceAPI(base_url=fake.binance_url)
+            aggregator.sources["coingecko"]["handler"] = CoinGeckoAPI(base_url=fake.coingecko_url)
+            aggregator.sources["coinbase"]["handler"] = CoinbaseAPI(base_url=fake.coinbase_url)
+            prices = aggregator.get_all_prices("BTCUSDT")
+        finally:
+            fake.stop()
+            tmp.cleanup()
+        self.assertEqual(prices, {"binance": 64000.0, "coingecko": 64010.0, "coinbase": 64000.0})
+        self.assertFalse(aggregator.sources["binance_ws"].built)
+
+
+class AsyncSource:
+    def __init__(self, price):
+        self.price = price
+        self.calls = 0
+
+    async def get_price(self, symbol):
+        self.calls += 1
+        return self.price
+
+
+class TestAsyncFetches(unittest.TestCase):
+    def test_async_sources_go_through_their_guard(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        aggregator = PriceAggregator("crypto", ["BTCUSDT"])
+        aggregator.price_history = PriceHistory(os.path.join(tmp.name, "prices.json"))
+        source = AsyncSource(64000.0)
+        aggregator.sources = {"binance": aggregator.sources["binance"]}
+        aggregator.sources["binance"]["handler"] = source
+
+        self.assertEqual(aggregator.get_all_prices_async("BTCUSDT"), {"binance": 64000.0})
+        self.assertEqual(source.calls, 1)
+
+        guard = aggregator.guards["binance"]
+        for _ in range(guard.breaker.failure_threshold):
+            guard.breaker.record_failure()
+        self.assertEqual(aggregator.get_all_prices_async("ETHUSDT"), {})  # breaker open: skipped
+        self.assertEqual(source.calls, 1)
+
+
+class TestCliStartup(unittest.TestCase):
+    def test_main_imports_nothing_heavy(self):
+        self.assertEqual(modules_loaded_by("import main"), [])
+
+    def test_api_live_mode_imports(self):
+        self.assertEqual(modules_loaded_by("import main, importlib\n"
+                                           "for m in main.MODE_IMPORTS['api-live']: importlib.import_module(m)"), [])
+
+    def test_aggregator_defers_sources_and_pandas(self):
+        loaded = modules_loaded_by("from price_engine.aggregator import PriceAggregator\n"
+                                   "PriceAggregator('crypto', ['BTCUSDT'])")
+        self.assertEqual(loaded, ["numpy"])  # the consolidator's, and nothing else
+
+
+if __name__ == "__main__":
+    unittest.main()
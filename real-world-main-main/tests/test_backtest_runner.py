@@ -0,0 +1,90 @@
+# tests/test_backtest_runner.py
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from backtesting_engine.backtest_runner import main, run_backtest, run_file_backtest, run_per_symbol_backtests
+from backtesting_engine.execution import SimulatedExecution
+from backtesting_engine.portfolio import Portfolio
+from backtesting_engine.strategies import Strategy
+from price_engine.indicators import cache as indicator_cache
+
+
+class BuyOnce(Strategy):
+    def on_bar(self, window, position):
+        if not getattr(self, "bought", False):
+            self.bought = True
+            return "buy"
+        return None
+
+
+class TestPerSymbolBacktest(unittest.TestCase):
+    def setUp(self):
+        index = pd.date_range("2024-01-01", periods=400, freq="D")
+        rng = np.random.default_rng(4)
+        self.frames = {symbol: pd.DataFrame({"close": start * np.exp(np.cumsum(rng.normal(0, 0.03, 400))),
+                                             "volume": 1e6}, index=index)
+                       for symbol, start in (("AAA", 100.0), ("BBB", 20.0))}
+
+    def test_take_profit_and_stop_loss_exits(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            totals = run_per_symbol_backtests(self.frames, [60, 40], "crypto", "bollinger", 1_000_000)
+            expected = [run_backtest(symbol, None, None, "crypto", "bollinger",
+                                     Portfolio(initial_capital=1_000_000 * allocation / 100), data=df)
+                        for (symbol, df), allocation in zip(self.frames.items(), [60, 40])]
+
+        self.assertIn("TAKE PROFIT LONG", output.getvalue())
+        self.assertIn("STOP LOSS LONG", output.getvalue())
+        self.assertAlmostEqual(totals["final_net_worth"], sum(r["final_net_worth"] for r in expected))
+        self.assertEqual(totals["total_trades"], sum(r["total_trades"] for r in expected))
+
+    def test_volume_capped_exit_keeps_the_residual(self):
+        # Bought whole on a deep bar, then +30%: take profit can only sell 40 of 100 per bar.
+        df = pd.DataFrame({"close": [100.0] * 50 + [130.0] * 10, "volume": [1e9] * 50 + [80.0] * 10},
+                          index=pd.date_range("2024-01-01", periods=60, freq="D"))
+        portfolio = Portfolio(initial_capital=100_000, execution=SimulatedExecution(taker_fee=0.0,
+                                                                                     max_participation=0.5))
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            run_backtest("AAA", None, None, "crypto", BuyOnce(), portfolio, data=df)
+
+        self.assertEqual(output.getvalue().count("TAKE PROFIT LONG"), 3)  # 40 + 40 + 20
+        self.assertEqual(portfolio.positions["AAA"], 0)
+        self.assertIsNone(portfolio.current_position["AAA"])
+
+
+class TestFileBacktest(unittest.TestCase):
+    def test_options_it_cannot_honour_are_rejected(self):
+        defaults = {"impact": 0.0, "max_participation": None, "per_symbol": False, "config": None}
+        for options in ({"impact": 0.1}, {"max_participation": 0.05}, {"per_symbol": True}, {"config": "run.json"}):
+            with self.subTest(**options), self.assertRaises(ValueError):
+                run_file_backtest(argparse.Namespace(data_file="ticks.csv", **dict(defaults, **options)))
+
+    def test_indicator_cache_is_configured(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.addCleanup(setattr, indicator_cache, "_default", indicator_cache._default)
+        path = os.path.join(tmp.name, "bars.csv")
+        pd.DataFrame({"AAA": 100 + np.sin(np.arange(200) / 5)},
+                     index=pd.date_range("2024-01-01", periods=200, freq="D")).to_csv(path)
+        cache_dir = os.path.join(tmp.name, "cache")
+
+        argv = ["backtest_runner", "--data_file", path, "--indicator_cache", cache_dir]
+        with mock.patch.object(sys, "argv", argv), contextlib.redirect_stdout(io.StringIO()):
+            main()
+        self.assertEqual(indicator_cache.get_cache().path, cache_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# tests/test_consolidator.py
+import os
+import sys
+import unittest
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from price_engine.aggregator import PriceAggregator
+from price_engine.consolidator import PriceConsolidator, robust_mask, row_median
+from price_engine.price_calculator import PriceCalculator
+from price_engine.quote_cache import QuoteCache
+from price_engine.utils import handle_outliers
+
+
+class TestRobustFiltering(unittest.TestCase):
+    def test_mad_rejects_single_bad_source(self):
+        # Mean +/- 2 sigma keeps 71000 here: the outlier inflates sigma itself.
+        prices = {"binance": 64000.0, "coinbase": 64010.0, "coingecko": 71000.0, "kraken": None}
+        filtered = PriceCalculator.handle_outliers(prices)
+        self.assertEqual(filtered, {"binance": 64000.0, "coinbase": 64010.0, "coingecko": None, "kraken": None})
+        self.assertEqual(handle_outliers(prices), filtered)
+
+        # Identical quotes give a MAD of 0; a quote a hair away is still kept.
+        mask = robust_mask(np.array([[100.0, 100.0, 100.0, 100.02]]))
+        self.assertTrue(mask.all())
+
+    def test_row_median_ignores_nan(self):
+        values = np.array([[3.0, np.nan, 1.0, 2.0], [np.nan, np.nan, np.nan, np.nan], [4.0, 1.0, np.nan, np.nan]])
+        np.testing.assert_allclose(row_median(values), [2.0, np.nan, 2.5])
+
+    def test_weighted_average_tolerates_unweighted_sources(self):
+        price = PriceCalculator.calculate_weighted_average({"binance": 100.0, "new_source": 110.0}, {"binance": 3.0})
+        self.assertAlmostEqual(price, (300.0 + 110.0) / 4.0)
+
+
+class TestPriceConsolidator(unittest.TestCase):
+    def test_vectorized_universe(self):
+        consolidator = PriceConsolidator({"a": 1.0, "b": 1.0, "c": 2.0}, half_life=5.0, max_age=30.0)
+        prices = np.array([
+            [100.0, 101.0, 150.0],     # c is an outlier
+            [10.0, np.nan, 10.5],      # b has no quote
+            [50.0, 52.0, 51.0],        # a's quote is too old
+            [np.nan, np.nan, np.nan],  # nothing at all
+        ])
+        ages = np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 5.0], [60.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+        consolidated, kept = consolidator.consolidate(prices, ages)
+
+        self.assertAlmostEqual(consolidated[0], 100.5)
+        self.assertFalse(kept[0, 2])
+        # c's weight of 2 is halved by one half-life of age.
+        self.assertAlmostEqual(consolidated[1], (10.0 * 1.0 + 10.5 * 1.0) / 2.0)
+        self.assertAlmostEqual(consolidated[2], (52.0 + 2 * 51.0) / 3.0)
+        self.assertTrue(np.isnan(consolidated[3]))
+
+        self.assertAlmostEqual(consolidator.consolidate_quotes({"a": 100.0, "b": 101.0, "c": 150.0, "zz": 1.0}),
+                               100.5)
+
+    def test_slow_sources_lose_weight(self):
+        consolidator = PriceConsolidator({"fast": 1.0, "slow": 1.0}, latency_scale=0.25)
+        consolidator.observe_latency("fast", 0.0)
+        consolidator.observe_latency("slow", 0.75)
+        np.testing.assert_allclose(consolidator.source_scores(), [1.0, 0.25])
+        price = consolidator.consolidate_quotes({"fast": 100.0, "slow": 100.04})
+        self.assertAlmostEqual(price, (100.0 + 0.25 * 100.04) / 1.25)
+
+
+class TestAggregatorConsolidation(unittest.TestCase):
+    def test_displayed_quotes_match_consolidation(self):
+        aggregator = PriceAggregator("crypto", ["BTCUSDT"])
+        aggregator.quotes = QuoteCache(clock=lambda: 1000.0)  # same quote ages for both calls
+        for source, price in (("binance", 64000.0), ("coinbase", 64010.0), ("coingecko", 71000.0)):
+            aggregator.quotes.put(source, "BTCUSDT", price)
+
+        price, quotes = aggregator.get_consolidated_quotes("BTCUSDT")
+        self.assertEqual(price, aggregator.get_consolidated_prices(["BTCUSDT"])["BTCUSDT"])
+        self.assertEqual(quotes, {"binance": (64000.0, True), "coinbase": (64010.0, True),
+                                  "coingecko": (71000.0, False)})
+        self.assertTrue(64000.0 <= price <= 64010.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
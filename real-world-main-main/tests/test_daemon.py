@@ -0,0 +1,113 @@
+# tests/test_daemon.py
+import os
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from backtesting_engine.daemon import Engine
+from backtesting_engine.engine_client import EngineClient, EngineUnavailable
+from price_engine.fake_exchange import FakeBinanceWebSocketServer
+
+
+def wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestEngineDaemon(unittest.TestCase):
+    def setUp(self):
+        ticks = [(1700000000 + i, "BTCUSDT", 100.0 + (i % 7)) for i in range(400)]
+        self.server = FakeBinanceWebSocketServer(ticks, speed=200).start()
+        self.engine = Engine(base_url=self.server.url, rest_url=None).start(port=0)
+        self.client = EngineClient(self.engine.url)
+
+    def tearDown(self):
+        self.engine.shutdown()
+        self.server.stop()
+
+    def test_sessions_share_one_feed(self):
+        first = self.client.start_session(capital=10000, runtime=60, symbols=["btcusdt"])
+        second = self.client.start_session(capital=5000, runtime=60, symbols=["BTCUSDT"], name="small")
+        traders = [self.engine.session(s.id).trader for s in (first, second)]
+        self.assertTrue(wait_for(lambda: all(t.get_price_data().get("BTCUSDT") for t in traders)))
+
+        self.assertEqual(list(self.engine.feed.connections), ["BTCUSDT"])  # one stream for both sessions
+        self.assertEqual(self.client.status()["active_sessions"], 2)
+        self.assertIn("BTCUSDT", self.client.quotes())
+
+        second.refresh(logs=5, pnl=3)
+        self.assertEqual(second.initial_capital, 5000)
+        self.assertEqual(second.data["name"], "small")
+        self.assertLessEqual(len(second.get_pnl_data()), 3)
+        self.assertIsNotNone(second.get_latest_price("BTCUSDT"))
+
+        second.stop()
+        self.assertFalse(second.is_active)
+        second.refresh(logs=None, pnl=None)  # the whole log and timeline, as archived by the dashboard
+        self.assertEqual(second.get_pnl_data(), traders[1].get_pnl_data())
+        self.assertEqual(second.get_logs(), traders[1].get_logs())
+        self.assertEqual(self.engine._routes["BTCUSDT"], (traders[0],))
+        self.assertEqual([s["active"] for s in self.client.sessions()], [True, False])
+
+    def test_errors_and_shutdown(self):
+        with self.assertRaises(EngineUnavailable):
+            self.client.snapshot("42")
+        with self.assertRaises(EngineUnavailable):
+            self.client.start_session(capital=100, runtime=10, symbols=[])
+        with self.assertRaisesRegex(EngineUnavailable, "list of non-empty strings"):
+            self.client.subscribe("BTCUSDT")
+        with self.assertRaisesRegex(EngineUnavailable, "list of non-empty strings"):
+            self.client.start_session(capital=100, runtime=10, symbols="BTCUSDT")
+        self.assertEqual(self.engine.feed.connections, {})  # no stream per letter
+
+        session = self.client.start_session(capital=100, runtime=10, symbols=["BTCUSDT"])
+
+        def broken():
+            raise RuntimeError("stats unavailable")
+        self.engine.session(session.id).trader.get_latency_stats = broken
+        with self.assertRaisesRegex(EngineUnavailable, "internal error: RuntimeError"):
+            session.refresh()
+        self.assertTrue(self.client.ping())  # answered with a 500, the server carries on
+
+        self.client.shutdown()
+        self.assertTrue(wait_for(lambda: not self.client.ping(), timeout=5))
+        self.assertFalse(self.engine.session(session.id).active)
+
+
+class _HtmlErrorHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b"<html><body>502 Bad Gateway</body></html>"
+        self.send_response(502)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestEngineClient(unittest.TestCase):
+    def test_non_json_answer_is_engine_unavailable(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _HtmlErrorHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            client = EngineClient(f"http://127.0.0.1:{server.server_address[1]}")
+            with self.assertRaisesRegex(EngineUnavailable, "HTTP 502"):
+                client.status()
+            self.assertFalse(client.ping())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
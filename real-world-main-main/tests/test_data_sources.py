@@ -0,0 +1,52 @@
+# tests/test_data_sources.py
+import os
+import tempfile
+import unittest
+
+from src.price_engine.data_sources.websocket_handler import BinanceWebSocketClient
+from src.price_engine.replay import TickReplayer, merge_tick_logs, replay_over_websocket, ws_message_handler
+
+
+def write_log(directory, name, rows):
+    path = os.path.join(directory, name)
+    with open(path, "w") as f:
+        f.write("\n".join(f"{ts},{price}" for ts, price in rows))
+    return path
+
+
+class TestTickReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.btc = write_log(self.tmp.name, "btcusdt_price_log.csv",
+                             [("2025-04-06 03:01:53", 100.0), ("2025-04-06 03:01:54", 101.0)])
+        self.eth = write_log(self.tmp.name, "ethusdt_price_log.csv",
+                             [("2025-04-06 05:00:00", 10.0), ("2025-04-06 05:00:01", 11.0)])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_merge_is_ordered_and_aligned(self):
+        ticks = merge_tick_logs([self.btc, self.eth], align_start=True)
+        self.assertEqual([t[1] for t in ticks], ["BTCUSDT", "ETHUSDT", "BTCUSDT", "ETHUSDT"])
+        self.assertEqual(ticks[0][0], ticks[1][0])
+
+    def test_replay_through_on_message(self):
+        received = []
+        client = BinanceWebSocketClient(["BTCUSDT"], lambda s, p: received.append((s, p)))
+        ticks = merge_tick_logs([self.btc])
+        report = TickReplayer(ticks, speed=None).run(ws_message_handler(client))
+        self.assertEqual(received, [("BTCUSDT", 100.0), ("BTCUSDT", 101.0)])
+        self.assertEqual(report["ticks"], 2)
+        self.assertGreater(report["ticks_per_second"], 0)
+
+    def test_replay_over_fake_websocket_server(self):
+        received = []
+        ticks = merge_tick_logs([self.btc, self.eth], align_start=True)
+        report = replay_over_websocket(ticks, lambda s, p: received.append((s, p)), timeout=10)
+        self.assertEqual(report["ticks"], 4)
+        self.assertEqual(sorted(received), [("BTCUSDT", 100.0), ("BTCUSDT", 101.0),
+                                            ("ETHUSDT", 10.0), ("ETHUSDT", 11.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+# tests/test_database.py
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from price_engine.data_sources.websocket_handler import BinanceWebSocketClient
+from price_engine.database import PartitionedPriceDatabase, PriceDatabase
+
+
+class TestPriceDatabase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "prices.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_batched_writer_wal_and_index(self):
+        with PriceDatabase(self.path, batched=True, batch_size=50) as db:
+            for i in range(120):
+                db.insert_price("binance", "BTCUSDT", 100.0 + i, timestamp=f"2024-01-01 00:00:{i // 2:02d}.{i % 2}00")
+            db.insert_price("binance", "ETHUSDT", 10.0)
+            self.assertTrue(db.flush(timeout=5))
+
+            self.assertEqual(db.conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            rows = db.get_prices("BTCUSDT")
+            self.assertEqual(len(rows), 120)
+            self.assertEqual(rows[0], ("binance", 219.0, "2024-01-01 00:00:59.100"))
+
+            plan = " ".join(r[-1] for r in db.conn.execute(
+                "EXPLAIN QUERY PLAN SELECT source, price, timestamp FROM prices WHERE symbol = ? "
+                "ORDER BY timestamp DESC", ("BTCUSDT",)))
+            self.assertIn("COVERING INDEX idx_prices_symbol_ts", plan)
+
+    def test_ranged_and_paged_queries(self):
+        with PriceDatabase(self.path) as db:
+            # Two sources quote in the same millisecond, so pages must not split on timestamp alone.
+            db.insert_prices([(source, "BTCUSDT", float(i), f"2024-01-01 00:00:{i:02d}.000")
+                              for i in range(30) for source in ("binance", "coinbase")])
+            window = db.get_prices("BTCUSDT", start="2024-01-01 00:00:10", end="2024-01-01 00:00:20",
+                                   ascending=True)
+            self.assertEqual([r[1] for r in window[::2]], [float(i) for i in range(10, 20)])
+            self.assertEqual(db.get_prices("BTCUSDT", limit=4, offset=2)[0][1], 28.0)
+
+            pages = list(db.iter_prices("BTCUSDT", page_size=7))
+            self.assertEqual(sum(len(p) for p in pages), 60)
+            self.assertEqual(len({(r[0], r[2]) for page in pages for r in page}), 60)
+
+    def test_websocket_sink(self):
+        with PriceDatabase(self.path, batched=True) as db:
+            client = BinanceWebSocketClient(["BTCUSDT"], on_price_update=lambda symbol, price: None, sink=db)
+            client.on_message(None, '{"s": "BTCUSDT", "p": "64000.5"}')
+            client.on_message(None, "not json")
+            db.flush()
+            self.assertEqual([r[:2] for r in db.get_prices("BTCUSDT")], [("binance_ws", 64000.5)])
+
+
+class TestPartitionedPriceDatabase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "ticks.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_partitions_and_incremental_rollups(self):
+        with PartitionedPriceDatabase(self.path, batched=True, batch_size=3) as db:
+            # Out of order within the minute: the 10:00:05 tick is the open, 10:00:50 the close.
+            for price, ts in [(101.0, "10:00:20"), (100.0, "10:00:05"), (104.0, "10:00:50"),
+                              (99.0, "10:00:30"), (102.0, "10:01:10"), (110.0, "11:30:00")]:
+                db.insert_price("binance", "BTCUSDT", price, f"2024-03-01 {ts}.000")
+            db.insert_price("binance", "BTCUSDT", 120.0, "2024-03-02 00:00:01.000")
+            db.insert_price("coinbase", "ETHUSDT", 10.0, "2024-03-01 10:00:00.000")
+            db.flush()
+
+            self.assertEqual(db.partitions("BTCUSDT"), [("BTCUSDT", "2024-03-01", 6), ("BTCUSDT", "2024-03-02", 1)])
+            minute = db.get_ohlc("BTCUSDT", "1m", end="2024-03-01 10:01")
+            self.assertEqual(minute, [("2024-03-01 10:00", 100.0, 104.0, 99.0, 104.0, 4)])
+            hours = db.get_ohlc("BTCUSDT", "1h", as_frame=True)
+            self.assertEqual(list(hours["close"]), [102.0, 110.0, 120.0])
+            self.assertEqual(str(hours.index[1]), "2024-03-01 11:00:00")
+
+            # Reads span partitions and honour ranges and paging.
+            self.assertEqual(db.get_prices("BTCUSDT", limit=2)[1][1], 110.0)
+            self.assertEqual(len(db.get_prices("BTCUSDT", start="2024-03-01 10:00:30")), 5)
+            pages = list(db.iter_prices("BTCUSDT", page_size=4))
+            self.assertEqual([len(p) for p in pages], [1, 4, 2])
+
+    def test_retention_drops_old_days(self):
+        with PartitionedPriceDatabase(self.path, retention_days=2, minute_retention_days=2) as db:
+            for day in ("2024-03-01", "2024-03-02"):
+                db.insert_price("binance", "BTCUSDT", 100.0, f"{day} 12:00:00.000")
+            self.assertEqual(len(db.partitions()), 2)
+
+            db.insert_price("binance", "BTCUSDT", 101.0, "2024-03-03 12:00:00.000")
+            self.assertEqual([p[1] for p in db.partitions()], ["2024-03-02", "2024-03-03"])
+            self.assertEqual(len(db.get_prices("BTCUSDT")), 2)
+            self.assertEqual(len(db.get_ohlc("BTCUSDT", "1m")), 2)
+            self.assertEqual(len(db.get_ohlc("BTCUSDT", "1h")), 3)  # hour rollups are kept
+
+        with PartitionedPriceDatabase(self.path, retention_days=2) as reopened:
+            self.assertEqual(len(reopened.get_prices("BTCUSDT")), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+# tests/test_execution.py
+import os
+import sys
+import time
+import unittest
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from backtesting_engine.execution import BUY, SELL, SimulatedExecution
+from backtesting_engine.multi_asset import run_multi_asset_backtest
+from backtesting_engine.portfolio import Portfolio
+from backtesting_engine.real_time_runner import RealTimeTrader
+
+
+class TestExecutionModel(unittest.TestCase):
+    def test_fees_slippage_and_partial_fills(self):
+        model = SimulatedExecution(maker_fee=0.0002, taker_fee=0.001, spread_bps=10, impact=0.1,
+                                   max_participation=0.1)
+        qty, price, fee = model.fill(BUY, 100.0, 50, volume=1000)
+        self.assertEqual(qty, 50)
+        self.assertAlmostEqual(price, 100.0 * (1 + 0.0005 + 0.1 * np.sqrt(0.05)))
+        self.assertAlmostEqual(fee, 50 * price * 0.001)
+
+        qty, price, _ = model.fill(SELL, 100.0, 500, volume=1000)
+        self.assertEqual(qty, 100)  # capped at 10% of bar volume
+        self.assertLess(price, 100.0)
+
+        qty, price, fee = model.fill(BUY, 100.0, 10, order_type="limit")
+        self.assertEqual((qty, price), (10, 100.0))
+        self.assertAlmostEqual(fee, 10 * 100.0 * 0.0002)
+
+    def test_fill_many_matches_scalar_fill(self):
+        model = SimulatedExecution(taker_fee=0.001, spread_bps=4, slippage_bps=1, impact=0.05, max_participation=0.2)
+        sides = np.array([BUY, SELL, BUY, SELL])
+        prices = np.array([100.0, 50.0, 10.0, 1.0])
+        qtys = np.array([5.0, 80.0, 3.0, 1.0])
+        volumes = np.array([100.0, 200.0, np.nan, 0.0])
+        batch = model.fill_many(sides, prices, qtys, volumes)
+        for i in range(4):
+            qty, price, fee = model.fill(int(sides[i]), prices[i], qtys[i], volumes[i])
+            self.assertAlmostEqual(batch[0][i], qty)
+            self.assertAlmostEqual(batch[2][i], fee)
+            if qty:  # an empty fill has no meaningful price
+                self.assertAlmostEqual(batch[1][i], price)
+        self.assertEqual(batch[0][3], 0.0)  # no volume, no fill
+
+
+class TestExecutionInEngines(unittest.TestCase):
+    def test_portfolio_pays_fees_and_slippage(self):
+        model = SimulatedExecution(taker_fee=0.001, spread_bps=20)
+        portfolio = Portfolio(initial_capital=10000, execution=model)
+        portfolio.buy("BTC", 100.0, 10)
+        portfolio.sell("BTC", 100.0, 10)
+
+        buy_price, sell_price = 100.0 * 1.001, 100.0 * 0.999
+        fees = 0.001 * 10 * (buy_price + sell_price)
+        self.assertAlmostEqual(portfolio.fees_paid, fees)
+        self.assertAlmostEqual(portfolio.cash, 10000 - 10 * (buy_price - sell_price) - fees)
+        self.assertAlmostEqual(portfolio.trade_log[0]["price"], buy_price)
+        self.assertAlmostEqual(portfolio.trade_log[1]["fee"], 0.001 * 10 * sell_price)
+
+    def test_multi_asset_latency_and_volume_caps(self):
+        closes = pd.DataFrame({"AAA": [10.0, 11.0, 12.0, 13.0, 14.0]})
+        volumes = pd.DataFrame({"AAA": [100.0, 100.0, 100.0, 100.0, 100.0]})
+        weights = np.array([[0.5], [0.5], [0.5], [0.5], [0.5]])
+
+        delayed = run_multi_asset_backtest(closes, weights, 1000, execution=SimulatedExecution(taker_fee=0.0,
+                                                                                               latency_bars=1))
+        self.assertAlmostEqual(delayed.trade_log[0]["price"], 11.0)
+
+        ioc = run_multi_asset_backtest(closes, weights, 1000, volumes=volumes,
+                                       execution=SimulatedExecution(taker_fee=0.0, max_participation=0.1))
+        self.assertEqual(ioc.positions["AAA"], 10)  # 50 wanted, 10% of 100 filled, rest cancelled
+
+        working = run_multi_asset_backtest(closes, weights, 1000, volumes=volumes,
+                                           execution=SimulatedExecution(taker_fee=0.0, max_participation=0.1,
+                                                                        resubmit_unfilled=True))
+        self.assertEqual(len(working.trade_log), 5)  # the remainder is worked over the following bars
+        self.assertEqual(working.positions["AAA"], 50)
+
+    def test_live_trader_fees_and_latency(self):
+        trader = RealTimeTrader(capital=10000, runtime=60, execution=SimulatedExecution(taker_fee=0.001))
+        trader.enter_position("BTCUSDT", "long", 100.0)
+        self.assertAlmostEqual(trader.cash_balance, 10000 - 1000 - 1.0)
+        self.assertAlmostEqual(trader.get_portfolio_summary()["fees_paid"], 1.0)
+
+        delayed = RealTimeTrader(capital=10000, runtime=60,
+                                 execution=SimulatedExecution(taker_fee=0.0, latency_ms=20))
+        delayed.on_price_update("BTCUSDT", 100.0)
+        delayed.apply_action("BTCUSDT", 100.0, "buy")
+        self.assertEqual(delayed.pending_orders(), 1)
+        self.assertNotIn("BTCUSDT", delayed.positions)
+
+        time.sleep(0.03)
+        delayed.on_price_update("BTCUSDT", 105.0)
+        self.assertEqual(delayed.pending_orders(), 0)
+        self.assertEqual(delayed.positions["BTCUSDT"]["entry_price"], 105.0)
+
+    def test_delayed_order_waits_for_its_own_symbol(self):
+        trader = RealTimeTrader(capital=10000, runtime=60, execution=SimulatedExecution(taker_fee=0.0, latency_ms=20))
+        trader.on_price_update("BTCUSDT", 100.0)
+        trader.on_price_update("ETHUSDT", 10.0)
+        trader.apply_action("BTCUSDT", 100.0, "buy")
+        trader.apply_action("ETHUSDT", 10.0, "buy")
+
+        time.sleep(0.03)
+        trader.on_price_update("ETHUSDT", 11.0)  # due, but an ETH tick only fills ETH orders
+        self.assertEqual(trader.pending_orders(), 1)
+        self.assertEqual(trader.positions["ETHUSDT"]["entry_price"], 11.0)
+        self.assertNotIn("BTCUSDT", trader.positions)
+
+        trader.on_price_update("BTCUSDT", 103.0)
+        self.assertEqual(trader.pending_orders(), 0)
+        self.assertEqual(trader.positions["BTCUSDT"]["entry_price"], 103.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
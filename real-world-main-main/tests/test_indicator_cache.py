@@ -0,0 +1,99 @@
+# tests/test_indicator_cache.py
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from backtesting_engine.multi_asset import bollinger_states
+from backtesting_engine.strategies.strategy_mean_reversion import MeanReversionStrategy
+from price_engine.indicators import cache as indicator_cache
+from price_engine.indicators.cache import IndicatorCache, fingerprint
+
+
+def random_walk(n, seed=0, start=100.0):
+    return start + np.cumsum(np.random.default_rng(seed).normal(0, 1, n))
+
+
+class TestIndicatorCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.series = random_walk(500)
+        self.fp = fingerprint(self.series)
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return self.series * 2
+
+    def test_memory_then_disk_hits(self):
+        cache = IndicatorCache(self.tmp.name)
+        first = cache.get_or_compute(self.fp, "double", {"k": 2}, self.compute)
+        second = cache.get_or_compute(self.fp, "double", {"k": 2}, self.compute)
+        self.assertIs(first, second)
+        self.assertFalse(first.flags.writeable)
+
+        reopened = IndicatorCache(self.tmp.name)  # a new process, same directory
+        np.testing.assert_array_equal(reopened.get_or_compute(self.fp, "double", {"k": 2}, self.compute), first)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(cache.stats()["memory_hits"], 1)
+        self.assertEqual(reopened.stats()["disk_hits"], 1)
+
+    def test_key_covers_data_and_params(self):
+        cache = IndicatorCache()
+        cache.get_or_compute(self.fp, "double", {"k": 2}, self.compute)
+        cache.get_or_compute(self.fp, "double", {"k": 3}, self.compute)
+        changed = self.series.copy()
+        changed[-1] += 0.01
+        cache.get_or_compute(fingerprint(changed), "double", {"k": 2}, self.compute)
+        self.assertEqual(self.calls, 3)
+        self.assertEqual(cache.stats()["hit_rate"], 0.0)
+
+    def test_size_based_eviction(self):
+        nbytes = self.series.nbytes
+        cache = IndicatorCache(self.tmp.name, memory_bytes=2 * nbytes, disk_bytes=int(2.5 * nbytes))
+        for k in range(4):
+            cache.get_or_compute(self.fp, "double", {"k": k}, self.compute)
+        stats = cache.stats()
+        self.assertEqual(stats["memory_items"], 2)
+        self.assertLessEqual(stats["disk_bytes"], 2.5 * nbytes)
+        self.assertEqual(len(os.listdir(self.tmp.name)), 2)
+
+        cache.get_or_compute(self.fp, "double", {"k": 3}, self.compute)  # most recent: still cached
+        cache.get_or_compute(self.fp, "double", {"k": 0}, self.compute)  # oldest: evicted from both tiers
+        self.assertEqual(self.calls, 5)
+
+
+class TestCachedStrategies(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        previous = indicator_cache._default
+        self.addCleanup(setattr, indicator_cache, "_default", previous)
+        self.cache = indicator_cache.configure_cache(tmp.name)
+        self.closes = pd.DataFrame({"A": random_walk(800, seed=1), "B": random_walk(800, seed=2, start=50.0)})
+
+    def test_threshold_sweep_reuses_series(self):
+        for threshold in (0.8, 1.2, 1.6):
+            cached = MeanReversionStrategy(threshold=threshold).on_series(self.closes)
+            uncached = MeanReversionStrategy(threshold=threshold)
+            uncached.use_cache = False
+            np.testing.assert_array_equal(cached, uncached.on_series(self.closes))
+        stats = self.cache.stats()
+        self.assertEqual(stats["misses"], 8)  # short/long EMA, slope and z-score per column, once
+        self.assertEqual(stats["memory_hits"], 16)
+
+    def test_bollinger_states_cached(self):
+        expected = bollinger_states(self.closes)
+        for _ in range(2):
+            np.testing.assert_array_equal(bollinger_states(self.closes, cache=self.cache), expected)
+        self.assertEqual(self.cache.stats()["misses"], 2)  # bands and RSI
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+# tests/test_kernels.py
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from backtesting_engine.multi_asset import strategy_states
+from backtesting_engine.strategies.strategy_mean_reversion import MeanReversionStrategy, strategy_mean_reversion
+from price_engine.indicators import kernels
+
+
+def random_walk(n, seed=0, start=64000.0):
+    return start + np.cumsum(np.random.default_rng(seed).normal(0, 5, n))
+
+
+class TestTickKernels(unittest.TestCase):
+    def test_match_reference_formulas(self):
+        prices = list(random_walk(120))
+        for end in range(50, 120):
+            window = prices[:end]
+            x = np.arange(50)
+            reference_slope = np.linalg.lstsq(np.vstack([x, np.ones(50)]).T, np.array(window[-50:]), rcond=None)[0][0]
+            self.assertAlmostEqual(kernels.slope_last(window, 50), reference_slope, places=8)
+
+            weights = np.exp(np.linspace(-1., 0., 20))
+            weights /= weights.sum()
+            reference_ema = np.convolve(window[-20:], weights, mode='valid')[-1]
+            self.assertAlmostEqual(kernels.window_ema_last(window, 20), reference_ema, places=6)
+
+            tail = window[-20:]
+            self.assertEqual(kernels.mean_std_last(window, 20), (np.mean(tail), np.std(tail)))
+
+        self.assertIsNone(kernels.zscore_last([5.0] * 30, 20))
+        self.assertEqual(kernels.slope_last([1.0, 2.0], 50), 0)
+
+
+class TestSeriesKernels(unittest.TestCase):
+    def setUp(self):
+        self.series = random_walk(400, seed=1)
+        self.series[100:130] = self.series[100]  # a flat stretch: z-score undefined
+
+    def check(self, rolling, scalar, window):
+        for jit in (False, True):  # the loop kernels run as plain Python without numba
+            values = rolling(self.series, window, jit=jit)
+            self.assertTrue(np.isnan(values[:window - 1]).all())
+            for t in range(window - 1, len(self.series)):
+                expected = scalar(list(self.series[:t + 1]), window)
+                if expected is None:
+                    self.assertTrue(np.isnan(values[t]))
+                else:
+                    self.assertAlmostEqual(values[t], expected, places=6)
+
+    def test_rolling_match_per_tick(self):
+        self.check(kernels.rolling_slope, kernels.slope_last, 50)
+        self.check(kernels.rolling_window_ema, kernels.window_ema_last, 20)
+        self.check(kernels.rolling_zscore, kernels.zscore_last, 20)
+
+    def test_recursive_ema(self):
+        for alpha in (0.5, 0.05, 0.001):
+            expected = pd.Series(self.series).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+            np.testing.assert_allclose(kernels.ewma(self.series, alpha, jit=False), expected, rtol=1e-12)
+            np.testing.assert_allclose(kernels.ewma(self.series, alpha, jit=True), expected, rtol=1e-12)
+
+    @unittest.skipUnless(kernels.JIT, "numba not installed")
+    def test_jit_matches_numpy(self):
+        for rolling in (kernels.rolling_slope, kernels.rolling_window_ema, kernels.rolling_zscore):
+            np.testing.assert_allclose(rolling(self.series, 20, jit=True), rolling(self.series, 20, jit=False),
+                                       rtol=1e-9, equal_nan=True)
+
+
+class TestVectorizedMeanReversion(unittest.TestCase):
+    def test_on_series_matches_per_bar_states(self):
+        closes = pd.DataFrame({"A": random_walk(1500, seed=2, start=100.0),
+                               "B": random_walk(1500, seed=3, start=2000.0)})
+        closes.iloc[:40, 1] = np.nan
+        closes.iloc[700:705, 0] = np.nan
+        np.testing.assert_array_equal(MeanReversionStrategy().on_series(closes),
+                                      strategy_states(closes, strategy_mean_reversion))
+
+
+if __name__ == "__main__":
+    unittest.main()
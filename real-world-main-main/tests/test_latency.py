@@ -0,0 +1,26 @@
+# tests/test_latency.py
+import unittest
+from src.price_engine.latency import LatencyHistogram
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_within_bucket_resolution(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 10001):
+            histogram.record(value * 1000)
+        self.assertEqual(histogram.count, 10000)
+        self.assertAlmostEqual(histogram.percentile(50), 5_000_000, delta=5_000_000 * 0.25)
+        self.assertAlmostEqual(histogram.percentile(99), 9_900_000, delta=9_900_000 * 0.25)
+        self.assertEqual(histogram.percentile(100), 10_000_000)
+
+    def test_merge(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.record(10)
+        b.record(1_000_000)
+        a.merge(b)
+        self.assertEqual(a.count, 2)
+        self.assertEqual(a.max, 1_000_000)
+
+
+if __name__ == "__main__":
+    unittest.main()
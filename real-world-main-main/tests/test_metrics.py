@@ -0,0 +1,60 @@
+# tests/test_metrics.py
+import math
+import unittest
+import numpy as np
+from src.backtesting_engine.portfolio import Portfolio
+from src.backtesting_engine.metrics import compute_metrics, portfolio_metrics, rank_metrics
+
+
+class TestBacktestMetrics(unittest.TestCase):
+    def test_equity_curve_metrics(self):
+        equity = [100.0, 110.0, 99.0, 90.0, 95.0, 120.0, 118.0]
+        m = compute_metrics(equity, initial_capital=100.0, periods_per_year=252)
+
+        self.assertAlmostEqual(m.total_return, 0.18)
+        self.assertAlmostEqual(m.max_drawdown, 90.0 / 110.0 - 1.0)
+        self.assertEqual(m.max_drawdown_duration, 3)  # 99, 90, 95 below the 110 peak
+        self.assertAlmostEqual(m.cagr, 1.18 ** (252 / 7) - 1.0)
+
+        all_returns = np.diff([100.0] + equity) / np.array([100.0] + equity[:-1])
+        expected_sharpe = all_returns.mean() / all_returns.std(ddof=1) * math.sqrt(252)
+        self.assertAlmostEqual(m.sharpe, expected_sharpe)
+        self.assertGreater(m.sortino, m.sharpe)
+        self.assertTrue(math.isnan(m.win_rate))
+
+    def test_portfolio_trade_metrics(self):
+        portfolio = Portfolio(initial_capital=10000)
+        portfolio.mark_to_market("BTC", 100.0)
+        portfolio.buy("BTC", 100.0, 10)
+        portfolio.mark_to_market("BTC", 110.0)
+        portfolio.sell("BTC", 110.0, 10)         # +100
+        portfolio.mark_to_market("BTC", 110.0)
+        portfolio.short("ETH", 50.0, 4)
+        portfolio.mark_to_market("ETH", 55.0)
+        portfolio.sell("ETH", 55.0, 4)           # covers at -20
+        portfolio.mark_to_market("ETH", 55.0)
+
+        m = portfolio_metrics(portfolio)
+        self.assertEqual(m.trades, 4)
+        self.assertEqual(m.closed_trades, 2)
+        self.assertAlmostEqual(m.win_rate, 0.5)
+        self.assertAlmostEqual(m.profit_factor, 100.0 / 20.0)
+        self.assertAlmostEqual(m.final_net_worth, 10080.0)
+        self.assertAlmostEqual(m.exposure, 2 / 5)  # long at bar 2, short at bar 4
+        notional = 100.0 * 10 + 110.0 * 10 + 50.0 * 4 + 55.0 * 4
+        mean_equity = np.mean([10000.0] + list(portfolio.net_worth_history))
+        self.assertAlmostEqual(m.turnover, notional / mean_equity)
+        self.assertEqual(portfolio.trade_log[1]["pnl"], 100.0)
+        self.assertNotIn("pnl", portfolio.trade_log[0])
+
+    def test_rank_puts_nan_last(self):
+        flat = compute_metrics([100.0, 100.0, 100.0])
+        good = compute_metrics([100.0, 101.0, 103.0, 104.0])
+        bad = compute_metrics([100.0, 99.0, 97.0, 98.0])
+        ranked = rank_metrics([("flat", flat), ("bad", bad), ("good", good)])
+        self.assertEqual([name for name, _ in ranked], ["good", "bad", "flat"])
+        self.assertEqual(rank_metrics([bad, good], by="max_drawdown")[0], good)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+# tests/test_multi_asset.py
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from backtesting_engine.multi_asset import (
+    align_closes, bollinger_states, run_multi_asset_backtest, target_weights,
+)
+
+
+def frame(dates, closes):
+    return pd.DataFrame({"close": closes}, index=pd.to_datetime(dates))
+
+
+class TestMultiAssetBacktest(unittest.TestCase):
+    def test_align_closes_uses_union_clock(self):
+        closes = align_closes({
+            "btc": frame(["2024-01-01", "2024-01-02", "2024-01-04"], [100.0, 101.0, 103.0]),
+            "eth": frame(["2024-01-02", "2024-01-03"], [10.0, 11.0]),
+        })
+        self.assertEqual(list(closes.columns), ["BTC", "ETH"])
+        self.assertEqual(len(closes), 4)
+        self.assertTrue(np.isnan(closes["ETH"].iloc[0]))          # not listed yet
+        self.assertEqual(closes["BTC"].iloc[2], 101.0)             # forward filled
+        self.assertEqual(closes["ETH"].iloc[3], 11.0)
+
+    def test_shared_cash_pool_and_full_equity_curve(self):
+        closes = pd.DataFrame({
+            "AAA": [10.0, 10.0, 12.0, 12.0, 15.0, 15.0],
+            "BBB": [np.nan, 20.0, 20.0, 25.0, 25.0, 20.0],
+        })
+        states = np.array([[1, 0], [1, 1], [1, 1], [0, 1], [0, 1], [0, 0]], dtype=float)
+        weights = target_weights(states, [0.5, 0.5])
+        portfolio = run_multi_asset_backtest(closes, weights, initial_capital=1000)
+
+        self.assertEqual(len(portfolio.net_worth_history), len(closes))
+        self.assertEqual(portfolio.trade_log.count("BUY"), 2)
+        self.assertEqual(portfolio.trade_log.count("SELL"), 2)
+        self.assertGreaterEqual(portfolio.cash, 0)
+        # 50 AAA bought at 10 and sold at 12; 25 BBB bought at 20 and sold at 20.
+        self.assertAlmostEqual(portfolio.get_final_net_worth(), 1100.0)
+
+        # Every bar's equity matches a full revaluation of the holdings at that bar.
+        values = portfolio.net_worth_history.to_numpy()
+        self.assertAlmostEqual(values[2], 500 + 50 * 12.0)
+        self.assertAlmostEqual(values[3], 1100 - 25 * 20.0 + 25 * 25.0)
+
+    def test_equal_mode_and_periodic_rebalance(self):
+        states = np.array([[1, 0], [1, 1], [0, 0]], dtype=float)
+        np.testing.assert_allclose(target_weights(states, mode="equal"), [[1, 0], [0.5, 0.5], [0, 0]])
+
+        closes = pd.DataFrame({"AAA": [10.0, 20.0, 20.0, 10.0], "BBB": [10.0, 10.0, 10.0, 10.0]})
+        weights = np.full((4, 2), 0.5)
+        drifted = run_multi_asset_backtest(closes, weights, 1000)
+        rebalanced = run_multi_asset_backtest(closes, weights, 1000, rebalance_every=2)
+        self.assertAlmostEqual(drifted.get_final_net_worth(), 1000.0)
+        self.assertAlmostEqual(rebalanced.get_final_net_worth(), 1500 - 37 * 10.0)
+        self.assertGreater(len(rebalanced.trade_log), len(drifted.trade_log))
+
+    def test_bollinger_states_shape(self):
+        rng = np.random.default_rng(7)
+        closes = pd.DataFrame(100 + rng.standard_normal((300, 5)).cumsum(axis=0))
+        states = bollinger_states(closes)
+        self.assertEqual(states.shape, (300, 5))
+        self.assertTrue(set(np.unique(states)) <= {0.0, 1.0})
+        self.assertFalse(states[:50].any())
+
+
+if __name__ == "__main__":
+    unittest.main()
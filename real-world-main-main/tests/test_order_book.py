@@ -0,0 +1,118 @@
+# tests/test_order_book.py
+import json
+import os
+import sys
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from backtesting_engine.execution import BUY, SELL, SimulatedExecution
+from backtesting_engine.real_time_runner import RealTimeTrader
+from price_engine.data_sources.depth_stream import BinanceDepthClient
+from price_engine.fake_exchange import FakeRestExchange
+from price_engine.order_book import OrderBook, SequenceGapError
+
+SNAPSHOT = {"lastUpdateId": 100,
+            "bids": [["99.0", "2"], ["98.0", "5"], ["97.0", "1"]],
+            "asks": [["101.0", "1"], ["102.0", "4"], ["103.0", "3"]]}
+
+
+def diff(first, last, bids=(), asks=(), symbol="BTCUSDT"):
+    return {"e": "depthUpdate", "s": symbol, "U": first, "u": last, "b": list(bids), "a": list(asks)}
+
+
+class TestOrderBook(unittest.TestCase):
+    def setUp(self):
+        self.book = OrderBook("BTCUSDT")
+        self.book.apply_snapshot(SNAPSHOT)
+
+    def test_snapshot_and_diffs(self):
+        self.assertEqual((self.book.best_bid(), self.book.best_ask()), ((99.0, 2.0), (101.0, 1.0)))
+        self.assertAlmostEqual(self.book.microprice(), (99.0 * 1 + 101.0 * 2) / 3)
+
+        self.assertFalse(self.book.apply_diff(diff(95, 100, bids=[["99.0", "0"]])))  # already in the snapshot
+        self.assertTrue(self.book.apply_diff(diff(98, 102, bids=[["99.5", "3"], ["99.0", "0"]], asks=[["101.0", "0"]])))
+        self.assertEqual(self.book.best_bid(), (99.5, 3.0))
+        self.assertEqual(self.book.best_ask(), (102.0, 4.0))
+        self.assertEqual(self.book.spread(), 2.5)
+        self.assertEqual(self.book.depth(2), ([(99.5, 3.0), (98.0, 5.0)], [(102.0, 4.0), (103.0, 3.0)]))
+        self.assertEqual(self.book.last_update_id, 102)
+
+    def test_sequence_gap_clears_book(self):
+        with self.assertRaises(SequenceGapError):
+            self.book.apply_diff(diff(105, 106, bids=[["99.0", "1"]]))
+        self.assertFalse(self.book.synced)
+        self.assertIsNone(self.book.top())
+
+    def test_sweep_and_book_execution(self):
+        self.assertEqual(self.book.sweep(BUY, 3), (3.0, (101.0 + 2 * 102.0) / 3))
+        self.assertEqual(self.book.sweep(SELL, 10), (8.0, (99.0 * 2 + 98.0 * 5 + 97.0) / 8))
+
+        model = SimulatedExecution(taker_fee=0.001, maker_fee=0.0)
+        qty, price, fee = model.fill_from_book(BUY, 3, self.book)
+        self.assertEqual(qty, 3.0)
+        self.assertAlmostEqual(price, 305.0 / 3)
+        self.assertAlmostEqual(fee, 0.305)
+        self.assertEqual(model.fill_from_book(SELL, 1, OrderBook("EMPTY")), (0.0, None, 0.0))
+
+    def test_paper_trader_fills_against_book(self):
+        trader = RealTimeTrader(capital=1000, runtime=60, books={"BTCUSDT": self.book})
+        self.assertEqual(trader.get_top_of_book("BTCUSDT").ask, 101.0)
+        trader.enter_position("BTCUSDT", "long", 100.0)  # 10% of cash: 1 unit, all at the 101 ask
+        self.assertEqual(trader.positions["BTCUSDT"]["entry_price"], 101.0)
+        self.assertAlmostEqual(trader.cash_balance, 899.0)
+        trader.exit_position("BTCUSDT", 100.0)
+        self.assertNotIn("BTCUSDT", trader.positions)
+
+
+class TestDepthClient(unittest.TestCase):
+    def setUp(self):
+        self.fake = FakeRestExchange().start()
+        self.fake.depth["BTCUSDT"] = SNAPSHOT
+        self.tops = []
+        self.client = BinanceDepthClient(["BTCUSDT"], on_book_update=lambda symbol, book: self.tops.append(book.top()),
+                                         rest_url=self.fake.binance_url)
+
+    def tearDown(self):
+        self.fake.stop()
+
+    def send(self, event):
+        self.client.on_message(None, json.dumps(event))
+
+    def test_snapshot_diffs_and_resync_after_gap(self):
+        self.client._after_open("BTCUSDT", reconnected=False)
+        self.send(diff(99, 101, bids=[["100.0", "1"]]))
+        self.assertEqual(self.client.top("BTCUSDT").bid, 100.0)
+
+        # Updates 102-109 are lost; the server's book has moved on in the meantime.
+        self.fake.depth["BTCUSDT"] = {"lastUpdateId": 110, "bids": [["99.5", "1"]], "asks": [["100.5", "1"]]}
+        self.send(diff(110, 111, asks=[["100.25", "2"]]))
+        top = self.client.top("BTCUSDT")
+        self.assertEqual((top.bid, top.ask, top.ask_qty), (99.5, 100.25, 2.0))
+        self.assertEqual(len(self.tops), 2)
+        self.assertEqual(self.fake.requests, 2)
+
+    def test_failed_snapshot_backs_off(self):
+        self.client.backoff_initial = 0.2
+        self.fake.fail(2, status=429)
+        self.client._after_open("BTCUSDT", reconnected=False)
+        for update_id in range(101, 111):  # ~1s of @100ms diffs with the book out of sync
+            self.send(diff(update_id, update_id))
+        self.assertEqual(self.fake.requests, 1)
+        self.assertIsNone(self.client.top("BTCUSDT"))
+
+        time.sleep(0.25)
+        self.send(diff(111, 111))  # retried once, rejected again: the delay doubles
+        time.sleep(0.25)
+        self.send(diff(112, 112))
+        self.assertEqual(self.fake.requests, 2)
+
+        time.sleep(0.2)
+        self.send(diff(101, 113, bids=[["100.0", "1"]]))
+        self.assertEqual(self.fake.requests, 3)
+        self.assertEqual(self.client.top("BTCUSDT").bid, 100.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
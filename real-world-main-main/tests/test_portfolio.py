@@ -0,0 +1,110 @@
+# tests/test_portfolio.py
+import unittest
+from src.backtesting_engine.portfolio import Portfolio
+from src.backtesting_engine.ledger import PositionLedger
+from src.backtesting_engine.trade_store import EquityCurve, TradeLog
+
+
+def legacy_pnl(trade_log, positions, current_prices):
+    """The previous trade-log scan, pairing each close with the last opening trade."""
+    realized = 0
+    for trade in trade_log:
+        if trade["action"] in ["SELL", "BUY_TO_COVER"]:
+            opens = [t for t in trade_log if t["symbol"] == trade["symbol"] and
+                     ((t["action"] == "BUY" and trade["action"] == "SELL") or
+                      (t["action"] == "SHORT" and trade["action"] == "BUY_TO_COVER"))]
+            if opens:
+                direction = 1 if trade["action"] == "SELL" else -1
+                realized += direction * trade["qty"] * (trade["price"] - opens[-1]["price"])
+    unrealized = 0
+    for symbol, qty in positions.items():
+        if symbol in current_prices and qty:
+            action = "BUY" if qty > 0 else "SHORT"
+            entry = [t for t in trade_log if t["symbol"] == symbol and t["action"] == action][-1]["price"]
+            unrealized += qty * (current_prices[symbol] - entry)
+    return realized, unrealized
+
+
+class TestPortfolioLedger(unittest.TestCase):
+    def test_matches_legacy_on_round_trips(self):
+        portfolio = Portfolio(initial_capital=100000)
+        portfolio.buy("BTC", 100.0, 10)
+        portfolio.sell("BTC", 110.0, 10)
+        portfolio.short("ETH", 50.0, 4)
+        portfolio.sell("ETH", 45.0, 4)  # covers the short
+        portfolio.buy("SOL", 20.0, 5)
+
+        prices = {"BTC": 120.0, "ETH": 40.0, "SOL": 25.0}
+        pnl = portfolio.calculate_pnl(prices)
+        realized, unrealized = legacy_pnl(portfolio.trade_log, portfolio.positions, prices)
+        self.assertAlmostEqual(pnl["realized_pnl"], realized)
+        self.assertAlmostEqual(pnl["unrealized_pnl"], unrealized)
+        self.assertAlmostEqual(pnl["realized_pnl"], 100.0 + 20.0)
+        self.assertAlmostEqual(pnl["unrealized_pnl"], 25.0)
+
+    def test_cost_methods(self):
+        fills = [(10, 100.0), (10, 110.0), (-10, 120.0)]
+        expected_realized = {"fifo": 200.0, "lifo": 100.0, "average": 150.0}
+        for method, realized in expected_realized.items():
+            ledger = PositionLedger(method)
+            for qty, price in fills:
+                ledger.record("BTC", qty, price)
+            self.assertAlmostEqual(ledger.realized_pnl, realized, msg=method)
+            self.assertEqual(ledger.position("BTC"), 10)
+            self.assertAlmostEqual(ledger.realized_pnl + ledger.unrealized_pnl({"BTC": 120.0}), 300.0, msg=method)
+
+    def test_fill_through_zero_flips_direction(self):
+        ledger = PositionLedger()
+        ledger.record("BTC", 5, 100.0)
+        realized = ledger.record("BTC", -8, 90.0)
+        self.assertAlmostEqual(realized, -50.0)
+        self.assertEqual(ledger.open_lots("BTC"), [(-3, 90.0)])
+        self.assertAlmostEqual(ledger.unrealized_pnl({"BTC": 80.0}), 30.0)
+
+
+class TestTradeStore(unittest.TestCase):
+    def test_trade_log_behaves_like_list_of_dicts(self):
+        log = TradeLog(capacity=2)
+        log.append({"action": "BUY", "symbol": "BTC", "price": 100.0, "qty": 1})
+        log.append({"action": "SELL", "symbol": "BTC", "price": 110.0, "qty": 1})
+        log.append({"action": "SHORT", "symbol": "ETH", "price": 50.0, "qty": 2})
+        self.assertEqual(len(log), 3)
+        self.assertEqual(log[1], {"action": "SELL", "symbol": "BTC", "price": 110.0, "qty": 1.0,
+                                  "note": "long position"})
+        self.assertEqual([t["symbol"] for t in log], ["BTC", "BTC", "ETH"])
+        self.assertEqual((log.count("BUY"), log.count("SELL"), log.count("SHORT")), (1, 1, 1))
+
+        combined = TradeLog()
+        combined.append({"action": "BUY", "symbol": "ETH", "price": 1.0, "qty": 1})
+        combined.extend(log)
+        self.assertEqual(len(combined), 4)
+        self.assertEqual(combined[-1]["symbol"], "ETH")
+        self.assertEqual(combined[1]["symbol"], "BTC")
+        self.assertEqual(combined.count("BUY"), 2)
+
+    def test_equity_curve_grows(self):
+        curve = EquityCurve(capacity=1)
+        for i in range(10):
+            curve.append(float(i))
+        self.assertEqual(len(curve), 10)
+        self.assertEqual(curve[-1], 9.0)
+        self.assertEqual(curve.to_numpy().sum(), 45.0)
+
+    def test_incremental_net_worth_matches_full_revaluation(self):
+        portfolio = Portfolio(initial_capital=10000)
+        prices = {"BTC": 100.0, "ETH": 50.0}
+        portfolio.update_net_worth(prices)
+        portfolio.buy("BTC", 100.0, 10)
+        portfolio.short("ETH", 50.0, 4)
+        portfolio.mark_to_market("BTC", 120.0)
+        portfolio.mark_to_market("ETH", 40.0)
+        portfolio.sell("BTC", 125.0, 5)
+        portfolio.mark_to_market("BTC", 130.0)
+
+        expected = portfolio.cash + 5 * 130.0 - 4 * 40.0
+        self.assertAlmostEqual(portfolio.get_final_net_worth(), expected)
+        self.assertEqual(len(portfolio.net_worth_history), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+# tests/test_quote_cache.py
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from price_engine.aggregator import PriceAggregator
+from price_engine.data_sources.websocket_handler import BinanceWebSocketClient
+from price_engine.price_history import PriceHistory
+from price_engine.quote_cache import QuoteCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingSource:
+    def __init__(self, price):
+        self.price = price
+        self.calls = 0
+
+    def get_price(self, symbol):
+        self.calls += 1
+        return self.price
+
+
+class TestQuoteCache(unittest.TestCase):
+    def test_ttl_and_snapshot(self):
+        clock = FakeClock()
+        cache = QuoteCache(clock=clock)
+        cache.put("binance", "BTCUSDT", 64000.0)
+        clock.now += 1.5
+        cache.put("coinbase", "BTCUSDT", 64010.0)
+
+        self.assertEqual(cache.get("binance", "BTCUSDT", ttl=2.0), 64000.0)
+        self.assertIsNone(cache.get("binance", "BTCUSDT", ttl=1.0))
+        self.assertIsNone(cache.get("kraken", "BTCUSDT", ttl=10.0))
+        self.assertAlmostEqual(cache.age("binance", "BTCUSDT"), 1.5)
+
+        prices, ages = cache.snapshot(["BTCUSDT", "ETHUSDT"], ["binance", "coinbase"])
+        np.testing.assert_allclose(prices[0], [64000.0, 64010.0])
+        np.testing.assert_allclose(ages[0], [1.5, 0.0])
+        self.assertTrue(np.isnan(prices[1]).all() and np.isinf(ages[1]).all())
+
+    def test_websocket_client_fills_cache(self):
+        cache = QuoteCache()
+        client = BinanceWebSocketClient(["ETHUSDT"], on_price_update=lambda symbol, price: None, quotes=cache)
+        client.on_message(None, '{"s": "ETHUSDT", "p": "3100.25"}')
+        client.on_message(None, '{"s": "ETHUSDT", "p": "3100.50"}')
+        self.assertEqual(cache.get("binance_ws", "ETHUSDT", ttl=5.0), 3100.5)
+
+
+class TestAggregatorServesFromCache(unittest.TestCase):
+    def test_only_stale_sources_are_refetched(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        clock = FakeClock()
+        aggregator = PriceAggregator("crypto", ["BTCUSDT"])
+        aggregator.quotes = QuoteCache(clock=clock)
+        aggregator.price_history = PriceHistory(os.path.join(tmp.name, "prices.json"))
+        sources = {"binance": CountingSource(64000.0), "coingecko": CountingSource(64010.0),
+                   "coinbase": CountingSource(64005.0)}  # ttls 2s, 30s and 5s
+        for name, source in sources.items():
+            aggregator.sources[name]["handler"] = source
+
+        first = aggregator.get_all_prices("BTCUSDT")
+        self.assertEqual(first, {name: source.price for name, source in sources.items()})
+
+        clock.now += 1.0
+        for _ in range(5):
+            self.assertEqual(aggregator.get_all_prices("BTCUSDT"), first)
+        self.assertEqual({name: source.calls for name, source in sources.items()},
+                         {"binance": 1, "coingecko": 1, "coinbase": 1})
+
+        clock.now += 2.5  # past binance's ttl only
+        self.assertEqual(aggregator.get_all_prices("BTCUSDT"), first)
+        self.assertEqual({name: source.calls for name, source in sources.items()},
+                         {"binance": 2, "coingecko": 1, "coinbase": 1})
+        self.assertFalse(aggregator.sources["binance_ws"].built)
+
+
+if __name__ == "__main__":
+    unittest.main()
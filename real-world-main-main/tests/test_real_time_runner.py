@@ -0,0 +1,196 @@
+# tests/test_real_time_runner.py
+import itertools
+import math
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from backtesting_engine.execution import SimulatedExecution
+from backtesting_engine.real_time_runner import RealTimeTrader
+from backtesting_engine.process_runner import ProcessShardedTrader, TickRing
+from backtesting_engine.strategies import Strategy, register_strategy
+
+
+@register_strategy("momentum_test")
+class Momentum(Strategy):
+    def __init__(self, lookback: int = 5):
+        super().__init__(lookback=lookback)
+        self.lookback = lookback
+
+    def on_bar(self, window, position):
+        change = window[-1]["price"] - window[-self.lookback]["price"]
+        if change > 0 and position is None:
+            return "buy"
+        if change < 0 and position == "long":
+            return "sell"
+        return None
+
+
+class TestRealTimeTrader(unittest.TestCase):
+    def test_positions_snapshot_is_immutable(self):
+        trader = RealTimeTrader(capital=10000, runtime=60)
+        trader.enter_position("BTCUSDT", "long", 100.0)
+        snapshot = trader.positions
+
+        trader.exit_position("BTCUSDT", 110.0)
+        self.assertIn("BTCUSDT", snapshot)
+        self.assertNotIn("BTCUSDT", trader.positions)
+        with self.assertRaises(TypeError):
+            snapshot["ETHUSDT"] = {}
+
+    def test_concurrent_symbols_keep_account_consistent(self):
+        trader = RealTimeTrader(capital=10000, runtime=60)
+        symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT"]
+
+        def feed(symbol):
+            for i in range(200):
+                trader.on_price_update(symbol, 100 + (i % 7))
+                if i % 50 == 0:
+                    trader.enter_position(symbol, "long", 100.0)
+                elif i % 50 == 25:
+                    trader.exit_position(symbol, 100.0)
+
+        threads = [threading.Thread(target=feed, args=(s,)) for s in symbols]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        data = trader.get_price_data()
+        self.assertEqual(set(data), set(symbols))
+        self.assertTrue(all(len(ticks) == 200 for ticks in data.values()))
+        self.assertEqual(len(trader.get_pnl_data()), 800)
+        summary = trader.get_portfolio_summary()
+        self.assertEqual(summary["position_count"], len(trader.get_positions()))
+
+    def test_latency_stages_are_recorded_per_symbol(self):
+        trader = RealTimeTrader(capital=10000, runtime=60)
+        for i in range(30):
+            trader.on_price_update("BTCUSDT", 100 + i, recv_ns=time.monotonic_ns())
+        stats = trader.get_latency_stats()
+        self.assertEqual(stats["strategy"]["BTCUSDT"]["count"], 30)
+        self.assertEqual(stats["tick_to_decision"]["ALL"]["count"], 30)
+        self.assertLessEqual(stats["decode"]["BTCUSDT"]["p50_us"], stats["decode"]["BTCUSDT"]["max_us"])
+
+
+class TestProcessShardedTrader(unittest.TestCase):
+    def test_tick_ring_round_trip(self):
+        ring = TickRing(capacity=4)
+        try:
+            for i in range(4):
+                self.assertTrue(ring.put(i, 100.0 + i, i))
+            self.assertFalse(ring.put(9, 1.0, 9))
+            batch = ring.peek_batch()
+            self.assertEqual(batch[0], (0, 100.0, 0))
+            ring.advance(len(batch))
+            self.assertEqual(len(ring), 0)
+            self.assertTrue(ring.put(5, 105.0, 5))
+        finally:
+            ring.close(unlink=True)
+
+    def test_workers_match_in_process_decisions(self):
+        prices = [100 + 5 * math.sin(i / 3) + (i % 5) for i in range(200)]
+        local = RealTimeTrader(capital=10000, runtime=60)
+        sharded = ProcessShardedTrader(capital=10000, runtime=60, workers=2)
+        try:
+            for price in prices:
+                local.on_price_update("BTCUSDT", price)
+                sharded.on_price_update("BTCUSDT", price)
+            # wait_idle covers actions still in flight, so no stop() is needed to compare
+            self.assertTrue(sharded.wait_idle(timeout=30))
+            self.assert_same_account(sharded, local)
+        finally:
+            sharded.stop()
+
+    def test_reset_restarts_workers(self):
+        prices = [100 + 5 * math.sin(i / 3) + (i % 5) for i in range(120)]
+        local = RealTimeTrader(capital=10000, runtime=60)
+        sharded = ProcessShardedTrader(capital=10000, runtime=60, workers=1)
+        try:
+            for _ in range(2):
+                for price in prices:
+                    local.on_price_update("BTCUSDT", price)
+                    sharded.on_price_update("BTCUSDT", price)
+                self.assertTrue(sharded.wait_idle(timeout=30))
+                self.assertTrue(sharded.get_positions())  # the run ends long
+                local.reset()
+                sharded.reset()
+                self.assertEqual(sharded.pending_ticks(), 0)
+            for price in prices:
+                local.on_price_update("BTCUSDT", price)
+                sharded.on_price_update("BTCUSDT", price)
+            self.assertTrue(sharded.wait_idle(timeout=30))
+            self.assert_same_account(sharded, local)
+            self.assertTrue(any("BUY" in log for log in sharded.get_logs()))
+        finally:
+            sharded.stop()
+
+    def test_configured_strategy_runs_in_workers(self):
+        prices = [100 + 5 * math.sin(i / 3) + (i % 5) for i in range(200)]
+        local = RealTimeTrader(capital=10000, runtime=60, strategy=Momentum(lookback=8))
+        # One worker, so both symbols' actions reach the account in tick order, as they do locally.
+        sharded = ProcessShardedTrader(capital=10000, runtime=60, workers=1, strategy=Momentum(lookback=8))
+        try:
+            for price in prices:
+                for symbol in ("BTCUSDT", "ETHUSDT"):
+                    local.on_price_update(symbol, price)
+                    sharded.on_price_update(symbol, price)
+            self.assertTrue(sharded.wait_idle(timeout=30))
+            self.assertTrue(any("SELL" in log for log in sharded.get_logs()))
+            self.assert_same_account(sharded, local)
+        finally:
+            sharded.stop()
+
+    def test_partial_fills_reach_the_workers(self):
+        class CappedExecution(SimulatedExecution):
+            """Bar volumes in turn, so entries fill whole or not at all and some exits leave a residual."""
+            def __init__(self):
+                super().__init__(taker_fee=0.0, max_participation=0.5)
+                self.volumes = itertools.cycle([0.0, 100.0, 100.0, 10.0])
+
+            def fill(self, side, price, qty, volume=None, order_type="market"):
+                return super().fill(side, price, qty, next(self.volumes), order_type)
+
+        prices = [100 + 5 * math.sin(i / 3) + (i % 5) for i in range(400)]
+        local = RealTimeTrader(capital=10000, runtime=60, execution=CappedExecution())
+        sharded = ProcessShardedTrader(capital=10000, runtime=60, workers=1, execution=CappedExecution())
+        try:
+            for price in prices:
+                local.on_price_update("BTCUSDT", price)
+                sharded.on_price_update("BTCUSDT", price)
+            self.assertTrue(sharded.wait_idle(timeout=30))
+            self.assert_same_account(sharded, local)
+        finally:
+            sharded.stop()
+
+    def test_stop_between_start_check_and_ring_lookup(self):
+        sharded = ProcessShardedTrader(capital=10000, runtime=60, workers=2)
+        symbol_id = sharded._symbol_id
+
+        def stopped_meanwhile(symbol):
+            # Another thread stops the trader while this tick is on its way to a ring.
+            stopper = threading.Thread(target=sharded.stop)
+            stopper.start()
+            stopper.join()
+            return symbol_id(symbol)
+
+        try:
+            sharded.on_price_update("BTCUSDT", 100.0)
+            sharded._symbol_id = stopped_meanwhile
+            sharded.on_price_update("BTCUSDT", 101.0)  # dropped quietly, no IndexError or closed ring
+            self.assertEqual(sharded.pending_ticks(), 0)
+        finally:
+            sharded.stop()
+
+    def assert_same_account(self, sharded, local):
+        self.assertEqual(len(sharded.get_logs()), len(local.get_logs()))
+        self.assertAlmostEqual(sharded.cash_balance, local.cash_balance)
+        self.assertEqual(sharded.get_positions(), local.get_positions())
+
+
+if __name__ == "__main__":
+    unittest.main()
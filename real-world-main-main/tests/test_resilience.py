@@ -0,0 +1,130 @@
+# tests/test_resilience.py
+import os
+import sys
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from price_engine.data_sources.binance_api import BinanceAPI
+from price_engine.data_sources.coinbase_api import CoinbaseAPI
+from price_engine.fake_exchange import FakeRestExchange
+from price_engine.resilience import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, RateLimitedError, SourceGuard, SourceUnavailable, TokenBucket,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_refill_penalty_and_headers(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, burst=2, clock=clock)
+        self.assertTrue(bucket.try_acquire() and bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+        clock.now += 1.0
+        self.assertTrue(bucket.try_acquire())
+
+        bucket.penalize(retry_after=5)
+        self.assertEqual(bucket.rate, 0.5)
+        clock.now += 4.9
+        self.assertFalse(bucket.try_acquire())
+        clock.now += 0.2
+        self.assertTrue(bucket.try_acquire())
+        bucket.reward()
+        self.assertAlmostEqual(bucket.rate, 0.6)
+
+        bucket.observe_headers({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "3"})
+        self.assertAlmostEqual(bucket.wait_time(), 3.0)
+
+    def test_binance_weight_window_on_bucket_clock(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=100.0, clock=clock)
+        bucket.observe_headers({"X-MBX-USED-WEIGHT-1M": "3000"})
+        self.assertAlmostEqual(bucket.rate, 1500 / 60)  # window not located yet: a whole minute left
+        clock.now += 20
+        bucket.observe_headers({"X-MBX-USED-WEIGHT-1M": "40"})  # dropped: a new window started now
+        clock.now += 30
+        bucket.observe_headers({"X-MBX-USED-WEIGHT-1M": "6000"})
+        self.assertAlmostEqual(bucket.wait_time(), 30.0)  # blocked until the window ends
+        clock.now += 30
+        self.assertTrue(bucket.try_acquire())
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_open_half_open_and_close(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow())
+
+        clock.now += 10
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertFalse(breaker.allow())  # only one probe
+        breaker.record_failure()
+        self.assertEqual((breaker.state, breaker.reset_timeout), (OPEN, 20))
+
+        clock.now += 20
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual((breaker.state, breaker.reset_timeout), (CLOSED, 10))
+
+
+class TestSourceGuardAgainstFakeExchange(unittest.TestCase):
+    def setUp(self):
+        self.fake = FakeRestExchange({"BTCUSDT": 64000.0}).start()
+        self.api = BinanceAPI(base_url=self.fake.binance_url)
+
+    def tearDown(self):
+        self.fake.stop()
+
+    def call(self, guard):
+        return guard.call(self.api.get_price, "BTCUSDT", headers=lambda: self.api.last_headers)
+
+    def test_breaker_removes_failing_source(self):
+        guard = SourceGuard("binance", rate=100, failure_threshold=2, reset_timeout=0.2)
+        self.fake.fail(2, status=500)
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                self.call(guard)
+        with self.assertRaises(SourceUnavailable):
+            self.call(guard)
+        self.assertEqual(self.fake.requests, 2)  # the open breaker never reached the server
+
+        time.sleep(0.25)
+        self.assertEqual(self.call(guard), 64000.0)
+        self.assertEqual(guard.breaker.state, CLOSED)
+
+    def test_429_backs_off_without_blocking(self):
+        guard = SourceGuard("binance", rate=100)
+        self.fake.fail(1, status=429, retry_after=30)
+        with self.assertRaises(RateLimitedError):
+            self.call(guard)
+        start = time.monotonic()
+        with self.assertRaises(SourceUnavailable):
+            self.call(guard)
+        self.assertLess(time.monotonic() - start, 0.05)
+        self.assertEqual(self.fake.requests, 1)
+        self.assertEqual(guard.breaker.state, CLOSED)  # throttling is not ill health
+
+    def test_slow_upstream_is_bounded(self):
+        api = CoinbaseAPI(base_url=self.fake.coinbase_url, timeout=0.2)
+        self.assertEqual(api.get_price("BTCUSDT"), 64000.0)
+        self.fake.delay = 1.0
+        start = time.monotonic()
+        with self.assertRaises(Exception):
+            api.get_price("BTCUSDT")
+        self.assertLess(time.monotonic() - start, 0.9)  # no backoff retries behind the timeout
+
+
+if __name__ == "__main__":
+    unittest.main()
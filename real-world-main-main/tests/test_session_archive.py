@@ -0,0 +1,115 @@
+# tests/test_session_archive.py
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from backtesting_engine.session_archive import INDEX_DTYPE, SessionArchive
+
+
+def summary(pnl, capital=10_000.0):
+    return {"initial_capital": capital, "final_portfolio_value": capital + pnl, "final_pnl": pnl,
+            "cash_balance": capital / 2, "unrealized_pnl": pnl / 2, "fees_paid": 1.5, "position_count": 1}
+
+
+class TestSessionArchive(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "archive")
+        self.archive = SessionArchive(self.path)
+
+    def fill(self, n):
+        for i in range(n):
+            self.archive.append(summary(float(i - n // 2)), ["BTCUSDT", "ETHUSDT"] if i % 2 else ["SOLUSDT"], 60 + i,
+                                strategy="bollinger" if i % 3 == 0 else "mean_reversion",
+                                timestamp=1_700_000_000.0 + 3600 * i)
+
+    def test_round_trip_and_reopen(self):
+        timeline = [{"timestamp": "2025-04-06T03:00:00.250000", "portfolio_value": 10_000.0},
+                    {"timestamp": "2025-04-06T03:00:01", "portfolio_value": 10_012.75}]
+        logs = ["BUY 0.01 BTCUSDT @ 64000.00", "SELL 0.01 BTCUSDT @ 64100.00"]
+        self.assertEqual(self.archive.append(summary(12.75), ["BTCUSDT"], 300, logs=logs, pnl_timeline=timeline,
+                                             strategy="mean_reversion"), 0)
+        self.assertEqual(self.archive.append(summary(-3.0), "ETHUSDT", 120, logs=logs[-1:], trades=75), 1)
+
+        reopened = SessionArchive(self.path)
+        self.assertEqual(len(reopened), 2)
+        session = reopened.session(0)
+        self.assertEqual(session["logs"], logs)
+        self.assertEqual(session["pnl_timeline"], timeline)
+        self.assertEqual(session["summary"]["PnL"], 12.75)
+        self.assertEqual(session["summary"]["Strategy"], "mean_reversion")
+        self.assertEqual(reopened.session(1), {"summary": reopened.page(0, 1)[0], "logs": logs[-1:],
+                                               "pnl_timeline": []})
+        np.testing.assert_array_equal(reopened.index["trades"], [2, 75])
+
+    def test_filters_and_paging(self):
+        self.fill(25)
+        rows = self.archive.page(0, 10)
+        self.assertEqual([row["Session"] for row in rows], list(range(24, 14, -1)))
+        self.assertEqual(len(self.archive.page(2, 10)), 5)
+        self.assertEqual(self.archive.page(0, 3, newest_first=False)[0]["Symbols"], "SOLUSDT")
+
+        self.assertEqual(self.archive.count(symbol="ethusdt"), 12)
+        self.assertEqual(self.archive.count(symbol="ETH"), 0)  # whole symbols only
+        self.assertEqual(self.archive.count(strategy="bollinger"), 9)
+        self.assertEqual(self.archive.count(min_pnl=0), 13)
+        self.assertEqual(self.archive.count(since=1_700_000_000.0 + 3600 * 20), 5)
+        ids = self.archive.query(symbol="BTCUSDT", strategy="mean_reversion", max_pnl=0)
+        self.assertEqual(list(ids), [1, 5, 7, 11])
+        self.assertTrue(all(row["Symbols"] == "BTCUSDT, ETHUSDT"
+                            for row in self.archive.page(0, 50, symbol="BTCUSDT")))
+        self.assertEqual(self.archive.symbols(), ["BTCUSDT", "ETHUSDT", "SOLUSDT"])
+
+    def test_symbols_are_never_cut(self):
+        self.fill(2)
+        many = [f"COIN{i:02d}USDT" for i in range(20)]  # 219 bytes joined
+        with self.assertRaisesRegex(ValueError, "128-byte symbols field"):
+            self.archive.append(summary(1.0), many, 60)
+        self.assertEqual(len(SessionArchive(self.path)), 2)
+        self.archive.append(summary(1.0), many[:10], 60)
+        self.assertEqual(self.archive.count(symbol="COIN09USDT"), 1)
+        self.assertIn("COIN09USDT", self.archive.symbols())
+
+    def test_cached_aggregates_follow_appends(self):
+        self.fill(10)
+        stats = self.archive.stats()
+        self.assertIs(self.archive.stats(), stats)
+        self.assertEqual((stats["sessions"], stats["total_pnl"], stats["win_rate"]), (10, -5.0, 0.4))
+        counts, edges = self.archive.pnl_histogram(bins=5)
+        self.assertEqual(counts.sum(), 10)
+
+        self.archive.append(summary(100.0), ["BTCUSDT"], 30)
+        self.assertEqual(self.archive.stats()["best_pnl"], 100.0)
+        counts, edges = self.archive.pnl_histogram(bins=5)
+        self.assertEqual((counts.sum(), edges[-1]), (11, 100.0))
+
+    def test_torn_index_record_dropped(self):
+        self.fill(3)
+        with open(os.path.join(self.path, "index.bin"), "ab") as f:
+            f.write(b"\0" * (INDEX_DTYPE.itemsize // 2))
+        reopened = SessionArchive(self.path)
+        self.assertEqual(len(reopened), 3)
+        self.assertEqual(reopened.append(summary(1.0), ["BTCUSDT"], 10), 3)
+        np.testing.assert_array_equal(SessionArchive(self.path).index["pnl"], [-1.0, 0.0, 1.0, 1.0])
+
+    def test_import_legacy_json(self):
+        legacy = [{"Timestamp": "2025-04-05 02:11:09", "Symbols": "BTCUSDT, ETHUSDT", "Initial Capital": 10000.0,
+                   "Final Portfolio Value": 10042.5, "PnL": 42.5, "Cash Balance": 4000.0, "Unrealized PnL": 12.0,
+                   "Duration (s)": 300}]
+        path = os.path.join(os.path.dirname(self.path), "session_history.json")
+        with open(path, "w") as f:
+            json.dump(legacy, f)
+        self.assertEqual(self.archive.import_json(path), 1)
+        row = self.archive.page()[0]
+        self.assertEqual({key: row[key] for key in legacy[0]}, legacy[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
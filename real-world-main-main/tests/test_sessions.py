@@ -0,0 +1,74 @@
+# tests/test_sessions.py
+import os
+import sys
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from backtesting_engine.sessions import EngineError, SessionManager
+from backtesting_engine.strategies.strategy_mean_reversion import MeanReversionStrategy
+
+SYMBOL_SETS = [("BTCUSDT",), ("ETHUSDT",), ("BTCUSDT", "ETHUSDT")]
+
+
+class TestSessionManager(unittest.TestCase):
+    def setUp(self):
+        self.manager = SessionManager(pnl_interval=3600)
+
+    def tearDown(self):
+        self.manager.stop_all()
+
+    def test_hundred_sessions_share_one_fan_out(self):
+        ids = [self.manager.start_session(capital=1000 * (i + 1), runtime=60, symbols=SYMBOL_SETS[i % 3])
+               for i in range(100)]
+        self.assertEqual(self.manager.subscribe([]), ["BTCUSDT", "ETHUSDT"])
+        self.assertEqual(len(self.manager._routes["BTCUSDT"]), 67)
+
+        for i in range(30):
+            self.manager.on_price_update("BTCUSDT", 100.0 + i % 5)
+        self.manager.on_price_update("ETHUSDT", 2000.0)
+
+        traders = [self.manager.session(session_id).trader for session_id in ids]
+        self.assertEqual([t.initial_capital for t in traders[:3]], [1000, 2000, 3000])
+        self.assertEqual([sorted(t.get_price_data()) for t in traders[:3]],
+                         [["BTCUSDT"], ["ETHUSDT"], ["BTCUSDT", "ETHUSDT"]])
+        # One receive timestamp per tick, shared by every session it reaches.
+        stamps = {t.get_price_data()["ETHUSDT"][-1]["timestamp"] for t in traders[1::3] + traders[2::3]}
+        self.assertEqual(len(stamps), 1)
+        # pnl_interval bounds the timeline to one point per interval instead of one per tick.
+        self.assertEqual(len(traders[0].get_pnl_data()), 1)
+
+    def test_strategies_are_chosen_per_session(self):
+        first = self.manager.start_session(capital=100, runtime=60, symbols=["btcusdt"])
+        second = self.manager.start_session(capital=100, runtime=60, symbols=["BTCUSDT"], strategy="bollinger",
+                                            name="bb")
+        self.assertIsInstance(self.manager.session(first).trader.strategy, MeanReversionStrategy)
+        self.assertEqual(self.manager.session(second).status()["strategy"], "bollinger")
+        self.assertEqual(self.manager.session(second).name, "bb")
+
+        with self.assertRaises(EngineError):
+            self.manager.start_session(capital=100, runtime=60, symbols=["BTCUSDT"], strategy="nope")
+        for symbols in ("BTCUSDT", ["BTCUSDT", ""], ["BTCUSDT", 1]):
+            with self.subTest(symbols=symbols), self.assertRaises(EngineError):
+                self.manager.start_session(capital=100, runtime=60, symbols=symbols)
+        self.assertEqual(len(self.manager.sessions), 2)
+        with self.assertRaises(EngineError) as missing:
+            self.manager.session("42")
+        self.assertEqual(missing.exception.status, 404)
+
+    def test_expired_sessions_are_unrouted(self):
+        short = self.manager.start_session(capital=100, runtime=0.05, symbols=["BTCUSDT"])
+        long = self.manager.start_session(capital=100, runtime=60, symbols=["BTCUSDT"])
+        self.manager.on_price_update("BTCUSDT", 100.0)
+        time.sleep(0.1)
+        self.manager.on_price_update("BTCUSDT", 101.0)  # the short session sees its runtime run out here
+        self.manager.on_price_update("BTCUSDT", 102.0)
+
+        self.assertEqual(self.manager._routes["BTCUSDT"], (self.manager.session(long).trader,))
+        self.assertIsNotNone(self.manager.session(short).stopped_at)
+        self.assertEqual([s.id for s in self.manager.active_sessions()], [long])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+# tests/test_strategies.py
+import math
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from backtesting_engine.multi_asset import bollinger_states, strategy_states
+from backtesting_engine.real_time_runner import RealTimeTrader
+from backtesting_engine.strategies import Strategy, available_strategies, create_strategy, register_strategy
+from backtesting_engine.strategies.strategy_bollinger import strategy_bollinger
+from backtesting_engine.strategies.strategy_mean_reversion import MeanReversionStrategy, strategy_mean_reversion
+from price_engine.replay import TickReplayer
+
+
+def wave(n, offset=0.0):
+    return [100.0 + offset + 5 * math.sin(i / 6) + (i % 5) * 0.3 for i in range(n)]
+
+
+class TestStrategyRegistry(unittest.TestCase):
+    def test_builtins_and_plugins(self):
+        self.assertTrue({"mean_reversion", "bollinger", "enhanced_mean_reversion"} <= set(available_strategies()))
+        with self.assertRaises(KeyError):
+            create_strategy("nope")
+
+        @register_strategy("always_buy_test")
+        class AlwaysBuy(Strategy):
+            def on_bar(self, window, position):
+                return "buy" if position is None else None
+
+        trader = RealTimeTrader(capital=1000, runtime=60, strategy="always_buy_test")
+        for price in wave(25):
+            trader.on_price_update("BTCUSDT", price)
+        self.assertIn("BTCUSDT", trader.get_positions())
+        self.assertEqual(trader.get_strategy_timing()["on_bar"]["BTCUSDT"]["count"], 6)  # from min_ticks on
+
+        with self.assertRaises(TypeError):
+            @register_strategy("no_on_bar_test")
+            class Incomplete(Strategy):
+                pass
+        self.assertNotIn("no_on_bar_test", available_strategies())
+
+    def test_class_matches_function(self):
+        for name, function in (("mean_reversion", strategy_mean_reversion), ("bollinger", strategy_bollinger)):
+            strategy = create_strategy(name)
+            window = []
+            for price in wave(200):
+                window.append({"price": price})
+                if len(window) >= 50:
+                    self.assertEqual(strategy(window[-50:], None), function(window[-50:], None))
+                    self.assertEqual(strategy(window[-50:], "long"), function(window[-50:], "long"))
+
+
+class TestStrategyInterfaces(unittest.TestCase):
+    def test_symbols_get_their_own_state_and_shared_timing(self):
+        strategy = create_strategy("enhanced_mean_reversion")
+        trader = RealTimeTrader(capital=1000, runtime=60, strategy=strategy)
+        for a, b in zip(wave(60), wave(60, 50.0)):
+            trader.on_price_update("BTCUSDT", a)
+            trader.on_price_update("ETHUSDT", b)
+
+        shards = trader._shards
+        self.assertIsNot(shards["BTCUSDT"].strategy, shards["ETHUSDT"].strategy)
+        self.assertEqual(shards["ETHUSDT"].strategy.symbol, "ETHUSDT")
+        self.assertEqual(set(strategy.get_timing()["on_bar"]), {"BTCUSDT", "ETHUSDT", "ALL"})
+
+    def test_on_tick_matches_on_bar_and_replays(self):
+        prices = wave(150)
+        ticks = [(1700000000 + i, "BTCUSDT", p) for i, p in enumerate(prices)]
+        handler = MeanReversionStrategy().tick_handler()
+        TickReplayer(ticks, speed=None).run(handler)
+
+        reference = MeanReversionStrategy()
+        expected, position, window = [], None, []
+        for price in prices:
+            window.append({"price": price})
+            action = reference(window[-50:], position) if len(window) >= 50 else None
+            if action:
+                expected.append(("BTCUSDT", price, action))
+                position = "long" if action == "buy" else None
+        self.assertEqual(handler.actions, expected)
+
+    def test_on_series(self):
+        closes = pd.DataFrame({"A": wave(120), "B": wave(120, 20.0)})
+        closes.iloc[:10, 1] = np.nan
+
+        states = create_strategy("mean_reversion").on_series(closes)
+        np.testing.assert_array_equal(states, strategy_states(closes, strategy_mean_reversion))
+
+        bollinger = create_strategy("bollinger")
+        np.testing.assert_array_equal(bollinger.on_series(closes), bollinger_states(closes))
+        self.assertEqual(bollinger.get_timing()["on_series"]["ALL"]["count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
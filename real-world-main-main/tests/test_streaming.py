@@ -0,0 +1,98 @@
+# tests/test_streaming.py
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from backtesting_engine.execution import SimulatedExecution
+from backtesting_engine.multi_asset import run_multi_asset_backtest, target_weights
+from backtesting_engine.streaming import forward_fill_chunks, open_chunks, run_chunked_backtest
+from backtesting_engine.strategies import Strategy, create_strategy
+from price_engine.tick_files import ColumnarFile, read_tick_log_chunks, tail_tick_log, write_columnar
+
+
+class Momentum(Strategy):
+    warmup = 10
+
+    def on_bar(self, window, position):
+        first, last = window[0]["price"], window[-1]["price"]
+        return "buy" if last > first * 1.002 else "sell" if last < first * 0.998 else None
+
+
+def random_walk(n, seed, start):
+    return start * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.002, n)))
+
+
+class TestChunkedBacktest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        index = pd.date_range("2025-01-01", periods=1500, freq="min", name="timestamp")
+        closes = pd.DataFrame({"AAA": random_walk(1500, 1, 100.0), "BBB": random_walk(1500, 2, 20.0)}, index=index)
+        closes.iloc[:120, 1] = np.nan  # BBB lists later
+        closes.iloc[700:710, 0] = np.nan  # a gap, forward filled
+        self.path = os.path.join(self.dir, "bars.csv")
+        closes.to_csv(self.path)
+        self.closes = pd.read_csv(self.path, index_col=0, parse_dates=True)  # the whole file in memory
+
+    def in_memory(self, strategy, **kwargs):
+        closes = self.closes.ffill()
+        return run_multi_asset_backtest(closes, target_weights(strategy.on_series(closes)), 100_000, **kwargs)
+
+    def assert_same(self, expected, actual):
+        np.testing.assert_array_equal(np.asarray(list(actual.net_worth_history)),
+                                      np.asarray(list(expected.net_worth_history)))
+        self.assertEqual(len(actual.trade_log), len(expected.trade_log))
+        self.assertEqual(actual.cash, expected.cash)
+        self.assertEqual(actual.positions, expected.positions)
+
+    def test_matches_in_memory(self):
+        for name in ("mean_reversion", "bollinger"):
+            for chunksize in (7, 400, 5000):
+                for kwargs in ({}, {"rebalance_every": 50, "execution": SimulatedExecution(
+                        maker_fee=0.001, taker_fee=0.001, latency_bars=3)}):
+                    with self.subTest(strategy=name, chunksize=chunksize, **{k: bool(v) for k, v in kwargs.items()}):
+                        expected = self.in_memory(create_strategy(name), lot_size=0.01, **kwargs)
+                        actual = run_chunked_backtest(open_chunks(self.path, chunksize), create_strategy(name),
+                                                      100_000, lot_size=0.01, **kwargs)
+                        self.assertGreater(len(expected.trade_log), 0)
+                        self.assert_same(expected, actual)
+
+    def test_per_bar_strategy_stream(self):
+        closes = self.closes.ffill()
+        stream = Momentum().series_stream()
+        states = np.vstack([stream(chunk) for chunk in forward_fill_chunks(open_chunks(self.path, 64))])
+        np.testing.assert_array_equal(states, Momentum().on_series(closes))
+
+    def test_columnar_round_trip(self):
+        columnar = write_columnar(open_chunks(self.path, 400), os.path.join(self.dir, "bars.cols"))
+        self.assertEqual(len(columnar), 1500)
+        reread = pd.concat(ColumnarFile(columnar.path).chunks(333))
+        pd.testing.assert_frame_equal(reread, self.closes, check_freq=False, check_index_type=False)
+        self.assert_same(run_chunked_backtest(open_chunks(self.path, 1500), create_strategy("mean_reversion"), 100_000),
+                         run_chunked_backtest(columnar.chunks(256), create_strategy("mean_reversion"), 100_000))
+
+
+class TestTickLogs(unittest.TestCase):
+    def test_chunks_and_tail(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "btcusdt_price_log.csv")
+            prices = random_walk(3000, 3, 64000.0)
+            with open(path, "w") as f:
+                for i, price in enumerate(prices):
+                    f.write(f"2025-04-06 03:{i // 60 % 60:02d}:{i % 60:02d},{price:.8f}\n")
+            ticks = pd.concat(read_tick_log_chunks(path, chunksize=700))
+            self.assertEqual(list(ticks.columns), ["BTCUSDT"])
+            np.testing.assert_allclose(ticks["BTCUSDT"].to_numpy(), prices, rtol=1e-12)
+            pd.testing.assert_frame_equal(tail_tick_log(path, 250, block_size=1024), ticks.iloc[-250:])
+            self.assertIs(type(open_chunks(path)), type(read_tick_log_chunks(path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
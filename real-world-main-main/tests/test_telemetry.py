@@ -0,0 +1,50 @@
+# tests/test_telemetry.py
+import os
+import sys
+import unittest
+import urllib.request
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from price_engine.telemetry import MetricsRegistry, REGISTRY, start_metrics_server
+from backtesting_engine.real_time_runner import RealTimeTrader
+
+
+class TestTelemetry(unittest.TestCase):
+    def test_render_prometheus_text(self):
+        registry = MetricsRegistry()
+        registry.counter("ticks_total", "Ticks").inc(symbol="BTCUSDT")
+        registry.counter("ticks_total").inc(2, symbol="BTCUSDT")
+        registry.gauge("queue_depth", "Depth").set(7)
+        registry.histogram("fetch_seconds", "Fetch").observe(0.002, source="binance")
+
+        text = registry.render()
+        self.assertIn("# TYPE ticks_total counter", text)
+        self.assertIn('ticks_total{symbol="BTCUSDT"} 3', text)
+        self.assertIn("queue_depth 7", text)
+        self.assertIn('fetch_seconds_bucket{source="binance",le="+Inf"} 1', text)
+        self.assertIn('fetch_seconds_bucket{source="binance",le="0.001"} 0', text)
+        self.assertIn('fetch_seconds_count{source="binance"} 1', text)
+
+    def test_local_scrape_includes_trader_metrics(self):
+        trader = RealTimeTrader(capital=10000, runtime=60)
+        for i in range(25):
+            trader.on_price_update("ETHUSDT", 100 + i)
+
+        server = start_metrics_server(port=0)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+                self.assertIn("text/plain", response.headers["Content-Type"])
+                body = response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertIn(f'trader_ticks_total{{symbol="ETHUSDT",trader="{trader.metrics_id}"}} 25', body)
+        self.assertIn("trader_stage_latency_seconds_count", body)
+        self.assertIs(server.registry, REGISTRY)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+# tests/test_ws_supervisor.py
+import os
+import socket
+import sys
+import threading
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from price_engine.data_sources.websocket_handler import WS_OPEN, BinanceWebSocketClient
+from price_engine.fake_exchange import FakeBinanceWebSocketServer, FakeRestExchange
+
+
+def ticks(count, symbol="BTCUSDT"):
+    return [(1700000000 + i, symbol, 100.0 + i) for i in range(count)]
+
+
+class TestWebSocketSupervisor(unittest.TestCase):
+    def run_feed(self, server, expected, **client_kwargs):
+        server.start()
+        rest = FakeRestExchange(trade_feed=server).start()
+        received = []
+        done = threading.Event()
+
+        def on_price_update(symbol, price):
+            received.append(price)
+            if len(received) >= expected:
+                done.set()
+
+        client = BinanceWebSocketClient(["BTCUSDT"], on_price_update, base_url=server.url, rest_url=rest.binance_url,
+                                        ping_interval=0, backoff_initial=0.05, **client_kwargs)
+        try:
+            client.create_ws("BTCUSDT")
+            done.wait(10)
+        finally:
+            client.stop()
+            server.stop()
+            rest.stop()
+        return client, received
+
+    def test_reconnects_and_backfills_dropped_connection(self):
+        server = FakeBinanceWebSocketServer(ticks(30), drop_after=10, drop_gap=5)
+        client, received = self.run_feed(server, 30, stale_after=None)
+
+        # Every trade arrives exactly once and in order, including the 5 sent while disconnected.
+        self.assertEqual(received, [100.0 + i for i in range(30)])
+        self.assertGreaterEqual(server.connections["BTCUSDT"], 2)
+        self.assertEqual(client.last_trade_ids["BTCUSDT"], 29)
+
+    def test_stale_stream_is_restarted(self):
+        stale = []
+        server = FakeBinanceWebSocketServer(ticks(10), drop_after=5, drop_gap=2, stall=True)
+        client, received = self.run_feed(server, 10, stale_after=0.3, on_stale=stale.append)
+
+        self.assertEqual(received, [100.0 + i for i in range(10)])
+        self.assertEqual(stale, ["BTCUSDT"])
+        self.assertFalse(client.is_stale("BTCUSDT"))
+
+    def test_refused_connects_leave_open_gauge_alone(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]  # nothing listens here once the socket is closed
+
+        closes = threading.Semaphore(0)
+
+        class Client(BinanceWebSocketClient):
+            def on_close(self, ws, close_status_code, close_msg):
+                super().on_close(ws, close_status_code, close_msg)
+                closes.release()
+
+        open_before = WS_OPEN.value()
+        client = Client(["BTCUSDT"], lambda symbol, price: None, base_url=f"ws://127.0.0.1:{port}/ws",
+                        rest_url=None, ping_interval=0, stale_after=None, backoff_initial=0.001, backoff_max=0.001)
+        try:
+            client.create_ws("BTCUSDT")
+            for _ in range(5):
+                self.assertTrue(closes.acquire(timeout=10))
+        finally:
+            client.stop()
+        self.assertEqual(WS_OPEN.value(), open_before)
+
+    def test_duplicate_trade_ids_are_dropped(self):
+        received = []
+        client = BinanceWebSocketClient(["ETHUSDT"], lambda symbol, price: received.append(price))
+        for trade_id, price in [(1, 10.0), (2, 11.0), (2, 11.0), (1, 10.0), (3, 12.0)]:
+            client.on_message(None, f'{{"s": "ETHUSDT", "t": {trade_id}, "p": "{price}"}}')
+        self.assertEqual(received, [10.0, 11.0, 12.0])
+
+
+if __name__ == "__main__":
+    unittest.main()